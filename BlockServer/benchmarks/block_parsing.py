@@ -0,0 +1,137 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+"""
+Compares the time to find the children of every block in a blocks.xml file by searching for each
+of them in turn, as blocks_from_xml used to, with finding them all in one pass, for files with
+and without a namespace. Also times reading the blocks from the file as a whole.
+
+Run from the top level directory with:
+
+    python -m BlockServer.benchmarks.block_parsing --blocks 5000
+"""
+
+import argparse
+import re
+import time
+from collections import OrderedDict
+from xml.etree import ElementTree
+
+from server_common.helpers import MACROS
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.config.group import Group
+from BlockServer.config.xml_converter import (
+    KEY_NONE,
+    NS_TAG_BLOCK,
+    TAG_BLOCK,
+    ConfigurationXmlConverter,
+)
+from BlockServer.core.constants import (
+    GRP_NONE,
+    TAG_LOCAL,
+    TAG_LOG_DEADBAND,
+    TAG_LOG_PERIODIC,
+    TAG_LOG_RATE,
+    TAG_NAME,
+    TAG_READ_PV,
+    TAG_RUNCONTROL_ENABLED,
+    TAG_RUNCONTROL_HIGH,
+    TAG_RUNCONTROL_LOW,
+    TAG_RUNCONTROL_SUSPEND_ON_INVALID,
+    TAG_SET_BLOCK,
+    TAG_SET_BLOCK_VAL,
+    TAG_VISIBLE,
+)
+
+# The children blocks_from_xml reads
+BLOCK_TAGS = [
+    TAG_NAME,
+    TAG_READ_PV,
+    TAG_LOCAL,
+    TAG_VISIBLE,
+    TAG_RUNCONTROL_ENABLED,
+    TAG_RUNCONTROL_LOW,
+    TAG_RUNCONTROL_HIGH,
+    TAG_RUNCONTROL_SUSPEND_ON_INVALID,
+    TAG_LOG_PERIODIC,
+    TAG_LOG_RATE,
+    TAG_LOG_DEADBAND,
+    TAG_SET_BLOCK,
+    TAG_SET_BLOCK_VAL,
+]
+
+
+def _blocks_xml(num_blocks):
+    config = Configuration(MACROS)
+    for i in range(num_blocks):
+        config.add_block(f"BLOCK_{i}", f"IN:INST:DEVICE_{i % 100:02d}:VALUE_{i}", f"GROUP_{i}")
+    return ConfigurationXmlConverter.blocks_to_xml(config.blocks, MACROS)
+
+
+def _search_each(block_nodes):
+    find = ConfigurationXmlConverter._find_single_node
+    return [{tag: find(b, NS_TAG_BLOCK, tag) for tag in BLOCK_TAGS} for b in block_nodes]
+
+
+def _one_pass(block_nodes):
+    nodes = [ConfigurationXmlConverter._find_child_nodes(b, NS_TAG_BLOCK) for b in block_nodes]
+    return [{tag: children.get(tag) for tag in BLOCK_TAGS} for children in nodes]
+
+
+def _read_blocks(root):
+    blocks = OrderedDict()
+    ConfigurationXmlConverter.blocks_from_xml(root, blocks, {KEY_NONE: Group(GRP_NONE)})
+    return blocks
+
+
+def _time(function, value, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function(value)
+    return result, (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--blocks", type=int, default=5000, help="Number of blocks to create")
+    parser.add_argument("--repeats", type=int, default=10, help="Number of times to time each")
+    args = parser.parse_args()
+
+    xml = _blocks_xml(args.blocks)
+    documents = [
+        ("namespaced", xml),
+        ("plain", re.sub(' xmlns(:blk)?="[^"]+"', "", xml)),
+    ]
+
+    print(f"Blocks: {args.blocks}")
+    print(f"{'':12}{'search each (ms)':>18}{'one pass (ms)':>15}{'blocks_from_xml (ms)':>22}")
+    for label, document in documents:
+        root = ElementTree.fromstring(document)
+        block_nodes = ConfigurationXmlConverter._find_all_nodes(root, NS_TAG_BLOCK, TAG_BLOCK)
+        searched, search_time = _time(_search_each, block_nodes, args.repeats)
+        passed, pass_time = _time(_one_pass, block_nodes, args.repeats)
+        if searched != passed:
+            raise AssertionError(f"The children found in the {label} file differ")
+        blocks, read_time = _time(_read_blocks, root, args.repeats)
+        if len(blocks) != args.blocks:
+            raise AssertionError(f"Read {len(blocks)} blocks from the {label} file")
+        print(
+            f"{label:12}{1000 * search_time:18.1f}{1000 * pass_time:15.1f}{1000 * read_time:22.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+"""
+Measures the time recording a Channel Access call adds to it, by calling a caget that returns
+straight away with and without the statistics being recorded.
+
+Run from the top level directory with:
+
+    python -m BlockServer.benchmarks.ca_statistics --calls 1000000
+"""
+
+import argparse
+import time
+
+from ServerTools import ca_statistics
+from ServerTools.ca_statistics import CA_STATISTICS, ChannelAccess
+
+
+class _NoOpChannelAccess:
+    @staticmethod
+    def caget(name, as_string=False):
+        return "VALUE"
+
+
+def _time_calls(caget, calls, pvs):
+    start = time.perf_counter()
+    for i in range(calls):
+        caget(pvs[i % len(pvs)])
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--calls", type=int, default=1000000, help="Number of calls to time")
+    parser.add_argument("--prefixes", type=int, default=100, help="Number of PV prefixes")
+    args = parser.parse_args()
+
+    pvs = [f"IN:INST:CS:PS:IOC_{i:02d}:STATUS" for i in range(args.prefixes)]
+    ca_statistics._ChannelAccess = _NoOpChannelAccess
+    plain = _time_calls(_NoOpChannelAccess.caget, args.calls, pvs)
+    recorded = _time_calls(ChannelAccess.caget, args.calls, pvs)
+    recorded_calls = sum(c["calls"] for c in CA_STATISTICS.get_statistics()["calls"])
+    if recorded_calls != args.calls:
+        raise AssertionError(f"Recorded {recorded_calls} of {args.calls} calls")
+
+    print(f"Calls: {args.calls} to {args.prefixes} PV prefixes")
+    print(f"Without statistics: {1e6 * plain:.2f} us per call")
+    print(f"With statistics:    {1e6 * recorded:.2f} us per call")
+    print(f"Overhead:           {1e6 * (recorded - plain):.2f} us per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+"""
+Compares the XML configuration files with the SQLite database for the time taken to list and
+load every configuration and component, as the BlockServer does on startup, and to save a
+configuration.
+
+Run from the top level directory with:
+
+    python -m BlockServer.benchmarks.config_store --configs 200 [--schema_dir DIR]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import shutil
+import tempfile
+import time
+from importlib.resources import as_file, files
+
+from server_common.file_path_manager import FILEPATH_MANAGER
+from server_common.helpers import MACROS
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.fileIO.file_manager import ConfigurationFileManager
+from BlockServer.fileIO.sqlite_file_manager import (
+    ConfigDatabase,
+    SqliteConfigurationFileManager,
+    import_from_xml,
+)
+
+DEVICES = ["EUROTHRM", "LKSH336", "CAEN", "JULABO", "KEPCO", "GALIL", "DANFYSIK", "IPS", "FINS"]
+QUANTITIES = ["TEMP", "SETPOINT", "FIELD", "CURRENT", "VOLTAGE", "POSITION", "PRESSURE", "FLOW"]
+
+
+def _configuration(rng, name, components):
+    config = Configuration(MACROS)
+    config.set_name(name)
+    config.meta.description = f"{name} for {rng.choice(QUANTITIES).lower()}"
+    for i in range(rng.choice([3, 10, 40, 150])):
+        device = f"{rng.choice(DEVICES)}_{rng.randint(1, 12):02d}"
+        quantity = rng.choice(QUANTITIES)
+        config.add_block(
+            f"{quantity.capitalize()}_{i}",
+            f"IN:INST:{device}:{quantity}",
+            f"{rng.choice(QUANTITIES).capitalize()}s",
+        )
+    for i in range(rng.randint(1, 10)):
+        config.add_ioc(f"{rng.choice(DEVICES)}_{i + 1:02d}", autostart=True)
+    for component in rng.sample(components, min(len(components), rng.randint(0, 3))):
+        config.components[component.lower()] = component
+    return config
+
+
+def _startup(file_manager):
+    loaded = 0
+    for is_component, root in (
+        (True, FILEPATH_MANAGER.component_dir),
+        (False, FILEPATH_MANAGER.config_dir),
+    ):
+        for name in file_manager.get_files_in_directory(root):
+            file_manager.load_config(name, MACROS, is_component)
+            loaded += 1
+    return loaded
+
+
+def _time(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _save_all(file_manager, configs):
+    for config, is_component in configs:
+        file_manager.save_config(config, is_component)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--configs", type=int, default=200, help="Number of configurations")
+    parser.add_argument("--components", type=int, default=20, help="Number of components")
+    parser.add_argument("--schema_dir", help="Schema folder (default=server_common)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    component_names = [f"COMPONENT_{i}" for i in range(args.components)]
+    configs = [(_configuration(rng, name, []), True) for name in component_names]
+    configs += [
+        (_configuration(rng, f"CONFIG_{i}", component_names), False) for i in range(args.configs)
+    ]
+
+    root = tempfile.mkdtemp()
+    if args.schema_dir:
+        schema_cm = contextlib.nullcontext(args.schema_dir)
+    else:
+        schema_cm = as_file(files("server_common.schema"))
+    try:
+        with schema_cm as schema_dir:
+            FILEPATH_MANAGER.initialise(root, root, schema_dir)
+            xml_files = ConfigurationFileManager()
+            _, xml_save = _time(_save_all, xml_files, configs)
+            loaded, xml_startup = _time(_startup, xml_files)
+
+            database = ConfigDatabase(os.path.join(root, "configs.sqlite"))
+            _, import_time = _time(import_from_xml, database)
+            store = SqliteConfigurationFileManager(database)
+            _, sqlite_save = _time(_save_all, store, configs)
+            _, sqlite_startup = _time(_startup, store)
+            database.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"Configurations and components: {loaded}, import into SQLite {import_time:.2f} s")
+    print(f"{'':8}{'startup (s)':>13}{'save (ms)':>11}")
+    results = (("XML", xml_startup, xml_save), ("SQLite", sqlite_startup, sqlite_save))
+    for label, startup, save in results:
+        print(f"{label:8}{startup:13.3f}{1000 * save / len(configs):11.2f}")
+
+
+if __name__ == "__main__":
+    main()
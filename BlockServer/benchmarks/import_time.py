@@ -0,0 +1,141 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+"""
+Profiles the time taken to import each entry point, which is most of the time taken before the
+server starts serving PVs. Each entry point is imported in a new interpreter with
+python -X importtime, and the number of modules imported and the slowest of them are reported.
+Packages that cannot be imported without the control system, such as pcaspy, can be stubbed.
+
+Run from the top level directory with:
+
+    python -m BlockServer.benchmarks.import_time --top 20 --stub pcaspy genie_python
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Iterable, List, NamedTuple
+
+ENTRY_POINTS = [
+    "block_server",
+    "DatabaseServer.database_server",
+    "ArchiverAccess.archiver_access",
+]
+
+# Written to stderr once the stubs are installed, so that only the imports after it are counted
+_MARKER = "import_time: importing"
+
+# Installs an import hook giving an empty module for each stubbed package and its submodules.
+# Any attribute of a stub module is a class accepting any arguments, so that the importing
+# modules can subclass and call what they import from it.
+_STUB_SCRIPT = """
+import sys
+from importlib.machinery import ModuleSpec
+
+class _Stub:
+    def __init__(self, *args, **kwargs):
+        pass
+
+class _StubFinder:
+    @staticmethod
+    def find_spec(name, path=None, target=None):
+        if name.split(".")[0] in {stubs!r}:
+            return ModuleSpec(name, _StubFinder, is_package=True)
+        return None
+
+    @staticmethod
+    def create_module(spec):
+        return None
+
+    @staticmethod
+    def exec_module(module):
+        module.__getattr__ = lambda name: type(name, (_Stub,), {{}})
+
+sys.meta_path.insert(0, _StubFinder)
+"""
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def profile_imports(module: str, stubs: Iterable[str] = ()) -> List[ImportTime]:
+    """Imports a module in a new interpreter and reads the time taken to import each module.
+
+    Args:
+        module: The module to import
+        stubs: Top level packages to replace with empty modules, which are not counted
+
+    Returns:
+        The time taken to import each module, in the order they finished importing
+
+    Raises:
+        RuntimeError: If the module could not be imported
+    """
+    stubs = sorted(set(stubs))
+    script = _STUB_SCRIPT.format(stubs=stubs) if stubs else "import sys\n"
+    script += f"sys.stderr.write({_MARKER!r} + '\\n')\nimport {module}\n"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    lines = result.stderr.splitlines()
+    times = []
+    for line in lines[lines.index(_MARKER) + 1 :]:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # The header line
+            continue
+        if name.strip().split(".")[0] in stubs:
+            continue
+        times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0].strip())
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="Modules to profile")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to show")
+    parser.add_argument("--stub", nargs="*", default=[], help="Packages to replace with stubs")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        try:
+            times = profile_imports(module, args.stub)
+        except RuntimeError as err:
+            print(f"{module}: could not be imported: {err}\n")
+            continue
+        total = sum(t.self_us for t in times)
+        print(f"{module}: {len(times)} modules imported in {total / 1000:.1f} ms")
+        print(f"{'cumulative (ms)':>16}{'self (ms)':>11}  module")
+        slowest = sorted(times, key=lambda t: t.cumulative_us, reverse=True)[: args.top]
+        for t in slowest:
+            print(f"{t.cumulative_us / 1000:16.1f}{t.self_us / 1000:11.1f}  {t.module}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+"""
+Measures the memory used by, and the time taken to deep copy, a configuration with a large
+number of blocks, compared with the same blocks held in per-instance dictionaries as the models
+were before they used slots.
+
+Run from the top level directory with:
+
+    python -m BlockServer.benchmarks.model_memory --blocks 50000
+"""
+
+import argparse
+import copy
+import time
+import tracemalloc
+
+from server_common.helpers import MACROS
+
+from BlockServer.config.block import Block
+from BlockServer.config.configuration import Configuration
+
+
+class _DictBlock:
+    """A block stored in an instance dictionary, for comparison.
+
+    It is deep copied as a block is, with a shallow copy, so that only the storage is compared.
+    """
+
+    def __init__(self, block):
+        for name in Block.__slots__:
+            setattr(self, name, getattr(block, name))
+
+    def __deepcopy__(self, memo):
+        return copy.copy(self)
+
+
+def _create_config(num_blocks):
+    config = Configuration(MACROS)
+    for i in range(num_blocks):
+        config.add_block(f"BLOCK_{i}", f"IN:INST:DEVICE_{i % 100:02d}:VALUE_{i}", f"GROUP_{i % 50}")
+    return config
+
+
+def _measure(create):
+    """Measures the memory allocated by a function and keeps the result alive while doing so.
+
+    Returns:
+        tuple: the result of the function and the number of bytes it allocated
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = create()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def _time_deepcopy(value, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        copy.deepcopy(value)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--blocks", type=int, default=50000, help="Number of blocks to create")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of deep copies to time")
+    args = parser.parse_args()
+
+    config = _create_config(args.blocks)
+    # Both copies share the attribute values so only the objects themselves are measured
+    dict_blocks, dict_bytes = _measure(lambda: [_DictBlock(b) for b in config.blocks.values()])
+    slot_blocks, slot_bytes = _measure(lambda: [copy.copy(b) for b in config.blocks.values()])
+
+    print(f"Blocks: {args.blocks}")
+    print(f"{'':24}{'total (MiB)':>14}{'per block (B)':>16}{'deepcopy (s)':>16}")
+    for label, blocks, size in [
+        ("instance dictionaries", dict_blocks, dict_bytes),
+        ("slots", slot_blocks, slot_bytes),
+    ]:
+        print(
+            f"{label:24}{size / 2**20:14.2f}{size / args.blocks:16.1f}"
+            f"{_time_deepcopy(blocks, args.repeats):16.3f}"
+        )
+    print(f"Memory saved: {100 * (1 - slot_bytes / dict_bytes):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+"""
+Compares the compression ratio and time of plain zlib with zlib using the preset payload
+dictionary, on a synthetic corpus of configuration details, configuration and component lists,
+and IOC and PV lists.
+
+Run from the top level directory with:
+
+    python -m BlockServer.benchmarks.payload_dictionary
+
+The corpus used to benchmark is generated from a different seed to the one the dictionary was
+trained on. To train a new version of the dictionary on the synthetic corpus, or on a directory
+of JSON files taken from an instrument, use:
+
+    python -m BlockServer.benchmarks.payload_dictionary --train payload_v2.dict [--corpus DIR]
+
+and move the file into ServerTools/dictionaries.
+"""
+
+import argparse
+import os
+import random
+import time
+import zlib
+
+from server_common.helpers import MACROS
+from server_common.utilities import convert_to_json
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.config.metadata import MetaData
+from BlockServer.core.config_holder import ConfigHolder
+from BlockServer.mocks.mock_file_manager import MockConfigurationFileManager
+from ServerTools.payload_dictionary import (
+    compress_with_dictionary,
+    decompress_with_dictionary,
+    load_dictionary,
+    train_dictionary,
+)
+
+TRAINING_SEED = 0
+BENCHMARK_SEED = 1
+
+DEVICES = ["EUROTHRM", "LKSH336", "CAEN", "JULABO", "KEPCO", "GALIL", "DANFYSIK", "IPS", "FINS"]
+QUANTITIES = ["TEMP", "SETPOINT", "FIELD", "CURRENT", "VOLTAGE", "POSITION", "PRESSURE", "FLOW"]
+PV_TYPES = ["ai", "ao", "bi", "bo", "calc", "mbbi", "stringin", "longin"]
+SIZE_BUCKETS = [(0, 2000, "< 2 KiB"), (2000, 32000, "2 - 32 KiB"), (32000, None, "> 32 KiB")]
+
+
+def _device(rng):
+    return f"{rng.choice(DEVICES)}_{rng.randint(1, 12):02d}"
+
+
+def _config_details(rng, name):
+    config = Configuration(MACROS)
+    config.meta = MetaData(name, description=f"{name} for {rng.choice(QUANTITIES).lower()}")
+    for i in range(rng.choice([3, 10, 40, 150, 600])):
+        device = _device(rng)
+        quantity = rng.choice(QUANTITIES)
+        config.add_block(
+            f"{quantity.capitalize()}_{i}",
+            f"IN:INST:{device}:{quantity}{rng.randint(1, 4)}",
+            f"{rng.choice(QUANTITIES).capitalize()}s",
+            visible=rng.random() > 0.1,
+            runcontrol=rng.random() > 0.7,
+            log_periodic=rng.random() > 0.5,
+            log_rate=rng.choice([5, 10, 30]),
+        )
+    for _ in range(rng.randint(1, 15)):
+        config.add_ioc(_device(rng), autostart=True, restart=rng.random() > 0.5, simlevel="none")
+    holder = ConfigHolder(MACROS, MockConfigurationFileManager(), test_config=config)
+    return holder.get_config_details()
+
+
+def _name(rng):
+    return f"{rng.choice(DEVICES)}_{rng.choice(QUANTITIES)}_{rng.randint(1, 999)}"
+
+
+def _timestamp(rng):
+    return (
+        f"20{rng.randint(15, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+    )
+
+
+def _config_list(rng, count):
+    configs = []
+    for _ in range(count):
+        name = _name(rng)
+        configs.append(
+            {
+                "name": name,
+                "pv": name,
+                "description": f"Configuration for {rng.choice(QUANTITIES).lower()}",
+                "synoptic": rng.choice(["", _name(rng)]),
+                "history": [_timestamp(rng) for _ in range(rng.randint(0, 3))],
+                "isProtected": rng.random() > 0.8,
+                "isDynamic": rng.random() > 0.9,
+                "configuresBlockGWAndArchiver": False,
+                "component_of": [],
+            }
+        )
+    return configs
+
+
+def _ioc_list(rng, count):
+    return {
+        _device(rng) + f"_{i}": {
+            "running": rng.random() > 0.5,
+            "description": f"{rng.choice(DEVICES)} {rng.choice(QUANTITIES).lower()} controller",
+            "macros": {},
+            "pvsets": {},
+            "pvs": {},
+        }
+        for i in range(count)
+    }
+
+
+def _pv_list(rng, count):
+    items = []
+    for _ in range(count):
+        device = _device(rng)
+        quantity = rng.choice(QUANTITIES)
+        items.append(
+            [
+                f"IN:INST:{device}:{quantity}",
+                rng.choice(PV_TYPES),
+                f"The {quantity.lower()}",
+                device,
+            ]
+        )
+    return items
+
+
+def synthetic_corpus(seed, size=200):
+    """Generates example payloads.
+
+    Args:
+        seed: Seeds the random generator, so the same corpus can be generated again
+        size: The number of payloads of each kind
+
+    Returns:
+        list: The payloads as JSON
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        corpus.append(_config_details(rng, _name(rng)))
+        corpus.append(_config_list(rng, rng.choice([1, 5, 20, 80])))
+        corpus.append(_ioc_list(rng, rng.choice([2, 20, 200])))
+        corpus.append(_pv_list(rng, rng.choice([5, 50, 500])))
+    return [convert_to_json(payload).encode("utf-8") for payload in corpus]
+
+
+def _read_corpus(directory):
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), "rb") as f:
+            corpus.append(f.read())
+    return corpus
+
+
+def _bucket(length):
+    for low, high, label in SIZE_BUCKETS:
+        if length >= low and (high is None or length < high):
+            return label
+
+
+def _benchmark(corpus, dictionary_version):
+    results = {label: [0, 0, 0, 0.0, 0.0, 0.0] for _, _, label in SIZE_BUCKETS}
+    load_dictionary(dictionary_version)
+    for payload in corpus:
+        row = results[_bucket(len(payload))]
+        start = time.perf_counter()
+        plain = zlib.compress(payload)
+        middle = time.perf_counter()
+        with_dictionary = compress_with_dictionary(payload, dictionary_version)
+        end = time.perf_counter()
+        zlib.decompress(plain)
+        after_plain = time.perf_counter()
+        decompress_with_dictionary(with_dictionary)
+        after_dictionary = time.perf_counter()
+        row[0] += len(payload)
+        row[1] += len(plain)
+        row[2] += len(with_dictionary)
+        row[3] += middle - start
+        row[4] += end - middle
+        row[5] += (after_dictionary - after_plain) - (after_plain - end)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--payloads", type=int, default=200, help="Payloads of each kind")
+    parser.add_argument("--version", type=int, default=1, help="Dictionary version to test")
+    parser.add_argument("--train", help="Train a dictionary and write it to this file")
+    parser.add_argument("--corpus", help="Directory of JSON files to train on")
+    args = parser.parse_args()
+
+    if args.train:
+        corpus = (
+            _read_corpus(args.corpus)
+            if args.corpus
+            else synthetic_corpus(TRAINING_SEED, args.payloads)
+        )
+        dictionary = train_dictionary(corpus)
+        with open(args.train, "wb") as f:
+            f.write(dictionary)
+        print(f"Wrote {len(dictionary)} byte dictionary trained on {len(corpus)} payloads")
+        return
+
+    corpus = synthetic_corpus(BENCHMARK_SEED, args.payloads)
+    print(f"Payloads: {len(corpus)}, dictionary version {args.version}")
+    print(
+        f"{'':12}{'count':>7}{'ratio':>9}{'ratio dict':>12}{'saved':>8}"
+        f"{'time (ms)':>11}{'time dict':>11}{'extra decompress':>18}"
+    )
+    for label, row in _benchmark(corpus, args.version).items():
+        raw, plain, with_dictionary, plain_time, dictionary_time, decompress_time = row
+        count = sum(1 for payload in corpus if _bucket(len(payload)) == label)
+        if count == 0:
+            continue
+        print(
+            f"{label:12}{count:7d}{raw / plain:9.2f}{raw / with_dictionary:12.2f}"
+            f"{100 * (1 - with_dictionary / plain):7.1f}%"
+            f"{plain_time * 1000:11.2f}{dictionary_time * 1000:11.2f}"
+            f"{decompress_time * 1000:18.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+"""
+Compares the size on the wire, and the time to encode and decode, the details of a configuration
+with a large number of blocks when sent as hexed compressed JSON, as raw compressed bytes on a
+binary twin PV and as base64.
+
+Run from the top level directory with:
+
+    python -m BlockServer.benchmarks.wire_format --blocks 5000
+"""
+
+import argparse
+import time
+
+from server_common.helpers import MACROS
+from server_common.utilities import (
+    compress_and_hex,
+    convert_to_json,
+    dehex_and_decompress,
+)
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.core.config_holder import ConfigHolder
+from BlockServer.mocks.mock_file_manager import MockConfigurationFileManager
+from ServerTools.binary_payload import (
+    decode_base64,
+    decode_binary,
+    encode_base64,
+    encode_binary,
+)
+
+
+def _create_details(num_blocks):
+    config = Configuration(MACROS)
+    for i in range(num_blocks):
+        config.add_block(f"BLOCK_{i}", f"IN:INST:DEVICE_{i % 100:02d}:VALUE_{i}", f"GROUP_{i % 50}")
+    holder = ConfigHolder(MACROS, MockConfigurationFileManager(), test_config=config)
+    return holder.get_config_details()
+
+
+def _time(function, value, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function(value)
+    return result, (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--blocks", type=int, default=5000, help="Number of blocks to create")
+    parser.add_argument("--repeats", type=int, default=10, help="Number of times to time each")
+    args = parser.parse_args()
+
+    details = _create_details(args.blocks)
+    formats = [
+        ("hex", lambda v: compress_and_hex(convert_to_json(v)), dehex_and_decompress),
+        ("binary", encode_binary, decode_binary),
+        ("base64", lambda v: encode_base64(convert_to_json(v)), decode_base64),
+    ]
+
+    print(f"Blocks: {args.blocks}, JSON size: {len(convert_to_json(details)) / 1024:.1f} KiB")
+    print(f"{'':10}{'size (KiB)':>14}{'encode (ms)':>14}{'decode (ms)':>14}")
+    for label, encode, decode in formats:
+        encoded, encode_time = _time(encode, details, args.repeats)
+        _, decode_time = _time(decode, encoded, args.repeats)
+        print(
+            f"{label:10}{len(encoded) / 1024:14.1f}"
+            f"{encode_time * 1000:14.2f}{decode_time * 1000:14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,8 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import json
 import os
 from queue import Queue
-from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set
 
-import numpy.typing as npt
 from server_common.channel_access import ChannelAccess
 from server_common.helpers import MACROS, PVPREFIX_MACRO
 from server_common.utilities import SEVERITY
@@ -13,6 +12,10 @@ from server_common.utilities import print_and_log as _common_print_and_log
 
 from BlockServer.core.config_list_manager import ConfigListManager
 
+# Numpy is slow to import and only needed for type checking, as type aliases are evaluated lazily
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
 type PVBaseValue = bool | int | float | str
 type PVValue = PVBaseValue | list[PVBaseValue] | npt.NDArray | None
 
@@ -63,8 +66,7 @@ class ComponentSwitcher(object):
     def all_components_dynamic(self, components: Iterable[str]) -> bool:
         for comp in components:
             try:
-                loaded_comp = self._config_list.load_config(comp, is_component=True)
-                if not loaded_comp.is_dynamic():
+                if not self._config_list.get_component_details(comp)["isDynamic"]:
                     print_and_log(f"Component is not dynamic: {comp}")
                     return False
             except Exception as e:
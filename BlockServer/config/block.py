@@ -13,12 +13,15 @@
 # along with this program; if not, you can obtain a copy from
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
-from typing import Dict, TypedDict, Union
+import copy
+from typing import Any, Dict, TypedDict, Union
 
 from server_common.helpers import PVPREFIX_MACRO
 
+from BlockServer.config.fingerprint import Fingerprinted
 
-class Block:
+
+class Block(Fingerprinted):
     """Contains all the information about a block.
 
     Attributes:
@@ -35,6 +38,23 @@ class Block:
         log_deadband (float): Deadband for the block to be archived
     """
 
+    __slots__ = (
+        "name",
+        "pv",
+        "local",
+        "visible",
+        "component",
+        "rc_lowlimit",
+        "rc_highlimit",
+        "rc_enabled",
+        "rc_suspend_on_invalid",
+        "log_periodic",
+        "log_rate",
+        "log_deadband",
+        "set_block",
+        "set_block_val",
+    )
+
     def __init__(
         self,
         name: str,
@@ -134,6 +154,45 @@ class Block:
             "set_block_val": self.set_block_val,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Block":
+        """Creates a block from a dictionary in the format produced by to_dict.
+
+        Args:
+            data: The block's details
+
+        Returns:
+            The new block
+        """
+        local = data.get("local", True)
+        pv = data["pv"]
+        if local and pv.startswith(PVPREFIX_MACRO):
+            # to_dict adds the prefix macro to local PVs, which are stored without it
+            pv = pv[len(PVPREFIX_MACRO) :]
+        return cls(
+            name=data["name"],
+            pv=pv,
+            local=local,
+            visible=data.get("visible", True),
+            component=data.get("component"),
+            runcontrol=data.get("runcontrol", False),
+            lowlimit=data.get("lowlimit"),
+            highlimit=data.get("highlimit"),
+            suspend_on_invalid=data.get("suspend_on_invalid", False),
+            log_periodic=data.get("log_periodic", False),
+            log_rate=data.get("log_rate", 5),
+            log_deadband=data.get("log_deadband", 0),
+            set_block=data.get("set_block", False),
+            set_block_val=data.get("set_block_val"),
+        )
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Block":
+        # All of a block's attributes are immutable so a shallow copy is enough
+        return copy.copy(self)
+
+    def _fingerprint_content(self) -> Dict[str, Union[str, float, bool, None]]:
+        return self.to_dict()
+
 
 class BlockKwargs(TypedDict, total=False):
     visible: bool
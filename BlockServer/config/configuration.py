@@ -17,12 +17,13 @@
 """Contains all the code for defining a configuration or component"""
 
 from collections import OrderedDict
-from typing import Dict, Unpack
+from typing import Any, Dict, Unpack
 
 from server_common.helpers import PVPREFIX_MACRO
 from server_common.utilities import print_and_log
 
 from BlockServer.config.block import Block, BlockKwargs
+from BlockServer.config.fingerprint import content_hash
 from BlockServer.config.group import Group
 from BlockServer.config.ioc import IOC
 from BlockServer.config.metadata import MetaData
@@ -42,6 +43,8 @@ class Configuration:
         is_component (bool): Whether it is actually a component
     """
 
+    __slots__ = ("blocks", "macros", "groups", "iocs", "meta", "components", "is_component")
+
     def __init__(self, macros: Dict) -> None:
         """Constructor.
 
@@ -88,7 +91,7 @@ class Configuration:
             # If group does not exists then add it
             if group.lower() not in self.groups.keys():
                 self.groups[group.lower()] = Group(group)
-            self.groups[group.lower()].blocks.append(name)
+            self.groups[group.lower()].add_block(name)
 
     def add_ioc(
         self,
@@ -151,3 +154,64 @@ class Configuration:
             name: The new name for the configuration
         """
         self.meta.name = name
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Puts the configuration's details into a dictionary.
+
+        Returns:
+            The configuration's details
+        """
+        return {
+            "blocks": [block.to_dict() for block in self.blocks.values()],
+            "groups": [group.to_dict() for group in self.groups.values()],
+            "iocs": [ioc.to_dict() for ioc in self.iocs.values()],
+            "components": list(self.components.values()),
+            "meta": self.meta.to_dict(),
+            "is_component": self.is_component,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], macros: Dict) -> "Configuration":
+        """Creates a configuration from a dictionary in the format produced by to_dict.
+
+        Args:
+            data: The configuration's details
+            macros: The dictionary containing the macros
+
+        Returns:
+            The new configuration
+        """
+        configuration = cls(macros)
+        for block in data.get("blocks", []):
+            configuration.blocks[block["name"].lower()] = Block.from_dict(block)
+        for group in data.get("groups", []):
+            configuration.groups[group["name"].lower()] = Group.from_dict(group)
+        for ioc in data.get("iocs", []):
+            configuration.iocs[ioc["name"].upper()] = IOC.from_dict(ioc)
+        for component in data.get("components", []):
+            configuration.components[component.lower()] = component
+        configuration.meta = MetaData.from_dict(data["meta"])
+        configuration.is_component = data.get("is_component", False)
+        return configuration
+
+    def get_fingerprints(self) -> Dict[str, str]:
+        """Gets a fingerprint for each section of the configuration.
+
+        These are rolled up from the cached fingerprints of the blocks, groups and IOCs so are
+        cheap to calculate.
+
+        Returns:
+            The fingerprints of the blocks, groups, iocs, components and meta sections
+        """
+        return {
+            "blocks": content_hash([(k, v.fingerprint) for k, v in self.blocks.items()]),
+            "groups": content_hash([(k, v.fingerprint) for k, v in self.groups.items()]),
+            "iocs": content_hash([(k, v.fingerprint) for k, v in self.iocs.items()]),
+            "components": content_hash(list(self.components.items())),
+            "meta": content_hash(self.meta.to_dict()),
+        }
+
+    @property
+    def fingerprint(self) -> str:
+        """The fingerprint of the whole configuration."""
+        return content_hash(self.get_fingerprints())
@@ -0,0 +1,218 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Content fingerprints for the configuration models and structured diffs built from them"""
+
+import hashlib
+import json
+from operator import attrgetter
+from typing import AbstractSet, Any, Callable, Dict, List, Mapping, NamedTuple
+
+
+def _canonical(value: Any) -> Any:
+    """Converts a value into a form where values which compare equal serialise identically.
+
+    Args:
+        value: The value to convert
+
+    Returns:
+        The converted value
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, Mapping):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def content_hash(value: Any) -> str:
+    """Gets a stable hash of a JSON-like value.
+
+    Dictionaries are hashed independently of their key order and numbers which compare equal
+    (e.g. True, 1 and 1.0) hash the same.
+
+    Args:
+        value: The value to hash
+
+    Returns:
+        The hex digest of the hash
+    """
+    data = json.dumps(_canonical(value), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Fingerprinted:
+    """Mixin giving a model a content fingerprint which is only recalculated after it changes.
+
+    The fingerprint is cached along with the values of the model's attributes, and is only
+    recalculated when it is read after one of them has been replaced, so setting an attribute
+    costs nothing extra. Containers held by the model (e.g. the blocks of a group or the macros of
+    an IOC) should be changed through the model's methods or replaced; if one is changed in place
+    after the fingerprint has been read then invalidate_fingerprint must be called.
+    """
+
+    __slots__ = ("_fingerprint",)
+
+    # Gets the values of the attributes of a model, which its fingerprint is cached along with
+    _attribute_values: "attrgetter[Any]"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        names = [
+            name
+            for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get("__slots__", ())
+            if name != "_fingerprint"
+        ]
+        if names:
+            cls._attribute_values = attrgetter(*names)
+
+    def _fingerprint_content(self) -> Any:
+        """Gets the content the fingerprint is calculated from.
+
+        Returns:
+            A JSON-like value describing the model
+        """
+        raise NotImplementedError()
+
+    @property
+    def fingerprint(self) -> str:
+        """The fingerprint of the model's content."""
+        values = self._attribute_values(self)
+        cached = getattr(self, "_fingerprint", None)
+        if cached is not None and cached[0] == values:
+            return cached[1]
+        fingerprint = content_hash(self._fingerprint_content())
+        self._fingerprint = (values, fingerprint)
+        return fingerprint
+
+    def invalidate_fingerprint(self) -> None:
+        """Forces the fingerprint to be recalculated the next time it is read."""
+        self._fingerprint = None
+
+
+class ModelDiff(NamedTuple):
+    """The differences between two collections of models, by key.
+
+    Attributes:
+        added: The keys only in the new collection
+        removed: The keys only in the old collection
+        modified: The keys in both collections whose content differs
+    """
+
+    added: AbstractSet[str]
+    removed: AbstractSet[str]
+    modified: AbstractSet[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    def merge(self, other: "ModelDiff") -> "ModelDiff":
+        """Combines this diff with another.
+
+        A key that one diff adds and the other removes (e.g. a block moving from the
+        configuration to a component) is reported as modified.
+
+        Args:
+            other: The diff to combine with this one
+
+        Returns:
+            The combined diff
+        """
+        added = self.added | other.added
+        removed = self.removed | other.removed
+        moved = added & removed
+        return ModelDiff(added - moved, removed - moved, self.modified | other.modified | moved)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Puts the diff into a dictionary of sorted lists.
+
+        Returns:
+            The diff's details
+        """
+        return {
+            "added": sorted(self.added),
+            "removed": sorted(self.removed),
+            "modified": sorted(self.modified),
+        }
+
+
+EMPTY_DIFF = ModelDiff(frozenset(), frozenset(), frozenset())
+
+
+def _fingerprints_differ(old: Fingerprinted, new: Fingerprinted) -> bool:
+    return old.fingerprint != new.fingerprint
+
+
+def _key_name(name: str, _model: Any) -> str:
+    return name
+
+
+def diff_models(
+    old: Mapping[str, Any],
+    new: Mapping[str, Any],
+    changed: Callable[[Any, Any], bool] = _fingerprints_differ,
+    key: Callable[[str, Any], str] | None = None,
+) -> ModelDiff:
+    """Finds the models which have been added, removed or modified between two collections.
+
+    Args:
+        old: The old models, by key
+        new: The new models, by key
+        changed: A function that takes the old and new version of a model and returns True
+            if it has changed; by default their fingerprints are compared
+        key: A function taking the key and model and returning the name to report it under;
+            by default the key itself is used
+
+    Returns:
+        The differences between the collections
+    """
+    name_of = key if key is not None else _key_name
+    added = {name_of(name, new[name]) for name in new.keys() - old.keys()}
+    removed = {name_of(name, old[name]) for name in old.keys() - new.keys()}
+    modified = {
+        name_of(name, new[name])
+        for name in new.keys() & old.keys()
+        if changed(old[name], new[name])
+    }
+    return ModelDiff(added, removed, modified)
+
+
+def diff_fields(old: Fingerprinted, new: Fingerprinted) -> Dict[str, List[Any]]:
+    """Finds the fields which differ between two versions of a model.
+
+    The fingerprints are compared first, so models which have not changed are cheap to check.
+
+    Args:
+        old: The old version of the model
+        new: The new version of the model
+
+    Returns:
+        The old and new value of each field which differs, by field name
+    """
+    if old.fingerprint == new.fingerprint:
+        return {}
+    old_content = old._fingerprint_content()
+    new_content = new._fingerprint_content()
+    return {
+        name: [old_content.get(name), new_content.get(name)]
+        for name in sorted(old_content.keys() | new_content.keys())
+        if _canonical(old_content.get(name)) != _canonical(new_content.get(name))
+    }
@@ -13,10 +13,12 @@
 # along with this program; if not, you can obtain a copy from
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Union
 
+from BlockServer.config.fingerprint import Fingerprinted
 
-class Group:
+
+class Group(Fingerprinted):
     """Represents a group.
 
     Attributes:
@@ -25,6 +27,8 @@ class Group:
         component (string): The component the group belongs to
     """
 
+    __slots__ = ("name", "blocks", "component")
+
     def __init__(self, name: str, component: str | None = None) -> None:
         """Constructor.
 
@@ -36,6 +40,24 @@ class Group:
         self.blocks = []
         self.component = component
 
+    def add_block(self, name: str) -> None:
+        """Adds a block to the end of the group.
+
+        Args:
+            name: The name of the block
+        """
+        self.blocks.append(name)
+        self.invalidate_fingerprint()
+
+    def remove_block(self, name: str) -> None:
+        """Removes a block from the group.
+
+        Args:
+            name: The name of the block
+        """
+        self.blocks.remove(name)
+        self.invalidate_fingerprint()
+
     def __str__(self) -> str:
         return f"Name: {self.name}, COMPONENT: {self.component}, Blocks: {self.blocks}"
 
@@ -45,4 +67,21 @@ class Group:
         Returns:
             The group's details
         """
-        return {"name": self.name, "blocks": self.blocks, "component": self.component}
+        return {"name": self.name, "blocks": list(self.blocks), "component": self.component}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Group":
+        """Creates a group from a dictionary in the format produced by to_dict.
+
+        Args:
+            data: The group's details
+
+        Returns:
+            The new group
+        """
+        group = cls(data["name"], data.get("component"))
+        group.blocks = list(data.get("blocks", []))
+        return group
+
+    def _fingerprint_content(self) -> Dict[str, Union[str, List, None]]:
+        return self.to_dict()
@@ -17,8 +17,10 @@
 import copy
 from typing import Any, Dict, List, Union
 
+from BlockServer.config.fingerprint import Fingerprinted
 
-class IOC:
+
+class IOC(Fingerprinted):
     """Represents an IOC.
 
     Attributes:
@@ -32,8 +34,21 @@ class IOC:
         pvs (dict): The IOC's PVs
         pvsets (dict): The IOC's PV sets
         simlevel (string): The level of simulation
+        remote_pv_prefix (string): The remote PV prefix
     """
 
+    __slots__ = (
+        "name",
+        "autostart",
+        "restart",
+        "component",
+        "remote_pv_prefix",
+        "simlevel",
+        "macros",
+        "pvs",
+        "pvsets",
+    )
+
     def __init__(
         self,
         name: str,
@@ -134,6 +149,56 @@ class IOC:
             "remotePvPrefix": self.remote_pv_prefix,
         }
 
+    @staticmethod
+    def _list_to_dict(in_list: List[Dict[str, Any]] | None) -> Dict[str, Any]:
+        """Converts a list in the format produced by _dict_to_list back into a dictionary.
+
+        Args:
+            in_list: The list to be converted
+
+        Returns:
+            The newly created dictionary
+        """
+        out_dict = {}
+        for item in in_list or []:
+            out_dict[item["name"]] = {k: v for k, v in item.items() if k != "name"}
+        return out_dict
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IOC":
+        """Creates an IOC from a dictionary in the format produced by to_dict.
+
+        Args:
+            data: The IOC's details
+
+        Returns:
+            The new IOC
+        """
+        return cls(
+            name=data["name"],
+            autostart=data.get("autostart", True),
+            restart=data.get("restart", True),
+            component=data.get("component"),
+            macros=cls._list_to_dict(data.get("macros")),
+            pvs=cls._list_to_dict(data.get("pvs")),
+            pvsets=cls._list_to_dict(data.get("pvsets")),
+            simlevel=data.get("simlevel"),
+            remotePvPrefix=data.get("remotePvPrefix"),
+        )
+
+    def _fingerprint_content(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "autostart": self.autostart,
+            "restart": self.restart,
+            "component": self.component,
+            "remote_pv_prefix": self.remote_pv_prefix,
+            "simlevel": self.simlevel,
+            "macros": self.macros,
+            "pvs": self.pvs,
+            "pvsets": self.pvsets,
+        }
+
     def get(self, name: str) -> bool | str | Dict | None:
         return self.__getattribute__(name)
 
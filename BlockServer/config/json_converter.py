@@ -31,19 +31,37 @@ class ConfigurationJsonConverter:
     """
 
     @staticmethod
-    def _groups_to_list(groups: Dict[str, "Group"]) -> List[Dict[str, Any]]:
+    def groups_to_list(groups: Dict[str, "Group"]) -> List[Dict[str, Any]]:
+        """Converts the groups dictionary to a list of dictionaries, in the order sent to clients.
+
+        The lists of blocks are copied so the result is not affected by later changes to the groups.
+
+        Args:
+            groups (OrderedDict): The groups to convert
+
+        Returns:
+            list : The details of each group, with the NONE group last
+        """
         grps = []
         if groups is not None:
             for group in groups.values():
                 if group.name.lower() != GRP_NONE.lower():
                     grps.append(
-                        {"name": group.name, "component": group.component, "blocks": group.blocks}
+                        {
+                            "name": group.name,
+                            "component": group.component,
+                            "blocks": list(group.blocks),
+                        }
                     )
 
             # Add NONE group at end
             if GRP_NONE.lower() in groups.keys():
                 grps.append(
-                    {"name": GRP_NONE, "component": None, "blocks": groups[GRP_NONE.lower()].blocks}
+                    {
+                        "name": GRP_NONE,
+                        "component": None,
+                        "blocks": list(groups[GRP_NONE.lower()].blocks),
+                    }
                 )
         return grps
 
@@ -57,5 +75,5 @@ class ConfigurationJsonConverter:
         Returns:
             string : The groups as a JSON list
         """
-        grps = ConfigurationJsonConverter._groups_to_list(groups)
+        grps = ConfigurationJsonConverter.groups_to_list(groups)
         return json.dumps(grps)
@@ -13,7 +13,7 @@
 # along with this program; if not, you can obtain a copy from
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Union
 
 
 class MetaData:
@@ -27,6 +27,17 @@ class MetaData:
         history (list): The save history of the configuration
     """
 
+    __slots__ = (
+        "name",
+        "pv",
+        "description",
+        "synoptic",
+        "history",
+        "isProtected",
+        "isDynamic",
+        "configuresBlockGWAndArchiver",
+    )
+
     def __init__(
         self, config_name: str, pv_name: str = "", description: str = "", synoptic: str = ""
     ):
@@ -58,8 +69,27 @@ class MetaData:
             "pv": self.pv,
             "description": self.description,
             "synoptic": self.synoptic,
-            "history": self.history,
+            "history": list(self.history),
             "isProtected": self.isProtected,
             "isDynamic": self.isDynamic,
             "configuresBlockGWAndArchiver": self.configuresBlockGWAndArchiver,
         }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetaData":
+        """Creates metadata from a dictionary in the format produced by to_dict.
+
+        Args:
+            data: The metadata
+
+        Returns:
+            The new metadata
+        """
+        meta = cls(
+            data["name"], data.get("pv", ""), data.get("description", ""), data.get("synoptic", "")
+        )
+        meta.history = list(data.get("history", []))
+        meta.isProtected = data.get("isProtected", False)
+        meta.isDynamic = data.get("isDynamic", False)
+        meta.configuresBlockGWAndArchiver = data.get("configuresBlockGWAndArchiver", False)
+        return meta
@@ -332,8 +332,10 @@ class ConfigurationXmlConverter:
         blks = ConfigurationXmlConverter._find_all_nodes(root_xml, NS_TAG_BLOCK, TAG_BLOCK)
 
         for b in blks:
-            n = ConfigurationXmlConverter._find_single_node(b, NS_TAG_BLOCK, TAG_NAME)
-            read = ConfigurationXmlConverter._find_single_node(b, NS_TAG_BLOCK, TAG_READ_PV)
+            # Find all the children in one pass rather than searching for each
+            nodes = ConfigurationXmlConverter._find_child_nodes(b, NS_TAG_BLOCK)
+            n = nodes.get(TAG_NAME)
+            read = nodes.get(TAG_READ_PV)
             if (
                 n is not None
                 and n.text is not None
@@ -344,75 +346,56 @@ class ConfigurationXmlConverter:
                 name = n.text
 
                 # Blocks automatically get assigned to the NONE group
-                blocks[name.lower()] = Block(name, read.text)
-                groups[KEY_NONE].blocks.append(name)
+                block = Block(name, read.text)
+                blocks[name.lower()] = block
+                groups[KEY_NONE].add_block(name)
 
                 # Check to see if not local
-                loc = ConfigurationXmlConverter._find_single_node(b, NS_TAG_BLOCK, TAG_LOCAL)
+                loc = nodes.get(TAG_LOCAL)
                 if loc is not None and loc.text == "False":
-                    blocks[name.lower()].local = False
+                    block.local = False
 
                 # Check for visibility
-                vis = ConfigurationXmlConverter._find_single_node(b, NS_TAG_BLOCK, TAG_VISIBLE)
+                vis = nodes.get(TAG_VISIBLE)
                 if vis is not None and vis.text == "False":
-                    blocks[name.lower()].visible = False
+                    block.visible = False
 
                 # Runcontrol
-                rc_enabled = ConfigurationXmlConverter._find_single_node(
-                    b, NS_TAG_BLOCK, TAG_RUNCONTROL_ENABLED
-                )
+                rc_enabled = nodes.get(TAG_RUNCONTROL_ENABLED)
                 if rc_enabled is not None and rc_enabled.text is not None:
-                    blocks[name.lower()].rc_enabled = rc_enabled.text == "True"
+                    block.rc_enabled = rc_enabled.text == "True"
 
-                rc_low = ConfigurationXmlConverter._find_single_node(
-                    b, NS_TAG_BLOCK, TAG_RUNCONTROL_LOW
-                )
+                rc_low = nodes.get(TAG_RUNCONTROL_LOW)
                 if rc_low is not None and rc_low.text is not None:
-                    blocks[name.lower()].rc_lowlimit = float(rc_low.text)
-                rc_high = ConfigurationXmlConverter._find_single_node(
-                    b, NS_TAG_BLOCK, TAG_RUNCONTROL_HIGH
-                )
+                    block.rc_lowlimit = float(rc_low.text)
+                rc_high = nodes.get(TAG_RUNCONTROL_HIGH)
                 if rc_high is not None and rc_high.text is not None:
-                    blocks[name.lower()].rc_highlimit = float(rc_high.text)
+                    block.rc_highlimit = float(rc_high.text)
 
-                rc_suspend_on_invalid = ConfigurationXmlConverter._find_single_node(
-                    b, NS_TAG_BLOCK, TAG_RUNCONTROL_SUSPEND_ON_INVALID
-                )
+                rc_suspend_on_invalid = nodes.get(TAG_RUNCONTROL_SUSPEND_ON_INVALID)
                 if rc_suspend_on_invalid is not None:
-                    blocks[name.lower()].rc_suspend_on_invalid = (
-                        rc_suspend_on_invalid.text == "True"
-                    )
+                    block.rc_suspend_on_invalid = rc_suspend_on_invalid.text == "True"
 
                 # Logging
-                log_periodic = ConfigurationXmlConverter._find_single_node(
-                    b, NS_TAG_BLOCK, TAG_LOG_PERIODIC
-                )
+                log_periodic = nodes.get(TAG_LOG_PERIODIC)
                 if log_periodic is not None and log_periodic.text is not None:
-                    blocks[name.lower()].log_periodic = log_periodic.text == "True"
+                    block.log_periodic = log_periodic.text == "True"
 
-                log_rate = ConfigurationXmlConverter._find_single_node(
-                    b, NS_TAG_BLOCK, TAG_LOG_RATE
-                )
+                log_rate = nodes.get(TAG_LOG_RATE)
                 if log_rate is not None and log_rate.text is not None:
-                    blocks[name.lower()].log_rate = float(log_rate.text)
+                    block.log_rate = float(log_rate.text)
 
-                log_deadband = ConfigurationXmlConverter._find_single_node(
-                    b, NS_TAG_BLOCK, TAG_LOG_DEADBAND
-                )
+                log_deadband = nodes.get(TAG_LOG_DEADBAND)
                 if log_deadband is not None and log_deadband.text is not None:
-                    blocks[name.lower()].log_deadband = float(log_deadband.text)
+                    block.log_deadband = float(log_deadband.text)
 
-                set_block = ConfigurationXmlConverter._find_single_node(
-                    b, NS_TAG_BLOCK, TAG_SET_BLOCK
-                )
+                set_block = nodes.get(TAG_SET_BLOCK)
                 if set_block is not None and set_block.text is not None:
-                    blocks[name.lower()].set_block = eval(set_block.text)
+                    block.set_block = eval(set_block.text)
 
-                set_block_val = ConfigurationXmlConverter._find_single_node(
-                    b, NS_TAG_BLOCK, TAG_SET_BLOCK_VAL
-                )
+                set_block_val = nodes.get(TAG_SET_BLOCK_VAL)
                 if set_block_val is not None:
-                    blocks[name.lower()].set_block_val = set_block_val.text
+                    block.set_block_val = set_block_val.text
 
     @staticmethod
     def groups_from_xml(
@@ -447,13 +430,11 @@ class ConfigurationXmlConverter:
                 # Check block is not already in the group.
                 # Unlikely, but may be a config was edited by hand...
                 if name not in groups[gname_low].blocks:
-                    groups[gname_low].blocks.append(name)
-                if name.lower() in blocks.keys():
-                    blocks[name.lower()].group = gname
+                    groups[gname_low].add_block(name)
 
                 # Remove the block from the NONE group
                 if KEY_NONE in groups and name in groups[KEY_NONE].blocks:
-                    groups[KEY_NONE].blocks.remove(name)
+                    groups[KEY_NONE].remove_block(name)
 
     @staticmethod
     def ioc_from_xml(root_xml: ElementTree.Element, iocs: OrderedDict) -> None:
@@ -620,6 +601,36 @@ class ConfigurationXmlConverter:
 
         return node
 
+    @staticmethod
+    def _find_child_nodes(root: ElementTree.Element, tag: str) -> Dict[str, ElementTree.Element]:
+        """Finds the children of a node by name in one pass, regardless of whether they have a
+        namespace or not.
+
+        As with _find_single_node, the first child with the namespace is found for each name and
+        the first child without a namespace is found if there is none with it.
+
+        Args:
+            root: The XML tree object
+            tag: The namespace tag
+
+        Returns: The found nodes keyed by name without the namespace
+        """
+        namespace = "{" + NAMESPACES[tag] + "}"
+        nodes = {}
+        nodes_without_namespace = {}
+        for child in root:
+            name = child.tag
+            if not isinstance(name, str):
+                # Comments and processing instructions
+                continue
+            if name.startswith(namespace):
+                nodes.setdefault(name[len(namespace) :], child)
+            elif not name.startswith("{"):
+                nodes_without_namespace.setdefault(name, child)
+        for name, child in nodes_without_namespace.items():
+            nodes.setdefault(name, child)
+        return nodes
+
     @staticmethod
     def _find_single_node_with_none_check(
         root: ElementTree.Element, tag: str, name: str
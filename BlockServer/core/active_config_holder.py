@@ -14,16 +14,21 @@
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
 import os
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Optional
 
+from BlockServer.config.fingerprint import ModelDiff, diff_models
 from BlockServer.config.ioc import IOC
 from BlockServer.core.config_holder import ConfigHolder
-from BlockServer.core.database_client import get_iocs
+from BlockServer.core.constants import ARCHIVE_CONFIG
+from BlockServer.core.database_client import get_iocs, get_running_iocs
 from server_common.file_path_manager import FILEPATH_MANAGER
 from server_common.constants import IOCS_NOT_TO_STOP
 from server_common.helpers import CONTROL_SYSTEM_PREFIX, MACROS, BLOCK_PREFIX
 from server_common.utilities import print_and_log
 
+if TYPE_CHECKING:
+    from BlockServer.core.config_staging import StagedConfig
+
 
 def _blocks_changed(block1, block2) -> bool:
     """
@@ -39,12 +44,27 @@ def _blocks_changed(block1, block2) -> bool:
     if block1.name != block2.name:
         return True
 
-    # Check for any changed blocks (symmetric difference operation of sets)
-    block_diff = set(block1.to_dict().items()) ^ set(block2.to_dict().items())
-    if len(block_diff) > 0:
-        return True
+    return block1.fingerprint != block2.fingerprint
+
 
-    return False
+def _block_name(_key, block) -> str:
+    return block.name
+
+
+def _diff_blocks(old_blocks, new_blocks, block_comparator=_blocks_changed) -> ModelDiff:
+    """
+    Find the blocks which have been added, removed or modified between two sets of blocks.
+
+    Args:
+        old_blocks: The "old" blocks to use as a reference, keyed by lower case block name.
+        new_blocks: The "new" blocks, keyed by lower case block name.
+        block_comparator: A function that takes two blocks as arguments and returns True if they
+         have changed.
+
+    Returns:
+        The names of the added, removed and modified blocks.
+    """
+    return diff_models(old_blocks, new_blocks, block_comparator, _block_name)
 
 
 def _blocks_changed_in_config(old_config, new_config, block_comparator=_blocks_changed) -> bool:
@@ -62,21 +82,7 @@ def _blocks_changed_in_config(old_config, new_config, block_comparator=_blocks_c
     Returns:
         True if the blocks have changed, False otherwise.
     """
-
-    for block_name in new_config.blocks.keys():
-        # Check to see if there are any new blocks
-        if block_name not in old_config.blocks.keys() or block_comparator(
-            old_config.blocks[block_name], new_config.blocks[block_name]
-        ):
-            return True
-
-    for block_name in old_config.blocks.keys():
-        if block_name not in new_config.blocks.keys() or block_comparator(
-            old_config.blocks[block_name], new_config.blocks[block_name]
-        ):
-            return True
-
-    return False
+    return bool(_diff_blocks(old_config.blocks, new_config.blocks, block_comparator))
 
 
 def _compare_ioc_properties(old: Dict[str, IOC], new: Dict[str, IOC]):
@@ -100,9 +106,11 @@ def _compare_ioc_properties(old: Dict[str, IOC], new: Dict[str, IOC]):
         if ioc_name not in old.keys():
             # If not in previously then add it to new iocs
             new_iocs.add(ioc_name)
-        elif any(
+        elif old[ioc_name].fingerprint != new[ioc_name].fingerprint and any(
             getattr(old[ioc_name], attr) != getattr(new[ioc_name], attr) for attr in _attributes
         ):
+            # The fingerprint also covers properties which do not need a restart (e.g. the
+            # component) so only the attributes listed above are checked when it differs
             # If any attributes have changed, add to changed iocs
             changed_iocs.add(ioc_name)
 
@@ -132,6 +140,8 @@ class ActiveConfigHolder(ConfigHolder):
         self._archive_manager = archive_manager
         self._ioc_control = ioc_control
         self._config_dir = config_dir
+        # The staged configuration this was loaded from, if it was
+        self._staged: Optional["StagedConfig"] = None
 
     def save_active(self, name, as_comp=False) -> None:
         """Save the active configuration.
@@ -146,16 +156,50 @@ class ActiveConfigHolder(ConfigHolder):
             self.save_configuration(name, False)
             self.set_last_config(name)
 
-    def load_active(self, name) -> None:
+    def load_active(self, name, staged: Optional["StagedConfig"] = None) -> None:
         """Load a configuration as the active configuration.
         Cannot load a component as the active configuration.
 
         Args:
             name (string): The name of the configuration to load
+            staged: The configuration already loaded and prepared by a ConfigStager, if it has
+                been
         """
-        self.set_config(self.load_configuration(name))
+        if staged is None:
+            self.set_config(self.load_configuration(name))
+        else:
+            self.set_config_from(staged.holder)
+            self._staged = staged
         self.set_last_config(name)
 
+    def clear_config(self) -> None:
+        self._staged = None
+        super(ActiveConfigHolder, self).clear_config()
+
+    def get_staged_artifact(self, kind: str) -> Optional[str]:
+        """Gets a file generated when the active configuration was staged.
+
+        Args:
+            kind: The kind of file, e.g. GATEWAY_ALIASES from constants
+
+        Returns:
+            The content of the file, or None if the configuration was not staged
+        """
+        return None if self._staged is None else self._staged.artifacts.get(kind)
+
+    def build_archive_config(self, blocks) -> str:
+        """Builds the archiver settings for some blocks, as update_archiver would.
+
+        Args:
+            blocks (OrderedDict): The blocks to archive
+
+        Returns:
+            The settings as XML
+        """
+        return self._archive_manager.build_archive_config(
+            MACROS["$(MYPVPREFIX)"] + BLOCK_PREFIX, blocks.values()
+        )
+
     def update_archiver(self, full_init=False) -> None:
         """Update the archiver configuration.
 
@@ -168,6 +212,7 @@ class ActiveConfigHolder(ConfigHolder):
                 self.get_block_details().values(),
                 self.configures_block_gateway_and_archiver(),
                 os.path.join(self._config_dir, "configurations", self.get_config_name()),
+                self.get_staged_artifact(ARCHIVE_CONFIG),
             )
 
     def set_last_config(self, config_name) -> None:
@@ -220,6 +265,17 @@ class ActiveConfigHolder(ConfigHolder):
         print_and_log(f"Trying to reload current configuration '{current_config_name}'")
         self.load_active(current_config_name)
 
+    @staticmethod
+    def _get_all_iocs(config, components) -> Dict[str, IOC]:
+        iocs = {}
+        for ioc_name, ioc in config.iocs.items():
+            iocs[ioc_name] = ioc
+
+        for name, component in components.items():
+            for ioc_name, ioc in component.iocs.items():
+                iocs[ioc_name] = ioc
+        return iocs
+
     def iocs_changed(self):
         """Checks to see if the IOCs have changed on saving."
 
@@ -236,27 +292,27 @@ class ActiveConfigHolder(ConfigHolder):
             set, set, set : IOCs to start, IOCs to restart, IOCs to stop.
         """
 
-        def _get_config_iocs(config, components):
-            iocs = {}
-            for ioc_name, ioc in config.iocs.items():
-                iocs[ioc_name] = ioc
-
-            for name, component in components.items():
-                for ioc_name, ioc in component.iocs.items():
-                    iocs[ioc_name] = ioc
-            return iocs
+        iocs_in_current_config = self._get_all_iocs(self._cached_config, self._cached_components)
+        iocs_in_new_config = self._get_all_iocs(self._config, self._components)
 
-        iocs_in_current_config = _get_config_iocs(self._cached_config, self._cached_components)
-        iocs_in_new_config = _get_config_iocs(self._config, self._components)
-
-        new_iocs, changed_iocs, removed_iocs = _compare_ioc_properties(
-            old=iocs_in_current_config, new=iocs_in_new_config
-        )
+        changes = None
+        if self._staged is not None:
+            changes = self._staged.get_ioc_changes(iocs_in_current_config)
+        if changes is None:
+            changes = _compare_ioc_properties(old=iocs_in_current_config, new=iocs_in_new_config)
+        new_iocs, changed_iocs, removed_iocs = changes
 
         # Look for manually-started IOCS, which have been started with unknown macros
         # and therefore should be assumed
         # to need stopping or restarting on config change.
-        for ioc_name in get_iocs(CONTROL_SYSTEM_PREFIX):
+        running_iocs = get_running_iocs(CONTROL_SYSTEM_PREFIX)
+        if running_iocs is None:
+            # The running list is not available so query procServ for each IOC instead
+            candidate_iocs = get_iocs(CONTROL_SYSTEM_PREFIX)
+        else:
+            candidate_iocs = running_iocs
+
+        for ioc_name in candidate_iocs:
             # IOCS which shouldn't be stopped.
             if any(ioc_name.startswith(x) for x in IOCS_NOT_TO_STOP):
                 continue
@@ -266,7 +322,7 @@ class ActiveConfigHolder(ConfigHolder):
             if ioc_name in iocs_in_current_config:
                 continue
 
-            if self._ioc_control.get_ioc_status(ioc_name) == "RUNNING":
+            if running_iocs is not None or self._ioc_control.get_ioc_status(ioc_name) == "RUNNING":
                 if ioc_name in iocs_in_new_config:
                     # If the IOC is in the new config, we need to restart it as the new config
                     # may have macros which were not used when the IOC was manually
@@ -295,76 +351,43 @@ class ActiveConfigHolder(ConfigHolder):
 
         return new_iocs, changed_iocs, removed_iocs
 
-    def _blocks_in_top_level_config_changed(self):
-        """
-        Checks whether the blocks in the top level configuration have changed
-
-        Returns:
-            True if the blocks have changed, False otherwise
-        """
-        return _blocks_changed_in_config(self._cached_config, self._config)
-
-    def _blocks_in_components_changed(self) -> bool:
-        """
-        Checks whether blocks that appear in both the old and the new components have changed.
-
-        The checks for components containing blocks being added/removed occurs elsewhere.
+    def get_block_changes(self) -> ModelDiff:
         """
-        for name, component in self._components.items():
-            if name in self._cached_components and _blocks_changed_in_config(
-                self._cached_components[name], self._components[name]
-            ):
-                return True
-        return False
-
-    def _blocks_removed_from_top_level_config(self):
-        """
-        Checks whether any blocks have been removed from the top level configuration
-        (does not recurse to components)
+        Gets the blocks which have changed on saving, in the configuration or its components.
 
-        Returns:
-            True if blocks have been removed from the top-level config; False otherwise
-        """
-        return any(name not in self._config.blocks for name in self._cached_config.blocks)
-
-    @staticmethod
-    def _check_for_added_blocks(old_components, new_components) -> bool:
-        """
-        Checks whether there are any new blocks when moving between two sets of components.
-
-        Args:
-            old_components (dict): Dictionary of components in the form
-             {component_name: component, ...}
-            new_components (dict): Dictionary of components in the form
-             {component_name: component, ...}
+        Blocks in components which have been added or removed count as added or removed blocks.
+        A block which moves between the configuration and a component counts as modified.
 
         Returns:
-            True if switching from components1 to components2 would have added any blocks.
+            ModelDiff : The names of the added, removed and modified blocks
         """
-        for new_component_name, new_component in new_components.items():
-            if new_component_name not in old_components and len(new_component.blocks) != 0:
-                return True
-        return False
-
-    def _new_components_containing_blocks(self) -> bool:
-        """
-        Checks whether there are any new components which contain blocks.
+        changes = _diff_blocks(self._cached_config.blocks, self._config.blocks)
+
+        for name in self._cached_components.keys() | self._components.keys():
+            old_component = self._cached_components.get(name)
+            new_component = self._components.get(name)
+            changes = changes.merge(
+                _diff_blocks(
+                    old_component.blocks if old_component is not None else {},
+                    new_component.blocks if new_component is not None else {},
+                )
+            )
+        return changes
 
-        Returns:
-            True if there are new components with blocks defined, False otherwise
+    def get_ioc_changes(self) -> ModelDiff:
         """
-        return ActiveConfigHolder._check_for_added_blocks(self._cached_components, self._components)
+        Gets the IOCs which have changed on saving, in the configuration or its components.
 
-    def _removed_components_containing_blocks(self) -> bool:
-        """
-        Checks whether there are any removed components which contained blocks.
+        Unlike iocs_changed this does not consider manually started IOCs.
 
         Returns:
-            True if there are removed components with blocks defined, False otherwise
+            ModelDiff : The names of the added, removed and modified IOCs
         """
-
-        # Check for removed blocks == check for added blocks in the other direction.
-        return ActiveConfigHolder._check_for_added_blocks(self._components, self._cached_components)
+        new_iocs, changed_iocs, removed_iocs = _compare_ioc_properties(
+            old=self._get_all_iocs(self._cached_config, self._cached_components),
+            new=self._get_all_iocs(self._config, self._components),
+        )
+        return ModelDiff(new_iocs, removed_iocs, changed_iocs)
 
     def blocks_changed(self) -> bool:
         """
@@ -375,13 +398,7 @@ class ActiveConfigHolder(ConfigHolder):
         Returns:
             bool : True if blocks have changed, False otherwise
         """
-        return (
-            self._blocks_in_top_level_config_changed()
-            or self._blocks_in_components_changed()
-            or self._blocks_removed_from_top_level_config()
-            or self._new_components_containing_blocks()
-            or self._removed_components_containing_blocks()
-        )
+        return bool(self.get_block_changes())
 
     def contains_rc_settings(self) -> bool:
         return os.path.exists(self.get_rc_settings_filepath())
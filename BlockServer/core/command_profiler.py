@@ -0,0 +1,164 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Profiles write queue commands on request, to find out why a command was slow.
+
+The profiler is armed for a number of commands, optionally only those with a given name, and
+the next commands run are profiled with cProfile. The functions taking the most time in each
+are kept in memory, the oldest being dropped, and published.
+
+Only one command is profiled at a time, as only one profiler can run at once. A command run while
+another is profiled is not, and does not count towards the number armed. Functions called by
+other threads while a command is profiled may also appear in its profile.
+"""
+
+import cProfile
+import pstats
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, List
+
+from server_common.pv_names import prepend_blockserver
+
+# Arms the profiler, with JSON giving the number of commands and optionally the command name
+PROFILE_COMMANDS_PV = prepend_blockserver("PROFILE_COMMANDS")
+# Publishes whether the profiler is armed and the latest profiles as compressed and hexed JSON
+COMMAND_PROFILES_PV = prepend_blockserver("COMMAND_PROFILES")
+
+DEFAULT_MAX_PROFILES = 10
+DEFAULT_TOP_FUNCTIONS = 25
+
+
+class CommandProfiler:
+    """Runs write queue commands, profiling them when armed."""
+
+    def __init__(
+        self,
+        publish: Callable[[Dict[str, Any]], None],
+        max_profiles: int = DEFAULT_MAX_PROFILES,
+        top_functions: int = DEFAULT_TOP_FUNCTIONS,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            publish: Called with the result of get_profiles whenever it changes
+            max_profiles: The most profiles to keep
+            top_functions: The number of functions to keep in each profile
+        """
+        self._publish = publish
+        self._top_functions = top_functions
+        self._profiles: Deque[Dict[str, Any]] = deque(maxlen=max_profiles)
+        self._lock = Lock()
+        # Held while a command is profiled
+        self._profiling = Lock()
+        self._armed = 0
+        self._command: str | None = None
+
+    def arm(self, count: int, command: str | None = None) -> None:
+        """Profiles the next commands run.
+
+        Args:
+            count: The number of commands to profile, or 0 to stop profiling
+            command: The name of the commands to profile, e.g. load_config, or None for any
+        """
+        if count < 0:
+            raise ValueError(f"Cannot profile {count} commands")
+        with self._lock:
+            self._armed = count
+            self._command = command.lower() if command else None
+        self._publish(self.get_profiles())
+
+    def run(self, cmd: Callable[..., Any], arg: tuple | None, state: str) -> None:
+        """Runs a write queue command, profiling it if armed.
+
+        Args:
+            cmd: The method to call
+            arg: The argument(s) to send
+            state: The description of the state while the command runs
+        """
+        if not self._start_profiling(cmd.__name__):
+            cmd(*arg) if arg is not None else cmd()
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler, such as a debugger, is running
+            self._profiling.release()
+            cmd(*arg) if arg is not None else cmd()
+            return
+        started = time.time()
+        try:
+            cmd(*arg) if arg is not None else cmd()
+        finally:
+            profiler.disable()
+            duration = time.time() - started
+            self._profiling.release()
+            profile = {
+                "command": cmd.__name__,
+                "state": state,
+                "started": started,
+                "duration_ms": round(1000 * duration, 3),
+                "functions": self._top_functions_of(profiler),
+            }
+            with self._lock:
+                self._profiles.append(profile)
+            self._publish(self.get_profiles())
+
+    def get_profiles(self) -> Dict[str, Any]:
+        """Gets what the profiler is armed to profile and the profiles kept, oldest first.
+
+        Returns:
+            The number of commands still to profile and their name, and the profiles, each with
+            the command, its state, when it started, how long it took and the functions taking
+            the most time including the functions they called
+        """
+        with self._lock:
+            return {
+                "armed": {"count": self._armed, "command": self._command},
+                "profiles": list(self._profiles),
+            }
+
+    def _start_profiling(self, name: str) -> bool:
+        with self._lock:
+            if self._armed == 0 or self._command not in (None, name.lower()):
+                return False
+            if not self._profiling.acquire(blocking=False):
+                return False
+            self._armed -= 1
+            return True
+
+    def _top_functions_of(self, profiler: cProfile.Profile) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+        functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": f"{file_name}:{line}({function})",
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "own_ms": round(1000 * own_time, 3),
+                "cumulative_ms": round(1000 * cumulative_time, 3),
+            }
+            for (file_name, line, function), (
+                primitive_calls,
+                calls,
+                own_time,
+                cumulative_time,
+                _,
+            ) in functions[: self._top_functions]
+        ]
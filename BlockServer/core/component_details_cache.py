@@ -0,0 +1,171 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""A bounded cache of component details which reloads components when their files change"""
+
+import os
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from server_common.utilities import convert_to_json
+
+# The default limit on the total size of the cached details, measured as encoded JSON
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+Signature = Optional[Tuple[Tuple[str, int, int], ...]]
+
+
+class _CacheEntry(NamedTuple):
+    details: Dict[str, Any]
+    signature: Signature
+    size: int
+
+
+def directory_signature(path: str) -> Signature:
+    """Gets a cheap signature of the files in a directory which changes when any of them change.
+
+    Args:
+        path: The directory
+
+    Returns:
+        The name, modification time and size of each file, or None if the directory is missing
+    """
+    try:
+        with os.scandir(path) as entries:
+            files = [entry for entry in entries if entry.is_file()]
+            return tuple(
+                sorted(
+                    (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size) for entry in files
+                )
+            )
+    except OSError:
+        return None
+
+
+class ComponentDetailsCache:
+    """A least recently used cache of component details.
+
+    The cache is bounded by the encoded size of the details it holds rather than by the number of
+    components. Details that have been evicted, or whose files have changed on disk since they
+    were cached, are reloaded on demand.
+    """
+
+    def __init__(
+        self,
+        load_details: Callable[[str], Dict[str, Any]],
+        get_path: Callable[[str], str],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            load_details: Function that loads the details of a component from disk, given its name
+            get_path: Function that gives the directory of a component, given its name
+            max_bytes: The maximum total encoded size of the details to keep
+        """
+        self._load_details = load_details
+        self._get_path = get_path
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = RLock()
+
+    @property
+    def total_bytes(self) -> int:
+        """The total encoded size of the details currently cached."""
+        return self._total_bytes
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name.lower() in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def signature(self, name: str) -> Signature:
+        """Gets the signature of the files of a component as they are now on disk.
+
+        Args:
+            name: The name of the component
+
+        Returns:
+            The signature, as given by directory_signature
+        """
+        return directory_signature(self._get_path(name))
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """Gets the details of a component, loading them if they are not cached or are stale.
+
+        Args:
+            name: The name of the component
+
+        Returns:
+            The details of the component
+        """
+        key = name.lower()
+        signature = self.signature(name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(key)
+                return entry.details
+        details = self._load_details(name)
+        self.put(name, details, signature)
+        return details
+
+    def put(self, name: str, details: Dict[str, Any], signature: Signature = None) -> None:
+        """Adds or replaces the details of a component.
+
+        Args:
+            name: The name of the component
+            details: The details of the component
+            signature: The signature of the component's files the details were read from; if not
+                given it is read from disk
+        """
+        if signature is None:
+            signature = self.signature(name)
+        key = name.lower()
+        size = len(convert_to_json(details))
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = _CacheEntry(details, signature, size)
+            self._total_bytes += size
+            # Always keep the newest entry, even if it is larger than the budget on its own
+            while self._total_bytes > self._max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size
+
+    def remove(self, name: str) -> None:
+        """Removes a component from the cache.
+
+        Args:
+            name: The name of the component
+        """
+        with self._lock:
+            self._discard(name.lower())
+
+    def clear(self) -> None:
+        """Removes all components from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
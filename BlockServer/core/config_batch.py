@@ -0,0 +1,162 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Edits several configurations and components so that either all or none of them change.
+
+A batch is written to EDIT_CONFIGS_PV as {"configs": [details, ...], "components": [details,
+...]}, where the details are as written to SAVE_NEW_CONFIG and SAVE_NEW_COMPONENT. Every edit is
+checked before any is saved, and the batch is then saved together, with one update of the
+configuration lists and one version control commit.
+"""
+
+from typing import Any, Dict, List, NamedTuple
+
+from server_common.channel_access import verify_manager_mode
+from server_common.file_path_manager import FILEPATH_MANAGER
+from server_common.helpers import MACROS
+from server_common.pv_names import prepend_blockserver
+from server_common.utilities import convert_from_json
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.core.inactive_config_holder import InactiveConfigHolder
+from BlockServer.fileIO.file_manager import ConfigurationFileManager
+
+EDIT_CONFIGS_PV = prepend_blockserver("EDIT_CONFIGS")
+
+# The keys of a batch and whether their edits are to components
+_BATCH_KEYS = {"configs": False, "components": True}
+
+
+class ConfigEdit(NamedTuple):
+    """The new details of a configuration or component."""
+
+    name: str
+    is_component: bool
+    details: Dict[str, Any]
+
+
+class PreparedEdit(NamedTuple):
+    """An edit applied in memory and ready to save."""
+
+    holder: InactiveConfigHolder
+    configuration: Configuration
+    is_component: bool
+
+
+def parse_edits(data: str) -> List[ConfigEdit]:
+    """Reads a batch of edits.
+
+    Args:
+        data: The JSON of the batch
+
+    Returns:
+        The edits, configurations first
+
+    Raises:
+        ValueError: if the batch is malformed, empty or edits anything more than once
+    """
+    batch = convert_from_json(data)
+    if not isinstance(batch, dict) or not set(batch).issubset(_BATCH_KEYS):
+        raise ValueError(f"A batch of edits is a dictionary of {' and '.join(_BATCH_KEYS)}")
+    edits = []
+    for key, is_component in _BATCH_KEYS.items():
+        for details in batch.get(key, []):
+            name = details.get("name") if isinstance(details, dict) else None
+            if not isinstance(name, str):
+                raise ValueError(f"Every edit in {key} must have a name")
+            edits.append(ConfigEdit(name, is_component, details))
+    if not edits:
+        raise ValueError("The batch has no edits")
+    names = [(edit.name.lower(), edit.is_component) for edit in edits]
+    duplicates = sorted({edit.name for edit, name in zip(edits, names) if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"The batch edits {', '.join(duplicates)} more than once")
+    return edits
+
+
+def edit_paths(edits: List[ConfigEdit]) -> List[str]:
+    """Gets the directories a batch of edits saves to, to commit them to version control.
+
+    Args:
+        edits: The edits
+
+    Returns:
+        The directory of each configuration and component edited
+    """
+    return [
+        FILEPATH_MANAGER.get_component_path(edit.name)
+        if edit.is_component
+        else FILEPATH_MANAGER.get_config_path(edit.name)
+        for edit in edits
+    ]
+
+
+def prepare_edits(
+    edits: List[ConfigEdit], file_manager: ConfigurationFileManager, timestamp: str
+) -> List[PreparedEdit]:
+    """Applies a batch of edits in memory, checking each can be saved.
+
+    Nothing is saved, so if any edit is invalid none of them are made.
+
+    Args:
+        edits: The edits
+        file_manager: Loads the configurations and components being edited
+        timestamp: The time of the edits, added to the history of each one
+
+    Returns:
+        The edited configurations and components, in the order of the edits
+
+    Raises:
+        ValueError: if an edit is invalid
+        ManagerModeRequiredError: if a protected configuration or component is edited when not
+         in manager mode
+    """
+    prepared = []
+    for edit in edits:
+        kind = "component" if edit.is_component else "config"
+        if edit.details.get("isProtected", False):
+            verify_manager_mode(message=f"Attempt to save protected {kind} ('{edit.name}')")
+
+        holder = InactiveConfigHolder(MACROS, file_manager)
+        try:
+            holder.load_inactive(edit.name, is_component=edit.is_component)
+            if holder.is_protected():
+                verify_manager_mode(
+                    message=f"Attempt to overwrite protected {kind} ('{edit.name}')"
+                )
+            history = holder.get_history()
+        except IOError:
+            # A new configuration or component
+            history = []
+
+        try:
+            holder.set_config_details(edit.details)
+            holder.set_history(history + [timestamp])
+            configuration = holder.prepare_save(edit.name, edit.is_component)
+        except ValueError as err:
+            raise ValueError(f"Invalid edit to {kind} {edit.name}: {err}") from err
+        prepared.append(PreparedEdit(holder, configuration, edit.is_component))
+    return prepared
+
+
+def save_edits(prepared: List[PreparedEdit], file_manager: ConfigurationFileManager) -> None:
+    """Saves a batch of prepared edits so that either all or none of them change.
+
+    Args:
+        prepared: The edits
+        file_manager: Saves the configurations and components
+    """
+    file_manager.save_configs([(edit.configuration, edit.is_component) for edit in prepared])
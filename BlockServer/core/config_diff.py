@@ -0,0 +1,94 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Structured differences between two configurations.
+
+A diff is requested by writing {"from": name, "to": name} to DIFF_CONFIGS_PV, where a name of
+null means the active configuration as it is loaded, and is published on CONFIG_DIFF_PV. For
+example {"from": null, "to": "X"} shows what changes if X is loaded, and {"from": "X", "to":
+null} shows what has changed in the active configuration X since it was saved.
+"""
+
+from typing import Any, Dict, Mapping
+
+from server_common.pv_names import prepend_blockserver
+
+from BlockServer.config.block import Block
+from BlockServer.config.fingerprint import diff_fields, diff_models
+from BlockServer.config.group import Group
+from BlockServer.config.ioc import IOC
+from BlockServer.core.config_holder import ConfigHolder
+
+DIFF_CONFIGS_PV = prepend_blockserver("DIFF_CONFIGS")
+CONFIG_DIFF_PV = prepend_blockserver("CONFIG_DIFF")
+
+# The details of a configuration compared as its metadata; the name and history always differ
+META_FIELDS = (
+    "description",
+    "synoptic",
+    "isProtected",
+    "isDynamic",
+    "configuresBlockGWAndArchiver",
+)
+
+
+def _diff_section(
+    old: Mapping[str, Block | Group | IOC], new: Mapping[str, Block | Group | IOC]
+) -> Dict[str, Any]:
+    diff = diff_models(old, new)
+    return {
+        "added": sorted(new[key].name for key in diff.added),
+        "removed": sorted(old[key].name for key in diff.removed),
+        "modified": {
+            new[key].name: diff_fields(old[key], new[key]) for key in sorted(diff.modified)
+        },
+    }
+
+
+def diff_configs(old: ConfigHolder, new: ConfigHolder) -> Dict[str, Any]:
+    """Finds the differences between two configurations, including their components.
+
+    Only the models whose fingerprints differ are compared field by field.
+
+    Args:
+        old: Holds the configuration being compared from
+        new: Holds the configuration being compared to
+
+    Returns:
+        The names of the added and removed blocks, groups and IOCs; the old and new values of the
+        changed fields of the modified ones; the added and removed components; and the old and
+        new values of the changed metadata
+    """
+    old_components = set(old.get_component_names())
+    new_components = set(new.get_component_names())
+    old_details = old.get_meta_details()
+    new_details = new.get_meta_details()
+    return {
+        "from": old.get_config_name(),
+        "to": new.get_config_name(),
+        "blocks": _diff_section(old.get_block_details(), new.get_block_details()),
+        "groups": _diff_section(old.get_group_details(), new.get_group_details()),
+        "iocs": _diff_section(old.get_all_iocs(), new.get_all_iocs()),
+        "components": {
+            "added": sorted(new_components - old_components),
+            "removed": sorted(old_components - new_components),
+        },
+        "meta": {
+            field: [old_details[field], new_details[field]]
+            for field in META_FIELDS
+            if old_details[field] != new_details[field]
+        },
+    }
@@ -27,6 +27,7 @@ from server_common.utilities import print_and_log
 
 from BlockServer.config.configuration import Configuration
 from BlockServer.config.group import Group
+from BlockServer.config.ioc import IOC
 from BlockServer.config.metadata import MetaData
 from BlockServer.core.constants import DEFAULT_COMPONENT, GRP_NONE
 from BlockServer.fileIO.file_manager import ConfigurationFileManager
@@ -116,15 +117,15 @@ class ConfigHolder:
         Returns:
             The names of all the blocks
         """
-        names = []
-        for block in self._config.blocks.values():
-            names.append(block.name)
+        names = [block.name for block in self._config.blocks.values()]
+        seen = set(names)
 
         for component in self._components.values():
             for block in component.blocks.values():
                 # Ignore duplicates
-                if block.name not in names:
+                if block.name not in seen:
                     names.append(block.name)
+                    seen.add(block.name)
         return names
 
     def get_block_details(self) -> Dict:
@@ -146,46 +147,38 @@ class ConfigHolder:
         Returns:
             A dictionary of group objects
         """
-        blocks = self.get_blocknames()
-        used_blocks = []
+        blocks = set(self.get_blocknames())
         groups = copy.deepcopy(self._config.groups)
+        used_blocks = set()
 
         for group in groups.values():
-            used_blocks.extend(group.blocks)
+            used_blocks.update(group.blocks)
 
         for component in self._components.values():
             for group_name, grp in component.groups.items():
-                if group_name not in groups.keys():
-                    # Add the groups if they have not been used before and exist
+                if group_name not in groups:
+                    # Add the groups if they have not been used before and exist.
+                    # Copy the group so that the component itself is not modified
                     blks = [x for x in grp.blocks if x not in used_blocks and x in blocks]
-                    groups[group_name] = grp
+                    groups[group_name] = copy.copy(grp)
                     groups[group_name].blocks = blks
-                    used_blocks.extend(blks)
+                    used_blocks.update(blks)
                 else:
                     # If group exists then append with component group
-                    # But don't add any duplicate blocks or blocks that don't exist
+                    # But don't add any duplicate blocks or blocks that don't exist.
+                    # Every block already in a group is in used_blocks.
                     for bn in grp.blocks:
-                        if (
-                            bn not in groups[group_name].blocks
-                            and bn not in used_blocks
-                            and bn in blocks
-                        ):
-                            groups[group_name].blocks.append(bn)
-                            used_blocks.append(bn)
+                        if bn not in used_blocks and bn in blocks:
+                            groups[group_name].add_block(bn)
+                            used_blocks.add(bn)
 
         # If any groups are empty now we've filled in from the components, get rid of them
-        # This is an ordered dict so we need to copy it before iterating - throws a runtime error
-        # if it has mutated.
-        groups_copy = groups.copy()
-        for key in groups_copy.keys():
-            if len(groups[key].blocks) == 0:
-                groups.pop(key)
-
-        return groups
+        return OrderedDict((key, group) for key, group in groups.items() if group.blocks)
 
     def _set_group_details(self, redefinition: List[Dict]) -> None:
         # Any redefinition only affects the main configuration
-        homeless_blocks = self.get_blocknames()
+        # Use a dict as an ordered set so blocks can be removed in constant time
+        homeless_blocks = dict.fromkeys(self.get_blocknames())
         for grp in redefinition:
             # Skip the NONE group
             if grp["name"].lower() == GRP_NONE.lower():
@@ -199,8 +192,8 @@ class ConfigHolder:
                 self._config.groups[grp["name"].lower()].blocks = []
                 for blk in grp["blocks"]:
                     if blk in homeless_blocks:
-                        self._config.groups[grp["name"].lower()].blocks.append(blk)
-                        homeless_blocks.remove(blk)
+                        self._config.groups[grp["name"].lower()].add_block(blk)
+                        del homeless_blocks[blk]
             else:
                 component = grp.get("component")
                 # Ignore empty groups, except those with components. Component groups are
@@ -212,12 +205,12 @@ class ConfigHolder:
                     if component is None:
                         for blk in grp["blocks"]:
                             if blk in homeless_blocks:
-                                self._config.groups[grp["name"].lower()].blocks.append(blk)
-                                homeless_blocks.remove(blk)
+                                self._config.groups[grp["name"].lower()].add_block(blk)
+                                del homeless_blocks[blk]
         # Finally, anything in homeless gets put in NONE
         if GRP_NONE.lower() not in self._config.groups:
             self._config.groups[GRP_NONE.lower()] = Group(GRP_NONE)
-        self._config.groups[GRP_NONE.lower()].blocks = homeless_blocks
+        self._config.groups[GRP_NONE.lower()].blocks = list(homeless_blocks)
 
     def get_config_name(self) -> str:
         """Get the name of the configuration.
@@ -276,6 +269,19 @@ class ConfigHolder:
         iocs.update(self.get_component_ioc_details())
         return iocs
 
+    def get_all_iocs(self) -> Dict[str, IOC]:
+        """Get the IOCs in the configuration and its components, without copying them.
+
+        An IOC in a component takes the place of one with the same name in the configuration.
+
+        Returns:
+            The IOCs keyed by name
+        """
+        iocs = dict(self._config.iocs)
+        for component in self._components.values():
+            iocs.update(component.iocs)
+        return iocs
+
     def get_component_names(self, include_base: bool = False) -> List[str]:
         """Get the names of the components in the configuration.
 
@@ -337,10 +343,20 @@ class ConfigHolder:
             "iocs": self._iocs_to_list(),
             "component_iocs": self._iocs_to_list_with_components(),
             "components": self._comps_to_list(),  # Just return the names of the components
+            **self.get_meta_details(),
+        }
+
+    def get_meta_details(self) -> Dict[str, Any]:
+        """Get the metadata of the configuration, without building the rest of its details.
+
+        Returns:
+            A dictionary of the name, description, synoptic, history and flags
+        """
+        return {
             "name": self._config.get_name(),
             "description": self._config.meta.description,
             "synoptic": self._config.meta.synoptic,
-            "history": self._config.meta.history,
+            "history": list(self._config.meta.history),
             "isProtected": self._config.meta.isProtected,
             "isDynamic": self._config.meta.isDynamic,
             "configuresBlockGWAndArchiver": self._config.meta.configuresBlockGWAndArchiver,
@@ -437,6 +453,19 @@ class ConfigHolder:
             # add default component to list of components
             self.add_component(DEFAULT_COMPONENT)
 
+    def set_config_from(self, other: "ConfigHolder") -> None:
+        """Replace the existing configuration with one already loaded by another holder, along
+        with its components. The other holder must not be used afterwards.
+
+        Args:
+            other: The holder of the configuration
+        """
+        self._cache_config()
+        self.clear_config()
+        self._config = other._config
+        self._components = other._components
+        self._is_component = other._is_component
+
     def _set_component_names(self, comp: Configuration, name: str) -> None:
         # Set the component for blocks, groups and IOCs
         for block in comp.blocks.values():
@@ -471,17 +500,25 @@ class ConfigHolder:
             name: The name to save the configuration under
             as_component: Whether to save as a component
         """
+        self._filemanager.save_config(self.prepare_save(name, as_component), as_component)
+
+    def prepare_save(self, name: str, as_component: bool) -> Configuration:
+        """Checks the configuration can be saved and names it, without saving it.
+
+        Args:
+            name: The name to save the configuration under
+            as_component: Whether to save as a component
+
+        Returns:
+            The configuration to save
+        """
         self._check_name(name, as_component)
         if self._is_component != as_component:
             self._set_as_component(as_component)
 
-        if self._is_component:
-            self._set_config_name(name)
-            self._filemanager.save_config(self._config, True)
-        else:
-            self._set_config_name(name)
-            # TODO: CHECK WHAT COMPONENTS self._config contains and remove _base if it is in there
-            self._filemanager.save_config(self._config, False)
+        self._set_config_name(name)
+        # TODO: CHECK WHAT COMPONENTS self._config contains and remove _base if it is in there
+        return self._config
 
     def _check_name(self, name: str, is_comp: bool = False) -> None:
         # Not empty
@@ -14,17 +14,18 @@
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
 
-import json
 import os
 import traceback
 from functools import wraps
 from threading import RLock
 from typing import TYPE_CHECKING
 
+from BlockServer.core.component_details_cache import ComponentDetailsCache
 from BlockServer.core.config_list_manager_exceptions import InvalidDeleteException
 from BlockServer.core.constants import DEFAULT_COMPONENT
 from server_common.file_path_manager import FILEPATH_MANAGER
 from BlockServer.core.inactive_config_holder import InactiveConfigHolder
+from BlockServer.core.search_index import SearchIndex
 from server_common.channel_access import ChannelAccess, verify_manager_mode
 from server_common.common_exceptions import MaxAttemptsExceededException
 from server_common.helpers import MACROS
@@ -100,18 +101,26 @@ class ConfigListManager:
         """
 
         self._config_metas = {}
+        # The names of the configurations keyed by their details PV
+        self._config_details_pvs = {}
         self._component_metas = {}
         self._comp_dependencies = {}
+        self._search_index = SearchIndex()
         self._bs = block_server
         self.active_config_name = ""
         self.active_components = []
-        self.all_components = {}
         self._lock = RLock()
         self.channel_access = channel_access
         self.file_manager = file_manager
 
         self._conf_path = FILEPATH_MANAGER.config_dir
         self._comp_path = FILEPATH_MANAGER.component_dir
+        self._component_details = ComponentDetailsCache(
+            self._load_component_details, self._get_component_path
+        )
+        self._all_component_details_payload = None
+        # The names and signatures of the components the payload was built from
+        self._all_component_details_signatures = None
         self._import_configs()
 
     def _update_pv_value(self, fullname, data) -> None:
@@ -119,8 +128,8 @@ class ConfigListManager:
         if not self._bs.does_pv_exist(fullname):
             self._bs.add_string_pv_to_db(fullname, count=16000)
 
-        self._bs.setParam(fullname, data)
-        self._bs.updatePVs()
+        # The data is encoded off this thread so it must not be modified afterwards
+        self._bs.encode_and_set_param(fullname, data)
 
     def _delete_pv(self, fullname: str) -> None:
         self._bs.delete_pv_from_db(fullname)
@@ -202,6 +211,71 @@ class ConfigListManager:
         config.load_inactive(name, is_component)
         return config
 
+    def get_config_name_for_details_pv(self, pv: str) -> str | None:
+        """Gets the configuration whose details a PV holds.
+
+        Args:
+            pv (string): The name of the PV
+
+        Returns:
+            string : The name of the configuration, or None if the PV is not a details PV
+        """
+        name = self._config_details_pvs.get(pv)
+        meta = None if name is None else self._config_metas.get(name)
+        return None if meta is None else meta.name
+
+    def _get_component_path(self, name: str) -> str:
+        meta = self._component_metas.get(name.lower())
+        return os.path.join(self._comp_path, meta.name if meta is not None else name)
+
+    def _load_component_details(self, name: str) -> dict:
+        meta = self._component_metas.get(name.lower())
+        return self.load_config(meta.name if meta is not None else name, True).get_config_details()
+
+    @needs_lock
+    def get_component_details(self, name: str) -> dict:
+        """Gets the details of a component, from the cache if they are still current.
+
+        Args:
+            name (string): The name of the component
+
+        Returns:
+            dict : The details of the component
+        """
+        return self._component_details.get(name)
+
+    @needs_lock
+    def get_all_component_details(self) -> list:
+        """Gets the details of all the components apart from the default component.
+
+        Returns:
+            list : The details of each component
+        """
+        return [self._component_details.get(name) for name in self._component_metas]
+
+    @needs_lock
+    def get_all_component_details_payload(self) -> bytes:
+        """Gets the encoded value of the ALL_COMPONENT_DETAILS PV.
+
+        The payload is only rebuilt after a component has been updated or deleted, or the files
+        of a component have changed on disk.
+
+        Returns:
+            bytes : The compressed and hexed JSON of the details of all the components
+        """
+        signatures = tuple(
+            (name, self._component_details.signature(name)) for name in self._component_metas
+        )
+        if (
+            self._all_component_details_payload is None
+            or signatures != self._all_component_details_signatures
+        ):
+            self._all_component_details_payload = compress_and_hex(
+                convert_to_json(self.get_all_component_details())
+            )
+            self._all_component_details_signatures = signatures
+        return self._all_component_details_payload
+
     def _update_component_dependencies_pv(self, name: str) -> None:
         # Updates PV with list of configs that depend on a component
         configs = []
@@ -210,17 +284,18 @@ class ConfigListManager:
         if name in self._component_metas.keys():
             # Check just in case component failed to load
             pv_name = BlockserverPVNames.get_dependencies_pv(self._component_metas[name].pv)
-            self._update_pv_value(pv_name, compress_and_hex(json.dumps(configs)))
+            self._update_pv_value(pv_name, list(configs))
 
     def _update_config_pv(self, name, data) -> None:
         # Updates pvs with new data
         pv_name = BlockserverPVNames.get_config_details_pv(self._config_metas[name].pv)
-        self._update_pv_value(pv_name, compress_and_hex(json.dumps(data)))
+        self._config_details_pvs[pv_name] = name
+        self._update_pv_value(pv_name, data)
 
     def _update_component_pv(self, name, data) -> None:
         # Updates pvs with new data
         pv_name = BlockserverPVNames.get_component_details_pv(self._component_metas[name].pv)
-        self._update_pv_value(pv_name, compress_and_hex(json.dumps(data)))
+        self._update_pv_value(pv_name, data)
 
     @needs_lock
     def update(self, config, is_component: bool = False) -> None:
@@ -257,6 +332,21 @@ class ConfigListManager:
             config (ConfigHolder): The configuration holder
             is_component (bool): Whether it is a component or not
         """
+        self._update_config(config, is_component)
+
+    @needs_lock
+    @update_monitors_when_finished
+    def update_configs_in_list(self, configs) -> None:
+        """Updates the list of meta data and the individual PVs for several configurations,
+        updating the monitors of the lists once at the end.
+
+        Args:
+            configs (list): Tuples of each configuration holder and whether it is a component
+        """
+        for config, is_component in configs:
+            self._update_config(config, is_component)
+
+    def _update_config(self, config, is_component: bool) -> None:
         name = config.get_config_name()
         name_lower = name.lower()
 
@@ -267,13 +357,23 @@ class ConfigListManager:
         meta = config.get_config_meta()
         meta.pv = pv_name
 
+        # Only the configuration's own blocks, those from its components are indexed separately
+        self._search_index.update(
+            name,
+            is_component,
+            [block for block in config.get_block_details().values() if block.component is None],
+            config.get_ioc_details().values(),
+        )
+
         # Add metas and update pvs appropriately
         if is_component:
             if name_lower != DEFAULT_COMPONENT.lower():
+                details = config.get_config_details()
                 self._component_metas[name_lower] = meta
-                self._update_component_pv(name_lower, config.get_config_details())
+                self._update_component_pv(name_lower, details)
                 self._update_component_dependencies_pv(name_lower)
-                self.all_components[name_lower] = config.get_config_details()
+                self._component_details.put(name_lower, details)
+                self._all_component_details_payload = None
         else:
             if name_lower in self._config_metas.keys():
                 # Config already exists
@@ -345,11 +445,12 @@ class ConfigListManager:
                 "MINOR",
             )
 
-        self._delete_pv(
-            BlockserverPVNames.get_config_details_pv(self._config_metas[config.lower()].pv)
-        )
+        pv_name = BlockserverPVNames.get_config_details_pv(self._config_metas[config.lower()].pv)
+        self._config_details_pvs.pop(pv_name, None)
+        self._delete_pv(pv_name)
         del self._config_metas[config.lower()]
         self._remove_config_from_dependencies(config)
+        self._search_index.remove(config, False)
 
     @deletion_context
     def delete_components(self, delete_list: list[str]) -> None:
@@ -413,7 +514,44 @@ class ConfigListManager:
         )
         self._delete_pv(BlockserverPVNames.get_dependencies_pv(self._component_metas[component].pv))
         del self._component_metas[component]
-        del self.all_components[component]
+        self._component_details.remove(component)
+        self._search_index.remove(component, True)
+        self._all_component_details_payload = None
+
+    @needs_lock
+    def search(self, field: str, value: str, match: str = "exact") -> list[dict]:
+        """Finds the configurations and components containing a block, PV or IOC.
+
+        Args:
+            field (string): The field to search: pv, block or ioc
+            value (string): The value to look for
+            match (string): Whether the field must equal the value (exact) or contain it (contains)
+
+        Returns:
+            list : The matching rows; those in components also list the configurations using them
+        """
+        rows = self._search_index.search(field, value, match)
+        for row in rows:
+            if row["is_component"]:
+                row["used_by"] = list(self._comp_dependencies.get(row["config"].lower(), []))
+        return rows
+
+    @needs_lock
+    def get_cache_sizes(self) -> dict[str, int]:
+        """Gets the numbers of configurations and components held, to look for memory leaks.
+
+        Returns:
+            dict : The numbers of configurations, components and details PVs, and the number and
+             size in bytes of the component details cached
+        """
+        return {
+            "configs": len(self._config_metas),
+            "components": len(self._component_metas),
+            "config_details_pvs": len(self._config_details_pvs),
+            "component_details_cached": len(self._component_details),
+            "component_details_bytes": self._component_details.total_bytes,
+            "all_component_details_bytes": len(self._all_component_details_payload or b""),
+        }
 
     @needs_lock
     def get_dependencies(self, comp_name: str) -> dict[str, list[str]]:
@@ -428,21 +566,36 @@ class ConfigListManager:
         dependencies = self._comp_dependencies.get(comp_name.lower())
         return [] if dependencies is None else dependencies
 
+    @needs_lock
+    def get_components_of(self, config_name: str) -> list[str]:
+        """Get the names of the components a configuration uses, including the base component
+        which every configuration loads.
+
+        Args:
+            config_name (string): The name of the configuration
+
+        Returns:
+            list : The names of the components, in lower case
+        """
+        name = config_name.lower()
+        components = [
+            comp
+            for comp, configs in self._comp_dependencies.items()
+            if any(config.lower() == name for config in configs)
+        ]
+        return components + [DEFAULT_COMPONENT.lower()]
+
     def update_monitors(self) -> None:
         with self._bs.monitor_lock:
             print_and_log("Updating config list monitors")
             # Set the available configs
-            self._bs.setParam(
-                BlockserverPVNames.CONFIGS, compress_and_hex(convert_to_json(self.get_configs()))
-            )
+            self._bs.encode_and_set_param(BlockserverPVNames.CONFIGS, self.get_configs())
             # Set the available comps
-            self._bs.setParam(
-                BlockserverPVNames.COMPS, compress_and_hex(convert_to_json(self.get_components()))
-            )
+            self._bs.encode_and_set_param(BlockserverPVNames.COMPS, self.get_components())
             # Set the available component details
             self._bs.setParam(
                 BlockserverPVNames.ALL_COMPONENT_DETAILS,
-                compress_and_hex(convert_to_json(list(self.all_components.values()))),
+                self.get_all_component_details_payload(),
             )
             # Update them
             self._bs.updatePVs()
@@ -0,0 +1,309 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Background staging of configurations before they are loaded.
+
+Before the slow work of restarting IOCs and the gateway, loading a configuration parses and
+validates its files and those of its components, works out which IOCs have changed and generates
+the gateway, archiver and run-control files. Clients usually fetch the details of a configuration
+before loading it, so the ConfigStager does this work in the background when the details are
+fetched or when asked to through PRESTAGE_CONFIG_PV. A later load uses the staged configuration
+as long as the files it was read from have not changed since.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from server_common.pv_names import prepend_blockserver
+from server_common.utilities import print_and_log
+
+from BlockServer.config.ioc import IOC
+from BlockServer.core.active_config_holder import _compare_ioc_properties
+from BlockServer.core.config_holder import ConfigHolder
+from BlockServer.core.constants import DEFAULT_COMPONENT
+from BlockServer.fileIO.file_manager import STAGING_DIR_PREFIX, ConfigurationFileManager
+
+PRESTAGE_CONFIG_PV = prepend_blockserver("PRESTAGE_CONFIG")
+
+# The most configurations kept staged at once; the least recently requested is dropped first
+MAX_STAGED = 4
+# The most times a configuration is loaded while staging, if its components keep changing
+MAX_STAGING_LOADS = 3
+
+IocChanges = Tuple[Set[str], Set[str], Set[str]]
+
+
+def content_hash(paths: Iterable[str]) -> str:
+    """Gets a hash of the content of every file in some directories.
+
+    Args:
+        paths: The directories
+
+    Returns:
+        The hex digest, which changes if any file is added, removed or changed
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode("utf-8") + b"\0")
+        if not os.path.isdir(path):
+            digest.update(b"\0")
+            continue
+        for root, dirs, files in os.walk(path):
+            # Saves in progress are not part of the content
+            dirs[:] = sorted(d for d in dirs if not d.startswith(STAGING_DIR_PREFIX))
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                file_digest = hashlib.sha256()
+                with open(file_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(65536), b""):
+                        file_digest.update(chunk)
+                digest.update(os.path.relpath(file_path, path).encode("utf-8") + b"\0")
+                digest.update(file_digest.digest())
+    return digest.hexdigest()
+
+
+def config_content_paths(
+    name: str,
+    component_names: Iterable[str],
+    get_path: Callable[[str, bool], str] = ConfigurationFileManager.get_path,
+) -> List[str]:
+    """Gets the directories holding the files of a configuration and its components.
+
+    Args:
+        name: The name of the configuration
+        component_names: The names of its components, including the base component
+        get_path: Gets the directory of a configuration or component
+
+    Returns:
+        The directories
+    """
+    return [get_path(name, False)] + [get_path(component, True) for component in component_names]
+
+
+def _fingerprints(iocs: Dict[str, IOC]) -> Dict[str, str]:
+    return {name: ioc.fingerprint for name, ioc in iocs.items()}
+
+
+class StagedConfig:
+    """A configuration which has been loaded and prepared, ready to become the active one."""
+
+    def __init__(
+        self,
+        holder: ConfigHolder,
+        content_hash: str,
+        paths: List[str],
+        artifacts: Dict[str, str],
+        base_iocs: Optional[Dict[str, IOC]] = None,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            holder: Holds the loaded configuration and its components
+            content_hash: The hash of the files the configuration was loaded from
+            paths: The directories of the configuration and its components
+            artifacts: The generated files, keyed by GATEWAY_ALIASES etc. from constants
+            base_iocs: The IOCs of the active configuration when staged, to work out the changed
+                IOCs against; None if they were not known
+        """
+        self.holder = holder
+        self.content_hash = content_hash
+        self.paths = paths
+        self.artifacts = artifacts
+        self._base_fingerprints = None
+        self._ioc_changes = None
+        if base_iocs is not None:
+            self._base_fingerprints = _fingerprints(base_iocs)
+            self._ioc_changes = _compare_ioc_properties(base_iocs, holder.get_all_iocs())
+
+    def get_name(self) -> str:
+        """Gets the name of the configuration.
+
+        Returns:
+            The name
+        """
+        return self.holder.get_config_name()
+
+    def get_ioc_changes(self, current_iocs: Dict[str, IOC]) -> Optional[IocChanges]:
+        """Gets the IOCs which change when moving to this configuration, if they were worked
+        out against the same IOCs when it was staged.
+
+        Args:
+            current_iocs: The IOCs of the configuration being moved from
+
+        Returns:
+            The added, changed and removed IOCs; or None if they need working out again
+        """
+        if self._ioc_changes is None or _fingerprints(current_iocs) != self._base_fingerprints:
+            return None
+        added, changed, removed = self._ioc_changes
+        return set(added), set(changed), set(removed)
+
+
+class ConfigStager:
+    """Stages configurations on a background thread, ready to be loaded."""
+
+    def __init__(
+        self,
+        macros: Dict,
+        file_manager: ConfigurationFileManager,
+        artifact_builders: Dict[str, Callable[[Dict], str]],
+        get_active_iocs: Optional[Callable[[], Dict[str, IOC]]] = None,
+        get_path: Callable[[str, bool], str] = ConfigurationFileManager.get_path,
+        executor: Optional[Executor] = None,
+        fingerprint: Callable[[Iterable[str]], str] = content_hash,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            macros: The BlockServer macros
+            file_manager: Loads the configuration files
+            artifact_builders: Build the generated files from the blocks of a configuration,
+                keyed by GATEWAY_ALIASES etc. from constants
+            get_active_iocs: Gets the IOCs of the active configuration
+            get_path: Gets the directory of a configuration or component
+            executor: Runs the staging; by default a single background thread
+            fingerprint: Gets a fingerprint of the files in some directories, which changes
+                whenever they change; by default the hash of their content
+        """
+        self._macros = macros
+        self._file_manager = file_manager
+        self._artifact_builders = artifact_builders
+        self._get_active_iocs = get_active_iocs
+        self._get_path = get_path
+        self._fingerprint = fingerprint
+        self._executor = executor or ThreadPoolExecutor(1, thread_name_prefix="config_stager")
+        # Staged configurations keyed by lower case name, least recently requested first
+        self._staged: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = Lock()
+
+    def prestage(self, name: str) -> Future:
+        """Starts staging a configuration in the background, unless it is already staged and
+        unchanged.
+
+        Args:
+            name: The name of the configuration
+
+        Returns:
+            A future holding the StagedConfig
+        """
+        key = name.lower()
+        with self._lock:
+            previous = self._staged.pop(key, None)
+            if previous is not None and not previous.done():
+                future = previous
+            else:
+                future = self._executor.submit(self._stage, name, previous)
+            self._staged[key] = future
+            while len(self._staged) > MAX_STAGED:
+                self._staged.popitem(last=False)
+        return future
+
+    def take(self, name: str) -> Optional[StagedConfig]:
+        """Takes a staged configuration to load, if it is still the same as the files.
+
+        Waits for the configuration to finish staging if it has been started, which is no
+        slower than loading it again.
+
+        Args:
+            name: The name of the configuration
+
+        Returns:
+            The staged configuration, or None if it has not been staged or is out of date
+        """
+        with self._lock:
+            future = self._staged.pop(name.lower(), None)
+        if future is None:
+            return None
+        try:
+            staged = future.result()
+        except Exception as err:
+            print_and_log(f"Could not stage configuration '{name}': {err}", "MINOR")
+            return None
+        if not self._is_current(staged):
+            print_and_log(f"Configuration '{name}' changed since it was staged")
+            return None
+        return staged
+
+    def discard(self, name: Optional[str] = None) -> None:
+        """Discards a staged configuration, for example because it has been saved.
+
+        Args:
+            name: The name of the configuration, or None to discard all of them
+        """
+        with self._lock:
+            if name is None:
+                self._staged.clear()
+            else:
+                self._staged.pop(name.lower(), None)
+
+    def get_cache_sizes(self) -> Dict[str, int]:
+        """Gets the number of configurations staged, to look for memory leaks.
+
+        Returns:
+            The number of configurations staged or being staged
+        """
+        with self._lock:
+            return {"staged_configs": len(self._staged)}
+
+    def shutdown(self) -> None:
+        """Waits for any staging to finish and stops the background thread."""
+        self._executor.shutdown(wait=True)
+
+    def _is_current(self, staged: StagedConfig) -> bool:
+        return self._fingerprint(staged.paths) == staged.content_hash
+
+    def _stage(self, name: str, previous: Optional[Future]) -> StagedConfig:
+        paths = config_content_paths(name, [DEFAULT_COMPONENT], self._get_path)
+        if previous is not None and previous.exception() is None:
+            staged = previous.result()
+            if self._is_current(staged):
+                return staged
+            paths = staged.paths
+
+        print_and_log(f"Staging configuration '{name}'")
+        # The fingerprint is taken before loading, so files changed while loading leave the
+        # staged configuration out of date rather than being recorded as what was loaded. The
+        # directories of the components are only known once loaded, so they are expected to be
+        # those used last time, or just the base, and the configuration is loaded again if not.
+        for _ in range(MAX_STAGING_LOADS):
+            fingerprint = self._fingerprint(paths)
+            holder = ConfigHolder(self._macros, self._file_manager)
+            holder.set_config(holder.load_configuration(name))
+            loaded_paths = config_content_paths(
+                name, holder.get_component_names(include_base=True), self._get_path
+            )
+            if set(loaded_paths) == set(paths):
+                break
+            paths = loaded_paths
+        else:
+            raise RuntimeError(f"The components of configuration '{name}' kept changing")
+        blocks = holder.get_block_details()
+        artifacts = {key: build(blocks) for key, build in self._artifact_builders.items()}
+
+        base_iocs = None
+        if self._get_active_iocs is not None:
+            try:
+                base_iocs = self._get_active_iocs()
+            except Exception as err:
+                # The active configuration may be changing; the IOCs are compared when loading
+                print_and_log(f"Could not get active IOCs while staging: {err}")
+        staged = StagedConfig(holder, fingerprint, paths, artifacts, base_iocs)
+        print_and_log(f"Staged configuration '{name}'")
+        return staged
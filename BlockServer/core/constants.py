@@ -81,3 +81,8 @@ FILENAME_SCREENS = "screens.xml"
 FILENAME_BANNER = "banner.xml"
 
 SCHEMA_FOR = [FILENAME_BLOCKS, FILENAME_GROUPS, FILENAME_IOCS, FILENAME_COMPONENTS, FILENAME_META]
+
+# The files generated from the blocks of a configuration, which can be built before it is loaded
+GATEWAY_ALIASES = "gateway_aliases"
+ARCHIVE_CONFIG = "archive_config"
+RUNCONTROL_FILE = "runcontrol_file"
@@ -5,9 +5,27 @@ Functions for interacting with the database server.
 import json
 import traceback
 
-from server_common.channel_access import ChannelAccess
 from server_common.pv_names import DatabasePVNames
 from server_common.utilities import dehex_and_decompress, print_and_log
+from ServerTools.ca_statistics import ChannelAccess
+from ServerTools.database_pv_names import IOC_NAMES, RUNNING_IOCS
+
+
+def _get_json_pv(pv):
+    """
+    Reads a compressed and hexed JSON PV from the DatabaseServer.
+
+    Args:
+        pv : The full name of the PV to read.
+
+    Returns:
+        The decoded JSON value.
+    """
+    return json.loads(
+        dehex_and_decompress(
+            bytes(ChannelAccess.caget(pv, as_string=True), encoding="utf-8")
+        ).decode("utf-8")
+    )
 
 
 def get_iocs(prefix):
@@ -20,14 +38,30 @@ def get_iocs(prefix):
     Returns:
         A list of the names of available IOCs.
     """
-    #
     try:
-        rawjson = dehex_and_decompress(
-            bytes(
-                ChannelAccess.caget(prefix + DatabasePVNames.IOCS, as_string=True), encoding="utf-8"
-            )
-        ).decode("utf-8")
-        return json.loads(rawjson).keys()
+        return _get_json_pv(prefix + IOC_NAMES)
+    except Exception:
+        # Fall back on the full IOC list for a DatabaseServer without the names-only PV
+        pass
+    try:
+        return _get_json_pv(prefix + DatabasePVNames.IOCS).keys()
     except Exception:
         print_and_log(f"Could not retrieve IOC list: {traceback.format_exc()}", "MAJOR")
         return []
+
+
+def get_running_iocs(prefix):
+    """
+    Get the names of the IOCs which the DatabaseServer reports as running.
+
+    Args:
+        prefix : The PV prefix for this instrument.
+
+    Returns:
+        A list of the names of running IOCs, or None if they could not be retrieved.
+    """
+    try:
+        return _get_json_pv(prefix + RUNNING_IOCS)
+    except Exception:
+        print_and_log(f"Could not retrieve running IOCs: {traceback.format_exc()}", "MINOR")
+        return None
@@ -0,0 +1,178 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Encodes PV values on worker threads and sets them on the PVs in the order they were submitted"""
+
+import itertools
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition, Lock
+from typing import Any, Callable, ContextManager, Deque, Dict, List, NamedTuple, Optional
+
+from server_common.utilities import compress_and_hex, convert_to_json, print_and_log
+
+DEFAULT_WORKERS = 2
+
+Encoder = Callable[[Any], Any]
+
+
+def encode_json(value: Any) -> bytes:
+    """Converts a value to JSON then compresses and hexes it.
+
+    Args:
+        value: The value to encode
+
+    Returns:
+        The encoded value
+    """
+    return compress_and_hex(convert_to_json(value))
+
+
+def encode_json_as_str(value: Any) -> str:
+    """Converts a value to JSON then compresses and hexes it, for PVs which are set with a string.
+
+    Args:
+        value: The value to encode
+
+    Returns:
+        The encoded value
+    """
+    return bytes.decode(encode_json(value), "utf-8")
+
+
+class _Job(NamedTuple):
+    sequence: int
+    pv: str
+    future: Future
+
+
+class EncodingService:
+    """Encodes values for PVs on a pool of worker threads and sets them on the PVs.
+
+    Values are set in the order they were submitted, whichever order they finish encoding in.
+    If a newer value for a PV is submitted before an older one has been set, the older one is
+    dropped. A submitted value is encoded later on another thread, so it must be a snapshot that
+    the caller will not modify.
+    """
+
+    def __init__(
+        self,
+        set_param: Callable[[str, Any], None],
+        update_pvs: Callable[[], None],
+        monitor_lock: ContextManager,
+        max_workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            set_param: Sets the value of a PV
+            update_pvs: Posts the values which have been set to the monitors
+            monitor_lock: The lock to hold while setting PVs
+            max_workers: The number of threads to encode with
+        """
+        self._set_param = set_param
+        self._update_pvs = update_pvs
+        self._monitor_lock = monitor_lock
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="pv_encoder")
+        self._sequence = itertools.count()
+        self._pending: Deque[_Job] = deque()
+        self._latest: Dict[str, int] = dict()
+        self._publishing = 0
+        # Guards the pending jobs; never held while waiting for the monitor lock
+        self._condition = Condition()
+        # Held by whichever thread is setting PVs so that they are set in order
+        self._publish_lock = Lock()
+
+    def submit(self, pv: str, value: Any, encoder: Encoder = encode_json) -> Future:
+        """Encodes a value on a worker thread and then sets it on a PV.
+
+        Args:
+            pv: The name of the PV
+            value: The value to encode
+            encoder: Function to encode the value with
+
+        Returns:
+            A future holding the encoded value
+        """
+        with self._condition:
+            sequence = next(self._sequence)
+            self._latest[pv] = sequence
+            future = self._executor.submit(encoder, value)
+            self._pending.append(_Job(sequence, pv, future))
+        future.add_done_callback(self._publish_ready)
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits for all the values submitted so far to be set.
+
+        This must not be called while holding the monitor lock.
+
+        Args:
+            timeout: The maximum time to wait in seconds, or None to wait indefinitely
+
+        Returns:
+            True if everything was set, False if the timeout expired first
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and self._publishing == 0, timeout
+            )
+
+    def shutdown(self) -> None:
+        """Sets any values still waiting and stops the worker threads."""
+        self._executor.shutdown(wait=True)
+        self.flush()
+
+    def _take_ready_jobs(self) -> List[_Job]:
+        with self._condition:
+            ready = []
+            while self._pending and self._pending[0].future.done():
+                ready.append(self._pending.popleft())
+            self._publishing += len(ready)
+            return ready
+
+    def _publish_ready(self, _future: Future) -> None:
+        # Never block on the publish lock: this can run on a thread already holding the monitor
+        # lock, which the thread that is publishing may be waiting for. Whoever holds the
+        # publish lock checks for more ready jobs after releasing it, so none are left behind.
+        while self._publish_lock.acquire(blocking=False):
+            try:
+                ready = self._take_ready_jobs()
+                while ready:
+                    try:
+                        self._publish(ready)
+                    finally:
+                        with self._condition:
+                            self._publishing -= len(ready)
+                            self._condition.notify_all()
+                    ready = self._take_ready_jobs()
+            finally:
+                self._publish_lock.release()
+            with self._condition:
+                if not (self._pending and self._pending[0].future.done()):
+                    return
+
+    def _publish(self, jobs: List[_Job]) -> None:
+        with self._monitor_lock:
+            for job in jobs:
+                if self._latest.get(job.pv) != job.sequence:
+                    # A newer value for this PV is on its way
+                    continue
+                try:
+                    self._set_param(job.pv, job.future.result())
+                except Exception as err:
+                    print_and_log(f"Unable to set encoded value of {job.pv}: {err}", "MAJOR")
+            self._update_pvs()
@@ -14,6 +14,7 @@
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
 from abc import ABCMeta, abstractmethod
+from typing import Any, Iterable
 
 
 class OnTheFlyPvInterface:
@@ -50,6 +51,18 @@ class OnTheFlyPvInterface:
         """
         return pv in self.pvs_to_write
 
+    def get_write_resources(self, pv: str) -> Iterable[str] | None:
+        """Gets the resources used when writing to a PV, so that writes which use different
+        resources can be handled at the same time (see ResourceScheduler).
+
+        Args:
+            pv (string): The PV name
+
+        Returns:
+            set: The names of the resources, or None if the write may use any resource
+        """
+        return None
+
     @abstractmethod
     def handle_pv_write(self, pv: str, data: str):
         """Handles the request to write to the PV.
@@ -63,7 +76,7 @@ class OnTheFlyPvInterface:
         pass
 
     @abstractmethod
-    def handle_pv_read(self, pv):
+    def handle_pv_read(self, pv: str) -> Any:
         """Handles the request to read the PV value
 
         Args:
@@ -0,0 +1,189 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Runs write commands concurrently when they touch different resources.
+
+Each command names the resources it uses, such as the active configuration or an inactive
+configuration. A command waits for every earlier command using any of the same resources to
+finish, so commands on a resource run one at a time in the order they were submitted, while
+commands on different resources run at the same time. A command which does not name its
+resources runs on its own, after every earlier command and before every later one.
+"""
+
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from threading import Condition
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_WORKERS = 4
+
+ACTIVE_CONFIG = "active_config"
+DEVICES = "devices"
+SYNOPTICS = "synoptics"
+
+
+def config_resource(name: str) -> str:
+    """Gets the resource for an inactive configuration.
+
+    Args:
+        name: The name of the configuration
+
+    Returns:
+        The resource
+    """
+    return "config:" + name.lower()
+
+
+def component_resource(name: str) -> str:
+    """Gets the resource for a component.
+
+    Args:
+        name: The name of the component
+
+    Returns:
+        The resource
+    """
+    return "component:" + name.lower()
+
+
+def active_config_resources(configs: Dict[str, Iterable[str]]) -> Set[str]:
+    """Gets the resources for a command on the active configuration.
+
+    Loading a configuration reads its files and those of its components, so the command also
+    uses each configuration it may load and their components.
+
+    Args:
+        configs: The names of the components of each configuration the command may load, keyed
+         by the name of the configuration
+
+    Returns:
+        The resources
+    """
+    resources = {ACTIVE_CONFIG}
+    for name, components in configs.items():
+        resources.add(config_resource(name))
+        resources.update(component_resource(component) for component in components)
+    return resources
+
+
+class _Command:
+    __slots__ = ("func", "args", "resources", "future")
+
+    def __init__(
+        self, func: Callable[..., Any], args: Tuple, resources: Optional[FrozenSet[str]]
+    ) -> None:
+        self.func = func
+        self.args = args
+        # None means every resource
+        self.resources = resources
+        self.future: Future = Future()
+
+    def conflicts_with(self, other: "_Command") -> bool:
+        if self.resources is None or other.resources is None:
+            return True
+        return not self.resources.isdisjoint(other.resources)
+
+
+class ResourceScheduler:
+    """Runs commands on a pool of threads, ordering the commands which share resources."""
+
+    def __init__(
+        self, max_workers: int = DEFAULT_WORKERS, executor: Optional[Executor] = None
+    ) -> None:
+        """Constructor.
+
+        Args:
+            max_workers: The number of commands to run at once
+            executor: Runs the commands; by default a pool of max_workers threads
+        """
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers, thread_name_prefix="write_command"
+        )
+        # Commands which have not started yet, in the order they were submitted
+        self._waiting: List[_Command] = list()
+        self._running: Set[_Command] = set()
+        self._condition = Condition()
+
+    def submit(
+        self, func: Callable[..., Any], args: Tuple = (), resources: Optional[Iterable[str]] = None
+    ) -> Future:
+        """Submits a command to run once no earlier command is using its resources.
+
+        Args:
+            func: The command
+            args: The arguments to call the command with
+            resources: The resources the command uses; None if it may use any resource
+
+        Returns:
+            A future holding the result of the command
+        """
+        command = _Command(func, args, None if resources is None else frozenset(resources))
+        with self._condition:
+            self._waiting.append(command)
+            ready = self._take_ready()
+        self._start(ready)
+        return command.future
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Waits for every submitted command to finish.
+
+        Args:
+            timeout: The maximum time to wait in seconds, or None to wait indefinitely
+
+        Returns:
+            True if every command finished, False if the timeout expired first
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._waiting and not self._running, timeout
+            )
+
+    def shutdown(self) -> None:
+        """Waits for the submitted commands to finish and stops the threads."""
+        self.wait_until_idle()
+        self._executor.shutdown(wait=True)
+
+    def _take_ready(self) -> List[_Command]:
+        # A waiting command is ready when it conflicts with no running command and no command
+        # submitted before it which is still waiting
+        ready = []
+        blocked: List[_Command] = []
+        for command in self._waiting:
+            if any(command.conflicts_with(other) for other in self._running) or any(
+                command.conflicts_with(other) for other in blocked
+            ):
+                blocked.append(command)
+            else:
+                ready.append(command)
+                self._running.add(command)
+        self._waiting = blocked
+        return ready
+
+    def _start(self, commands: List[_Command]) -> None:
+        for command in commands:
+            future = self._executor.submit(command.func, *command.args)
+            future.add_done_callback(lambda done, c=command: self._finished(c, done))
+
+    def _finished(self, command: _Command, done: Future) -> None:
+        with self._condition:
+            self._running.discard(command)
+            ready = self._take_ready()
+            self._condition.notify_all()
+        self._start(ready)
+        error = done.exception()
+        if error is None:
+            command.future.set_result(done.result())
+        else:
+            command.future.set_exception(error)
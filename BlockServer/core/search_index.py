@@ -0,0 +1,155 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""An inverted index of the blocks, PVs and IOCs in every configuration and component.
+
+A search is requested by writing {"field": "pv" | "block" | "ioc", "value": text, "match":
+"exact" | "contains"} to SEARCH_CONFIGS_PV; "match" defaults to "exact". The matching rows are
+published on SEARCH_RESULTS_PV. Matching ignores case, and a PV may be given with or without the
+instrument prefix.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from server_common.helpers import MACROS
+from server_common.pv_names import prepend_blockserver
+
+from BlockServer.config.block import Block
+from BlockServer.config.ioc import IOC
+
+SEARCH_CONFIGS_PV = prepend_blockserver("SEARCH_CONFIGS")
+SEARCH_RESULTS_PV = prepend_blockserver("SEARCH_RESULTS")
+
+PV = "pv"
+BLOCK = "block"
+IOC_FIELD = "ioc"
+FIELDS = (PV, BLOCK, IOC_FIELD)
+
+EXACT = "exact"
+CONTAINS = "contains"
+
+
+class _Row(NamedTuple):
+    config: str
+    is_component: bool
+    block: str | None
+    pv: str | None
+    ioc: str | None
+
+    def to_dict(self) -> Dict[str, Any]:
+        row = {"config": self.config, "is_component": self.is_component}
+        if self.ioc is None:
+            row.update({"block": self.block, "pv": self.pv})
+        else:
+            row["ioc"] = self.ioc
+        return row
+
+
+def _strip_prefix(pv: str) -> str:
+    prefix = MACROS["$(MYPVPREFIX)"]
+    return pv[len(prefix) :] if prefix and pv.startswith(prefix) else pv
+
+
+class SearchIndex:
+    """Finds the configurations and components containing a block, PV or IOC.
+
+    The index is not thread safe; its owner must serialise access to it.
+    """
+
+    def __init__(self) -> None:
+        # The rows of each configuration or component, keyed by (lower case name, is component)
+        self._rows: Dict[Tuple[str, bool], List[_Row]] = dict()
+        # The rows keyed by field then by the lower case value of the field
+        self._index: Dict[str, Dict[str, Set[_Row]]] = {field: defaultdict(set) for field in FIELDS}
+
+    def update(
+        self, name: str, is_component: bool, blocks: Iterable[Block], iocs: Iterable[IOC]
+    ) -> None:
+        """Replaces the entries of a configuration or component.
+
+        Args:
+            name: The name of the configuration or component
+            is_component: Whether it is a component
+            blocks: Its own blocks, not including those from its components
+            iocs: Its own IOCs, not including those from its components
+        """
+        self.remove(name, is_component)
+        rows = [
+            _Row(name, is_component, block.name, self._full_pv(block), None) for block in blocks
+        ]
+        rows += [_Row(name, is_component, None, None, ioc.name) for ioc in iocs]
+        self._rows[(name.lower(), is_component)] = rows
+        for row in rows:
+            for field, value in self._keys(row):
+                self._index[field][value].add(row)
+
+    def remove(self, name: str, is_component: bool) -> None:
+        """Removes the entries of a configuration or component.
+
+        Args:
+            name: The name of the configuration or component
+            is_component: Whether it is a component
+        """
+        for row in self._rows.pop((name.lower(), is_component), []):
+            for field, value in self._keys(row):
+                rows = self._index[field][value]
+                rows.discard(row)
+                if not rows:
+                    del self._index[field][value]
+
+    def search(self, field: str, value: str, match: str = EXACT) -> List[Dict[str, Any]]:
+        """Finds the rows with a field matching a value.
+
+        Args:
+            field: The field to search: pv, block or ioc
+            value: The value to look for
+            match: Whether the field must equal the value (exact) or contain it (contains)
+
+        Returns:
+            The matching rows, sorted by configuration and then block or IOC
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Cannot search by {field}; search by one of {', '.join(FIELDS)}")
+        if match not in (EXACT, CONTAINS):
+            raise ValueError(f"Unknown match {match}; use {EXACT} or {CONTAINS}")
+        key = (_strip_prefix(value) if field == PV else value).lower()
+        index = self._index[field]
+        if match == EXACT:
+            found = set(index.get(key, ()))
+        else:
+            found = {row for indexed, rows in index.items() if key in indexed for row in rows}
+        return [
+            row.to_dict()
+            for row in sorted(
+                found, key=lambda r: (r.config.lower(), r.is_component, r.block or r.ioc or "")
+            )
+        ]
+
+    @staticmethod
+    def _full_pv(block: Block) -> str:
+        return MACROS["$(MYPVPREFIX)"] + block.pv if block.local else block.pv
+
+    @staticmethod
+    def _keys(row: _Row) -> List[Tuple[str, str]]:
+        keys = []
+        if row.block is not None:
+            keys.append((BLOCK, row.block.lower()))
+        if row.pv is not None:
+            keys.append((PV, _strip_prefix(row.pv).lower()))
+        if row.ioc is not None:
+            keys.append((IOC_FIELD, row.ioc.lower()))
+        return keys
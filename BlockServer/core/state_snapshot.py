@@ -0,0 +1,160 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Snapshots of the state of the BlockServer, for a warm restart.
+
+A snapshot holds the values the BlockServer has published on its PVs, the name and fingerprint of
+the active configuration and digests of the files generated for it (the gateway, archiver and
+run-control settings). On restart the BlockServer serves the published values straight away while
+it loads the configuration again, and skips regenerating the files if neither the configuration
+nor the files have changed.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from server_common.utilities import print_and_log
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILENAME = "blockserver_snapshot.json"
+# How often to save a snapshot while running, in seconds
+SNAPSHOT_INTERVAL = 60
+
+
+def file_digests(paths: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Gets a digest of each of some files.
+
+    Args:
+        paths: The locations of the files
+
+    Returns:
+        The hex digest of each file keyed by location, or None if the file does not exist
+    """
+    digests = {}
+    for path in paths:
+        if not os.path.isfile(path):
+            digests[path] = None
+            continue
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+        digests[path] = digest.hexdigest()
+    return digests
+
+
+class StateSnapshot:
+    """Saves and loads snapshots of the BlockServer state in a file."""
+
+    def __init__(self, path: str) -> None:
+        """Constructor.
+
+        Args:
+            path: The location of the snapshot file
+        """
+        self._path = path
+        self._last_saved: Optional[Dict[str, Any]] = None
+
+    def save(
+        self,
+        config: str,
+        fingerprint: str,
+        files: Dict[str, Optional[str]],
+        pvs: Dict[str, Any],
+    ) -> bool:
+        """Saves a snapshot, unless it is the same as the last one saved.
+
+        The file is replaced in one step, so a snapshot is never left half written.
+
+        Args:
+            config: The name of the active configuration
+            fingerprint: The fingerprint of the files of the active configuration
+            files: The digests of the files generated for the active configuration
+            pvs: The published values keyed by PV; bytes, such as compressed and hexed JSON, are
+                saved and loaded as strings
+
+        Returns:
+            True if the snapshot was saved
+        """
+        pvs = {
+            pv: value.decode("utf-8") if isinstance(value, bytes) else value
+            for pv, value in pvs.items()
+        }
+        state = {"config": config, "fingerprint": fingerprint, "files": files, "pvs": pvs}
+        if state == self._last_saved:
+            return False
+        temp_path = self._path + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump({"version": SNAPSHOT_VERSION, "time": time.time(), **state}, f)
+            os.replace(temp_path, self._path)
+        except Exception as err:
+            print_and_log(f"Could not save BlockServer snapshot: {err}", "MINOR")
+            return False
+        self._last_saved = state
+        return True
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Loads the snapshot.
+
+        Returns:
+            The snapshot with the keys config, fingerprint, files and pvs; or None if there is no
+            usable snapshot
+        """
+        if not os.path.isfile(self._path):
+            return None
+        try:
+            with open(self._path) as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                print_and_log(
+                    f"Ignoring BlockServer snapshot version {snapshot.get('version')}", "MINOR"
+                )
+                return None
+            state = {key: snapshot[key] for key in ("config", "fingerprint", "files", "pvs")}
+        except Exception as err:
+            print_and_log(f"Could not load BlockServer snapshot: {err}", "MINOR")
+            return None
+        print_and_log(f"Loaded BlockServer snapshot from {time.ctime(snapshot.get('time', 0))}")
+        return state
+
+    @staticmethod
+    def is_unchanged(
+        snapshot: Dict[str, Any], config: str, fingerprint: str, generated_files: Iterable[str]
+    ) -> bool:
+        """Checks whether a configuration and the files generated for it are the same as in a
+        snapshot.
+
+        Args:
+            snapshot: The snapshot, as returned by load
+            config: The name of the configuration
+            fingerprint: The fingerprint of the files of the configuration
+            generated_files: The locations of the files generated for the configuration
+
+        Returns:
+            True if they are unchanged, so the files do not need generating again
+        """
+        files = snapshot["files"]
+        return (
+            snapshot["config"] == config
+            and snapshot["fingerprint"] == fingerprint
+            and set(files) == set(generated_files)
+            and all(digest is not None for digest in files.values())
+            and file_digests(files) == files
+        )
@@ -0,0 +1,151 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Compressed payloads for PVs whose values only change when a file on disk changes"""
+
+import hashlib
+import os
+from threading import RLock
+from typing import Callable, Dict, List, Optional, Tuple
+
+from server_common.utilities import compress_and_hex
+
+# Takes the contents of the source file (None if it does not exist) and gives the PV's value
+Transform = Callable[[Optional[bytes]], str]
+
+
+class _StaticPayload:
+    __slots__ = ("path", "transform", "signature", "digest", "data", "payload", "published")
+
+    def __init__(self, path: Optional[str], transform: Transform) -> None:
+        self.path = path
+        self.transform = transform
+        self.signature: Optional[Tuple[int, int]] = None
+        self.digest: Optional[bytes] = None
+        self.data: Optional[bytes] = None
+        self.payload: Optional[bytes] = None
+        self.published = False
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_file(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+class StaticPayloadRegistry:
+    """Maps PVs to a source file and a transform, and holds the compressed value of each PV.
+
+    A source file is only read again when its modification time or size changes, and the
+    payload is only rebuilt when the file's contents have actually changed.
+    PVs without a source file have their payload built once.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _StaticPayload] = dict()
+        self._lock = RLock()
+
+    def register(self, pv: str, transform: Transform, path: Optional[str] = None) -> None:
+        """Registers a PV, replacing any previous registration.
+
+        Args:
+            pv: The name of the PV
+            transform: Takes the contents of the source file, or None if it does not exist, and
+                returns the uncompressed value of the PV
+            path: The source file; if None the payload never changes
+        """
+        with self._lock:
+            self._entries[pv] = _StaticPayload(path, transform)
+
+    def __contains__(self, pv: str) -> bool:
+        return pv in self._entries
+
+    def get(self, pv: str) -> bytes:
+        """Gets the compressed payload of a PV, rebuilding it if its source file has changed.
+
+        Args:
+            pv: The name of the PV
+
+        Returns:
+            The compressed and hexed value of the PV
+        """
+        with self._lock:
+            return self._refresh(self._entries[pv])
+
+    def get_data(self, pv: str) -> Optional[bytes]:
+        """Gets the current contents of a PV's source file.
+
+        Args:
+            pv: The name of the PV
+
+        Returns:
+            The contents of the file, or None if it does not exist or the PV has no source file
+        """
+        with self._lock:
+            entry = self._entries[pv]
+            self._refresh(entry)
+            return entry.data
+
+    def publish(self, set_param: Callable[[str, bytes], None]) -> List[str]:
+        """Sets the value of each PV whose payload has changed since it was last published.
+
+        Args:
+            set_param: Function taking a PV name and its new value
+
+        Returns:
+            The names of the PVs which were set
+        """
+        changed = []
+        with self._lock:
+            for pv, entry in self._entries.items():
+                payload = self._refresh(entry)
+                if not entry.published:
+                    set_param(pv, payload)
+                    entry.published = True
+                    changed.append(pv)
+        return changed
+
+    @staticmethod
+    def _refresh(entry: _StaticPayload) -> bytes:
+        payload = entry.payload
+        if entry.path is None:
+            if payload is None:
+                payload = entry.payload = compress_and_hex(entry.transform(None))
+            return payload
+
+        signature = _file_signature(entry.path)
+        if payload is not None and signature == entry.signature:
+            return payload
+
+        data = _read_file(entry.path)
+        digest = None if data is None else hashlib.blake2b(data, digest_size=16).digest()
+        if payload is None or digest != entry.digest:
+            payload = entry.payload = compress_and_hex(entry.transform(data))
+            entry.published = False
+        entry.signature = signature
+        entry.digest = digest
+        entry.data = data
+        return payload
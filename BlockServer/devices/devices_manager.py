@@ -30,6 +30,8 @@ from server_common.utilities import compress_and_hex, print_and_log
 
 from BlockServer.core.constants import FILENAME_SCREENS as SCREENS_FILE
 from BlockServer.core.on_the_fly_pv_interface import OnTheFlyPvInterface
+from BlockServer.core.resource_scheduler import DEVICES
+from BlockServer.core.static_payloads import StaticPayloadRegistry
 from BlockServer.devices.devices_file_io import DevicesFileIO
 from BlockServer.fileIO.schema_checker import (
     ConfigurationInvalidUnderSchema,
@@ -42,6 +44,10 @@ SET_SCREENS = BlockserverPVNames.SET_SCREENS
 GET_SCHEMA = BlockserverPVNames.SCREENS_SCHEMA
 
 
+def _encode_devices(data: bytes) -> bytes:
+    return compress_and_hex(data.decode("utf-8"))
+
+
 class DevicesManager(OnTheFlyPvInterface):
     """Class for managing the PVs associated with devices"""
 
@@ -62,7 +68,12 @@ class DevicesManager(OnTheFlyPvInterface):
         self._file_io = file_io
         self.pvs_to_write.append(SET_SCREENS)
         self._schema_folder = schema_folder
-        self._schema = b""
+        self._static_payloads = StaticPayloadRegistry()
+        self._static_payloads.register(
+            GET_SCHEMA,
+            lambda data: (data or b"").decode("utf-8"),
+            os.path.join(schema_folder, SCREENS_SCHEMA),
+        )
         self._devices_pvs = dict()
         self._bs = block_server
         self._data = b""
@@ -93,6 +104,9 @@ class DevicesManager(OnTheFlyPvInterface):
                     "MINOR",
                 )
 
+    def get_write_resources(self, pv: str) -> frozenset[str]:
+        return frozenset({DEVICES})
+
     def handle_pv_read(self, pv: str) -> None:
         """
         Nothing to do as it is all handled by monitors
@@ -104,10 +118,8 @@ class DevicesManager(OnTheFlyPvInterface):
         """Writes new device screens data to PVs"""
         with self._bs.monitor_lock:
             print_and_log("Updating devices monitors")
-            self._bs.setParam(
-                GET_SCHEMA, compress_and_hex(self.get_devices_schema().decode("utf-8"))
-            )
-            self._bs.setParam(GET_SCREENS, compress_and_hex(self._data.decode("utf-8")))
+            self._static_payloads.publish(self._bs.setParam)
+            self._bs.encode_and_set_param(GET_SCREENS, self._data, _encode_devices)
             self._bs.updatePVs()
 
     def on_config_change(self, full_init: bool = False) -> None:
@@ -195,16 +207,12 @@ class DevicesManager(OnTheFlyPvInterface):
     def get_devices_schema(self) -> bytes:
         """Gets the XSD data for the devices screens.
 
-        Note: Only reads file once, if the file changes then the BlockServer
-        will need to be restarted
+        Note: The file is only read again if it has changed on disk
 
         Returns:
-            str : The XML for the devices screens schema
+            bytes : The XML for the devices screens schema
         """
-        if self._schema == b"":
-            # Try loading it
-            self.schema = (self._schema_folder / SCREENS_SCHEMA).read_bytes()
-        return self._schema
+        return self._static_payloads.get_data(GET_SCHEMA) or b""
 
     def get_blank_devices(self) -> bytes:
         """Gets a blank devices xml
@@ -47,7 +47,12 @@ class ArchiverManager:
         self._archive_wrapper = archiver
 
     def update_archiver(
-        self, block_prefix, blocks, configuration_wants_to_use_own_block_config_xml, config_dir
+        self,
+        block_prefix,
+        blocks,
+        configuration_wants_to_use_own_block_config_xml,
+        config_dir,
+        archive_config=None,
     ):
         """Update the archiver to log the blocks specified.
 
@@ -57,6 +62,8 @@ class ArchiverManager:
             configuration_wants_to_use_own_block_config_xml (bool): True if the configuration
                 claims it contains the block_config.xml
             config_dir (str): The directory of the current configuration.
+            archive_config (str): The settings built beforehand by build_archive_config for
+                these blocks, if they have been
         """
         try:
             if self._settings_path is not None:
@@ -65,6 +72,7 @@ class ArchiverManager:
                     configuration_wants_to_use_own_block_config_xml,
                     block_prefix,
                     blocks,
+                    archive_config,
                 )
             if self._uploader_path is not None:
                 self._upload_archive_config_then_wait_1_second_then_restart_archiver()
@@ -83,7 +91,12 @@ class ArchiverManager:
         self._archive_wrapper.restart_archiver()
 
     def _if_config_contains_archiver_xml_then_copy_archive_config_else_generate_archive_config(
-        self, config_dir, configuration_wants_to_use_own_block_config_xml, block_prefix, blocks
+        self,
+        config_dir,
+        configuration_wants_to_use_own_block_config_xml,
+        block_prefix,
+        blocks,
+        archive_config=None,
     ):
         """
         If the configuration contains the block_config.xml file and configuration_wants_to_use_own_block_config_xml
@@ -95,6 +108,7 @@ class ArchiverManager:
             configuration_wants_to_use_own_block_config_xml (bool): Whether the configuration is set to use the block_config.xml file.
             block_prefix (str): The prefix to prefix blocks PV addresses with.
             blocks (List[Block]): The blocks to create the archive config with.
+            archive_config (str): The archive config built beforehand, if it has been.
         """
         block_config_xml_file = os.path.join(config_dir, "block_config.xml")
         if configuration_wants_to_use_own_block_config_xml and os.path.exists(
@@ -106,12 +120,20 @@ class ArchiverManager:
             print_and_log(
                 "Could not find {} generating archive config".format(block_config_xml_file)
             )
-            self._generate_archive_config(block_prefix, blocks)
+            self._generate_archive_config(block_prefix, blocks, archive_config)
         else:
-            self._generate_archive_config(block_prefix, blocks)
+            self._generate_archive_config(block_prefix, blocks, archive_config)
 
-    def _generate_archive_config(self, block_prefix, blocks):
-        print_and_log(f"Generating archiver configuration file: {self._settings_path}")
+    def build_archive_config(self, block_prefix, blocks):
+        """Builds the archiver settings which log some blocks.
+
+        Args:
+            block_prefix (str): The prefix to prefix blocks PV addresses with.
+            blocks (List[Block]): The blocks to archive.
+
+        Returns:
+            str: The settings as XML
+        """
         root = eTree.Element("engineconfig")
         group = eTree.SubElement(root, "group")
         name = eTree.SubElement(group, "name")
@@ -122,10 +144,14 @@ class ArchiverManager:
         for block in blocks:
             # Append prefix for the archiver
             self._generate_archive_channel(group, block_prefix, block, dataweb)
+        return minidom.parseString(eTree.tostring(root)).toprettyxml()
 
+    def _generate_archive_config(self, block_prefix, blocks, archive_config=None):
+        print_and_log(f"Generating archiver configuration file: {self._settings_path}")
+        if archive_config is None:
+            archive_config = self.build_archive_config(block_prefix, blocks)
         with open(self._settings_path, "w") as f:
-            xml = minidom.parseString(eTree.tostring(root)).toprettyxml()
-            f.write(xml)
+            f.write(archive_config)
 
     def _upload_archive_config(self):
         extra_args = {}
@@ -13,11 +13,13 @@
 # along with this program; if not, you can obtain a copy from
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
-from urllib.request import ProxyHandler, build_opener, install_opener, urlopen
 
 
 class ArchiverWrapper:
     def restart_archiver(self):
+        # urllib.request is slow to import, so it is imported when the archiver is first restarted
+        from urllib.request import ProxyHandler, build_opener, install_opener, urlopen
+
         # Set to ignore proxy for localhost
         proxy_handler = ProxyHandler({})
         opener = build_opener(proxy_handler)
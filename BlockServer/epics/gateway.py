@@ -19,10 +19,11 @@ import re
 import time
 from shutil import copyfile
 
-from server_common.channel_access import ChannelAccess
 from server_common.helpers import CONTROL_SYSTEM_PREFIX
 from server_common.utilities import print_and_log
 
+from ServerTools.ca_statistics import ChannelAccess
+
 ALIAS_HEADER = """\
 ##
 EVALUATION ORDER ALLOW, DENY
@@ -134,18 +135,29 @@ class Gateway:
         except Exception as err:
             print_and_log(f"Problem with reloading the gateway {err}")
 
-    def _generate_alias_file(self, blocks=None) -> None:
+    def build_alias_file(self, blocks=None) -> str:
+        """Builds the content of the gateway file which creates the aliases for some blocks.
+
+        Args:
+            blocks (OrderedDict): The blocks to create aliases for
+
+        Returns:
+            string: The content of the file
+        """
+        content = [ALIAS_HEADER.format(self._inst_prefix)]
+        if blocks is not None:
+            for name, value in blocks.items():
+                lines = self.generate_alias(value.name, value.pv, value.local)
+                content.append("\n".join(lines) + "\n")
+        content.append(ALIAS_FOOTER.format(self._inst_prefix))
+        # Add a blank line at the end!
+        content.append("\n")
+        return "".join(content)
+
+    def _generate_alias_file(self, blocks=None, alias_file: str | None = None) -> None:
         # Generate blocks.pvlist for gateway
         with open(self._pvlist_file, "w") as f:
-            header = ALIAS_HEADER.format(self._inst_prefix)
-            f.write(header)
-            if blocks is not None:
-                for name, value in blocks.items():
-                    lines = self.generate_alias(value.name, value.pv, value.local)
-                    f.write("\n".join(lines) + "\n")
-            f.write(ALIAS_FOOTER.format(self._inst_prefix))
-            # Add a blank line at the end!
-            f.write("\n")
+            f.write(self.build_alias_file(blocks) if alias_file is None else alias_file)
 
     def generate_alias(self, block_name: str, underlying_pv: str, local: bool) -> list[str]:
         print_and_log(f"Creating block: {block_name} for {underlying_pv}")
@@ -175,7 +187,13 @@ class Gateway:
         lines.append("")  # New line to seperate out each block
         return lines
 
-    def set_new_aliases(self, blocks, configures_block_gateway: bool, config_dir: str) -> None:
+    def set_new_aliases(
+        self,
+        blocks,
+        configures_block_gateway: bool,
+        config_dir: str,
+        alias_file: str | None = None,
+    ) -> None:
         """Creates the aliases for the blocks and restarts the gateway.
 
         Args:
@@ -184,6 +202,8 @@ class Gateway:
              gwblock.pvlist to configure the block gateway with.
             config_dir (str): The directory the configuration we are loading the
              blocks for lives in.
+            alias_file (str): The content of the file built beforehand by build_alias_file
+             for these blocks, if it has been
         """
         pvlist_file = os.path.join(config_dir, "gwblock.pvlist")
         if configures_block_gateway and os.path.exists(pvlist_file):
@@ -191,7 +211,7 @@ class Gateway:
             copyfile(pvlist_file, self._pvlist_file)
         elif configures_block_gateway:
             print_and_log("File: {} not found generating gwblock.pvlist".format(pvlist_file))
-            self._generate_alias_file(blocks)
+            self._generate_alias_file(blocks, alias_file)
         else:
-            self._generate_alias_file(blocks)
+            self._generate_alias_file(blocks, alias_file)
         self._reload()
@@ -13,9 +13,10 @@
 # along with this program; if not, you can obtain a copy from
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
-from server_common.channel_access import ChannelAccess
 from server_common.utilities import ioc_restart_pending, print_and_log, retry
 
+from ServerTools.ca_statistics import ChannelAccess
+
 
 class ProcServWrapper:
     """A wrapper for accessing some of the functionality of ProcServ."""
@@ -13,9 +13,12 @@
 # along with this program; if not, you can obtain a copy from
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
+import contextlib
+import hashlib
 import os
 import re
 import shutil
+import tempfile
 from collections import OrderedDict
 from xml.etree import ElementTree
 
@@ -44,6 +47,13 @@ from server_common.utilities import print_and_log, retry
 RETRY_MAX_ATTEMPTS = 20
 RETRY_INTERVAL = 0.5
 
+# Prefix of the temporary directory a configuration is written to before it is swapped in.
+# It starts with a dot so it is never picked up as a configuration or component. It must be in
+# the directory of the configuration for the files to be swapped in with an atomic rename, so it
+# is kept out of version control by an ignore pattern.
+STAGING_DIR_PREFIX = ".staging"
+STAGING_DIR_IGNORE_PATTERN = STAGING_DIR_PREFIX + "*/"
+
 
 class ConfigurationFileManager:
     """The ConfigurationFileManager class.
@@ -67,11 +77,21 @@ class ConfigurationFileManager:
             macros (dict): The BlockServer macros
             is_component (bool): Is it a component?
         """
+        path = self.get_path(name, is_component)
+        return self.load_config_from_path(name, path, macros, is_component)
+
+    def load_config_from_path(self, name, path, macros, is_component):
+        """Loads a configuration from a folder, checking the files against the schema.
+
+        Args:
+            name (string): The name of the configuration
+            path (string): The folder holding the configuration files
+            macros (dict): The BlockServer macros
+            is_component (bool): Is it a component?
+        """
         print_and_log(f"Start loading config '{name}'...")
         configuration = Configuration(macros)
 
-        path = self.get_path(name, is_component)
-
         if not os.path.isdir(path):
             raise IOError(f"Configuration could not be found: {name}")
 
@@ -185,11 +205,59 @@ class ConfigurationFileManager:
             is_component (bool): Is it a component?
         """
         path = self.get_path(configuration.get_name(), is_component)
+        self.save_config_to_path(configuration, path)
+
+    def save_config_to_path(self, configuration, path):
+        """Saves a configuration into a folder.
 
+        Args:
+            configuration (Configuration): The actual configuration to save
+            path (string): The folder to save the configuration files in
+        """
         if not os.path.isdir(path):
             # Create the directory
             os.makedirs(path)
+        self._save_files_atomically(path, self.config_to_xml(configuration))
+
+    def save_configs(self, configurations):
+        """Saves several configurations so that either all or none of them change.
+
+        Every configuration is converted before any file is written. If writing any of them
+        fails, the files already replaced are rolled back and the folders created are removed.
+
+        Args:
+            configurations (list): Tuples of each Configuration and whether it is a component
+        """
+        files = [
+            (
+                self.get_path(configuration.get_name(), is_component),
+                self.config_to_xml(configuration),
+            )
+            for configuration, is_component in configurations
+        ]
+        created = []
+        try:
+            with self._atomic_saves() as save:
+                for path, config_files in files:
+                    if not os.path.isdir(path):
+                        os.makedirs(path)
+                        created.append(path)
+                    save(path, config_files)
+        except Exception:
+            for path in created:
+                shutil.rmtree(path, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def config_to_xml(configuration):
+        """Converts a configuration into the XML of each of its files.
 
+        Args:
+            configuration (Configuration): The configuration
+
+        Returns:
+            OrderedDict: The XML keyed by file name
+        """
         blocks_xml = ConfigurationXmlConverter.blocks_to_xml(
             configuration.blocks, configuration.macros
         )
@@ -202,25 +270,141 @@ class ConfigurationFileManager:
             # Is a component, so no components
             components_xml = ConfigurationXmlConverter.components_to_xml(dict())
 
-        # Save blocks
-        current_file = os.path.join(path, FILENAME_BLOCKS)
-        self._write_to_file(current_file, blocks_xml)
+        return OrderedDict(
+            [
+                (FILENAME_BLOCKS, blocks_xml),
+                (FILENAME_GROUPS, groups_xml),
+                (FILENAME_IOCS, iocs_xml),
+                (FILENAME_COMPONENTS, components_xml),
+                (FILENAME_META, meta_xml),
+            ]
+        )
+
+    def _save_files_atomically(self, path, files):
+        """Writes a set of files into a directory so that either all or none of them change.
+
+        Each file is written to a staging directory inside the target directory first. Files
+        whose content is identical to what is already on disk are left untouched; the others
+        are moved into place with an atomic rename. If any of the renames fails the files that
+        were already replaced are rolled back to their previous content.
+
+        Args:
+            path (string): The directory to write the files into
+            files (OrderedDict): Mapping of file name to the (string) content of that file
+        """
+        with self._atomic_saves() as save:
+            save(path, files)
+
+    @contextlib.contextmanager
+    def _atomic_saves(self):
+        """Writes sets of files into directories so that either all or none of them change.
+
+        Yields a function taking a directory and its files, as for _save_files_atomically. The
+        files replaced are backed up until the block finishes. If it raises, every directory
+        written in it is rolled back, most recent first.
+        """
+        saves = []
+
+        def save(path, files):
+            staging_dir = tempfile.mkdtemp(prefix=STAGING_DIR_PREFIX, dir=path)
+            backup_dir = os.path.join(staging_dir, "backup")
+            replaced = []
+            saves.append((path, staging_dir, backup_dir, replaced))
+
+            changed = []
+            for filename, data in files.items():
+                staged_file = os.path.join(staging_dir, filename)
+                self._write_to_file(staged_file, data)
+                live_file = os.path.join(path, filename)
+                if self._file_hash(staged_file) != self._file_hash(live_file):
+                    changed.append(filename)
+
+            if not changed:
+                print_and_log(f"No changes to save in {path}")
+                return
+
+            # Keep the current files until every new file is in place so they can be restored
+            os.mkdir(backup_dir)
+            for filename in changed:
+                live_file = os.path.join(path, filename)
+                if os.path.exists(live_file):
+                    shutil.copy2(live_file, os.path.join(backup_dir, filename))
+                self._replace_file(os.path.join(staging_dir, filename), live_file)
+                replaced.append(filename)
+
+        try:
+            yield save
+        except Exception:
+            for path, _, backup_dir, replaced in reversed(saves):
+                self._roll_back(path, backup_dir, replaced)
+            raise
+        finally:
+            for _, staging_dir, _, _ in saves:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _roll_back(self, path, backup_dir, replaced):
+        """Restores files that were replaced during a failed save.
 
-        # Save groups
-        current_file = os.path.join(path, FILENAME_GROUPS)
-        self._write_to_file(current_file, groups_xml)
+        Args:
+            path (string): The directory the files were written into
+            backup_dir (string): The directory holding copies of the original files
+            replaced (list): The names of the files that had already been replaced
+        """
+        for filename in replaced:
+            live_file = os.path.join(path, filename)
+            backup_file = os.path.join(backup_dir, filename)
+            try:
+                if os.path.exists(backup_file):
+                    self._replace_file(backup_file, live_file)
+                else:
+                    # The file did not exist before this save
+                    os.remove(live_file)
+            except Exception as e:
+                print_and_log(f"Could not restore {live_file} after failed save: {e}", "MAJOR")
 
-        # Save IOCs
-        current_file = os.path.join(path, FILENAME_IOCS)
-        self._write_to_file(current_file, iocs_xml)
+    @staticmethod
+    def _file_hash(file_path):
+        """Gets a hash of a file's content.
 
-        # Save components
-        current_file = os.path.join(path, FILENAME_COMPONENTS)
-        self._write_to_file(current_file, components_xml)
+        Args:
+            file_path (string): The location of the file
 
-        # Save meta
-        current_file = os.path.join(path, FILENAME_META)
-        self._write_to_file(current_file, meta_xml)
+        Returns:
+            string: the hex digest of the file's content, or None if the file does not exist
+        """
+        if not os.path.isfile(file_path):
+            return None
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _replace_file(self, source, destination):
+        try:
+            return self._attempt_replace(source, destination)
+        except MaxAttemptsExceededException:
+            raise IOError(
+                f"Could not write to file at {destination}. Please check the file is "
+                f"not in use by another process."
+            )
+
+    @staticmethod
+    def remove_staging_dirs():
+        """Removes the staging directories left in the configurations and components by saves
+        which did not finish, e.g. because the server stopped during the save.
+        """
+        for root in (FILEPATH_MANAGER.config_dir, FILEPATH_MANAGER.component_dir):
+            if not os.path.isdir(root):
+                continue
+            for name in os.listdir(root):
+                path = os.path.join(root, name)
+                if not os.path.isdir(path):
+                    continue
+                for staging_dir in os.listdir(path):
+                    if staging_dir.startswith(STAGING_DIR_PREFIX):
+                        print_and_log(f"Removing unfinished save {staging_dir} from {path}")
+                        shutil.rmtree(os.path.join(path, staging_dir), ignore_errors=True)
 
     @retry(RETRY_MAX_ATTEMPTS, RETRY_INTERVAL, (OSError, IOError))
     def delete(self, name, is_component):
@@ -242,8 +426,7 @@ class ConfigurationFileManager:
         if not os.path.isdir(os.path.join(root_path, name)):
             raise Exception("Component does not exist")
 
-    @staticmethod
-    def copy_default(dest_path):
+    def copy_default(self, dest_path):
         """Copies the default/base component in if it does exist.
 
         Args:
@@ -296,6 +479,17 @@ class ConfigurationFileManager:
             f.write(data)
             return
 
+    @staticmethod
+    @retry(RETRY_MAX_ATTEMPTS, RETRY_INTERVAL, (OSError, IOError))
+    def _attempt_replace(source, destination):
+        """Atomically replace a file with another one on the same filesystem.
+
+        Args:
+            source (string): The location of the new file
+            destination (string): The location of the file being replaced
+        """
+        os.replace(source, destination)
+
     def get_files_in_directory(self, path: str) -> list[str]:
         """Gets a list of the files in the specified folder
 
@@ -328,23 +522,38 @@ class ConfigurationFileManager:
             Dictionary containing information about banner items and buttons,
             empty dictionary if it doesn't exist or fails to parse.
         """
-        if os.path.exists(FILEPATH_MANAGER.get_banner_path()):
-            root = ConfigurationFileManager._read_element_tree(FILEPATH_MANAGER.get_banner_path())
+        if not os.path.exists(FILEPATH_MANAGER.get_banner_path()):
+            return {}
+        root = ConfigurationFileManager._read_element_tree(FILEPATH_MANAGER.get_banner_path())
+        return ConfigurationFileManager._banner_config_from_root(root)
 
-            # Check against the schema - raises if incorrect
-            ConfigurationFileManager._check_against_schema(
-                ElementTree.tostring(root, encoding="utf8"), FILENAME_BANNER
+    @staticmethod
+    def parse_banner_config(data):
+        """
+        Parses the contents of a banner config file in the same way as get_banner_config.
+
+        Args:
+            data (bytes): The contents of the file, or None if it doesn't exist
+
+        Returns:
+            Dictionary containing information about banner items and buttons,
+            empty dictionary if there is no data or it fails to parse.
+        """
+        if data is None:
+            return {}
+        return ConfigurationFileManager._banner_config_from_root(ElementTree.fromstring(data))
+
+    @staticmethod
+    def _banner_config_from_root(root):
+        # Check against the schema - raises if incorrect
+        ConfigurationFileManager._check_against_schema(
+            ElementTree.tostring(root, encoding="utf8"), FILENAME_BANNER
+        )
+        try:
+            return ConfigurationXmlConverter.banner_config_from_xml(root)
+        except Exception as ex:
+            # XML failed to parse. Log the error and return an empty list
+            print_and_log(
+                f"Failed to parse banner xml file. Error was {ex.__class__.__name__} {ex}"
             )
-            try:
-                banner = ConfigurationXmlConverter.banner_config_from_xml(
-                    ConfigurationFileManager._attempt_read(FILEPATH_MANAGER.get_banner_path())
-                )
-            except Exception as ex:
-                # XML failed to parse. Log the error and return an empty list
-                print_and_log(
-                    f"Failed to parse banner xml file. Error was {ex.__class__.__name__} {ex}"
-                )
-                banner = {}
-        else:
-            banner = {}
-        return banner
+            return {}
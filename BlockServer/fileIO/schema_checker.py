@@ -15,8 +15,11 @@
 # http://opensource.org/licenses/eclipse-1.0.php
 
 import os
+from typing import TYPE_CHECKING
 
-from lxml import etree
+# lxml is slow to import, so it is imported when XML is first checked rather than at startup
+if TYPE_CHECKING:
+    import lxml.etree as etree
 
 
 class NotConfigFileException(Exception):  # noqa N818 historic name
@@ -59,20 +62,61 @@ class ConfigurationSchemaChecker:
             schema_filepath (string): The location of the schema file
             xml_data (bytes): The XML data of the configuration
         """
+        import lxml.etree as etree
+
         if len(xml_data) == 0:
             raise ConfigurationFileBlank("Invalid XML: File is blank.")
 
+        schema = ConfigurationSchemaChecker.load_schema(schema_filepath)
+
+        try:
+            doc = etree.fromstring(xml_data)
+            schema.assertValid(doc)
+        except etree.DocumentInvalid as err:
+            raise ConfigurationInvalidUnderSchema(str(err))
+
+    @staticmethod
+    def load_schema(schema_filepath: str) -> "etree.XMLSchema":
+        """Loads a schema so it can be used to check many pieces of XML.
+
+        Args:
+            schema_filepath (string): The location of the schema file
+
+        Returns:
+            etree.XMLSchema : The schema
+        """
         if isinstance(schema_filepath, str):
             folder, file_name = schema_filepath.rsplit(os.sep, 1)
         else:
             folder, file_name = schema_filepath.parent, schema_filepath.name
-        schema = ConfigurationSchemaChecker._get_schema(folder, file_name)
+        return ConfigurationSchemaChecker._get_schema(folder, file_name)
+
+    @staticmethod
+    def parse_xml_matching_schema(
+        schema: "etree.XMLSchema", xml_data: bytes, object_type: str
+    ) -> "etree._Element":
+        """Parses xml data and checks it against a loaded schema.
+
+        A ConfigurationInvalidUnderSchema error is raised if the data is incorrect.
 
+        Args:
+            schema (etree.XMLSchema): The schema to check against
+            xml_data (bytes): The XML data
+            object_type (string): The type of object the XML describes, for error messages
+
+        Returns:
+            etree._Element : The root of the parsed XML
+        """
+        import lxml.etree as etree
+
+        if len(xml_data) == 0:
+            raise ConfigurationFileBlank("Invalid XML: File is blank.")
         try:
             doc = etree.fromstring(xml_data)
             schema.assertValid(doc)
         except etree.DocumentInvalid as err:
-            raise ConfigurationInvalidUnderSchema(str(err))
+            raise ConfigurationInvalidUnderSchema(f"{object_type} incorrectly formatted: {err}")
+        return doc
 
     @staticmethod
     def check_xml_matches_schema(
@@ -99,6 +143,8 @@ class ConfigurationSchemaChecker:
         Raises:
             etree.DocumentInvalid : Raised if the file is incorrect
         """
+        import lxml.etree as etree
+
         schema = ConfigurationSchemaChecker._get_schema(schema_folder, schema_file)
 
         # Import the xml file
@@ -109,13 +155,15 @@ class ConfigurationSchemaChecker:
         schema.assertValid(doc)
 
     @staticmethod
-    def _get_schema(schema_folder: str, schema_file: str) -> etree.XMLSchema:
+    def _get_schema(schema_folder: str, schema_file: str) -> "etree.XMLSchema":
         """This method generates an xml schemaq object for later use in validation.
 
         Args:
             schema_folder (string): The directory for schema files
             schema_file (string): The initial schema file
         """
+        import lxml.etree as etree
+
         # must move to directory to handle schema includes
         cur = os.getcwd()
         os.chdir(schema_folder)
@@ -0,0 +1,574 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+"""
+An optional store for configurations, components, synoptics and devices in a single SQLite
+database, instead of directories of XML files.
+
+Each configuration is kept as the XML of its files, which is checked against the schema when it
+is imported, so loading it needs no file opens or schema checks. The blocks, IOCs and components
+of each configuration are also kept in indexed tables to look up which configurations use them.
+
+The database can be imported from, and exported to, the XML layout so sites which keep their
+configurations in git can carry on doing so:
+
+    python -m BlockServer.fileIO.sqlite_file_manager import DATABASE CONFIG_ROOT --schema_dir DIR
+    python -m BlockServer.fileIO.sqlite_file_manager export DATABASE CONFIG_ROOT
+"""
+
+import argparse
+import os
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import RLock
+from typing import Iterator, List, Optional
+from xml.etree import ElementTree
+
+from server_common.file_path_manager import FILEPATH_MANAGER
+from server_common.helpers import MACROS
+from server_common.utilities import print_and_log
+
+from BlockServer.config.configuration import Configuration, MetaData
+from BlockServer.config.group import Group
+from BlockServer.config.xml_converter import ConfigurationXmlConverter
+from BlockServer.core.constants import (
+    DEFAULT_COMPONENT,
+    EXAMPLE_DEFAULT,
+    FILENAME_BLOCKS,
+    FILENAME_COMPONENTS,
+    FILENAME_GROUPS,
+    FILENAME_IOCS,
+    FILENAME_META,
+    FILENAME_SCREENS,
+    GRP_NONE,
+)
+from BlockServer.devices.devices_file_io import DevicesFileIO
+from BlockServer.fileIO.file_manager import ConfigurationFileManager
+from BlockServer.synoptic.synoptic_file_io import SynopticFileIO
+
+SYNOPTIC = "synoptic"
+DEVICES = "devices"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS configurations (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL COLLATE NOCASE,
+    is_component INTEGER NOT NULL,
+    blocks TEXT NOT NULL,
+    groups TEXT NOT NULL,
+    iocs TEXT NOT NULL,
+    components TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    UNIQUE (name, is_component)
+);
+CREATE TABLE IF NOT EXISTS config_blocks (
+    config_id INTEGER NOT NULL REFERENCES configurations (id) ON DELETE CASCADE,
+    name TEXT NOT NULL COLLATE NOCASE,
+    pv TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS config_blocks_pv ON config_blocks (pv);
+CREATE TABLE IF NOT EXISTS config_iocs (
+    config_id INTEGER NOT NULL REFERENCES configurations (id) ON DELETE CASCADE,
+    name TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS config_iocs_name ON config_iocs (name);
+CREATE TABLE IF NOT EXISTS config_components (
+    config_id INTEGER NOT NULL REFERENCES configurations (id) ON DELETE CASCADE,
+    name TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS config_components_name ON config_components (name);
+CREATE TABLE IF NOT EXISTS revision (
+    number INTEGER NOT NULL
+);
+INSERT INTO revision (number) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM revision);
+CREATE TABLE IF NOT EXISTS documents (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE,
+    data BLOB NOT NULL,
+    PRIMARY KEY (kind, name)
+);
+"""
+
+# The columns holding the XML of each configuration file
+_XML_COLUMNS = OrderedDict(
+    [
+        (FILENAME_BLOCKS, "blocks"),
+        (FILENAME_GROUPS, "groups"),
+        (FILENAME_IOCS, "iocs"),
+        (FILENAME_COMPONENTS, "components"),
+        (FILENAME_META, "meta"),
+    ]
+)
+
+
+class ConfigDatabase:
+    """A connection to the SQLite database, shared between threads."""
+
+    def __init__(self, path: str) -> None:
+        """Constructor.
+
+        Args:
+            path: The location of the database file, which is created if it does not exist
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = RLock()
+        self._depth = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Runs statements in a transaction, which is committed if the block succeeds and rolled
+        back if it raises. Transactions can be nested, in which case they are committed with the
+        outermost one.
+
+        Yields:
+            The connection to run statements on
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._connection.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self._connection
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._connection.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._connection.execute("UPDATE revision SET number = number + 1")
+                self._connection.execute("COMMIT")
+
+    def get_revision(self) -> int:
+        """Gets the revision of the database, which changes whenever anything is saved.
+
+        Returns:
+            The revision
+        """
+        return self.query("SELECT number FROM revision")[0][0]
+
+    def query(self, sql: str, parameters: tuple = ()) -> List[tuple]:
+        """Runs a query.
+
+        Args:
+            sql: The query
+            parameters: The values of the parameters in the query
+
+        Returns:
+            The rows
+        """
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def close(self) -> None:
+        """Closes the connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class SqliteConfigurationFileManager(ConfigurationFileManager):
+    """Saves and loads configurations in the SQLite database."""
+
+    def __init__(self, database: ConfigDatabase) -> None:
+        """Constructor.
+
+        Args:
+            database: The database
+        """
+        self._database = database
+
+    def load_config(self, name, macros, is_component):
+        """Loads a configuration.
+
+        Args:
+            name (string): The name of the configuration
+            macros (dict): The BlockServer macros
+            is_component (bool): Is it a component?
+        """
+        rows = self._database.query(
+            f"SELECT name, {', '.join(_XML_COLUMNS.values())} FROM configurations "
+            "WHERE name = ? AND is_component = ?",
+            (name, int(is_component)),
+        )
+        if not rows:
+            raise IOError(f"Configuration could not be found: {name}")
+        stored_name, blocks_xml, groups_xml, iocs_xml, components_xml, meta_xml = rows[0]
+
+        blocks = OrderedDict()
+        groups = OrderedDict()
+        groups[GRP_NONE.lower()] = Group(GRP_NONE)
+        iocs = OrderedDict()
+        components = OrderedDict()
+        meta = MetaData(stored_name)
+        ConfigurationXmlConverter.blocks_from_xml(
+            ElementTree.fromstring(blocks_xml), blocks, groups
+        )
+        ConfigurationXmlConverter.groups_from_xml(
+            ElementTree.fromstring(groups_xml), groups, blocks
+        )
+        ConfigurationXmlConverter.ioc_from_xml(ElementTree.fromstring(iocs_xml), iocs)
+        ConfigurationXmlConverter.components_from_xml(
+            ElementTree.fromstring(components_xml), components
+        )
+        ConfigurationXmlConverter.meta_from_xml(ElementTree.fromstring(meta_xml), meta)
+
+        configuration = Configuration(macros)
+        configuration.blocks = blocks
+        configuration.groups = groups
+        configuration.iocs = iocs
+        configuration.components = components
+        configuration.meta = meta
+        return configuration
+
+    def save_config(self, configuration, is_component):
+        """Saves a configuration, replacing any with the same name in one transaction.
+
+        Args:
+            configuration (Configuration): The actual configuration to save
+            is_component (bool): Is it a component?
+        """
+        xml = self.config_to_xml(configuration)
+        name = configuration.get_name()
+        with self._database.transaction() as connection:
+            connection.execute(
+                "DELETE FROM configurations WHERE name = ? AND is_component = ?",
+                (name, int(is_component)),
+            )
+            config_id = connection.execute(
+                "INSERT INTO configurations "
+                f"(name, is_component, {', '.join(_XML_COLUMNS.values())}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, int(is_component), *[xml[filename] for filename in _XML_COLUMNS]),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO config_blocks (config_id, name, pv) VALUES (?, ?, ?)",
+                [(config_id, block.name, block.pv) for block in configuration.blocks.values()],
+            )
+            connection.executemany(
+                "INSERT INTO config_iocs (config_id, name) VALUES (?, ?)",
+                [(config_id, ioc.name) for ioc in configuration.iocs.values()],
+            )
+            if not is_component:
+                connection.executemany(
+                    "INSERT INTO config_components (config_id, name) VALUES (?, ?)",
+                    [(config_id, component) for component in configuration.components.values()],
+                )
+
+    def save_configs(self, configurations):
+        """Saves several configurations in one transaction, so either all or none of them change.
+
+        Args:
+            configurations (list): Tuples of each Configuration and whether it is a component
+        """
+        with self._database.transaction():
+            for configuration, is_component in configurations:
+                self.save_config(configuration, is_component)
+
+    def delete(self, name, is_component):
+        with self._database.transaction() as connection:
+            connection.execute(
+                "DELETE FROM configurations WHERE name = ? AND is_component = ?",
+                (name, int(is_component)),
+            )
+
+    def component_exists(self, root_path, name):
+        """Checks to see if a component exists.
+
+        root_path (string): Not used, as the components are stored in the database
+        name (string): The name of the components
+
+        Raises:
+            (Exception): raises an Exception if the component does not exist
+        """
+        if name not in self.get_names(True):
+            raise Exception("Component does not exist")
+
+    def copy_default(self, dest_path):
+        """Imports the default/base component.
+
+        Args:
+            dest_path (string): Not used, as the components are stored in the database
+        """
+        source = os.path.abspath(os.path.join(os.environ["MYDIRBLOCK"], EXAMPLE_DEFAULT))
+        component = ConfigurationFileManager().load_config_from_path(
+            DEFAULT_COMPONENT, source, MACROS, True
+        )
+        component.set_name(DEFAULT_COMPONENT)
+        self.save_config(component, True)
+
+    def get_files_in_directory(self, path: str) -> list[str]:
+        """Gets the names of the configurations or components, if the path is the configuration
+        or component folder, otherwise the folders in the path.
+
+        Args:
+            path (string): The path of the folder
+
+        Returns:
+            list: the names
+        """
+        path = os.path.abspath(path)
+        if path == os.path.abspath(FILEPATH_MANAGER.config_dir):
+            return self.get_names(False)
+        if path == os.path.abspath(FILEPATH_MANAGER.component_dir):
+            return self.get_names(True)
+        return super(SqliteConfigurationFileManager, self).get_files_in_directory(path)
+
+    def get_names(self, is_component: bool) -> List[str]:
+        """Gets the names of the configurations or components.
+
+        Args:
+            is_component: Whether to get the components
+
+        Returns:
+            The names
+        """
+        rows = self._database.query(
+            "SELECT name FROM configurations WHERE is_component = ? ORDER BY name",
+            (int(is_component),),
+        )
+        return [name for (name,) in rows]
+
+    def get_configs_using_component(self, component: str) -> List[str]:
+        """Gets the configurations which contain a component.
+
+        Args:
+            component: The name of the component
+
+        Returns:
+            The names of the configurations
+        """
+        return self._find_configs("config_components", "name", component)
+
+    def get_configs_using_ioc(self, ioc: str) -> List[str]:
+        """Gets the configurations and components which contain an IOC.
+
+        Args:
+            ioc: The name of the IOC
+
+        Returns:
+            The names of the configurations and components
+        """
+        return self._find_configs("config_iocs", "name", ioc)
+
+    def get_configs_using_pv(self, pv: str) -> List[str]:
+        """Gets the configurations and components which have a block pointing at a PV.
+
+        Args:
+            pv: The PV
+
+        Returns:
+            The names of the configurations and components
+        """
+        return self._find_configs("config_blocks", "pv", pv)
+
+    def _find_configs(self, table: str, column: str, value: str) -> List[str]:
+        rows = self._database.query(
+            f"SELECT DISTINCT configurations.name FROM {table} "
+            f"JOIN configurations ON configurations.id = {table}.config_id "
+            f"WHERE {table}.{column} = ? ORDER BY configurations.name",
+            (value,),
+        )
+        return [name for (name,) in rows]
+
+    def export_config(self, name: str, is_component: bool, path: str) -> None:
+        """Writes the files of a configuration into a folder, as they are stored.
+
+        Args:
+            name: The name of the configuration
+            is_component: Is it a component?
+            path: The folder to write the files into
+        """
+        rows = self._database.query(
+            f"SELECT {', '.join(_XML_COLUMNS.values())} FROM configurations "
+            "WHERE name = ? AND is_component = ?",
+            (name, int(is_component)),
+        )
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self._save_files_atomically(path, OrderedDict(zip(_XML_COLUMNS, rows[0])))
+
+
+class _DocumentStore:
+    def __init__(self, database: ConfigDatabase, kind: str) -> None:
+        self._database = database
+        self._kind = kind
+
+    def _read(self, name: str) -> Optional[bytes]:
+        rows = self._database.query(
+            "SELECT data FROM documents WHERE kind = ? AND name = ?", (self._kind, name)
+        )
+        return rows[0][0] if rows else None
+
+    def _write(self, name: str, data: bytes) -> None:
+        with self._database.transaction() as connection:
+            # Replace any document whose name differs only in case
+            connection.execute(
+                "DELETE FROM documents WHERE kind = ? AND name = ?", (self._kind, name)
+            )
+            connection.execute(
+                "INSERT INTO documents (kind, name, data) VALUES (?, ?, ?)",
+                (self._kind, name, data),
+            )
+
+    def _delete(self, name: str) -> None:
+        with self._database.transaction() as connection:
+            connection.execute(
+                "DELETE FROM documents WHERE kind = ? AND name = ?", (self._kind, name)
+            )
+
+    def _names(self) -> List[str]:
+        rows = self._database.query(
+            "SELECT name FROM documents WHERE kind = ? ORDER BY name", (self._kind,)
+        )
+        return [name for (name,) in rows]
+
+
+class SqliteSynopticFileIO(_DocumentStore, SynopticFileIO):
+    """Saves and loads synoptics in the SQLite database, in place of SynopticFileIO."""
+
+    def __init__(self, database: ConfigDatabase) -> None:
+        super(SqliteSynopticFileIO, self).__init__(database, SYNOPTIC)
+
+    def write_synoptic_file(self, name: str, save_path: str, xml_data: bytes) -> None:
+        self._write(os.path.basename(save_path), xml_data)
+
+    def read_synoptic_file(self, directory: str, fullname: str) -> bytes:
+        data = self._read(fullname)
+        if data is None:
+            raise IOError(f"Synoptic could not be found: {fullname}")
+        return data
+
+    def delete_synoptic(self, directory: str, fullname: str) -> None:
+        self._delete(fullname)
+
+    def get_list_synoptic_files(self, directory: str) -> List[str]:
+        return self._names()
+
+
+class SqliteDevicesFileIO(_DocumentStore, DevicesFileIO):
+    """Saves and loads the device screens in the SQLite database, in place of DevicesFileIO."""
+
+    def __init__(self, database: ConfigDatabase) -> None:
+        super(SqliteDevicesFileIO, self).__init__(database, DEVICES)
+
+    def load_devices_file(self, file_name: str) -> bytes:
+        data = self._read(os.path.basename(file_name))
+        if data is None:
+            raise IOError(f"Devices could not be found: {file_name}")
+        return data
+
+    def save_devices_file(self, file_name: str, data: bytes) -> None:
+        self._write(os.path.basename(file_name), data)
+
+
+def import_from_xml(database: ConfigDatabase) -> None:
+    """Imports the configurations, components, synoptics and devices from the XML layout in the
+    folders of FILEPATH_MANAGER, replacing what is in the database in one transaction.
+
+    Every configuration is checked against the schema, and nothing is imported if any fails.
+
+    Args:
+        database: The database
+    """
+    xml_files = ConfigurationFileManager()
+    store = SqliteConfigurationFileManager(database)
+    synoptics = SqliteSynopticFileIO(database)
+    devices = SqliteDevicesFileIO(database)
+    with database.transaction() as connection:
+        connection.execute("DELETE FROM configurations")
+        connection.execute("DELETE FROM documents")
+        for is_component, root in (
+            (True, FILEPATH_MANAGER.component_dir),
+            (False, FILEPATH_MANAGER.config_dir),
+        ):
+            for name in xml_files.get_files_in_directory(root):
+                config = xml_files.load_config_from_path(
+                    name, os.path.join(root, name), MACROS, is_component
+                )
+                store.save_config(config, is_component)
+        synoptic_io = SynopticFileIO()
+        for fullname in synoptic_io.get_list_synoptic_files(FILEPATH_MANAGER.synoptic_dir):
+            synoptics.write_synoptic_file(
+                fullname,
+                fullname,
+                synoptic_io.read_synoptic_file(FILEPATH_MANAGER.synoptic_dir, fullname),
+            )
+        devices_file = os.path.join(FILEPATH_MANAGER.devices_dir, FILENAME_SCREENS)
+        if os.path.isfile(devices_file):
+            devices.save_devices_file(devices_file, DevicesFileIO().load_devices_file(devices_file))
+    print_and_log(f"Imported configurations into {database.path}")
+
+
+def export_to_xml(database: ConfigDatabase) -> None:
+    """Exports the configurations, components, synoptics and devices to the XML layout in the
+    folders of FILEPATH_MANAGER. Files which are not in the database are left alone.
+
+    Args:
+        database: The database
+    """
+    store = SqliteConfigurationFileManager(database)
+    for is_component, root in (
+        (True, FILEPATH_MANAGER.component_dir),
+        (False, FILEPATH_MANAGER.config_dir),
+    ):
+        for name in store.get_names(is_component):
+            store.export_config(name, is_component, os.path.join(root, name))
+
+    synoptics = SqliteSynopticFileIO(database)
+    if not os.path.isdir(FILEPATH_MANAGER.synoptic_dir):
+        os.makedirs(FILEPATH_MANAGER.synoptic_dir)
+    for fullname in synoptics.get_list_synoptic_files(FILEPATH_MANAGER.synoptic_dir):
+        with open(os.path.join(FILEPATH_MANAGER.synoptic_dir, fullname), "wb") as f:
+            f.write(synoptics.read_synoptic_file(FILEPATH_MANAGER.synoptic_dir, fullname))
+
+    devices_file = os.path.join(FILEPATH_MANAGER.devices_dir, FILENAME_SCREENS)
+    try:
+        data = SqliteDevicesFileIO(database).load_devices_file(devices_file)
+    except IOError:
+        data = None
+    if data is not None:
+        if not os.path.isdir(FILEPATH_MANAGER.devices_dir):
+            os.makedirs(FILEPATH_MANAGER.devices_dir)
+        with open(devices_file, "wb") as f:
+            f.write(data)
+    print_and_log(f"Exported configurations from {database.path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0].strip())
+    parser.add_argument("direction", choices=["import", "export"])
+    parser.add_argument("database", help="The SQLite database file")
+    parser.add_argument("config_root", help="The configuration root folder")
+    parser.add_argument("--schema_dir", help="The folder of the configuration schema")
+    args = parser.parse_args()
+
+    FILEPATH_MANAGER.initialise(os.path.abspath(args.config_root), ".", args.schema_dir)
+    database = ConfigDatabase(args.database)
+    try:
+        if args.direction == "import":
+            import_from_xml(database)
+        else:
+            export_to_xml(database)
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
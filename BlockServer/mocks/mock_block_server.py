@@ -16,6 +16,8 @@
 
 from threading import RLock
 
+from BlockServer.core.encoding_service import encode_json
+
 
 class MockBlockServer:
     def __init__(self):
@@ -57,5 +59,8 @@ class MockBlockServer:
     def setParam(self, name, data):
         self.pvs[name] = data
 
+    def encode_and_set_param(self, name, data, encoder=encode_json):
+        self.pvs[name] = encoder(data)
+
     def updatePVs(self):
         pass
@@ -56,6 +56,10 @@ class MockConfigurationFileManager:
         else:
             self.confs[configuration.get_name().lower()] = configuration
 
+    def save_configs(self, configurations):
+        for configuration, is_component in configurations:
+            self.save_config(configuration, is_component)
+
     def delete(self, name, is_component):
         if is_component:
             del self.comps[name.lower()]
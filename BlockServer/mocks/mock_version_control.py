@@ -14,6 +14,7 @@
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
 
+import contextlib
 import os
 import shutil
 
@@ -38,9 +39,15 @@ class MockVersionControl:
         elif os.path.isfile(file_path):
             os.remove(file_path)
 
-    def commit(self, commit_comment):
+    def commit(self, commit_comment, paths=None):
         pass
 
+    def ignore(self, pattern):
+        pass
+
+    def hold_commits(self, paths):
+        return contextlib.nullcontext()
+
     def update(self, update_path=""):
         pass
 
@@ -51,7 +58,7 @@ class FailOnAddMockVersionControl(MockVersionControl):
 
 
 class FailOnCommitMockVersionControl(MockVersionControl):
-    def commit(self, commit_comment):
+    def commit(self, commit_comment, paths=None):
         raise CommitToVersionControlException("Oops cannot commit")
 
 
@@ -21,11 +21,12 @@ from collections import OrderedDict
 from datetime import datetime
 from shutil import copyfile
 from time import sleep
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict
 
 from BlockServer.config.block import Block
 from BlockServer.core.active_config_holder import ActiveConfigHolder
 from BlockServer.core.constants import (
+    RUNCONTROL_FILE,
     TAG_RC_ENABLE,
     TAG_RC_HIGH,
     TAG_RC_LOW,
@@ -34,7 +35,6 @@ from BlockServer.core.constants import (
 )
 from BlockServer.core.ioc_control import IocControl
 from BlockServer.core.on_the_fly_pv_interface import OnTheFlyPvInterface
-from server_common.channel_access import ChannelAccess
 from server_common.pv_names import prepend_blockserver
 from server_common.utilities import (
     compress_and_hex,
@@ -42,6 +42,7 @@ from server_common.utilities import (
     ioc_restart_pending,
     print_and_log,
 )
+from ServerTools.ca_statistics import ChannelAccess
 
 if TYPE_CHECKING:
     from block_server import BlockServer
@@ -84,6 +85,19 @@ def create_db_load_string(block: Block) -> str:
         )
 
 
+def build_runcontrol_settings(blocks: Dict) -> str:
+    """Builds the run-control settings which create the run-control PVs for some blocks.
+
+    Args:
+        blocks (dict): The blocks that are part of the configuration
+
+    Returns:
+        The content of the settings file
+    """
+    # Need an extra blank line
+    return "".join(create_db_load_string(block) for block in blocks.values()) + "\n"
+
+
 class RunControlManager(OnTheFlyPvInterface):
     """A class for taking care of setting up run-control."""
 
@@ -165,6 +179,12 @@ class RunControlManager(OnTheFlyPvInterface):
         else:
             self.create_runcontrol_pvs(full_init=full_init)
 
+    def get_settings_file(self) -> str:
+        """
+        Gets the location of the run-control settings file the IOC loads.
+        """
+        return self._settings_file
+
     def _create_standard_pvs(self) -> None:
         self._bs.add_string_pv_to_db(RUNCONTROL_OUT_PV, 16000)
         self._bs.add_string_pv_to_db(RUNCONTROL_GET_PV, 16000)
@@ -189,7 +209,10 @@ class RunControlManager(OnTheFlyPvInterface):
         """
         if self._active_configholder.blocks_changed() or full_init:
             print_and_log("Start creating runcontrol PVs")
-            self.update_runcontrol_blocks(self._active_configholder.get_block_details())
+            self.update_runcontrol_blocks(
+                self._active_configholder.get_block_details(),
+                self._active_configholder.get_staged_artifact(RUNCONTROL_FILE),
+            )
             self.restart_ioc()
             # Need to wait for RUNCONTROL_IOC to restart
             self.wait_for_ioc_start(time_between_tries)
@@ -206,20 +229,19 @@ class RunControlManager(OnTheFlyPvInterface):
             self.restore_config_settings(self._active_configholder.get_block_details())
             print_and_log("Finish restoring config settings")
 
-    def update_runcontrol_blocks(self, blocks: OrderedDict) -> None:
+    def update_runcontrol_blocks(self, blocks: OrderedDict, settings: str | None = None) -> None:
         """
         Update the run-control settings in the IOC with the current blocks.
 
         Args:
             blocks (OrderedDict): The blocks that are part of the current
                 configuration
+            settings: The settings built beforehand by build_runcontrol_settings for these
+                blocks, if they have been
         """
         try:
             with open(self._settings_file, "w") as f:
-                for block in blocks.values():
-                    f.write(create_db_load_string(block))
-                # Need an extra blank line
-                f.write("\n")
+                f.write(build_runcontrol_settings(blocks) if settings is None else settings)
         except Exception as err:
             print_and_log(str(err))
 
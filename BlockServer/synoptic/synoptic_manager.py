@@ -16,17 +16,18 @@
 
 import os
 from pathlib import Path
-from typing import TYPE_CHECKING, List
+from threading import RLock
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 if TYPE_CHECKING:
+    import lxml.etree as etree
+
     from block_server import BlockServer
-from lxml import etree
 from server_common.common_exceptions import MaxAttemptsExceededException
 from server_common.file_path_manager import FILEPATH_MANAGER
 from server_common.utilities import (
     compress_and_hex,
     convert_from_json,
-    convert_to_json,
     create_pv_name,
     print_and_log,
 )
@@ -34,6 +35,8 @@ from server_common.utilities import (
 from BlockServer.core.active_config_holder import ActiveConfigHolder
 from BlockServer.core.config_list_manager import InvalidDeleteException
 from BlockServer.core.on_the_fly_pv_interface import OnTheFlyPvInterface
+from BlockServer.core.resource_scheduler import SYNOPTICS
+from BlockServer.core.static_payloads import StaticPayloadRegistry
 from BlockServer.fileIO.schema_checker import ConfigurationSchemaChecker
 from BlockServer.synoptic.synoptic_file_io import SynopticFileIO
 
@@ -51,6 +54,37 @@ SYNOPTIC_SCHEMA = "SCHEMA"
 SYNOPTIC_SCHEMA_FILE = "synoptic.xsd"
 
 
+class _Synoptic:
+    """A synoptic known to the manager.
+
+    The compressed payload served on the synoptic's PV is only built the first time it is needed.
+    """
+
+    __slots__ = ("name", "pv", "xml", "_payload")
+
+    def __init__(self, name: str, pv: str, xml: bytes) -> None:
+        self.name = name
+        self.pv = pv
+        self.xml = xml
+        self._payload = None
+
+    @property
+    def has_payload(self) -> bool:
+        """Whether the payload has been built."""
+        return self._payload is not None
+
+    @property
+    def payload(self) -> bytes:
+        """The compressed and hexed XML of the synoptic."""
+        if self._payload is None:
+            self._payload = compress_and_hex(str(self.xml, encoding="utf-8"))
+        return self._payload
+
+
+def _get_payload(synoptic: Optional[_Synoptic]) -> bytes:
+    return synoptic.payload if synoptic is not None else compress_and_hex("")
+
+
 class SynopticManager(OnTheFlyPvInterface):
     """Class for managing the PVs associated with synoptics"""
 
@@ -75,48 +109,106 @@ class SynopticManager(OnTheFlyPvInterface):
         )
         self._directory = FILEPATH_MANAGER.synoptic_dir
         self._schema_folder = schema_folder
-        self._synoptic_pvs = dict()
+        self._schema = None
+        self._static_payloads = StaticPayloadRegistry()
+        self._static_payloads.register(
+            SYNOPTIC_PRE + SYNOPTIC_SCHEMA,
+            lambda data: (data or b"").decode("utf-8"),
+            os.path.join(schema_folder, SYNOPTIC_SCHEMA_FILE),
+        )
+        self._static_payloads.register(
+            SYNOPTIC_PRE + SYNOPTIC_BLANK + SYNOPTIC_GET, lambda _: self.get_blank_synoptic()
+        )
+        self._synoptics: Dict[str, _Synoptic] = dict()
+        self._names_by_pv: Dict[str, str] = dict()
+        self._default_synoptic: Optional[str] = None
+        # Writes and configuration changes can be handled on different threads at the same time
+        self._lock = RLock()
         self._bs = block_server
         self._activech = active_configholder
         self._file_io = file_io
-        self._default_syn_xml = b""
         self._create_standard_pvs()
         self._load_initial()
 
+    def get_write_resources(self, pv: str) -> frozenset[str]:
+        return frozenset({SYNOPTICS})
+
     def handle_pv_write(self, pv: str, data: str) -> None:
         try:
-            if pv == SYNOPTIC_PRE + SYNOPTIC_DELETE:
-                self.delete(convert_from_json(data))
-                self.update_monitors()
-            elif pv == SYNOPTIC_PRE + SYNOPTIC_SET_DETAILS:
-                self.save_synoptic_xml(bytes(data, encoding="utf-8"))
-                self.update_monitors()
+            with self._lock:
+                if pv == SYNOPTIC_PRE + SYNOPTIC_DELETE:
+                    self.delete(convert_from_json(data))
+                    self.update_monitors()
+                elif pv == SYNOPTIC_PRE + SYNOPTIC_SET_DETAILS:
+                    self.save_synoptic_xml(bytes(data, encoding="utf-8"))
+                    self.update_monitors()
         except IOError as err:
             print_and_log(f"Error accessing synoptic file: {err}", "MAJOR")
         except Exception as err:
             print_and_log(f"Error writing to PV {pv}: {err}", "MAJOR")
 
-    def handle_pv_read(self, pv: str) -> None:
-        # Nothing to do as it is all handled by monitors
-        pass
+    def get_cache_sizes(self) -> Dict[str, int]:
+        """Gets the numbers of synoptics and payloads held, to look for memory leaks.
+
+        Returns:
+            The number of synoptics, the size of their XML in bytes, and the number and size in
+            bytes of the payloads built
+        """
+        with self._lock:
+            built = [s.payload for s in self._synoptics.values() if s.has_payload]
+            return {
+                "synoptics": len(self._synoptics),
+                "synoptic_xml_bytes": sum(len(s.xml) for s in self._synoptics.values()),
+                "synoptic_payloads": len(built),
+                "synoptic_payload_bytes": sum(len(payload) for payload in built),
+            }
+
+    def read_pv_exists(self, pv: str) -> bool:
+        # Only synoptics which have never been read are served here, after that the PV holds
+        # the payload and updates are pushed to monitors
+        name = self._names_by_pv.get(pv)
+        return name is not None and not self._synoptics[name].has_payload
+
+    def handle_pv_read(self, pv: str) -> bytes:
+        """Builds the payload of a synoptic PV the first time it is read, and sets it on the PV
+        so that it is pushed to monitors.
+
+        Args:
+            pv: The PV's name
+
+        Returns:
+            The compressed and hexed XML of the synoptic
+        """
+        with self._lock, self._bs.monitor_lock:
+            synoptic = self._synoptics[self._names_by_pv[pv]]
+            payload = synoptic.payload
+            self.update_pv_value(pv, payload)
+            return payload
 
     def update_monitors(self) -> None:
-        with self._bs.monitor_lock:
+        with self._lock, self._bs.monitor_lock:
             print_and_log("Updating synoptic monitors")
-            self._bs.setParam(
-                SYNOPTIC_PRE + SYNOPTIC_GET_DEFAULT,
-                compress_and_hex(str(self.get_default_synoptic_xml(), encoding="utf-8")),
+            default = self._get_default()
+            self._bs.encode_and_set_param(
+                SYNOPTIC_PRE + SYNOPTIC_GET_DEFAULT, default, _get_payload
             )
-            names = convert_to_json(self.get_synoptic_list())
-            self._bs.setParam(SYNOPTIC_PRE + SYNOPTIC_NAMES, compress_and_hex(names))
+            if default is not None:
+                # Clients monitor the default synoptic, so its own PV is set before it is read,
+                # as building its payload above means it is no longer served on first read
+                self._bs.encode_and_set_param(
+                    SYNOPTIC_PRE + default.pv + SYNOPTIC_GET, default, _get_payload
+                )
+            self._bs.encode_and_set_param(SYNOPTIC_PRE + SYNOPTIC_NAMES, self.get_synoptic_list())
+            self._static_payloads.publish(self._bs.setParam)
             self._bs.updatePVs()
             print_and_log("Finished updating synoptic monitors")
 
     def on_config_change(self, full_init: bool = False) -> None:
         # If the config has a default synoptic then set the PV to that
         default = self._activech.get_config_meta().synoptic
-        self.set_default_synoptic(default)
-        self.update_monitors()
+        with self._lock:
+            self.set_default_synoptic(default)
+            self.update_monitors()
 
     def _create_standard_pvs(self) -> None:
         self._bs.add_string_pv_to_db(SYNOPTIC_PRE + SYNOPTIC_NAMES, 16000)
@@ -126,14 +218,9 @@ class SynopticManager(OnTheFlyPvInterface):
         self._bs.add_string_pv_to_db(SYNOPTIC_PRE + SYNOPTIC_DELETE, 16000)
         self._bs.add_string_pv_to_db(SYNOPTIC_PRE + SYNOPTIC_SCHEMA, 16000)
 
-        # Set values for PVs that don't change
-        self.update_pv_value(
-            SYNOPTIC_PRE + SYNOPTIC_BLANK + SYNOPTIC_GET,
-            compress_and_hex(self.get_blank_synoptic()),
-        )
-        self.update_pv_value(
-            SYNOPTIC_PRE + SYNOPTIC_SCHEMA, compress_and_hex(self.get_synoptic_schema())
-        )
+        # Set values for PVs that only change if their files change
+        self._static_payloads.publish(self._bs.setParam)
+        self._bs.updatePVs()
 
     def _load_initial(self) -> None:
         """Create the PVs for all the synoptics found in the synoptics directory."""
@@ -141,11 +228,7 @@ class SynopticManager(OnTheFlyPvInterface):
             # Load the data, checking the schema
             try:
                 data = self._file_io.read_synoptic_file(self._directory, f)
-                ConfigurationSchemaChecker.check_xml_matches_schema(
-                    os.path.join(self._schema_folder, SYNOPTIC_SCHEMA_FILE), data, "Synoptic"
-                )
-                # Get the synoptic name
-                self._create_pv(data)
+                self._add_synoptic(self._parse_synoptic(data), data, publish=False)
             except MaxAttemptsExceededException:
                 print_and_log(
                     f"Could not open synoptic file {f}. Please check the file is "
@@ -155,30 +238,66 @@ class SynopticManager(OnTheFlyPvInterface):
             except Exception as err:
                 print_and_log(f"Error creating synoptic PV: {err}", "MAJOR")
 
-    def _create_pv(self, data: bytes) -> None:
-        """Creates a single PV based on a name and data.
-        Adds this PV to the dictionary returned on get_synoptic_list
+    def _get_schema(self) -> "etree.XMLSchema":
+        if self._schema is None:
+            self._schema = ConfigurationSchemaChecker.load_schema(
+                os.path.join(self._schema_folder, SYNOPTIC_SCHEMA_FILE)
+            )
+        return self._schema
+
+    def _parse_synoptic(self, xml_data: bytes) -> str:
+        """Checks a synoptic against the schema and gets its name, parsing it only once.
 
         Args:
-            data (bytes): Starting data for the pv,
-            the pv name is derived from the name tag of this
+            xml_data (bytes): The XML of the synoptic
+
+        Returns:
+            string : The name of the synoptic
         """
-        name = self._get_synoptic_name_from_xml(data)
-        if name not in self._synoptic_pvs:
-            # Extra check, if a non-case sensitive match exist remove it
-            for key in self._synoptic_pvs.keys():
-                if name.lower() == key.lower():
-                    self._synoptic_pvs.pop(key)
-            pv = create_pv_name(name, list(self._synoptic_pvs.values()), "SYNOPTIC")
-            self._synoptic_pvs[name] = pv
-
-        # Create the PV
-        self._bs.add_string_pv_to_db(SYNOPTIC_PRE + self._synoptic_pvs[name] + SYNOPTIC_GET, 16000)
-        # Update the value
-        self.update_pv_value(
-            SYNOPTIC_PRE + self._synoptic_pvs[name] + SYNOPTIC_GET,
-            compress_and_hex(str(data, encoding="utf-8")),
+        root = ConfigurationSchemaChecker.parse_xml_matching_schema(
+            self._get_schema(), xml_data, "Synoptic"
         )
+        return self._get_synoptic_name_from_root(root)
+
+    def _find_synoptic(self, name: str) -> Optional[str]:
+        """Finds the name a synoptic is known by, ignoring case.
+
+        Args:
+            name (string): The name of the synoptic
+
+        Returns:
+            string : The name it is known by, or None if there is no such synoptic
+        """
+        if name in self._synoptics:
+            return name
+        for key in self._synoptics.keys():
+            if name.lower() == key.lower():
+                return key
+        return None
+
+    def _add_synoptic(self, name: str, data: bytes, publish: bool = True) -> None:
+        """Adds or replaces a synoptic, creating its PV if needed.
+
+        Args:
+            name (string): The name of the synoptic
+            data (bytes): The XML of the synoptic
+            publish (bool): Whether to build the payload and set the PV now rather than waiting
+                for it to be read
+        """
+        existing = self._find_synoptic(name)
+        if existing is not None:
+            pv = self._synoptics.pop(existing).pv
+        else:
+            pv = create_pv_name(name, [s.pv for s in self._synoptics.values()], "SYNOPTIC")
+        if existing is not None and existing == self._default_synoptic:
+            self._default_synoptic = name
+        self._synoptics[name] = synoptic = _Synoptic(name, pv, data)
+
+        fullname = SYNOPTIC_PRE + pv + SYNOPTIC_GET
+        self._names_by_pv[fullname] = name
+        self._bs.add_string_pv_to_db(fullname, 16000)
+        if publish:
+            self._bs.encode_and_set_param(fullname, synoptic, _get_payload)
 
     def update_pv_value(self, name: str, data: bytes) -> None:
         """Updates value of a PV holding synoptic information with new data
@@ -190,25 +309,26 @@ class SynopticManager(OnTheFlyPvInterface):
         self._bs.setParam(name, data)
         self._bs.updatePVs()
 
-    def get_synoptic_list(self) -> List[str]:
+    def get_synoptic_list(self) -> List[Dict[str, Any]]:
         """Gets the names and associated pvs of the synoptic files in the synoptics directory.
 
         Returns:
             list : Alphabetical list of synoptics files on the server,
             along with their associated pvs
         """
-        syn_list = []
-        default_is_none_synoptic = True
-        for k, v in self._synoptic_pvs.items():
-            is_default = False
-            if bytes(f"<name>{k}</name>", encoding="utf-8") in self._default_syn_xml:
-                default_is_none_synoptic = False
-                is_default = True
-            syn_list.append({"name": k, "pv": v, "is_default": is_default})
+        syn_list = [
+            {"name": s.name, "pv": s.pv, "is_default": s.name == self._default_synoptic}
+            for s in self._synoptics.values()
+        ]
         ans = sorted(syn_list, key=lambda x: x["name"].lower())
         # Insert the "blank" synoptic
         ans.insert(
-            0, {"pv": "__BLANK__", "name": "-- NONE --", "is_default": default_is_none_synoptic}
+            0,
+            {
+                "pv": "__BLANK__",
+                "name": "-- NONE --",
+                "is_default": self._default_synoptic not in self._synoptics,
+            },
         )
         return ans
 
@@ -218,23 +338,7 @@ class SynopticManager(OnTheFlyPvInterface):
         Args:
             name (string): the name of the synoptic to load
         """
-        fullname = name + ".xml"
-        f = self._file_io.get_list_synoptic_files(self._directory)
-        if fullname in f:
-            # Load the data
-            try:
-                data = self._file_io.read_synoptic_file(self._directory, fullname)
-                self._default_syn_xml = data
-            except MaxAttemptsExceededException:
-                print_and_log(
-                    f"Could not open synoptic file {fullname}. Please check the file is not "
-                    f"in use by another process.",
-                    "MAJOR",
-                )
-                self._default_syn_xml = b""
-        else:
-            # No synoptic
-            self._default_syn_xml = b""
+        self._default_synoptic = self._find_synoptic(name)
 
     def get_default_synoptic_xml(self) -> bytes:
         """Gets the XML for the default synoptic.
@@ -242,14 +346,16 @@ class SynopticManager(OnTheFlyPvInterface):
         Returns:
             bytes : The XML for the synoptic
         """
-        return self._default_syn_xml
-
-    def _get_synoptic_name_from_xml(self, xml_data: bytes) -> str:
-        name = None
-        root = etree.fromstring(xml_data)
-        for child in root:
-            if child.tag.split("}", 1)[1] == "name":
-                name = child.text
+        default = self._get_default()
+        return default.xml if default is not None else b""
+
+    def _get_default(self) -> Optional[_Synoptic]:
+        if self._default_synoptic is None:
+            return None
+        return self._synoptics.get(self._default_synoptic)
+
+    def _get_synoptic_name_from_root(self, root: "etree._Element") -> str:
+        name = root.findtext("{*}name")
         if name is None:
             raise Exception("Synoptic contains no name tag")
         return name
@@ -262,16 +368,13 @@ class SynopticManager(OnTheFlyPvInterface):
         """
         try:
             # Check against schema
-            ConfigurationSchemaChecker.check_xml_matches_schema(
-                os.path.join(self._schema_folder, SYNOPTIC_SCHEMA_FILE), xml_data, "Synoptic"
-            )
+            name = self._parse_synoptic(xml_data)
             # Update PVs
-            self._create_pv(xml_data)
+            self._add_synoptic(name, xml_data)
         except Exception as err:
             print_and_log(err)
             raise
 
-        name = self._get_synoptic_name_from_xml(xml_data)
         save_path = FILEPATH_MANAGER.get_synoptic_path(name)
         try:
             self._file_io.write_synoptic_file(name, save_path, xml_data)
@@ -290,7 +393,7 @@ class SynopticManager(OnTheFlyPvInterface):
         """
         print_and_log("Deleting: " + ", ".join(list(delete_list)), "INFO")
         delete_set = set(delete_list)
-        if not delete_set.issubset(self._synoptic_pvs.keys()):
+        if not delete_set.issubset(self._synoptics.keys()):
             raise InvalidDeleteException("Delete list contains unknown configurations")
         for synoptic in delete_list:
             self._delete_synoptic(synoptic)
@@ -306,8 +409,9 @@ class SynopticManager(OnTheFlyPvInterface):
                 "MINOR",
             )
             return
-        self._bs.delete_pv_from_db(SYNOPTIC_PRE + self._synoptic_pvs[synoptic] + SYNOPTIC_GET)
-        del self._synoptic_pvs[synoptic]
+        pv = SYNOPTIC_PRE + self._synoptics.pop(synoptic).pv + SYNOPTIC_GET
+        del self._names_by_pv[pv]
+        self._bs.delete_pv_from_db(pv)
 
     def update(self, xml_data: str) -> None:
         """Updates the synoptic list when modifications are made via the filesystem.
@@ -316,17 +420,12 @@ class SynopticManager(OnTheFlyPvInterface):
             xml_data (str): The xml data to update the PV with
 
         """
+        import lxml.etree as etree
+
         # Convert to bytes
         bytes_xml_data = bytes(xml_data, encoding="utf-8")
-        name = self._get_synoptic_name_from_xml(bytes_xml_data)
-        names = self._synoptic_pvs.keys()
-        if name in names:
-            self.update_pv_value(
-                SYNOPTIC_PRE + self._synoptic_pvs[name] + SYNOPTIC_GET, compress_and_hex(xml_data)
-            )
-        else:
-            self._create_pv(bytes_xml_data)
-
+        root = etree.fromstring(bytes_xml_data)
+        self._add_synoptic(self._get_synoptic_name_from_root(root), bytes_xml_data)
         self.update_monitors()
 
     def get_synoptic_schema(self) -> str:
@@ -335,10 +434,8 @@ class SynopticManager(OnTheFlyPvInterface):
         Returns:
             string : The XML for the synoptic schema
         """
-        schema = ""
-        with open(os.path.join(self._schema_folder, SYNOPTIC_SCHEMA_FILE), "r") as schemafile:
-            schema = schemafile.read()
-        return schema
+        schema = self._static_payloads.get_data(SYNOPTIC_PRE + SYNOPTIC_SCHEMA)
+        return schema.decode("utf-8") if schema is not None else ""
 
     def get_blank_synoptic(self) -> str:
         """Gets a blank synoptic.
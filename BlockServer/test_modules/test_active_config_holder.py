@@ -73,8 +73,14 @@ def create_dummy_component():
 
 def patch_get_iocs_empty(f):
     def _wrapper(*args, **kwargs):
-        with mock.mock.patch("BlockServer.core.active_config_holder.get_iocs") as mock_get_iocs:
+        with (
+            mock.mock.patch("BlockServer.core.active_config_holder.get_iocs") as mock_get_iocs,
+            mock.mock.patch(
+                "BlockServer.core.active_config_holder.get_running_iocs"
+            ) as mock_get_running_iocs,
+        ):
             mock_get_iocs.return_value = []
+            mock_get_running_iocs.return_value = []
             return f(*args, **kwargs)
 
     return _wrapper
@@ -439,8 +445,15 @@ class TestActiveConfigHolderSequence(unittest.TestCase):
     def test_GIVEN_a_manually_started_ioc_WHEN_config_not_containing_that_ioc_is_loaded_THEN_the_ioc_is_stopped(
         self,
     ):
-        with mock.mock.patch("BlockServer.core.active_config_holder.get_iocs") as mock_get_iocs:
+        with (
+            mock.mock.patch("BlockServer.core.active_config_holder.get_iocs") as mock_get_iocs,
+            mock.mock.patch(
+                "BlockServer.core.active_config_holder.get_running_iocs"
+            ) as mock_get_running_iocs,
+        ):
             mock_get_iocs.return_value = ["IOCNAME1", "IOCNAME2"]
+            # Running list unavailable, so each IOC's status is checked
+            mock_get_running_iocs.return_value = None
 
             # Arrange
             config_holder = self.create_active_config_holder()
@@ -461,8 +474,15 @@ class TestActiveConfigHolderSequence(unittest.TestCase):
     def test_GIVEN_a_manually_started_ioc_WHEN_config_containing_that_ioc_is_loaded_THEN_the_ioc_is_restarted(
         self,
     ):
-        with mock.mock.patch("BlockServer.core.active_config_holder.get_iocs") as mock_get_iocs:
+        with (
+            mock.mock.patch("BlockServer.core.active_config_holder.get_iocs") as mock_get_iocs,
+            mock.mock.patch(
+                "BlockServer.core.active_config_holder.get_running_iocs"
+            ) as mock_get_running_iocs,
+        ):
             mock_get_iocs.return_value = ["IOCNAME1", "IOCNAME2"]
+            # Running list unavailable, so each IOC's status is checked
+            mock_get_running_iocs.return_value = None
 
             # Arrange
             config_holder = self.create_active_config_holder()
@@ -481,6 +501,64 @@ class TestActiveConfigHolderSequence(unittest.TestCase):
             self.assertEqual(stop, set())
             self.assertEqual(restart, {"IOCNAME1"})
 
+    def test_GIVEN_a_running_ioc_reported_by_database_server_WHEN_config_not_containing_that_ioc_is_loaded_THEN_the_ioc_is_stopped_without_querying_status(
+        self,
+    ):
+        with (
+            mock.mock.patch("BlockServer.core.active_config_holder.get_iocs") as mock_get_iocs,
+            mock.mock.patch(
+                "BlockServer.core.active_config_holder.get_running_iocs"
+            ) as mock_get_running_iocs,
+        ):
+            mock_get_running_iocs.return_value = ["IOCNAME1"]
+
+            # Arrange
+            config_holder = self.create_active_config_holder()
+            config_holder._ioc_control.get_ioc_status = Mock()
+
+            details = config_holder.get_config_details()
+            self._modify_active(config_holder, details)
+
+            # Act
+            self._modify_active(config_holder, details)
+
+            # Assert
+            start, restart, stop = config_holder.iocs_changed()
+            self.assertEqual(start, set())
+            self.assertEqual(restart, set())
+            self.assertEqual(stop, {"IOCNAME1"})
+            mock_get_iocs.assert_not_called()
+            config_holder._ioc_control.get_ioc_status.assert_not_called()
+
+    def test_GIVEN_a_running_ioc_reported_by_database_server_WHEN_config_containing_that_ioc_is_loaded_THEN_the_ioc_is_restarted(
+        self,
+    ):
+        with (
+            mock.mock.patch("BlockServer.core.active_config_holder.get_iocs"),
+            mock.mock.patch(
+                "BlockServer.core.active_config_holder.get_running_iocs"
+            ) as mock_get_running_iocs,
+        ):
+            mock_get_running_iocs.return_value = ["IOCNAME1", "INSTETC_01"]
+
+            # Arrange
+            config_holder = self.create_active_config_holder()
+            config_holder._ioc_control.get_ioc_status = Mock()
+
+            details = config_holder.get_config_details()
+            self._modify_active(config_holder, details)
+
+            # Act
+            details["iocs"].append(IOC("IOCNAME1"))
+            self._modify_active(config_holder, details)
+
+            # Assert
+            start, restart, stop = config_holder.iocs_changed()
+            self.assertEqual(start, set())
+            self.assertEqual(stop, set())
+            self.assertEqual(restart, {"IOCNAME1"})
+            config_holder._ioc_control.get_ioc_status.assert_not_called()
+
     def test_given_empty_config_when_block_added_then_blocks_changed_returns_true(self):
         # Arrange
         config_holder = self.create_active_config_holder()
@@ -525,6 +603,54 @@ class TestActiveConfigHolderSequence(unittest.TestCase):
         # Assert
         self.assertTrue(config_holder.blocks_changed())
 
+    def test_given_config_when_blocks_added_removed_and_modified_then_block_changes_lists_them(
+        self,
+    ):
+        # Arrange
+        config_holder = self.create_active_config_holder()
+        details = config_holder.get_config_details()
+        details["blocks"].append(Block(name="KEPT", pv="PV1").to_dict())
+        details["blocks"].append(Block(name="MODIFIED", pv="PV2").to_dict())
+        details["blocks"].append(Block(name="REMOVED", pv="PV3").to_dict())
+        self._modify_active(config_holder, details)
+        # Act
+        details["blocks"] = [
+            Block(name="KEPT", pv="PV1").to_dict(),
+            Block(name="MODIFIED", pv="PV2", log_periodic=True).to_dict(),
+            Block(name="ADDED", pv="PV4").to_dict(),
+        ]
+        self._modify_active(config_holder, details)
+        # Assert
+        changes = config_holder.get_block_changes()
+        self.assertEqual(changes.added, {"ADDED"})
+        self.assertEqual(changes.removed, {"REMOVED"})
+        self.assertEqual(changes.modified, {"MODIFIED"})
+
+    def test_given_empty_config_when_component_added_then_block_changes_lists_component_blocks(
+        self,
+    ):
+        # Arrange
+        config_holder = self.create_active_config_holder()
+        # Act
+        self.mock_file_manager.comps["component_name"] = create_dummy_component()
+        config_holder.add_component("component_name")
+        # Assert
+        changes = config_holder.get_block_changes()
+        self.assertEqual(changes.added, {"COMPBLOCK1", "COMPBLOCK2"})
+        self.assertEqual(changes.removed, set())
+        self.assertEqual(changes.modified, set())
+
+    def test_given_config_when_no_change_then_block_changes_is_empty(self):
+        # Arrange
+        config_holder = self.create_active_config_holder()
+        details = config_holder.get_config_details()
+        details["blocks"].append(Block(name="TESTNAME", pv="TESTPV").to_dict())
+        self._modify_active(config_holder, details)
+        # Act
+        self._modify_active(config_holder, details)
+        # Assert
+        self.assertFalse(config_holder.get_block_changes())
+
     def test_given_empty_config_when_no_change_then_blocks_changed_returns_false(self):
         # Arrange
         config_holder = self.create_active_config_holder()
@@ -713,6 +839,17 @@ class TestActiveConfigHolderSequence(unittest.TestCase):
         self.assertEqual(len(start), 0)
         self.assertEqual(len(restart), 1)
 
+    def test_WHEN_compare_ioc_properties_called_with_only_component_changed_THEN_ioc_not_restarted(
+        self,
+    ):
+        old_iocs = {"a": IOC("a", component="comp1")}
+        new_iocs = {"a": IOC("a", component="comp2")}
+
+        start, restart, stop = _compare_ioc_properties(old_iocs, new_iocs)
+        self.assertEqual(len(start), 0)
+        self.assertEqual(len(restart), 0)
+        self.assertEqual(len(stop), 0)
+
     def test_WHEN_compare_ioc_properties_called_with_new_ioc_then_starts_new_ioc(self):
         old_iocs = {}
         new_iocs = {"a": IOC("a", macros={})}
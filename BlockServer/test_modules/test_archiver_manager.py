@@ -80,6 +80,20 @@ class TestArchiveManager(unittest.TestCase):
 
         assert_that(mock_file.file_contents[self._setting_path], contains_exactly(*expected_output))
 
+    @patch("builtins.open", new_callable=mock_open, mock=FileStub)
+    def test_GIVEN_archive_config_built_beforehand_WHEN_update_THEN_same_xml_written(
+        self, mock_file
+    ):
+        blocks = [Block("block", "pv", log_periodic=True, log_rate=0, log_deadband=1)]
+        prefix = "prefix"
+        self.archiver_manager.update_archiver(prefix, blocks, False, self.config_dir)
+        generated = mock_file.file_contents[self._setting_path]
+
+        archive_config = self.archiver_manager.build_archive_config(prefix, blocks)
+        self.archiver_manager.update_archiver(prefix, [], False, self.config_dir, archive_config)
+
+        assert_that(mock_file.file_contents[self._setting_path], is_(generated))
+
     @patch("builtins.open", new_callable=mock_open, mock=FileStub)
     def test_GIVEN_one_blocks_is_not_logged_WHEN_update_THEN_xml_for_archiver_contains_block_in_dataweb_group(
         self, mock_file
@@ -0,0 +1,84 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import os
+import shutil
+import tempfile
+import unittest
+from threading import Lock, RLock
+from unittest.mock import Mock, patch
+
+from hamcrest import *
+from pcaspy import Driver
+from server_common.utilities import dehex_and_decompress
+
+from block_server import BlockServer
+from BlockServer.core.encoding_service import encode_json
+from BlockServer.core.state_snapshot import StateSnapshot
+from server_common.pv_names import BlockserverPVNames
+
+
+class TestBlockServerSnapshot(unittest.TestCase):
+    """Saves and restores snapshots through a BlockServer without Channel Access."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.params = {}
+        for name, replacement in [
+            ("setParam", lambda _driver, pv, value: self.params.__setitem__(pv, value)),
+            ("getParam", lambda _driver, pv: self.params.get(pv)),
+            ("updatePVs", lambda _driver: None),
+        ]:
+            patcher = patch.object(Driver, name, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for name, value in [("does_pv_exist", True), ("_generated_files", [])]:
+            patcher = patch.object(BlockServer, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_server(self):
+        server = BlockServer.__new__(BlockServer)
+        server._published = {}
+        server._snapshot = StateSnapshot(os.path.join(self.dir, "snapshot.json"))
+        server._serving_snapshot = False
+        server._active_configserver = Mock(get_config_name=Mock(return_value="TEST_CONFIG"))
+        server._active_fingerprint = "abc"
+        server._snapshot_only_pvs = set()
+        server._stale_derived_pvs = set()
+        server._derived_lock = Lock()
+        server._chunks = Mock()
+        server.monitor_lock = RLock()
+        return server
+
+    def test_GIVEN_encoded_json_published_WHEN_snapshot_saved_and_restored_THEN_value_restored(
+        self,
+    ):
+        server = self.create_server()
+        server.setParam(BlockserverPVNames.GROUPS, encode_json([{"name": "GROUP1"}]))
+
+        server.save_snapshot()
+        self.params.clear()
+        snapshot = self.create_server()._restore_snapshot()
+
+        assert_that(snapshot, is_(not_none()))
+        assert_that(snapshot["config"], is_("TEST_CONFIG"))
+        restored = self.params[BlockserverPVNames.GROUPS]
+        assert_that(dehex_and_decompress(restored.encode("utf-8")), is_(b'[{"name": "GROUP1"}]'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import unittest
+
+from hamcrest import *
+from mock import Mock
+
+from BlockServer.core.command_profiler import CommandProfiler
+
+
+def parse_config(name):
+    return name.upper()
+
+
+def load_config(name):
+    return parse_config(name)
+
+
+def save_config(name):
+    raise IOError(f"Could not save {name}")
+
+
+class TestCommandProfiler(unittest.TestCase):
+    def setUp(self):
+        self.publish = Mock()
+        self.profiler = CommandProfiler(self.publish, max_profiles=2)
+
+    def _profiled_commands(self):
+        return [p["command"] for p in self.profiler.get_profiles()["profiles"]]
+
+    def test_GIVEN_not_armed_WHEN_command_run_THEN_run_and_not_profiled(self):
+        command = Mock(__name__="load_config")
+
+        self.profiler.run(command, ("CONFIG",), "LOADING_CONFIG")
+
+        command.assert_called_once_with("CONFIG")
+        assert_that(self._profiled_commands(), is_(empty()))
+        self.publish.assert_not_called()
+
+    def test_GIVEN_armed_WHEN_commands_run_THEN_only_number_armed_profiled(self):
+        self.profiler.arm(1)
+
+        self.profiler.run(load_config, ("CONFIG",), "LOADING_CONFIG")
+        self.profiler.run(load_config, ("CONFIG",), "LOADING_CONFIG")
+
+        profiles = self.profiler.get_profiles()
+        assert_that(profiles["armed"], has_entries(count=0))
+        assert_that(profiles["profiles"], contains_exactly(has_entries(state="LOADING_CONFIG")))
+        functions = [f["function"] for f in profiles["profiles"][0]["functions"]]
+        assert_that(functions, has_item(ends_with("(parse_config)")))
+        self.publish.assert_called_with(profiles)
+
+    def test_GIVEN_armed_for_command_WHEN_commands_run_THEN_only_that_command_profiled(self):
+        self.profiler.arm(5, "LOAD_CONFIG")
+
+        self.profiler.run(parse_config, ("CONFIG",), "PARSING")
+        self.profiler.run(load_config, ("CONFIG",), "LOADING_CONFIG")
+
+        assert_that(self._profiled_commands(), is_(["load_config"]))
+
+    def test_GIVEN_armed_WHEN_command_fails_THEN_profiled_and_error_raised(self):
+        self.profiler.arm(1)
+
+        self.assertRaises(IOError, self.profiler.run, save_config, ("CONFIG",), "SAVING")
+
+        assert_that(self._profiled_commands(), is_(["save_config"]))
+
+    def test_GIVEN_more_profiles_than_kept_THEN_oldest_dropped(self):
+        self.profiler.arm(3)
+
+        for command in (parse_config, load_config, parse_config):
+            self.profiler.run(command, ("CONFIG",), "RUNNING")
+
+        assert_that(self._profiled_commands(), is_(["load_config", "parse_config"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+from mock import MagicMock
+
+from BlockServer.core.component_details_cache import ComponentDetailsCache
+from server_common.utilities import convert_to_json
+
+
+def make_details(name, padding=0):
+    return {"name": name, "description": "x" * padding}
+
+
+class TestComponentDetailsCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.loader = MagicMock(side_effect=lambda name: make_details(name))
+        self.cache = ComponentDetailsCache(self.loader, self._get_path)
+
+    def _get_path(self, name):
+        return os.path.join(self.root, name)
+
+    def _write_component(self, name, content="a"):
+        path = self._get_path(name)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "blocks.xml"), "w") as f:
+            f.write(content)
+
+    def test_GIVEN_details_put_WHEN_got_THEN_not_loaded_from_disk(self):
+        self._write_component("COMP")
+        self.cache.put("COMP", make_details("COMP"))
+
+        assert_that(self.cache.get("COMP"), is_(make_details("COMP")))
+        self.loader.assert_not_called()
+
+    def test_GIVEN_details_not_cached_WHEN_got_THEN_loaded_once(self):
+        self._write_component("COMP")
+
+        self.cache.get("COMP")
+        self.cache.get("COMP")
+
+        self.loader.assert_called_once_with("COMP")
+
+    def test_GIVEN_component_files_changed_WHEN_got_THEN_reloaded(self):
+        self._write_component("COMP")
+        self.cache.put("COMP", {"name": "stale"})
+
+        self._write_component("COMP", content="a longer file")
+
+        assert_that(self.cache.get("COMP"), is_(make_details("COMP")))
+        self.loader.assert_called_once_with("COMP")
+
+    def test_GIVEN_budget_exceeded_WHEN_put_THEN_least_recently_used_evicted(self):
+        size = len(convert_to_json(make_details("COMP1", padding=100)))
+        cache = ComponentDetailsCache(self.loader, self._get_path, max_bytes=2 * size)
+        for name in ["COMP1", "COMP2"]:
+            self._write_component(name)
+            cache.put(name, make_details(name, padding=100))
+
+        cache.get("COMP1")
+        self._write_component("COMP3")
+        cache.put("COMP3", make_details("COMP3", padding=100))
+
+        assert_that("COMP1" in cache, is_(True))
+        assert_that("COMP2" in cache, is_(False))
+        assert_that("COMP3" in cache, is_(True))
+        assert_that(cache.total_bytes, is_(less_than_or_equal_to(2 * size)))
+
+    def test_GIVEN_single_entry_larger_than_budget_WHEN_put_THEN_kept(self):
+        cache = ComponentDetailsCache(self.loader, self._get_path, max_bytes=1)
+
+        cache.put("COMP", make_details("COMP"))
+
+        assert_that(len(cache), is_(1))
+
+    def test_GIVEN_component_removed_WHEN_got_THEN_reloaded_and_size_released(self):
+        self._write_component("COMP")
+        self.cache.put("COMP", make_details("COMP"))
+
+        self.cache.remove("COMP")
+
+        assert_that(self.cache.total_bytes, is_(0))
+        self.cache.get("COMP")
+        self.loader.assert_called_once_with("COMP")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -35,6 +35,9 @@ class MockConfigListManager(object):
     def get_components(self):
         return [{"name": comp_name} for comp_name in self.components]
 
+    def get_component_details(self, name):
+        return {"isDynamic": self.load_config(name, is_component=True).is_dynamic()}
+
     def load_config(self, name, *_, **__):
         if name in self.loaded_configs:
             return self.loaded_configs[name]
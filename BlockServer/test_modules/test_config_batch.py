@@ -0,0 +1,150 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+from mock import Mock, patch
+from server_common.helpers import MACROS
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.core.config_batch import edit_paths, parse_edits, prepare_edits, save_edits
+from BlockServer.core.constants import DEFAULT_COMPONENT
+from BlockServer.fileIO.file_manager import ConfigurationFileManager
+
+TIMESTAMP = "2024-01-01 12:00:00"
+
+
+class SimulatedCrash(Exception):
+    pass
+
+
+def details(name, pv):
+    return {
+        "name": name,
+        "description": f"{name} description",
+        "blocks": [{"name": "BLOCK1", "pv": pv, "local": False, "visible": True}],
+        "groups": [],
+        "iocs": [],
+        "components": [],
+    }
+
+
+class TestConfigBatch(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.config_dir = os.path.join(self.root, "configurations")
+        paths = Mock(
+            get_config_path=lambda name: os.path.join(self.config_dir, name),
+            get_component_path=lambda name: os.path.join(self.root, "components", name),
+        )
+        for module in ("BlockServer.fileIO.file_manager", "BlockServer.core.config_batch"):
+            path_patch = patch(f"{module}.FILEPATH_MANAGER", paths)
+            path_patch.start()
+            self.addCleanup(path_patch.stop)
+        # The schemas are not part of this repository
+        schema_patch = patch.object(ConfigurationFileManager, "_check_against_schema")
+        schema_patch.start()
+        self.addCleanup(schema_patch.stop)
+
+        self.file_manager = ConfigurationFileManager()
+        base = Configuration(MACROS)
+        base.set_name(DEFAULT_COMPONENT)
+        self.file_manager.save_config(base, True)
+        config = Configuration(MACROS)
+        config.set_name("CONFIG1")
+        config.add_block("BLOCK1", "OLD:PREFIX:PV", local=False)
+        config.meta.history = ["2023-01-01 12:00:00"]
+        self.file_manager.save_config(config, False)
+        self.original = self._read_config("CONFIG1")
+
+    def _read_config(self, name):
+        path = os.path.join(self.config_dir, name)
+        contents = {}
+        for filename in os.listdir(path):
+            with open(os.path.join(path, filename)) as f:
+                contents[filename] = f.read()
+        return contents
+
+    def _batch(self, *configs):
+        return parse_edits(json.dumps({"configs": list(configs)}))
+
+    def test_GIVEN_batch_WHEN_saved_THEN_every_config_changed_and_history_added(self):
+        edits = self._batch(details("CONFIG1", "NEW:PREFIX:PV"), details("CONFIG2", "NEW:PV"))
+
+        save_edits(prepare_edits(edits, self.file_manager, TIMESTAMP), self.file_manager)
+
+        config1 = self.file_manager.load_config("CONFIG1", MACROS, False)
+        assert_that(config1.blocks["block1"].pv, is_("NEW:PREFIX:PV"))
+        assert_that(config1.meta.history, is_(["2023-01-01 12:00:00", TIMESTAMP]))
+        config2 = self.file_manager.load_config("CONFIG2", MACROS, False)
+        assert_that(config2.meta.history, is_([TIMESTAMP]))
+
+    def test_GIVEN_invalid_edit_in_batch_WHEN_prepared_THEN_error_and_nothing_saved(self):
+        edits = self._batch(details("CONFIG1", "NEW:PREFIX:PV"), details("2_CONFIG", "NEW:PV"))
+
+        with self.assertRaises(ValueError):
+            prepare_edits(edits, self.file_manager, TIMESTAMP)
+
+        assert_that(self._read_config("CONFIG1"), is_(self.original))
+        assert_that(os.listdir(self.config_dir), is_(["CONFIG1"]))
+
+    def test_GIVEN_batch_WHEN_save_fails_part_way_THEN_every_config_rolled_back(self):
+        edits = self._batch(details("CONFIG1", "NEW:PREFIX:PV"), details("CONFIG2", "NEW:PV"))
+        prepared = prepare_edits(edits, self.file_manager, TIMESTAMP)
+        real_replace = os.replace
+
+        def fail_in_second_config(source, destination):
+            if os.sep + "CONFIG2" + os.sep in destination:
+                raise SimulatedCrash()
+            real_replace(source, destination)
+
+        with patch("os.replace", side_effect=fail_in_second_config):
+            self.assertRaises(SimulatedCrash, save_edits, prepared, self.file_manager)
+
+        assert_that(self._read_config("CONFIG1"), is_(self.original))
+        assert_that(os.listdir(self.config_dir), is_(["CONFIG1"]))
+
+    def test_GIVEN_config_edited_twice_WHEN_batch_read_THEN_error(self):
+        with self.assertRaises(ValueError):
+            self._batch(details("CONFIG1", "PV1"), details("config1", "PV2"))
+
+    def test_GIVEN_batch_THEN_paths_are_directories_of_configs_and_components_edited(self):
+        edits = parse_edits(
+            json.dumps(
+                {"configs": [details("CONFIG1", "PV1")], "components": [details("COMP1", "PV2")]}
+            )
+        )
+
+        assert_that(
+            edit_paths(edits),
+            contains_exactly(
+                os.path.join(self.config_dir, "CONFIG1"),
+                os.path.join(self.root, "components", "COMP1"),
+            ),
+        )
+
+    def test_GIVEN_no_edits_WHEN_batch_read_THEN_error(self):
+        with self.assertRaises(ValueError):
+            parse_edits(json.dumps({"configs": [], "components": []}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import unittest
+
+from hamcrest import *
+from server_common.helpers import MACROS
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.core.config_diff import diff_configs
+from BlockServer.core.config_holder import ConfigHolder
+from BlockServer.mocks.mock_file_manager import MockConfigurationFileManager
+
+
+def create_config(name):
+    config = Configuration(MACROS)
+    config.set_name(name)
+    config.add_block("BLOCK1", "PV1", "GROUP1")
+    config.add_block("BLOCK2", "PV2", "GROUP1", local=False)
+    config.add_ioc("IOC1")
+    return config
+
+
+class TestConfigDiff(unittest.TestCase):
+    def setUp(self):
+        self.file_manager = MockConfigurationFileManager()
+        component = Configuration(MACROS)
+        component.set_name("COMP1")
+        component.add_block("COMPBLOCK", "PV3", "GROUP2")
+        component.add_ioc("COMPIOC")
+        self.file_manager.save_config(component, True)
+
+    def holder(self, config):
+        return ConfigHolder(MACROS, self.file_manager, test_config=config)
+
+    def test_GIVEN_same_configs_WHEN_diffed_THEN_no_changes(self):
+        diff = diff_configs(self.holder(create_config("A")), self.holder(create_config("A")))
+
+        for section in ("blocks", "groups", "iocs"):
+            assert_that(diff[section], is_({"added": [], "removed": [], "modified": {}}))
+        assert_that(diff["components"], is_({"added": [], "removed": []}))
+        assert_that(diff["meta"], is_({}))
+
+    def test_GIVEN_blocks_changed_WHEN_diffed_THEN_changed_fields_given(self):
+        new = create_config("B")
+        new.add_block("BLOCK3", "PV3", "GROUP1")
+        new.blocks["block2"].pv = "NEW_PV"
+        del new.blocks["block1"]
+        new.groups["group1"].blocks.remove("BLOCK1")
+        new.groups["group1"].invalidate_fingerprint()
+
+        diff = diff_configs(self.holder(create_config("A")), self.holder(new))
+
+        assert_that(diff["from"], is_("A"))
+        assert_that(diff["to"], is_("B"))
+        assert_that(diff["blocks"]["added"], is_(["BLOCK3"]))
+        assert_that(diff["blocks"]["removed"], is_(["BLOCK1"]))
+        assert_that(diff["blocks"]["modified"], is_({"BLOCK2": {"pv": ["PV2", "NEW_PV"]}}))
+        assert_that(
+            diff["groups"]["modified"],
+            is_({"GROUP1": {"blocks": [["BLOCK1", "BLOCK2"], ["BLOCK2", "BLOCK3"]]}}),
+        )
+
+    def test_GIVEN_component_added_WHEN_diffed_THEN_component_and_its_contents_added(self):
+        new = self.holder(create_config("A"))
+        new.add_component("COMP1")
+
+        diff = diff_configs(self.holder(create_config("A")), new)
+
+        assert_that(diff["components"], is_({"added": ["COMP1"], "removed": []}))
+        assert_that(diff["blocks"]["added"], is_(["COMPBLOCK"]))
+        assert_that(diff["groups"]["added"], is_(["GROUP2"]))
+        assert_that(diff["iocs"]["added"], is_(["COMPIOC"]))
+
+    def test_GIVEN_description_changed_WHEN_diffed_THEN_meta_change_given(self):
+        new = create_config("A")
+        new.meta.description = "new"
+
+        diff = diff_configs(self.holder(create_config("A")), self.holder(new))
+
+        assert_that(diff["meta"], is_({"description": ["", "new"]}))
+
+
+if __name__ == "__main__":
+    unittest.main()
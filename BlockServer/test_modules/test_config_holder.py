@@ -14,10 +14,14 @@
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
 
+import copy
 import os
+import random
 import stat
 import unittest
 
+from parameterized import parameterized
+
 from BlockServer.config.configuration import Configuration
 from BlockServer.core.config_holder import ConfigHolder
 from BlockServer.core.constants import DEFAULT_COMPONENT
@@ -62,6 +66,50 @@ def on_rm_error(func, path, exc_info):
     os.unlink(path)
 
 
+def reference_group_details(config, components, blocks):
+    """The original (quadratic) group merge, kept to check the current implementation against."""
+    used_blocks = []
+    groups = copy.deepcopy(config.groups)
+    components = copy.deepcopy(components)
+
+    for group in groups.values():
+        used_blocks.extend(group.blocks)
+
+    for component in components.values():
+        for group_name, grp in component.groups.items():
+            if group_name not in groups.keys():
+                blks = [x for x in grp.blocks if x not in used_blocks and x in blocks]
+                groups[group_name] = grp
+                groups[group_name].blocks = blks
+                used_blocks.extend(blks)
+            else:
+                for bn in grp.blocks:
+                    if (
+                        bn not in groups[group_name].blocks
+                        and bn not in used_blocks
+                        and bn in blocks
+                    ):
+                        groups[group_name].blocks.append(bn)
+                        used_blocks.append(bn)
+
+    for key in list(groups.keys()):
+        if len(groups[key].blocks) == 0:
+            groups.pop(key)
+
+    return groups
+
+
+def create_random_config(rng, num_blocks, block_names, group_names):
+    config = Configuration(MACROS)
+    for name in rng.sample(block_names, num_blocks):
+        config.add_block(name, "PV_" + name, rng.choice(group_names), rng.random() < 0.8)
+    # Groups may also refer to blocks that do not exist or list a block twice
+    for group in config.groups.values():
+        if rng.random() < 0.2:
+            group.blocks.append(rng.choice(block_names + ["MISSING"]))
+    return config
+
+
 def create_default_test_config_holder(file_manager):
     ch = InactiveConfigHolder(MACROS, file_manager=file_manager, test_config=create_dummy_config())
     return ch
@@ -889,3 +937,52 @@ class TestConfigHolderSequence(unittest.TestCase):
         )
         self.assertRaises(Exception, ch.save_configuration, "This is invalid", False)
         self.assertRaises(Exception, ch.save_configuration, "This_is_invalid!", False)
+
+
+# (number of blocks, number of components) for each generated configuration
+GROUP_DETAILS_SIZES = [(0, 0), (1, 1), (10, 2), (100, 3), (1000, 5), (10000, 10)] + [
+    (random.Random(seed).randint(0, 500), random.Random(seed).randint(0, 6)) for seed in range(20)
+]
+
+
+class TestConfigHolderGroupDetailsMatchesReference(unittest.TestCase):
+    @parameterized.expand(
+        [(seed, blocks, comps) for seed, (blocks, comps) in enumerate(GROUP_DETAILS_SIZES)]
+    )
+    def test_GIVEN_random_config_WHEN_get_group_details_THEN_matches_reference(
+        self, seed, num_blocks, num_components
+    ):
+        rng = random.Random(seed)
+        file_manager = MockConfigurationFileManager()
+        # Draw from a shared pool of names so that components overlap with the config
+        block_names = ["BLOCK{}".format(i) for i in range(max(1, int(num_blocks * 1.5)))]
+        group_names = ["NONE"] + ["GROUP{}".format(i) for i in range(max(1, num_blocks // 20))]
+
+        ch = ConfigHolder(
+            MACROS,
+            file_manager=file_manager,
+            test_config=create_random_config(rng, num_blocks // 2, block_names, group_names),
+        )
+        for i in range(num_components):
+            name = "COMP{}".format(i)
+            size = rng.randint(0, num_blocks // num_components)
+            file_manager.comps[name.lower()] = create_random_config(
+                rng, min(size, len(block_names)), block_names, group_names
+            )
+            ch.add_component(name)
+
+        expected = reference_group_details(ch._config, ch._components, ch.get_blocknames())
+        components_before = copy.deepcopy(ch._components)
+        actual = ch.get_group_details()
+
+        self.assertEqual(list(actual.keys()), list(expected.keys()))
+        for key in expected:
+            self.assertEqual(actual[key].name, expected[key].name)
+            self.assertEqual(actual[key].component, expected[key].component)
+            self.assertEqual(actual[key].blocks, expected[key].blocks)
+        # Getting the details must not change the components themselves
+        for name, component in components_before.items():
+            self.assertEqual(
+                [g.blocks for g in ch._components[name].groups.values()],
+                [g.blocks for g in component.groups.values()],
+            )
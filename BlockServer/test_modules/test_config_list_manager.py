@@ -14,9 +14,12 @@
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
 
+import json
 import os
 import unittest
 
+from mock import patch
+
 from BlockServer.config.configuration import Configuration
 from BlockServer.core.active_config_holder import ActiveConfigHolder
 from BlockServer.core.config_list_manager import ConfigListManager, InvalidDeleteException
@@ -30,8 +33,8 @@ from BlockServer.mocks.mock_file_manager import MockConfigurationFileManager
 from BlockServer.mocks.mock_ioc_control import MockIocControl
 from server_common.channel_access import ManagerModeRequiredError
 from server_common.helpers import MACROS
-from server_common.pv_names import prepend_blockserver
-from server_common.utilities import create_pv_name
+from server_common.pv_names import BlockserverPVNames, prepend_blockserver
+from server_common.utilities import create_pv_name, dehex_and_decompress
 
 CONFIG_PATH = "./test_configs/"
 SCHEMA_PATH = "./../../../../schema"
@@ -417,6 +420,35 @@ class TestInactiveConfigsSequence(unittest.TestCase):
         self.assertFalse(self._does_pv_exist(pvs[2]))
         self.assertTrue(self._does_pv_exist(pvs[3]))
 
+    def test_all_component_details_lists_components_and_drops_deleted_ones(self):
+        self._create_components(["TEST_COMPONENT1", "TEST_COMPONENT2"])
+
+        self.clm.delete_components(["TEST_COMPONENT1"])
+
+        details = self.clm.get_all_component_details()
+        published = json.loads(
+            dehex_and_decompress(self.bs.pvs[BlockserverPVNames.ALL_COMPONENT_DETAILS])
+        )
+        self.assertEqual([d["name"] for d in details], ["TEST_COMPONENT2"])
+        self.assertEqual([d["name"] for d in published], ["TEST_COMPONENT2"])
+
+    def test_all_component_details_payload_only_rebuilt_after_component_changes(self):
+        self._create_components(["TEST_COMPONENT1"])
+        payload = self.clm.get_all_component_details_payload()
+
+        self.assertIs(self.clm.get_all_component_details_payload(), payload)
+
+        self._create_components(["TEST_COMPONENT2"])
+        self.assertIsNot(self.clm.get_all_component_details_payload(), payload)
+
+    def test_all_component_details_payload_rebuilt_after_component_files_change(self):
+        self._create_components(["TEST_COMPONENT1"])
+        payload = self.clm.get_all_component_details_payload()
+
+        changed_files = (("blocks.xml", 1, 1),)
+        with patch.object(self.clm._component_details, "signature", return_value=changed_files):
+            self.assertIsNot(self.clm.get_all_component_details_payload(), payload)
+
     def test_delete_many_inactive_configs_works(self):
         self._create_configs(["TEST_CONFIG1", "TEST_CONFIG2", "TEST_CONFIG3"], self.clm)
         self.clm.active_config_name = "TEST_ACTIVE"
@@ -525,6 +557,17 @@ class TestInactiveConfigsSequence(unittest.TestCase):
         self.assertTrue("TEST_CONFIG1" in self.clm.get_dependencies("TEST_COMPONENT1"))
         self.assertTrue("TEST_CONFIG2" in self.clm.get_dependencies("TEST_COMPONENT1"))
 
+    def test_components_of_config_include_its_components_and_base(self):
+        self._create_components(["TEST_COMPONENT1", "TEST_COMPONENT2"])
+        inactive = self._create_inactive_config_holder()
+        inactive.add_component("TEST_COMPONENT1")
+        inactive.save_inactive("TEST_INACTIVE")
+        self.clm.update_a_config_in_list(inactive)
+
+        self.assertEqual(
+            sorted(self.clm.get_components_of("test_inactive")), ["_base", "test_component1"]
+        )
+
     def test_dependencies_updates_remove(self):
         self._create_components(["TEST_COMPONENT1"])
 
@@ -551,6 +594,60 @@ class TestInactiveConfigsSequence(unittest.TestCase):
         self.clm.delete_configs(["TEST_INACTIVE"])
         self.assertNotIn("TEST_INACTIVE", self.clm.get_dependencies("TEST_COMPONENT1"))
 
+    def test_GIVEN_configs_saved_WHEN_searching_by_block_THEN_only_matching_configs_found(self):
+        self._create_configs(["TEST_CONFIG1", "TEST_CONFIG2"], self.clm)
+
+        rows = self.clm.search("block", "testblock4")
+
+        self.assertEqual(["TEST_CONFIG1", "TEST_CONFIG2"], [row["config"] for row in rows])
+        self.assertEqual("PV4", rows[0]["pv"])
+
+    def test_GIVEN_configs_and_components_saved_WHEN_cache_sizes_got_THEN_they_are_counted(self):
+        self._create_configs(["TEST_CONFIG1", "TEST_CONFIG2"], self.clm)
+        self._create_components(["TEST_COMPONENT1"])
+
+        sizes = self.clm.get_cache_sizes()
+
+        self.assertEqual(2, sizes["configs"])
+        self.assertEqual(2, sizes["config_details_pvs"])
+        self.assertEqual(1, sizes["components"])
+
+    def test_GIVEN_config_deleted_WHEN_searching_THEN_config_not_found(self):
+        self._create_configs(["TEST_CONFIG1", "TEST_CONFIG2"], self.clm)
+        self.clm.active_config_name = "TEST_ACTIVE"
+
+        self.clm.delete_configs(["TEST_CONFIG1"])
+
+        rows = self.clm.search("ioc", "SIMPLE1")
+        self.assertEqual(["TEST_CONFIG2"], [row["config"] for row in rows])
+
+    def test_GIVEN_component_used_by_config_WHEN_searching_THEN_component_row_lists_config(self):
+        self._create_components(["TEST_COMPONENT1"])
+        inactive = self._create_inactive_config_holder()
+        inactive.add_component("TEST_COMPONENT1")
+        inactive.save_inactive("TEST_INACTIVE")
+        self.clm.update_a_config_in_list(inactive)
+
+        rows = self.clm.search("ioc", "COMPSIMPLE1")
+
+        self.assertEqual(1, len(rows))
+        self.assertEqual("TEST_COMPONENT1", rows[0]["config"])
+        self.assertEqual(["TEST_INACTIVE"], rows[0]["used_by"])
+
+    def test_WHEN_several_configs_updated_together_THEN_monitors_updated_once(self):
+        holders = []
+        for name in ["TEST_CONFIG1", "TEST_CONFIG2"]:
+            holder = self._create_inactive_config_holder()
+            holder.set_config(create_dummy_config(name))
+            holder.save_inactive(name)
+            holders.append((holder, False))
+
+        with patch.object(self.clm, "update_monitors") as update_monitors:
+            self.clm.update_configs_in_list(holders)
+
+        update_monitors.assert_called_once_with()
+        self.assertEqual(2, len(self.clm.get_configs()))
+
     def test_cannot_delete_default(self):
         self._create_components(["TEST_COMPONENT1"])
 
@@ -0,0 +1,209 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+from mock import Mock
+from server_common.helpers import MACROS
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.core.active_config_holder import ActiveConfigHolder
+from BlockServer.core.config_staging import ConfigStager, content_hash
+from BlockServer.core.constants import ARCHIVE_CONFIG, GATEWAY_ALIASES
+from BlockServer.fileIO.file_manager import STAGING_DIR_PREFIX
+from BlockServer.mocks.mock_file_manager import MockConfigurationFileManager
+from BlockServer.mocks.mock_ioc_control import MockIocControl
+
+
+def block_names(blocks):
+    return ",".join(block.name for block in blocks.values())
+
+
+class TestConfigStaging(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.file_manager = MockConfigurationFileManager()
+        self.add_config("TEST_CONFIG", ["BLOCK1", "BLOCK2"], ["IOC1"])
+        self.stager = ConfigStager(
+            MACROS,
+            self.file_manager,
+            {GATEWAY_ALIASES: block_names},
+            get_path=self.get_path,
+        )
+        self.addCleanup(self.stager.shutdown)
+
+    def get_path(self, name, is_component):
+        return os.path.join(self.dir, "components" if is_component else "configurations", name)
+
+    def write_file(self, name, content, is_component=False):
+        path = self.get_path(name, is_component)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "blocks.xml"), "w") as f:
+            f.write(content)
+
+    def add_config(self, name, blocks, iocs):
+        config = Configuration(MACROS)
+        config.set_name(name)
+        for block in blocks:
+            config.add_block(block, "PV:" + block)
+        for ioc in iocs:
+            config.add_ioc(ioc)
+        self.file_manager.save_config(config, False)
+        self.write_file(name, ",".join(blocks))
+        self.write_file("_base", "", is_component=True)
+
+    def test_content_hash_changes_only_when_files_change(self):
+        paths = [self.get_path("TEST_CONFIG", False)]
+        original = content_hash(paths)
+
+        assert_that(content_hash(paths), is_(original))
+        self.write_file("TEST_CONFIG", "changed")
+        assert_that(content_hash(paths), is_not(original))
+
+    def test_content_hash_ignores_saves_in_progress(self):
+        paths = [self.get_path("TEST_CONFIG", False)]
+        original = content_hash(paths)
+
+        staging_dir = os.path.join(paths[0], STAGING_DIR_PREFIX + "abc")
+        os.makedirs(staging_dir)
+        with open(os.path.join(staging_dir, "blocks.xml"), "w") as f:
+            f.write("changed")
+
+        assert_that(content_hash(paths), is_(original))
+
+    def test_GIVEN_config_prestaged_WHEN_taken_THEN_loaded_config_and_artifacts_returned(self):
+        self.stager.prestage("TEST_CONFIG").result()
+
+        staged = self.stager.take("test_config")
+
+        assert_that(staged.get_name(), is_("TEST_CONFIG"))
+        assert_that(staged.holder.get_blocknames(), contains_inanyorder("BLOCK1", "BLOCK2"))
+        assert_that(staged.artifacts, is_({GATEWAY_ALIASES: "BLOCK1,BLOCK2"}))
+
+    def test_GIVEN_config_not_prestaged_WHEN_taken_THEN_none(self):
+        assert_that(self.stager.take("TEST_CONFIG"), is_(None))
+
+    def test_GIVEN_files_changed_after_staging_WHEN_taken_THEN_none(self):
+        self.stager.prestage("TEST_CONFIG").result()
+        self.write_file("TEST_CONFIG", "changed")
+
+        assert_that(self.stager.take("TEST_CONFIG"), is_(None))
+
+    def test_GIVEN_component_changed_after_staging_WHEN_taken_THEN_none(self):
+        self.stager.prestage("TEST_CONFIG").result()
+        self.write_file("_base", "changed", is_component=True)
+
+        assert_that(self.stager.take("TEST_CONFIG"), is_(None))
+
+    def test_GIVEN_files_changed_while_loading_WHEN_taken_THEN_none(self):
+        load_config = self.file_manager.load_config
+
+        def load_and_change(name, macros, is_component):
+            config = load_config(name, macros, is_component)
+            self.write_file("TEST_CONFIG", "changed")
+            return config
+
+        self.file_manager.load_config = load_and_change
+        self.stager.prestage("TEST_CONFIG").result()
+
+        assert_that(self.stager.take("TEST_CONFIG"), is_(None))
+
+    def test_GIVEN_config_with_component_WHEN_staged_THEN_component_files_fingerprinted(self):
+        component = Configuration(MACROS)
+        component.set_name("COMP")
+        self.file_manager.save_config(component, True)
+        self.write_file("COMP", "", is_component=True)
+        config = self.file_manager.load_config("TEST_CONFIG", MACROS, False)
+        config.components["comp"] = "COMP"
+        self.file_manager.save_config(config, False)
+        self.stager.prestage("TEST_CONFIG").result()
+        self.write_file("COMP", "changed", is_component=True)
+
+        assert_that(self.stager.take("TEST_CONFIG"), is_(None))
+
+    def test_GIVEN_fingerprint_changed_after_staging_WHEN_taken_THEN_none(self):
+        revision = [1]
+        self.stager = ConfigStager(
+            MACROS,
+            self.file_manager,
+            {GATEWAY_ALIASES: block_names},
+            get_path=self.get_path,
+            fingerprint=lambda paths: str(revision[0]),
+        )
+        self.addCleanup(self.stager.shutdown)
+        self.stager.prestage("TEST_CONFIG").result()
+        revision[0] += 1
+
+        assert_that(self.stager.take("TEST_CONFIG"), is_(None))
+
+    def test_GIVEN_staging_fails_WHEN_taken_THEN_none(self):
+        self.stager.prestage("UNKNOWN").exception()
+
+        assert_that(self.stager.take("UNKNOWN"), is_(None))
+
+    def test_GIVEN_unchanged_config_prestaged_twice_THEN_loaded_once(self):
+        first = self.stager.prestage("TEST_CONFIG").result()
+        second = self.stager.prestage("TEST_CONFIG").result()
+
+        assert_that(second, same_instance(first))
+        assert_that(self.file_manager.get_load_config_history().count("TEST_CONFIG"), is_(1))
+
+    def test_GIVEN_config_discarded_WHEN_taken_THEN_none(self):
+        self.stager.prestage("TEST_CONFIG").result()
+        self.stager.discard("TEST_CONFIG")
+
+        assert_that(self.stager.take("TEST_CONFIG"), is_(None))
+
+    def test_GIVEN_same_active_iocs_as_when_staged_THEN_ioc_changes_reused(self):
+        self.add_config("OLD_CONFIG", [], ["IOC1", "IOC2"])
+        old_iocs = self.file_manager.load_config("OLD_CONFIG", MACROS, False).iocs
+        self.stager = ConfigStager(
+            MACROS, self.file_manager, {}, lambda: dict(old_iocs), get_path=self.get_path
+        )
+        staged = self.stager.prestage("TEST_CONFIG").result()
+
+        assert_that(staged.get_ioc_changes(old_iocs), is_((set(), set(), {"IOC2"})))
+        assert_that(staged.get_ioc_changes({}), is_(None))
+
+    def test_GIVEN_staged_config_WHEN_loaded_as_active_THEN_staged_artifacts_used_until_next_load(
+        self,
+    ):
+        archive = Mock()
+        active = ActiveConfigHolder(
+            MACROS, archive, self.file_manager, MockIocControl(""), self.dir
+        )
+        active.set_last_config = Mock()
+        staged = self.stager.prestage("TEST_CONFIG").result()
+
+        active.load_active("TEST_CONFIG", self.stager.take("TEST_CONFIG"))
+
+        assert_that(active.get_config_name(), is_("TEST_CONFIG"))
+        assert_that(active.get_blocknames(), contains_inanyorder("BLOCK1", "BLOCK2"))
+        assert_that(active.get_staged_artifact(GATEWAY_ALIASES), is_("BLOCK1,BLOCK2"))
+        assert_that(active.get_staged_artifact(ARCHIVE_CONFIG), is_(None))
+        assert_that(staged.holder.get_blocknames(), is_(active.get_blocknames()))
+
+        active.load_active("TEST_CONFIG")
+
+        assert_that(active.get_staged_artifact(GATEWAY_ALIASES), is_(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
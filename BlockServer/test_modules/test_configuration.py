@@ -13,8 +13,10 @@
 # along with this program; if not, you can obtain a copy from
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
+import copy
 import unittest
 
+from BlockServer.config.block import Block
 from BlockServer.config.configuration import Configuration
 from BlockServer.mocks.mock_configuration import (
     MockConfigurationFileManager,
@@ -114,6 +116,49 @@ class TestConfigurationSequence(unittest.TestCase):
         # assert
         self.assertEqual(len(block_names), 0)
 
+    def test_configuration_from_dict_round_trips_to_dict(self):
+        cf = self.config
+        cf.set_name("ROUND_TRIP")
+        cf.meta.description = "A description"
+        cf.meta.history = ["2024-01-01"]
+        cf.add_block(**NEW_BLOCK_ARGS)
+        cf.add_block("TESTBLOCK3", "PV3", "GROUP1", False, runcontrol=True, lowlimit=1.5)
+        cf.add_ioc("TESTIOC", macros={"A": {"value": "1"}}, simlevel="devsim")
+        cf.components["comp"] = "Comp"
+
+        copied = Configuration.from_dict(cf.to_dict(), MACROS)
+
+        self.assertEqual(copied.to_dict(), cf.to_dict())
+        self.assertEqual(copied.fingerprint, cf.fingerprint)
+        self.assertEqual(list(copied.blocks.keys()), list(cf.blocks.keys()))
+        self.assertEqual(copied.blocks["testblock1"].pv, cf.blocks["testblock1"].pv)
+
+    def test_block_from_dict_strips_prefix_macro_from_local_pv(self):
+        block = Block.from_dict(Block("NAME", "PV1", local=True).to_dict())
+
+        self.assertEqual(block.pv, "PV1")
+
+    def test_deep_copied_block_is_independent_and_keeps_fingerprint(self):
+        block = Block("NAME", "PV1")
+        fingerprint = block.fingerprint
+
+        copied = copy.deepcopy(block)
+        copied.visible = False
+
+        self.assertEqual(block.fingerprint, fingerprint)
+        self.assertTrue(block.visible)
+        self.assertNotEqual(copied.fingerprint, fingerprint)
+
+    def test_models_have_no_instance_dict(self):
+        self.config.add_block(**NEW_BLOCK_ARGS)
+        for model in [
+            self.config,
+            self.config.meta,
+            self.config.blocks["testblock1"],
+            self.config.groups["group1"],
+        ]:
+            self.assertFalse(hasattr(model, "__dict__"), type(model).__name__)
+
 
 if __name__ == "__main__":
     # start blockserver
@@ -502,6 +502,30 @@ class TestConfigurationXmlConverterSequence(unittest.TestCase):
         self.assertTrue("comp1" in comps)
         self.assertTrue("comp2" in comps)
 
+    def test_xml_to_blocks_prefers_namespaced_children_as_before(self):
+        # Arrange
+        xc = self.xml_converter
+        blocks = OrderedDict()
+        groups = {"none": Group("NONE")}
+        root_xml = ElementTree.fromstring(
+            '<blocks xmlns:blk="http://epics.isis.rl.ac.uk/schema/blocks/1.0">'
+            "<block><name>PLAIN</name><blk:name>NAMESPACED</blk:name><read_pv>PV</read_pv>"
+            '<other:local xmlns:other="http://example.com">False</other:local></block>'
+            "</blocks>"
+        )
+        block_xml = root_xml.find("block")
+
+        # Act
+        xc.blocks_from_xml(root_xml, blocks, groups)
+        nodes = xc._find_child_nodes(block_xml, "blk")
+
+        # Assert
+        self.assertEqual(list(blocks), ["namespaced"])
+        self.assertEqual(blocks["namespaced"].pv, "PV")
+        self.assertTrue(blocks["namespaced"].local)
+        for name in ["name", "read_pv", "local", "visible"]:
+            self.assertIs(nodes.get(name), xc._find_single_node(block_xml, "blk", name))
+
     def test_roundtrip_block_to_xml_to_block(self):
         # Arrange
         xc = self.xml_converter
@@ -0,0 +1,110 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import unittest
+from threading import Event, RLock
+
+from hamcrest import *
+from mock import patch
+
+from BlockServer.core.encoding_service import EncodingService, encode_json
+from server_common.utilities import compress_and_hex, convert_to_json
+
+TIMEOUT = 5
+
+
+def identity(value):
+    return value
+
+
+def wait_for(event):
+    def encoder(value):
+        event.wait(TIMEOUT)
+        return value
+
+    return encoder
+
+
+class TestEncodingService(unittest.TestCase):
+    def setUp(self):
+        self.set_values = []
+        self.updates = []
+        self.monitor_lock = RLock()
+        self.service = EncodingService(
+            lambda pv, value: self.set_values.append((pv, value)),
+            lambda: self.updates.append(len(self.set_values)),
+            self.monitor_lock,
+            max_workers=4,
+        )
+        self.addCleanup(self.service.shutdown)
+
+    def test_GIVEN_value_WHEN_submitted_THEN_encoded_value_set(self):
+        self.service.submit("PV", {"a": 1})
+
+        assert_that(self.service.flush(TIMEOUT), is_(True))
+        assert_that(self.set_values, is_([("PV", compress_and_hex(convert_to_json({"a": 1})))]))
+        assert_that(self.updates, is_not(empty()))
+
+    def test_GIVEN_earlier_value_slower_to_encode_THEN_values_still_set_in_order(self):
+        release = Event()
+        self.service.submit("PV1", "first", wait_for(release))
+        self.service.submit("PV2", "second", identity)
+        self.service.submit("PV3", "third", identity)
+
+        assert_that(self.service.flush(0.2), is_(False))
+        assert_that(self.set_values, is_(empty()))
+
+        release.set()
+        assert_that(self.service.flush(TIMEOUT), is_(True))
+        assert_that(self.set_values, is_([("PV1", "first"), ("PV2", "second"), ("PV3", "third")]))
+
+    def test_GIVEN_newer_value_for_same_pv_submitted_before_set_THEN_only_newer_value_set(self):
+        release = Event()
+        self.service.submit("PV", "old", wait_for(release))
+        self.service.submit("PV", "new", identity)
+
+        release.set()
+        self.service.flush(TIMEOUT)
+
+        assert_that(self.set_values, is_([("PV", "new")]))
+
+    def test_GIVEN_encoder_fails_THEN_error_logged_and_other_values_set(self):
+        def fail(_value):
+            raise ValueError("cannot encode")
+
+        with patch("BlockServer.core.encoding_service.print_and_log") as log:
+            self.service.submit("PV1", "first", fail)
+            self.service.submit("PV2", "second", identity)
+            self.service.flush(TIMEOUT)
+
+        assert_that(self.set_values, is_([("PV2", "second")]))
+        log.assert_called_once()
+
+    def test_GIVEN_monitor_lock_held_by_submitter_WHEN_submitting_THEN_does_not_deadlock(self):
+        with self.monitor_lock:
+            for i in range(50):
+                self.service.submit(f"PV{i}", i, identity)
+
+        assert_that(self.service.flush(TIMEOUT), is_(True))
+        assert_that(self.set_values, is_([(f"PV{i}", i) for i in range(50)]))
+
+    def test_encode_json_matches_inline_encoding(self):
+        value = {"blocks": ["A", "B"], "name": "CONFIG"}
+
+        assert_that(encode_json(value), is_(compress_and_hex(convert_to_json(value))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+from mock import Mock, patch
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.core.constants import (
+    FILENAME_BLOCKS,
+    FILENAME_COMPONENTS,
+    FILENAME_GROUPS,
+    FILENAME_IOCS,
+    FILENAME_META,
+)
+from BlockServer.fileIO.file_manager import STAGING_DIR_PREFIX, ConfigurationFileManager
+from server_common.helpers import MACROS
+
+CONFIG_NAME = "TEST_CONFIG"
+ALL_FILES = [FILENAME_BLOCKS, FILENAME_GROUPS, FILENAME_IOCS, FILENAME_COMPONENTS, FILENAME_META]
+
+
+class SimulatedCrash(Exception):
+    pass
+
+
+class TestConfigurationFileManagerSave(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, CONFIG_NAME)
+        get_path_patch = patch.object(ConfigurationFileManager, "get_path", return_value=self.path)
+        get_path_patch.start()
+        self.addCleanup(get_path_patch.stop)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+        self.file_manager = ConfigurationFileManager()
+        self.config = Configuration(MACROS)
+        self.config.set_name(CONFIG_NAME)
+        self.config.add_block("TESTBLOCK1", "PV1", "GROUP1")
+        self.config.add_ioc("SIMPLE1")
+        self.config.meta.description = "original description"
+
+    def _read_all(self):
+        contents = {}
+        for filename in ALL_FILES:
+            with open(os.path.join(self.path, filename)) as f:
+                contents[filename] = f.read()
+        return contents
+
+    def _staging_dirs(self):
+        return [f for f in os.listdir(self.path) if f.startswith(STAGING_DIR_PREFIX)]
+
+    def test_GIVEN_new_config_WHEN_saved_THEN_all_files_written_and_no_staging_left(self):
+        self.file_manager.save_config(self.config, False)
+
+        assert_that(sorted(os.listdir(self.path)), is_(sorted(ALL_FILES)))
+
+    def test_GIVEN_saved_config_WHEN_only_description_changes_THEN_only_meta_is_replaced(self):
+        self.file_manager.save_config(self.config, False)
+        inodes = {f: os.stat(os.path.join(self.path, f)).st_ino for f in ALL_FILES}
+
+        self.config.meta.description = "new description"
+        self.file_manager.save_config(self.config, False)
+
+        for filename in ALL_FILES:
+            unchanged = os.stat(os.path.join(self.path, filename)).st_ino == inodes[filename]
+            assert_that(unchanged, is_(filename != FILENAME_META), filename)
+        assert_that(self._read_all()[FILENAME_META], contains_string("new description"))
+
+    def test_GIVEN_saved_config_WHEN_saved_again_unchanged_THEN_no_files_replaced(self):
+        self.file_manager.save_config(self.config, False)
+        with patch("os.replace") as replace:
+            self.file_manager.save_config(self.config, False)
+
+        replace.assert_not_called()
+        assert_that(self._staging_dirs(), is_(empty()))
+
+    def test_GIVEN_saved_config_WHEN_save_fails_part_way_THEN_original_files_are_intact(self):
+        self.file_manager.save_config(self.config, False)
+        original = self._read_all()
+
+        self.config.add_block("TESTBLOCK2", "PV2", "GROUP2")
+        self.config.meta.description = "new description"
+
+        real_replace = os.replace
+        calls = []
+
+        def fail_on_second_replace(source, destination):
+            calls.append(destination)
+            if len(calls) == 2:
+                raise SimulatedCrash()
+            real_replace(source, destination)
+
+        with patch("os.replace", side_effect=fail_on_second_replace):
+            self.assertRaises(SimulatedCrash, self.file_manager.save_config, self.config, False)
+
+        assert_that(self._read_all(), is_(original))
+        assert_that(self._staging_dirs(), is_(empty()))
+
+    def test_GIVEN_new_config_WHEN_save_fails_part_way_THEN_no_partial_files_left(self):
+        real_replace = os.replace
+        calls = []
+
+        def fail_on_third_replace(source, destination):
+            calls.append(destination)
+            if len(calls) == 3:
+                raise SimulatedCrash()
+            real_replace(source, destination)
+
+        with patch("os.replace", side_effect=fail_on_third_replace):
+            self.assertRaises(SimulatedCrash, self.file_manager.save_config, self.config, False)
+
+        assert_that(os.listdir(self.path), is_(empty()))
+
+    def test_GIVEN_staging_dir_left_by_unfinished_save_WHEN_removed_THEN_only_staging_dir_gone(
+        self,
+    ):
+        self.file_manager.save_config(self.config, False)
+        os.makedirs(os.path.join(self.path, STAGING_DIR_PREFIX + "abc", "backup"))
+        paths = Mock(config_dir=self.root, component_dir=os.path.join(self.root, "components"))
+
+        with patch("BlockServer.fileIO.file_manager.FILEPATH_MANAGER", paths):
+            ConfigurationFileManager.remove_staging_dirs()
+
+        assert_that(sorted(os.listdir(self.path)), is_(sorted(ALL_FILES)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import copy
+import unittest
+
+from hamcrest import *
+from parameterized import parameterized
+
+from BlockServer.config.block import Block
+from BlockServer.config.configuration import Configuration
+from BlockServer.config.fingerprint import ModelDiff, content_hash, diff_fields, diff_models
+from BlockServer.config.group import Group
+from BlockServer.config.ioc import IOC
+from server_common.helpers import MACROS
+
+
+class TestContentHash(unittest.TestCase):
+    def test_GIVEN_dicts_with_different_key_order_THEN_hashes_are_equal(self):
+        assert_that(content_hash({"a": 1, "b": 2}), is_(content_hash({"b": 2, "a": 1})))
+
+    @parameterized.expand([(True, 1), (5, 5.0), (0, False), ({"a": [1, 2.0]}, {"a": (1, 2)})])
+    def test_GIVEN_values_which_compare_equal_THEN_hashes_are_equal(self, value1, value2):
+        assert_that(content_hash(value1), is_(content_hash(value2)))
+
+    @parameterized.expand([(1, "1"), (5, 5.5), ([1, 2], [2, 1]), ({"a": None}, {"a": ""})])
+    def test_GIVEN_different_values_THEN_hashes_differ(self, value1, value2):
+        assert_that(content_hash(value1), is_not(content_hash(value2)))
+
+
+class TestModelFingerprints(unittest.TestCase):
+    def test_GIVEN_block_WHEN_attribute_set_THEN_fingerprint_changes(self):
+        block = Block("NAME", "PV")
+        original = block.fingerprint
+
+        block.rc_enabled = True
+
+        assert_that(block.fingerprint, is_not(original))
+
+    def test_GIVEN_block_WHEN_attribute_set_back_THEN_fingerprint_restored(self):
+        block = Block("NAME", "PV")
+        original = block.fingerprint
+
+        block.visible = False
+        block.visible = True
+
+        assert_that(block.fingerprint, is_(original))
+
+    def test_GIVEN_block_WHEN_copied_THEN_copy_has_same_fingerprint(self):
+        block = Block("NAME", "PV", log_periodic=True)
+
+        assert_that(copy.deepcopy(block).fingerprint, is_(block.fingerprint))
+
+    def test_GIVEN_group_WHEN_block_added_and_removed_THEN_fingerprint_follows(self):
+        group = Group("GROUP")
+        empty = group.fingerprint
+
+        group.add_block("BLOCK")
+        with_block = group.fingerprint
+        group.remove_block("BLOCK")
+
+        assert_that(with_block, is_not(empty))
+        assert_that(group.fingerprint, is_(empty))
+
+    def test_GIVEN_ioc_WHEN_macros_replaced_THEN_fingerprint_changes(self):
+        ioc = IOC("SIMPLE", macros={"A": {"value": "1"}})
+        original = ioc.fingerprint
+
+        ioc.macros = {"A": {"value": "2"}}
+
+        assert_that(ioc.fingerprint, is_not(original))
+
+    def test_GIVEN_ioc_WHEN_macro_changed_in_place_and_invalidated_THEN_fingerprint_changes(self):
+        ioc = IOC("SIMPLE", macros={"A": {"value": "1"}})
+        original = ioc.fingerprint
+
+        ioc.macros["A"]["value"] = "2"
+        ioc.invalidate_fingerprint()
+
+        assert_that(ioc.fingerprint, is_not(original))
+
+    def test_GIVEN_configuration_WHEN_block_added_THEN_only_blocks_and_groups_fingerprints_change(
+        self,
+    ):
+        config = Configuration(MACROS)
+        config.add_ioc("SIMPLE")
+        before = config.get_fingerprints()
+
+        config.add_block("NAME", "PV", "GROUP")
+
+        after = config.get_fingerprints()
+        changed = {section for section in before if before[section] != after[section]}
+        assert_that(changed, is_({"blocks", "groups"}))
+
+
+class TestDiffModels(unittest.TestCase):
+    def test_GIVEN_collections_WHEN_diffed_THEN_added_removed_and_modified_found(self):
+        old = {"a": Block("a", "PV"), "b": Block("b", "PV"), "c": Block("c", "PV")}
+        new = {"a": Block("a", "PV"), "b": Block("b", "OTHER"), "d": Block("d", "PV")}
+
+        diff = diff_models(old, new)
+
+        assert_that(diff, is_(ModelDiff({"d"}, {"c"}, {"b"})))
+        assert_that(diff.to_dict(), is_({"added": ["d"], "removed": ["c"], "modified": ["b"]}))
+
+    def test_GIVEN_identical_collections_WHEN_diffed_THEN_diff_is_empty(self):
+        diff = diff_models({"a": IOC("a")}, {"a": IOC("a")})
+
+        assert_that(bool(diff), is_(False))
+
+    def test_GIVEN_key_added_in_one_diff_and_removed_in_other_WHEN_merged_THEN_reported_modified(
+        self,
+    ):
+        merged = ModelDiff({"a", "b"}, set(), set()).merge(ModelDiff(set(), {"a"}, {"c"}))
+
+        assert_that(merged, is_(ModelDiff({"b"}, set(), {"a", "c"})))
+
+    def test_GIVEN_models_differ_WHEN_fields_diffed_THEN_only_changed_fields_given(self):
+        old = Block("a", "PV", local=False, log_rate=5)
+        new = Block("a", "OTHER", local=False, log_rate=5.0)
+
+        assert_that(diff_fields(old, new), is_({"pv": ["PV", "OTHER"]}))
+
+    def test_GIVEN_same_models_WHEN_fields_diffed_THEN_empty(self):
+        assert_that(diff_fields(IOC("a"), IOC("a")), is_({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
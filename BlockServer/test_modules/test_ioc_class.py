@@ -33,6 +33,27 @@ class TestIocClassSequence(unittest.TestCase):
         macrotest = {"name": "macro2", "value": "Hello"}
         self.assertTrue(macrotest in d["macros"])
 
+    def test_ioc_from_dict_round_trips_to_dict(self):
+        ioc = IOC(
+            "SIMPLE1",
+            autostart=False,
+            component="comp",
+            macros={"macro1": {"value": 123}},
+            pvs={"pv1": {"value": "1"}},
+            pvsets={"set1": {"enabled": True}},
+            simlevel="recsim",
+            remotePvPrefix="REMOTE:",
+        )
+
+        copied = IOC.from_dict(ioc.to_dict())
+
+        self.assertEqual(copied.to_dict(), ioc.to_dict())
+        self.assertEqual(copied.macros, ioc.macros)
+        self.assertEqual(copied.fingerprint, ioc.fingerprint)
+
+    def test_ioc_has_no_instance_dict(self):
+        self.assertFalse(hasattr(IOC("SIMPLE1"), "__dict__"))
+
     def test_ioc_simlevel_none_spelling(self):
         ioc = IOC("SIMPLE1")
 
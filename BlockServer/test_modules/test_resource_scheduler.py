@@ -0,0 +1,234 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import random
+import unittest
+from collections import defaultdict
+from concurrent.futures import Future
+from threading import Event
+
+from hamcrest import *
+from parameterized import parameterized
+
+from BlockServer.core.resource_scheduler import (
+    ACTIVE_CONFIG,
+    ResourceScheduler,
+    active_config_resources,
+    component_resource,
+    config_resource,
+)
+
+TIMEOUT = 5
+RESOURCES = [ACTIVE_CONFIG, config_resource("A"), config_resource("B"), "synoptics", "devices"]
+
+
+def command(name):
+    return name
+
+
+class StepExecutor:
+    """Starts commands when asked to, so that a test chooses the order in which running
+    commands finish."""
+
+    def __init__(self):
+        self.started = []
+
+    def submit(self, func, *args):
+        future = Future()
+        if hasattr(func, "start"):
+            func.start()
+        self.started.append((func, args, future))
+        return future
+
+    def finish(self, index):
+        func, args, future = self.started.pop(index)
+        try:
+            future.set_result(func(*args))
+        except Exception as err:
+            future.set_exception(err)
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class ReadModifyWrite:
+    """Increments a counter for each of its resources, reading the counters when it starts and
+    writing them when it finishes. Two of these running at once on a resource lose an update."""
+
+    def __init__(self, counters, history, resources, number):
+        self.counters = counters
+        self.history = history
+        self.resources = resources
+        self.number = number
+        self.read = {}
+
+    def start(self):
+        self.read = {r: self.counters[r] for r in self.resources}
+
+    def __call__(self):
+        for resource in self.resources:
+            self.counters[resource] = self.read[resource] + 1
+            self.history[resource].append(self.number)
+
+
+class LoadConfig:
+    """Reads the files of a configuration and its components, one at a time, as loading a
+    configuration does. Records a torn read if a file changed between reading the first and the
+    last of them."""
+
+    def __init__(self, files, resources):
+        self.files = files
+        self.resources = resources
+        self.first = {}
+        self.torn = False
+
+    def start(self):
+        self.first = {r: self.files[r] for r in self.resources}
+
+    def __call__(self):
+        self.torn = any(self.files[r] != version for r, version in self.first.items())
+
+
+class SaveFiles:
+    """Saves the files of a configuration or component."""
+
+    def __init__(self, files, resource):
+        self.files = files
+        self.resource = resource
+
+    def __call__(self):
+        self.files[self.resource] += 1
+
+
+class TestResourceScheduler(unittest.TestCase):
+    def setUp(self):
+        self.executor = StepExecutor()
+        self.scheduler = ResourceScheduler(executor=self.executor)
+
+    def _started_names(self):
+        return [args[0] for _, args, _ in self.executor.started]
+
+    def test_GIVEN_commands_on_different_resources_THEN_both_start(self):
+        self.scheduler.submit(command, ("active",), [ACTIVE_CONFIG])
+        self.scheduler.submit(command, ("config",), [config_resource("A")])
+
+        assert_that(self._started_names(), contains_exactly("active", "config"))
+
+    def test_GIVEN_commands_on_same_resource_THEN_second_starts_when_first_finishes(self):
+        self.scheduler.submit(command, ("first",), [ACTIVE_CONFIG])
+        self.scheduler.submit(command, ("second",), [ACTIVE_CONFIG, config_resource("A")])
+
+        assert_that(self._started_names(), contains_exactly("first"))
+        self.executor.finish(0)
+        assert_that(self._started_names(), contains_exactly("second"))
+
+    def test_GIVEN_command_without_resources_THEN_runs_alone_in_order(self):
+        self.scheduler.submit(command, ("before",), [ACTIVE_CONFIG])
+        self.scheduler.submit(command, ("alone",))
+        self.scheduler.submit(command, ("after",), [config_resource("A")])
+
+        assert_that(self._started_names(), contains_exactly("before"))
+        self.executor.finish(0)
+        assert_that(self._started_names(), contains_exactly("alone"))
+        self.executor.finish(0)
+        assert_that(self._started_names(), contains_exactly("after"))
+
+    def test_GIVEN_waiting_command_THEN_later_command_sharing_its_resource_does_not_overtake(self):
+        self.scheduler.submit(command, ("active",), [ACTIVE_CONFIG])
+        self.scheduler.submit(command, ("active and A",), [ACTIVE_CONFIG, config_resource("A")])
+        self.scheduler.submit(command, ("A",), [config_resource("A")])
+        self.scheduler.submit(command, ("B",), [config_resource("B")])
+
+        assert_that(self._started_names(), contains_exactly("active", "B"))
+
+    def test_GIVEN_command_fails_THEN_future_holds_error_and_next_command_starts(self):
+        def fail():
+            raise ValueError("failed")
+
+        future = self.scheduler.submit(fail, (), [ACTIVE_CONFIG])
+        self.scheduler.submit(command, ("next",), [ACTIVE_CONFIG])
+        self.executor.finish(0)
+
+        assert_that(calling(future.result), raises(ValueError))
+        assert_that(self._started_names(), contains_exactly("next"))
+
+    @parameterized.expand([(seed,) for seed in range(25)])
+    def test_GIVEN_random_commands_finishing_in_random_order_THEN_no_lost_updates(self, seed):
+        rng = random.Random(seed)
+        counters = defaultdict(int)
+        history = defaultdict(list)
+        expected = defaultdict(list)
+        most_running = 0
+
+        for number in range(60):
+            resources = rng.sample(RESOURCES, rng.randint(1, 2))
+            for resource in resources:
+                expected[resource].append(number)
+            self.scheduler.submit(
+                ReadModifyWrite(counters, history, resources, number), (), resources
+            )
+            # Let a random number of the running commands finish between submissions
+            for _ in range(rng.randint(0, len(self.executor.started))):
+                most_running = max(most_running, len(self.executor.started))
+                self.executor.finish(rng.randrange(len(self.executor.started)))
+
+        while self.executor.started:
+            most_running = max(most_running, len(self.executor.started))
+            self.executor.finish(rng.randrange(len(self.executor.started)))
+
+        assert_that(self.scheduler.wait_until_idle(0), is_(True))
+        assert_that(dict(counters), is_({r: len(numbers) for r, numbers in expected.items()}))
+        assert_that(dict(history), is_(dict(expected)))
+        assert_that(most_running, is_(greater_than(1)))
+
+    def test_GIVEN_load_running_WHEN_its_component_or_config_saved_THEN_save_waits_for_load(self):
+        files = defaultdict(int)
+        resources = active_config_resources({"A": ["comp1"], "ACTIVE": ["comp2"]})
+        load = LoadConfig(files, [r for r in resources if r != ACTIVE_CONFIG])
+        self.scheduler.submit(load, (), resources)
+        for resource in (
+            component_resource("comp1"),
+            component_resource("comp2"),
+            config_resource("ACTIVE"),
+        ):
+            self.scheduler.submit(SaveFiles(files, resource), (), [resource])
+        other = SaveFiles(files, component_resource("comp3"))
+        self.scheduler.submit(other, (), [other.resource])
+
+        assert_that([func for func, _, _ in self.executor.started], contains_exactly(load, other))
+        # Finish the load last of the commands started, as a save could overtake it
+        self.executor.finish(1)
+        self.executor.finish(0)
+        while self.executor.started:
+            self.executor.finish(0)
+
+        assert_that(load.torn, is_(False))
+        assert_that(sum(files.values()), is_(4))
+
+    def test_GIVEN_thread_pool_WHEN_active_config_command_blocked_THEN_config_command_runs(self):
+        scheduler = ResourceScheduler(max_workers=2)
+        self.addCleanup(scheduler.shutdown)
+        release = Event()
+        scheduler.submit(release.wait, (TIMEOUT,), [ACTIVE_CONFIG])
+
+        saved = scheduler.submit(lambda: "saved", (), [config_resource("A")])
+
+        assert_that(saved.result(TIMEOUT), is_("saved"))
+        release.set()
+        assert_that(scheduler.wait_until_idle(TIMEOUT), is_(True))
+
+
+if __name__ == "__main__":
+    unittest.main()
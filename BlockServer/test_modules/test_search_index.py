@@ -0,0 +1,95 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import unittest
+
+from hamcrest import *
+from server_common.helpers import MACROS
+
+from BlockServer.config.block import Block
+from BlockServer.config.ioc import IOC
+from BlockServer.core.search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.update(
+            "CONFIG1",
+            False,
+            [Block("TEMP", "IN:INST:EUROTHRM_01:TEMP", local=False), Block("FIELD", "MAG:FIELD")],
+            [IOC("EUROTHRM_01")],
+        )
+        self.index.update(
+            "COMP1", True, [Block("TEMP", "IN:INST:LKSH336_01:TEMP", local=False)], []
+        )
+
+    def test_WHEN_searching_by_block_THEN_rows_from_configs_and_components_returned(self):
+        assert_that(
+            self.index.search("block", "temp"),
+            is_(
+                [
+                    {
+                        "config": "COMP1",
+                        "is_component": True,
+                        "block": "TEMP",
+                        "pv": "IN:INST:LKSH336_01:TEMP",
+                    },
+                    {
+                        "config": "CONFIG1",
+                        "is_component": False,
+                        "block": "TEMP",
+                        "pv": "IN:INST:EUROTHRM_01:TEMP",
+                    },
+                ]
+            ),
+        )
+
+    def test_GIVEN_local_block_WHEN_searching_with_or_without_prefix_THEN_found(self):
+        full_pv = MACROS["$(MYPVPREFIX)"] + "MAG:FIELD"
+
+        for value in ("MAG:FIELD", full_pv):
+            rows = self.index.search("pv", value)
+            assert_that([row["pv"] for row in rows], is_([full_pv]))
+
+    def test_WHEN_searching_for_part_of_value_THEN_only_containing_rows_returned(self):
+        rows = self.index.search("pv", "eurothrm", match="contains")
+
+        assert_that([row["config"] for row in rows], is_(["CONFIG1"]))
+        assert_that(self.index.search("ioc", "EUROTHRM"), is_([]))
+
+    def test_GIVEN_config_updated_WHEN_searching_THEN_only_new_contents_found(self):
+        self.index.update("config1", False, [Block("PRESSURE", "IN:INST:PRES")], [])
+
+        assert_that(self.index.search("ioc", "EUROTHRM_01"), is_([]))
+        assert_that(self.index.search("block", "FIELD"), is_([]))
+        assert_that(len(self.index.search("block", "PRESSURE")), is_(1))
+
+    def test_GIVEN_component_removed_WHEN_searching_THEN_config_of_same_name_kept(self):
+        self.index.update("COMP1", False, [Block("TEMP", "OTHER:TEMP", local=False)], [])
+
+        self.index.remove("comp1", True)
+
+        rows = self.index.search("block", "TEMP")
+        assert_that([row["pv"] for row in rows], has_item("OTHER:TEMP"))
+        assert_that(self.index.search("pv", "IN:INST:LKSH336_01:TEMP"), is_([]))
+
+    def test_WHEN_searching_unknown_field_THEN_error(self):
+        with self.assertRaises(ValueError):
+            self.index.search("group", "TEMPS")
+
+
+if __name__ == "__main__":
+    unittest.main()
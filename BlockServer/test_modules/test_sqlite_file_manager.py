@@ -0,0 +1,179 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+from mock import Mock, patch
+from server_common.helpers import MACROS
+
+from BlockServer.config.configuration import Configuration
+from BlockServer.fileIO.file_manager import ConfigurationFileManager
+from BlockServer.fileIO.sqlite_file_manager import (
+    ConfigDatabase,
+    SqliteConfigurationFileManager,
+    SqliteSynopticFileIO,
+    export_to_xml,
+    import_from_xml,
+)
+
+
+def make_config(name, blocks=(), iocs=(), components=()):
+    config = Configuration(MACROS)
+    config.set_name(name)
+    for block in blocks:
+        config.add_block(block, "PV:" + block, "GROUP1")
+    for ioc in iocs:
+        config.add_ioc(ioc)
+    for component in components:
+        config.components[component.lower()] = component
+    config.meta.description = f"{name} description"
+    return config
+
+
+def patch_schema_check(test):
+    # The schemas are not part of this repository
+    schema_patch = patch.object(ConfigurationFileManager, "_check_against_schema")
+    schema_patch.start()
+    test.addCleanup(schema_patch.stop)
+
+
+class TestSqliteConfigurationFileManager(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.database = ConfigDatabase(os.path.join(self.dir, "configs.sqlite"))
+        self.addCleanup(self.database.close)
+        self.file_manager = SqliteConfigurationFileManager(self.database)
+        patch_schema_check(self)
+
+    def test_WHEN_config_saved_THEN_loaded_the_same_as_from_xml_files(self):
+        config = make_config("TEST_CONFIG", ["BLOCK1", "BLOCK2"], ["IOC1"], ["COMP1"])
+        xml_files = ConfigurationFileManager()
+        path = os.path.join(self.dir, "TEST_CONFIG")
+        xml_files.save_config_to_path(config, path)
+        self.file_manager.save_config(config, False)
+
+        loaded = self.file_manager.load_config("test_config", MACROS, False)
+
+        expected = xml_files.load_config_from_path("TEST_CONFIG", path, MACROS, False)
+        assert_that(loaded.get_name(), is_("TEST_CONFIG"))
+        assert_that(loaded.fingerprint, is_(expected.fingerprint))
+
+    def test_GIVEN_config_not_saved_WHEN_loaded_THEN_error(self):
+        with self.assertRaises(IOError):
+            self.file_manager.load_config("UNKNOWN", MACROS, False)
+
+    def test_GIVEN_configs_and_components_saved_THEN_names_listed_separately(self):
+        self.file_manager.save_config(make_config("CONFIG_B"), False)
+        self.file_manager.save_config(make_config("CONFIG_A"), False)
+        self.file_manager.save_config(make_config("COMP1"), True)
+
+        assert_that(self.file_manager.get_names(False), is_(["CONFIG_A", "CONFIG_B"]))
+        assert_that(self.file_manager.get_names(True), is_(["COMP1"]))
+
+    def test_GIVEN_config_saved_again_WHEN_queried_THEN_only_new_contents_found(self):
+        self.file_manager.save_config(make_config("TEST_CONFIG", ["BLOCK1"], ["IOC1"]), False)
+        self.file_manager.save_config(make_config("TEST_CONFIG", ["BLOCK2"], ["IOC2"]), False)
+
+        assert_that(self.file_manager.get_configs_using_pv("PV:BLOCK1"), is_([]))
+        assert_that(self.file_manager.get_configs_using_pv("PV:BLOCK2"), is_(["TEST_CONFIG"]))
+        assert_that(self.file_manager.get_configs_using_ioc("IOC1"), is_([]))
+        assert_that(self.file_manager.get_configs_using_ioc("IOC2"), is_(["TEST_CONFIG"]))
+
+    def test_GIVEN_configs_with_components_WHEN_queried_THEN_configs_using_component_found(self):
+        self.file_manager.save_config(make_config("CONFIG1", components=["COMP1"]), False)
+        self.file_manager.save_config(make_config("CONFIG2", components=["COMP2"]), False)
+
+        assert_that(self.file_manager.get_configs_using_component("comp1"), is_(["CONFIG1"]))
+
+    def test_GIVEN_config_saved_WHEN_deleted_THEN_not_found(self):
+        self.file_manager.save_config(make_config("TEST_CONFIG", ["BLOCK1"]), False)
+
+        self.file_manager.delete("TEST_CONFIG", False)
+
+        assert_that(self.file_manager.get_names(False), is_([]))
+        assert_that(self.file_manager.get_configs_using_pv("PV:BLOCK1"), is_([]))
+
+    def test_GIVEN_transaction_fails_part_way_THEN_no_saves_in_it_kept(self):
+        self.file_manager.save_config(make_config("TEST_CONFIG", ["BLOCK1"]), False)
+        revision = self.database.get_revision()
+
+        with self.assertRaises(RuntimeError):
+            with self.database.transaction():
+                self.file_manager.save_config(make_config("TEST_CONFIG", ["BLOCK2"]), False)
+                self.file_manager.save_config(make_config("OTHER_CONFIG"), False)
+                raise RuntimeError("Failed")
+
+        assert_that(self.file_manager.get_names(False), is_(["TEST_CONFIG"]))
+        loaded = self.file_manager.load_config("TEST_CONFIG", MACROS, False)
+        assert_that(list(loaded.blocks), is_(["block1"]))
+        assert_that(self.database.get_revision(), is_(revision))
+
+    def test_WHEN_synoptic_saved_THEN_listed_and_read(self):
+        synoptics = SqliteSynopticFileIO(self.database)
+
+        synoptics.write_synoptic_file("SYN1", "/synoptics/SYN1.xml", b"<instrument/>")
+
+        assert_that(synoptics.get_list_synoptic_files(""), is_(["SYN1.xml"]))
+        assert_that(synoptics.read_synoptic_file("", "SYN1.xml"), is_(b"<instrument/>"))
+        synoptics.delete_synoptic("", "SYN1.xml")
+        assert_that(synoptics.get_list_synoptic_files(""), is_([]))
+
+
+class TestSqliteImportExport(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.database = ConfigDatabase(os.path.join(self.dir, "configs.sqlite"))
+        self.addCleanup(self.database.close)
+        root = os.path.join(self.dir, "root")
+        paths = Mock(
+            config_dir=os.path.join(root, "configurations"),
+            component_dir=os.path.join(root, "components"),
+            synoptic_dir=os.path.join(root, "synoptics"),
+            devices_dir=os.path.join(root, "devices"),
+        )
+        self.paths = paths
+        path_patch = patch("BlockServer.fileIO.sqlite_file_manager.FILEPATH_MANAGER", paths)
+        path_patch.start()
+        self.addCleanup(path_patch.stop)
+        patch_schema_check(self)
+
+    def test_GIVEN_xml_layout_WHEN_imported_and_exported_THEN_same_configurations_written(self):
+        xml_files = ConfigurationFileManager()
+        config_path = os.path.join(self.paths.config_dir, "TEST_CONFIG")
+        xml_files.save_config_to_path(
+            make_config("TEST_CONFIG", ["BLOCK1"], ["IOC1"], ["COMP1"]), config_path
+        )
+        xml_files.save_config_to_path(
+            make_config("COMP1", ["BLOCK2"]), os.path.join(self.paths.component_dir, "COMP1")
+        )
+        original = xml_files.load_config_from_path("TEST_CONFIG", config_path, MACROS, False)
+
+        import_from_xml(self.database)
+        shutil.rmtree(os.path.join(self.dir, "root"))
+        export_to_xml(self.database)
+
+        exported = xml_files.load_config_from_path("TEST_CONFIG", config_path, MACROS, False)
+        assert_that(exported.fingerprint, is_(original.fingerprint))
+        assert_that(os.listdir(self.paths.component_dir), is_(["COMP1"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import unittest
+
+from hamcrest import *
+
+from BlockServer.benchmarks.import_time import profile_imports
+
+# Packages that need the control system to import, and so are replaced with empty modules
+STUBBED_PACKAGES = ["pcaspy", "genie_python"]
+# The modules that are only needed once the PVs are served
+SLOW_MODULES = ["lxml", "git", "tornado", "numpy", "mysql"]
+# The most modules importing block_server may import, leaving some room
+MAX_STARTUP_MODULES = 300
+
+
+class TestStartupImports(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        times = profile_imports("block_server", STUBBED_PACKAGES)
+        # Failed attempts to import optional modules are reported more than once
+        cls.imported = {t.module for t in times}
+
+    def test_WHEN_block_server_imported_THEN_slow_modules_not_imported(self):
+        top_level = {module.split(".")[0] for module in self.imported}
+        assert_that(top_level.intersection(SLOW_MODULES), is_(empty()))
+
+    def test_WHEN_block_server_imported_THEN_number_of_modules_imported_is_limited(self):
+        assert_that(len(self.imported), less_than_or_equal_to(MAX_STARTUP_MODULES))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+
+from BlockServer.core.encoding_service import encode_json
+from BlockServer.core.state_snapshot import StateSnapshot, file_digests
+
+PVS = {"CS:BLOCKSERVER:GROUPS": "789c", "CS:BLOCKSERVER:CURR_CONFIG_NAME": "TEST_CONFIG"}
+
+
+class TestStateSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "snapshot.json")
+        self.generated = os.path.join(self.dir, "gwblock.pvlist")
+        self.write_generated("BLOCK1")
+        self.snapshot = StateSnapshot(self.path)
+
+    def write_generated(self, content):
+        with open(self.generated, "w") as f:
+            f.write(content)
+
+    def save(self):
+        return self.snapshot.save("TEST_CONFIG", "abc", file_digests([self.generated]), PVS)
+
+    def test_WHEN_snapshot_saved_THEN_loaded_the_same(self):
+        assert_that(self.save(), is_(True))
+
+        loaded = StateSnapshot(self.path).load()
+
+        assert_that(loaded["config"], is_("TEST_CONFIG"))
+        assert_that(loaded["fingerprint"], is_("abc"))
+        assert_that(loaded["pvs"], is_(PVS))
+
+    def test_GIVEN_encoded_json_values_WHEN_snapshot_saved_THEN_loaded_as_strings(self):
+        encoded = encode_json(["BLOCK1"])
+
+        saved = self.snapshot.save("TEST_CONFIG", "abc", {}, {"CS:BLOCKSERVER:GROUPS": encoded})
+
+        assert_that(saved, is_(True))
+        loaded = StateSnapshot(self.path).load()
+        assert_that(loaded["pvs"], is_({"CS:BLOCKSERVER:GROUPS": encoded.decode("utf-8")}))
+
+    def test_GIVEN_snapshot_saved_WHEN_saved_again_unchanged_THEN_not_written(self):
+        self.save()
+
+        assert_that(self.save(), is_(False))
+
+    def test_GIVEN_no_snapshot_WHEN_loaded_THEN_none(self):
+        assert_that(self.snapshot.load(), is_(None))
+
+    def test_GIVEN_snapshot_of_other_version_WHEN_loaded_THEN_none(self):
+        self.save()
+        with open(self.path) as f:
+            content = json.load(f)
+        content["version"] += 1
+        with open(self.path, "w") as f:
+            json.dump(content, f)
+
+        assert_that(self.snapshot.load(), is_(None))
+
+    def test_GIVEN_corrupt_snapshot_WHEN_loaded_THEN_none(self):
+        with open(self.path, "w") as f:
+            f.write('{"version": 1, "con')
+
+        assert_that(self.snapshot.load(), is_(None))
+
+    def test_GIVEN_nothing_changed_THEN_unchanged(self):
+        self.save()
+
+        assert_that(
+            StateSnapshot.is_unchanged(
+                self.snapshot.load(), "TEST_CONFIG", "abc", [self.generated]
+            ),
+            is_(True),
+        )
+
+    def test_GIVEN_generated_file_changed_THEN_changed(self):
+        self.save()
+        self.write_generated("BLOCK2")
+
+        assert_that(
+            StateSnapshot.is_unchanged(
+                self.snapshot.load(), "TEST_CONFIG", "abc", [self.generated]
+            ),
+            is_(False),
+        )
+
+    def test_GIVEN_generated_file_removed_THEN_changed(self):
+        self.save()
+        os.remove(self.generated)
+
+        assert_that(
+            StateSnapshot.is_unchanged(
+                self.snapshot.load(), "TEST_CONFIG", "abc", [self.generated]
+            ),
+            is_(False),
+        )
+
+    def test_GIVEN_config_fingerprint_changed_THEN_changed(self):
+        self.save()
+
+        assert_that(
+            StateSnapshot.is_unchanged(
+                self.snapshot.load(), "TEST_CONFIG", "def", [self.generated]
+            ),
+            is_(False),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
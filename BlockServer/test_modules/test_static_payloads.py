@@ -0,0 +1,101 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+from mock import MagicMock
+
+from BlockServer.core.static_payloads import StaticPayloadRegistry
+from server_common.utilities import compress_and_hex
+
+PV = "TEST_PV"
+
+
+def decode(data):
+    return "missing" if data is None else data.decode("utf-8")
+
+
+class TestStaticPayloadRegistry(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.path = os.path.join(self.root, "source.xml")
+        self.transform = MagicMock(side_effect=decode)
+        self.registry = StaticPayloadRegistry()
+        self.registry.register(PV, self.transform, self.path)
+
+    def _write(self, content, mtime_ns=None):
+        with open(self.path, "w") as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_GIVEN_unchanged_file_WHEN_payload_got_twice_THEN_transformed_once(self):
+        self._write("value")
+
+        assert_that(self.registry.get(PV), is_(compress_and_hex("value")))
+        assert_that(self.registry.get(PV), is_(compress_and_hex("value")))
+        assert_that(self.transform.call_count, is_(1))
+
+    def test_GIVEN_file_contents_change_WHEN_payload_got_THEN_rebuilt(self):
+        self._write("value", mtime_ns=1_000_000_000)
+        self.registry.get(PV)
+
+        self._write("other", mtime_ns=2_000_000_000)
+
+        assert_that(self.registry.get(PV), is_(compress_and_hex("other")))
+
+    def test_GIVEN_file_touched_but_identical_WHEN_published_THEN_not_republished(self):
+        self._write("value", mtime_ns=1_000_000_000)
+        set_param = MagicMock()
+        self.registry.publish(set_param)
+
+        self._write("value", mtime_ns=2_000_000_000)
+
+        assert_that(self.registry.publish(set_param), is_(empty()))
+        set_param.assert_called_once_with(PV, compress_and_hex("value"))
+        assert_that(self.transform.call_count, is_(1))
+
+    def test_GIVEN_file_changed_WHEN_published_THEN_only_changed_pvs_set(self):
+        self.registry.register("STATIC", lambda _: "static")
+        self._write("value", mtime_ns=1_000_000_000)
+        self.registry.publish(MagicMock())
+
+        self._write("other", mtime_ns=2_000_000_000)
+        set_param = MagicMock()
+
+        assert_that(self.registry.publish(set_param), contains_exactly(PV))
+        set_param.assert_called_once_with(PV, compress_and_hex("other"))
+
+    def test_GIVEN_file_missing_THEN_transform_given_none(self):
+        assert_that(self.registry.get(PV), is_(compress_and_hex("missing")))
+        assert_that(self.registry.get_data(PV), is_(None))
+
+    def test_GIVEN_no_source_file_THEN_payload_built_once(self):
+        transform = MagicMock(return_value="blank")
+        self.registry.register("BLANK", transform)
+
+        self.registry.get("BLANK")
+        self.registry.get("BLANK")
+
+        transform.assert_called_once_with(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
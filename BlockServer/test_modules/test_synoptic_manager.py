@@ -18,10 +18,19 @@ import os
 import unittest
 from importlib.resources import as_file, files
 
+from mock import patch
+
 from BlockServer.core.config_list_manager import InvalidDeleteException
+from BlockServer.fileIO.schema_checker import ConfigurationSchemaChecker
 from BlockServer.mocks.mock_block_server import MockBlockServer
 from BlockServer.synoptic.synoptic_file_io import SynopticFileIO
-from BlockServer.synoptic.synoptic_manager import SYNOPTIC_GET, SYNOPTIC_PRE, SynopticManager
+from BlockServer.synoptic.synoptic_manager import (
+    SYNOPTIC_GET,
+    SYNOPTIC_GET_DEFAULT,
+    SYNOPTIC_PRE,
+    SynopticManager,
+)
+from server_common.utilities import compress_and_hex
 
 TEST_DIR = os.path.abspath(".")
 
@@ -192,3 +201,83 @@ class TestSynopticManagerSequence(unittest.TestCase):
         self.assertEqual(len(synoptic_names), initial_len)
         self.assertTrue(self.bs.does_pv_exist(construct_pv_name(SYNOPTIC_1.upper())))
         self.assertTrue(self.bs.does_pv_exist(construct_pv_name(SYNOPTIC_2.upper())))
+
+    def _create_manager_with_synoptics_on_disk(self, names):
+        for name in names:
+            self.fileIO.syns[name + ".xml"] = bytes(EXAMPLE_SYNOPTIC.format(name), encoding="utf-8")
+        return SynopticManager(self.bs, os.path.join(self.dir), None, self.fileIO)
+
+    def test_GIVEN_synoptics_on_disk_WHEN_loaded_THEN_schema_loaded_once_and_each_parsed_once(self):
+        with (
+            patch.object(
+                ConfigurationSchemaChecker,
+                "load_schema",
+                wraps=ConfigurationSchemaChecker.load_schema,
+            ) as load_schema,
+            patch.object(
+                ConfigurationSchemaChecker,
+                "parse_xml_matching_schema",
+                wraps=ConfigurationSchemaChecker.parse_xml_matching_schema,
+            ) as parse,
+        ):
+            sm = self._create_manager_with_synoptics_on_disk([SYNOPTIC_1, SYNOPTIC_2])
+
+        self.assertEqual(load_schema.call_count, 1)
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual([s["name"] for s in sm.get_synoptic_list()[1:]], [SYNOPTIC_1, SYNOPTIC_2])
+
+    def test_GIVEN_synoptic_on_disk_WHEN_loaded_THEN_payload_only_built_when_first_read(self):
+        sm = self._create_manager_with_synoptics_on_disk([SYNOPTIC_1])
+        pv = construct_pv_name(SYNOPTIC_1.upper())
+        expected = compress_and_hex(EXAMPLE_SYNOPTIC.format(SYNOPTIC_1))
+
+        self.assertEqual(self.bs.pvs[pv], "")
+        self.assertTrue(sm.read_pv_exists(pv))
+
+        self.assertEqual(sm.handle_pv_read(pv), expected)
+        self.assertEqual(self.bs.pvs[pv], expected)
+        self.assertFalse(sm.read_pv_exists(pv))
+
+    def test_GIVEN_default_synoptic_on_disk_WHEN_monitors_updated_THEN_its_pv_set_before_read(
+        self,
+    ):
+        sm = self._create_manager_with_synoptics_on_disk([SYNOPTIC_1, SYNOPTIC_2])
+        expected = compress_and_hex(EXAMPLE_SYNOPTIC.format(SYNOPTIC_1))
+
+        sm.set_default_synoptic(SYNOPTIC_1)
+        sm.update_monitors()
+
+        self.assertEqual(self.bs.pvs[construct_pv_name(SYNOPTIC_1.upper())], expected)
+        self.assertEqual(self.bs.pvs[construct_pv_name(SYNOPTIC_2.upper())], "")
+
+    def test_GIVEN_synoptic_updated_from_filesystem_THEN_new_payload_published(self):
+        sm = self._create_manager_with_synoptics_on_disk([SYNOPTIC_1])
+        new_xml = EXAMPLE_SYNOPTIC.format(SYNOPTIC_1).replace("<name>", "<!-- new --><name>")
+
+        sm.update(new_xml)
+
+        pv = construct_pv_name(SYNOPTIC_1.upper())
+        self.assertEqual(self.bs.pvs[pv], compress_and_hex(new_xml))
+
+    def test_GIVEN_default_set_with_different_case_THEN_only_that_synoptic_is_default(self):
+        self._create_a_synoptic(SYNOPTIC_1, self.sm)
+        self._create_a_synoptic(SYNOPTIC_1 + "0", self.sm)
+
+        self.sm.set_default_synoptic(SYNOPTIC_1.upper())
+        self.sm.update_monitors()
+
+        defaults = [s["name"] for s in self.sm.get_synoptic_list() if s["is_default"]]
+        self.assertEqual(defaults, [SYNOPTIC_1])
+        self.assertEqual(
+            self.bs.pvs[SYNOPTIC_PRE + SYNOPTIC_GET_DEFAULT],
+            compress_and_hex(EXAMPLE_SYNOPTIC.format(SYNOPTIC_1)),
+        )
+
+    def test_GIVEN_default_synoptic_deleted_THEN_none_is_default(self):
+        self._create_a_synoptic(SYNOPTIC_1, self.sm)
+        self.sm.set_default_synoptic(SYNOPTIC_1)
+
+        self.sm.delete([SYNOPTIC_1])
+
+        self.assertTrue(self.sm.get_synoptic_list()[0]["is_default"])
+        self.assertEqual(self.sm.get_default_synoptic_xml(), b"")
@@ -14,8 +14,10 @@
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
 
+import contextlib
 import os
 import socket
+from collections import Counter
 from functools import wraps
 from threading import RLock, Thread
 from time import sleep
@@ -80,6 +82,9 @@ class GitVersionControl:
             self.remote = self.repo.remotes.origin
 
         self._push_lock = RLock()
+        # The paths whose changes are not committed by the background thread, with the number of
+        # holds on each
+        self._held_paths = Counter()
 
     @staticmethod
     def branch_allowed(branch_name):
@@ -115,6 +120,26 @@ class GitVersionControl:
         push_thread.daemon = True  # Daemonise thread
         push_thread.start()
 
+    def ignore(self, pattern):
+        """Stops files matching a pattern being added to the repository, without committing a
+        .gitignore file, by adding the pattern to the exclude file of the repository.
+
+        Args:
+            pattern (string): The pattern, as in a .gitignore file
+        """
+        exclude_path = os.path.join(self.repo.git_dir, "info", "exclude")
+        os.makedirs(os.path.dirname(exclude_path), exist_ok=True)
+        existing = ""
+        if os.path.exists(exclude_path):
+            with open(exclude_path) as f:
+                existing = f.read()
+        if pattern in existing.splitlines():
+            return
+        with open(exclude_path, "a") as f:
+            if existing and not existing.endswith("\n"):
+                f.write("\n")
+            f.write(pattern + "\n")
+
     @retry(RETRY_MAX_ATTEMPTS, RETRY_INTERVAL, OSError)
     def _unlock(self):
         """Removes index.lock if it exists, and it's not being used"""
@@ -128,16 +153,57 @@ class GitVersionControl:
 
     @check_branch_allowed
     @retry(RETRY_MAX_ATTEMPTS, RETRY_INTERVAL, GitCommandError)
-    def _commit(self):
-        """Commit changes to a repository"""
+    def _commit(self, commit_comment=None):
+        """Commit changes to a repository
+
+        Args:
+            commit_comment (string): The commit message, or None to describe the changes
+        """
         num_files_changed = len(self.repo.index.diff("HEAD"))
         if num_files_changed == 0:
             return  # nothing staged for commit
 
-        commit_comment = self._message_provider.get_commit_message(self.repo.index.diff("HEAD"))
+        if commit_comment is None:
+            commit_comment = self._message_provider.get_commit_message(self.repo.index.diff("HEAD"))
         self.repo.index.commit(commit_comment)
         print_and_log(f"GIT: Committed {num_files_changed} changes")
 
+    @contextlib.contextmanager
+    def hold_commits(self, paths):
+        """Stops the background thread committing the changes to some paths until the block has
+        finished, so the changes made to them in it can be committed together.
+
+        Args:
+            paths (list): The paths, files or directories
+        """
+        with self._push_lock:
+            self._held_paths.update(paths)
+        try:
+            yield
+        finally:
+            with self._push_lock:
+                self._held_paths.subtract(paths)
+                self._held_paths = +self._held_paths
+
+    def commit(self, commit_comment, paths):
+        """Adds and commits the changes to some paths now. They are pushed with the next
+        background push.
+
+        Args:
+            commit_comment (string): The commit message
+            paths (list): The paths, files or directories
+        """
+        with self._push_lock:
+            try:
+                self._add_files(paths)
+                self._commit(commit_comment)
+            except (
+                MaxAttemptsExceededException,
+                NotUnderAllowedBranchException,
+                GitCommandError,
+            ) as e:
+                print_and_log(f"{ERROR_PREFIX} for {self._repo_name}: {e}", "MINOR")
+
     def _commit_and_push(self):
         """Frequently adds, commits and pushes all file currently in the repository."""
         push_interval = self.push_interval
@@ -147,6 +213,7 @@ class GitVersionControl:
             with self._push_lock:
                 try:
                     self._add_all_files()
+                    self._unstage_held_paths()
                     self._commit()
                     self.remote.push()
                     push_interval = self.push_interval
@@ -175,3 +242,20 @@ class GitVersionControl:
         Does a 'git add -A' which adds all files in the repository.
         """
         self.repo.git.add(A=True)
+
+    @check_branch_allowed
+    def _add_files(self, paths):
+        """
+        Does a 'git add -A' of some paths, which adds all the files in them.
+
+        Args:
+            paths (list): The paths, files or directories
+        """
+        self.repo.git.add("--", *paths, A=True)
+
+    def _unstage_held_paths(self):
+        """
+        Does a 'git reset' of the held paths, so their changes are not committed.
+        """
+        if self._held_paths:
+            self.repo.git.reset("-q", "--", *self._held_paths)
@@ -14,9 +14,14 @@
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
 
+import os
+import shutil
 import socket
+import tempfile
 import unittest
 
+from mock import Mock
+
 from ConfigVersionControl.git_version_control import GitVersionControl
 
 
@@ -32,3 +37,42 @@ class TestVersionControl(unittest.TestCase):
 
     def test_WHEN_branch_is_another_random_name_THEN_branch_not_allowed(self):
         self.assertFalse(GitVersionControl.branch_allowed("random"))
+
+    def test_WHEN_changes_committed_THEN_only_their_paths_committed_with_given_message(self):
+        repo = Mock(active_branch=socket.gethostname())
+        repo.index.diff.return_value = ["a change"]
+        version_control = GitVersionControl("configurations", repo, "config", 300)
+
+        version_control.commit(
+            "Edited CONFIG1, CONFIG2", ["configurations/CONFIG1", "configurations/CONFIG2"]
+        )
+
+        repo.git.add.assert_called_once_with(
+            "--", "configurations/CONFIG1", "configurations/CONFIG2", A=True
+        )
+        repo.index.commit.assert_called_once_with("Edited CONFIG1, CONFIG2")
+
+    def test_WHEN_paths_held_THEN_background_commit_unstages_them_until_released(self):
+        repo = Mock(active_branch=socket.gethostname())
+        version_control = GitVersionControl("configurations", repo, "config", 300)
+
+        with version_control.hold_commits(["configurations/CONFIG1"]):
+            version_control._unstage_held_paths()
+            repo.git.reset.assert_called_once_with("-q", "--", "configurations/CONFIG1")
+        repo.git.reset.reset_mock()
+        version_control._unstage_held_paths()
+
+        repo.git.reset.assert_not_called()
+
+    def test_WHEN_pattern_ignored_twice_THEN_added_to_exclude_file_once(self):
+        git_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, git_dir)
+        version_control = GitVersionControl(
+            "configurations", Mock(git_dir=git_dir), "config", 300, is_local=True
+        )
+
+        version_control.ignore(".staging*/")
+        version_control.ignore(".staging*/")
+
+        with open(os.path.join(git_dir, "info", "exclude")) as f:
+            self.assertEqual(f.read(), ".staging*/\n")
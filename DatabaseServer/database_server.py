@@ -22,17 +22,17 @@ import json
 import os
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from threading import RLock, Thread
 from time import sleep
 from typing import Callable, Literal
 
 from pcaspy import Driver
+from pcaspy.driver import Data, manager
 
 sys.path.insert(0, os.path.abspath(os.environ["MYDIRBLOCK"]))
 
-from genie_python.mysql_abstraction_layer import SQLAbstraction
-
 from DatabaseServer.exp_data import ExpData, ExpDataSource
 from DatabaseServer.mocks.mock_exp_data import MockExpData
 from DatabaseServer.moxa_data import MoxaData, MoxaDataSource
@@ -42,7 +42,6 @@ from DatabaseServer.procserv_utils import ProcServWrapper
 from server_common.channel_access_server import CAServer
 from server_common.constants import IOCS_NOT_TO_STOP
 from server_common.ioc_data import IOCData
-from server_common.ioc_data_source import IocDataSource
 from server_common.loggers.isis_logger import IsisLogger
 from server_common.mocks.mock_ca_server import MockCAServer
 from server_common.pv_names import DatabasePVNames as DbPVNames
@@ -52,10 +51,29 @@ from server_common.utilities import (
     convert_to_json,
     dehex_and_decompress,
     print_and_log,
-    set_logger,
 )
+from ServerTools.async_logger import start_async_logging
+from ServerTools.binary_payload import (
+    binary_pv,
+    binary_waveform,
+    compress_binary,
+    to_waveform,
+)
+from ServerTools.ca_statistics import CA_STATISTICS
+from ServerTools.chunked_payload import CHUNK_HEADER_SIZE, ChunkPublisher, chunks_pv
+from ServerTools.database_pv_names import (
+    CA_STATS,
+    IOC_NAMES,
+    MEMORY_SNAPSHOT,
+    RESET_CA_STATS,
+    RUNNING_IOCS,
+    TAKE_MEMORY_SNAPSHOT,
+)
+from ServerTools.memory_snapshot import MemorySnapshots
+from ServerTools.payload_dictionary import compress_and_hex_with_dictionary, dictionary_pv
+from ServerTools.waveform_sizing import required_count
 
-set_logger(IsisLogger())
+start_async_logging(IsisLogger())
 
 MACROS = {
     "$(MYPVPREFIX)": os.environ["MYPVPREFIX"],
@@ -73,6 +91,19 @@ class DatabaseServer(Driver):
     The class for handling all the static PV access and monitors etc.
     """
 
+    # The PVs kept up to date by the monitor thread
+    MONITORED_PVS = (
+        DbPVNames.IOCS,
+        RUNNING_IOCS,
+        DbPVNames.HIGH_INTEREST,
+        DbPVNames.MEDIUM_INTEREST,
+        DbPVNames.FACILITY,
+        DbPVNames.ACTIVE_PVS,
+        DbPVNames.ALL_PVS,
+        DbPVNames.MOXA_MAPPINGS,
+        CA_STATS,
+    )
+
     def __init__(
         self,
         ca_server: CAServer | MockCAServer,
@@ -102,13 +133,23 @@ class DatabaseServer(Driver):
         self._ca_server = ca_server
         self._options_holder = OptionsHolder(options_folder, OptionsLoader())
         self._pv_info = self._generate_pv_acquisition_info()
+        self._binary_pvs = {
+            binary_pv(pv): pv for pv, info in self._pv_info.items() if "get" in info
+        }
+        self._dictionary_pvs = {
+            dictionary_pv(pv): pv for pv, info in self._pv_info.items() if "get" in info
+        }
         self._iocs = ioc_data
         self._ed = exp_data
         self._moxa_data = moxa_data
+        self._chunks = ChunkPublisher(self._add_pv_to_db, self.setParam)
+        self._memory_snapshots = MemorySnapshots(self._get_memory_counts)
+        # Snapshots can take seconds with many traces, so are not taken on the CA thread
+        self._snapshot_worker = ThreadPoolExecutor(1, thread_name_prefix="memory_snapshot")
+        self.monitor_lock = RLock()
 
         if self._iocs is not None and not test_mode:
             # Start a background thread for keeping track of running IOCs
-            self.monitor_lock = RLock()
             monitor_thread = Thread(target=self._update_ioc_monitors, args=())
             monitor_thread.daemon = True  # Daemonise thread
             monitor_thread.start()
@@ -126,6 +167,8 @@ class DatabaseServer(Driver):
             enhanced_info[pv]["get"] = get_function
 
         add_get_method(DbPVNames.IOCS, self._get_iocs_info)
+        add_get_method(IOC_NAMES, self._get_ioc_names)
+        add_get_method(RUNNING_IOCS, self._get_running_iocs)
         add_get_method(DbPVNames.HIGH_INTEREST, partial(self._get_interesting_pvs, "HIGH"))
         add_get_method(DbPVNames.MEDIUM_INTEREST, partial(self._get_interesting_pvs, "MEDIUM"))
         add_get_method(DbPVNames.LOW_INTEREST, partial(self._get_interesting_pvs, "LOW"))
@@ -138,23 +181,32 @@ class DatabaseServer(Driver):
         add_get_method(DbPVNames.IOCS_NOT_TO_STOP, DatabaseServer._get_iocs_not_to_stop)
         add_get_method(DbPVNames.MOXA_MAPPINGS, self._get_moxa_mappings)
         add_get_method(DbPVNames.NUM_MOXAS, self._get_num_of_moxas)
+        add_get_method(CA_STATS, CA_STATISTICS.get_statistics)
         return enhanced_info
 
     @staticmethod
-    def generate_pv_info() -> dict:
+    def generate_pv_info(pv_sizes: dict[str, int] | None = None) -> dict:
         """
         Generates information needed to construct PVs. Must be consumed by Server before
         DatabaseServer is initialized so must be static
 
+        Args:
+            pv_sizes: The lengths of the data the PVs need to hold, if known; PVs are made large
+             enough to hold them with room to grow. Data which outgrows the PVs updated by the
+             monitor thread is still published in full in chunks
+
         Returns:
             Dictionary containing the information to construct PVs
         """
         pv_size_256k = 256000
         pv_size_10k = 10000
+        pv_sizes = pv_sizes or {}
         pv_info = {}
 
         for pv in [
             DbPVNames.IOCS,
+            IOC_NAMES,
+            RUNNING_IOCS,
             DbPVNames.HIGH_INTEREST,
             DbPVNames.MEDIUM_INTEREST,
             DbPVNames.LOW_INTEREST,
@@ -162,8 +214,9 @@ class DatabaseServer(Driver):
             DbPVNames.ACTIVE_PVS,
             DbPVNames.ALL_PVS,
             DbPVNames.IOCS_NOT_TO_STOP,
+            CA_STATS,
         ]:
-            pv_info[pv] = char_waveform(pv_size_256k)
+            pv_info[pv] = char_waveform(required_count(pv_sizes.get(pv, 0), pv_size_256k))
 
         for pv in [
             DbPVNames.SAMPLE_PARS,
@@ -172,8 +225,22 @@ class DatabaseServer(Driver):
             DbPVNames.MOXA_MAPPINGS,
             DbPVNames.NUM_MOXAS,
         ]:
-            pv_info[pv] = char_waveform(pv_size_10k)
-
+            pv_info[pv] = char_waveform(required_count(pv_sizes.get(pv, 0), pv_size_10k))
+
+        # Each PV has a binary twin holding the same compressed JSON without the hex encoding,
+        # and a variant compressed with the preset payload dictionary
+        for pv, info in list(pv_info.items()):
+            pv_info[binary_pv(pv)] = binary_waveform(info["count"])
+            pv_info[dictionary_pv(pv)] = char_waveform(info["count"])
+
+        # The PVs updated by the monitor thread are also published in chunks, for when they
+        # outgrow the size they were created with
+        for pv in DatabaseServer.MONITORED_PVS:
+            pv_info[chunks_pv(pv)] = char_waveform(CHUNK_HEADER_SIZE)
+
+        pv_info[RESET_CA_STATS] = char_waveform(100)
+        pv_info[TAKE_MEMORY_SNAPSHOT] = char_waveform(1000)
+        pv_info[MEMORY_SNAPSHOT] = char_waveform(64000)
         return pv_info
 
     def get_data_for_pv(self, pv: str) -> bytes:
@@ -186,12 +253,48 @@ class DatabaseServer(Driver):
         Return:
             The data, compressed and hexed.
         """
-        data = self._pv_info[pv]["get"]()
-        data = compress_and_hex(str(json.dumps(data)))
+        data = compress_and_hex(self._get_json_for_pv(pv))
         self._check_pv_capacity(pv, len(data), self._blockserver_prefix)
         return data
 
-    def read(self, reason: str) -> bytes:
+    def get_binary_data_for_pv(self, pv: str, json_data: str | None = None) -> list[int]:
+        """
+        Get the data for the binary twin of the given pv name.
+
+        Args:
+            pv: The name of the PV to get the data for, without the binary suffix
+            json_data: The data already converted to JSON, if it is to hand
+
+        Return:
+            The data, compressed, as the values of a uchar waveform.
+        """
+        if json_data is None:
+            json_data = self._get_json_for_pv(pv)
+        data = compress_binary(json_data)
+        self._check_pv_capacity(binary_pv(pv), len(data), self._blockserver_prefix)
+        return to_waveform(data)
+
+    def get_dictionary_data_for_pv(self, pv: str, json_data: str | None = None) -> bytes:
+        """
+        Get the data for the variant of the given pv name which uses the preset dictionary.
+
+        Args:
+            pv: The name of the PV to get the data for, without the variant suffix
+            json_data: The data already converted to JSON, if it is to hand
+
+        Return:
+            The data, compressed with the dictionary and hexed.
+        """
+        if json_data is None:
+            json_data = self._get_json_for_pv(pv)
+        data = compress_and_hex_with_dictionary(json_data)
+        self._check_pv_capacity(dictionary_pv(pv), len(data), self._blockserver_prefix)
+        return data
+
+    def _get_json_for_pv(self, pv: str) -> str:
+        return str(json.dumps(self._pv_info[pv]["get"]()))
+
+    def read(self, reason: str) -> bytes | list[int]:
         """
         A method called by SimpleServer when a PV is read from the DatabaseServer over Channel
         Access.
@@ -201,11 +304,15 @@ class DatabaseServer(Driver):
 
         Returns:
             A compressed and hexed JSON formatted string that gives the desired information based on
-            reason.
+            reason, or for a binary twin the compressed JSON as a list of bytes.
         """
+        if reason in self._binary_pvs:
+            return self.get_binary_data_for_pv(self._binary_pvs[reason])
+        if reason in self._dictionary_pvs:
+            return self.get_dictionary_data_for_pv(self._dictionary_pvs[reason])
         return (
             self.get_data_for_pv(reason)
-            if reason in self._pv_info.keys()
+            if "get" in self._pv_info.get(reason, {})
             else self.getParam(reason)
         )
 
@@ -230,6 +337,11 @@ class DatabaseServer(Driver):
                 )
             elif reason == "UPDATE_MM":
                 self._moxa_data.update_mappings()
+            elif reason == RESET_CA_STATS:
+                CA_STATISTICS.reset()
+            elif reason == TAKE_MEMORY_SNAPSHOT:
+                request = json.loads(dehex_and_decompress(value.encode("utf-8")).decode("utf-8"))
+                self._snapshot_worker.submit(self._take_memory_snapshot, request)
         except Exception as e:
             value_bytes = compress_and_hex(convert_to_json("Error: " + str(e)))
             print_and_log(str(e), MAJOR_MSG)
@@ -246,24 +358,68 @@ class DatabaseServer(Driver):
         while True:
             if self._iocs is not None:
                 self._iocs.update_iocs_status()
-                for pv in [
-                    DbPVNames.IOCS,
-                    DbPVNames.HIGH_INTEREST,
-                    DbPVNames.MEDIUM_INTEREST,
-                    DbPVNames.FACILITY,
-                    DbPVNames.ACTIVE_PVS,
-                    DbPVNames.ALL_PVS,
-                    DbPVNames.MOXA_MAPPINGS,
-                ]:
-                    encoded_data = self.get_data_for_pv(pv)
+                for pv in DatabaseServer.MONITORED_PVS:
+                    json_data = self._get_json_for_pv(pv)
+                    encoded_data = compress_and_hex(json_data)
                     # No need to update monitors if data hasn't changed
                     if not self.getParam(pv) == encoded_data:
+                        self._check_pv_capacity(pv, len(encoded_data), self._blockserver_prefix)
                         self.setParam(pv, encoded_data)
+                        self.setParam(binary_pv(pv), self.get_binary_data_for_pv(pv, json_data))
+                        self.setParam(
+                            dictionary_pv(pv), self.get_dictionary_data_for_pv(pv, json_data)
+                        )
+                        self._chunks.publish(pv, encoded_data)
                 # Update them
                 with self.monitor_lock:
                     self.updatePVs()
             sleep(1)
 
+    def _take_memory_snapshot(self, request: dict) -> None:
+        """
+        Takes a memory snapshot as requested and publishes it, or the error if it could not be
+        taken, on the memory snapshot worker.
+
+        Args:
+            request: The request written to the TAKE_MEMORY_SNAPSHOT PV, as given to
+             MemorySnapshots.handle
+        """
+        try:
+            snapshot = self._memory_snapshots.handle(request)
+        except Exception as e:
+            # The request has already been acknowledged, so the error is published in its place
+            print_and_log(str(e), MAJOR_MSG)
+            snapshot = "Error: " + str(e)
+        with self.monitor_lock:
+            self.setParam(MEMORY_SNAPSHOT, compress_and_hex(convert_to_json(snapshot)))
+            self.updatePVs()
+
+    def _get_memory_counts(self) -> dict[str, int]:
+        """
+        Gets the numbers of PVs, to look for memory leaks.
+
+        Returns:
+            The numbers of PVs, and of those added while running
+        """
+        return {"pvs": len(self.pvDB), "on_the_fly_pvs": len(self.pvDB) - len(self._pv_info)}
+
+    def _add_pv_to_db(self, name: str, count: int) -> None:
+        """
+        Creates a char waveform PV while the server is running.
+
+        Args:
+            name: The name of the PV (without the PV prefix)
+            count: The size of the PV
+        """
+        if name not in manager.pvs[self.port]:
+            try:
+                self._ca_server.createPV(self._blockserver_prefix, {name: char_waveform(count)})
+                data = Data()
+                data.value = manager.pvs[self.port][name].info.value
+                self.pvDB[name] = data
+            except Exception:
+                print_and_log("Unable to add PV {0}".format(name), MAJOR_MSG, LOG_TARGET)
+
     def _check_pv_capacity(self, pv: str, size: int, prefix: str) -> None:
         """
         Check the capacity of a PV and write to the log if it is too small.
@@ -276,7 +432,12 @@ class DatabaseServer(Driver):
         if size > self._pv_info[pv]["count"]:
             print_and_log(
                 "Too much data to encode PV {0}. Current size is {1} characters "
-                "but {2} are required".format(prefix + pv, self._pv_info[pv]["count"], size),
+                "but {2} are required".format(prefix + pv, self._pv_info[pv]["count"], size)
+                + (
+                    "; it is available in full from {0}".format(prefix + chunks_pv(pv))
+                    if pv in DatabaseServer.MONITORED_PVS
+                    else ""
+                ),
                 MAJOR_MSG,
                 LOG_TARGET,
             )
@@ -289,6 +450,24 @@ class DatabaseServer(Driver):
                 iocs[iocname].update(options[iocname])
         return iocs
 
+    def _get_ioc_names(self) -> list:
+        """
+        Gets the names of all the IOCs, without the descriptions and options in the full IOC list.
+
+        Returns:
+            Sorted list of IOC names
+        """
+        return sorted(self._iocs.get_iocs().keys())
+
+    def _get_running_iocs(self) -> list:
+        """
+        Gets the names of the IOCs that are currently running, according to procServ.
+
+        Returns:
+            Sorted list of running IOC names
+        """
+        return sorted(name for name, info in self._iocs.get_iocs().items() if info["running"])
+
     def _get_pvs(
         self, get_method: Callable[[], list | str | dict], replace_pv_prefix: bool, *get_args: str
     ) -> list | str | dict:
@@ -433,10 +612,16 @@ if __name__ == "__main__":
         os.makedirs(os.path.abspath(OPTIONS_DIR))
 
     SERVER = CAServer(BLOCKSERVER_PREFIX)
+    # The PVs are created at their default sizes so they are served before the databases can be
+    # reached; data which outgrows them is published in chunks
     SERVER.createPV(BLOCKSERVER_PREFIX, DatabaseServer.generate_pv_info())
     SERVER.createPV(MACROS["$(MYPVPREFIX)"], ExpData.EDPV)
     SERVER.createPV(MACROS["$(MYPVPREFIX)"], MoxaData.MDPV)
 
+    # The database layer is slow to import, so is only imported once the PVs have been created
+    from genie_python.mysql_abstraction_layer import SQLAbstraction
+    from server_common.ioc_data_source import IocDataSource
+
     ioc_data = None
     exp_data = None
     moxa_data = None
@@ -20,12 +20,11 @@ import traceback
 import unicodedata
 from typing import TYPE_CHECKING, Union
 
-from genie_python.mysql_abstraction_layer import SQLAbstraction
-
-from server_common.channel_access import ChannelAccess
 from server_common.mocks.mock_ca import MockChannelAccess
 from server_common.utilities import char_waveform, compress_and_hex, print_and_log
 
+from ServerTools.ca_statistics import ChannelAccess
+
 if TYPE_CHECKING:
     from DatabaseServer.test_modules.test_exp_data import MockExpDataSource
 
@@ -49,6 +48,9 @@ class ExpDataSource(object):
     """
 
     def __init__(self) -> None:
+        # The database layer is slow to import, so is only imported once it is needed
+        from genie_python.mysql_abstraction_layer import SQLAbstraction
+
         self._db = SQLAbstraction("exp_data", "exp_data", "$exp_data")
 
     def get_team(self, experiment_id: str) -> list:
@@ -3,16 +3,17 @@ import socket
 import time
 from collections import OrderedDict
 from threading import RLock, Thread
-from typing import Dict, List, Optional, Tuple, TypeGuard
-
-from genie_python.mysql_abstraction_layer import (  # type: ignore
-    AbstractSQLCommands,
-    ParamsSequenceOrDictType,
-)
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, TypeGuard
 
 from server_common.snmpWalker import walk
 from server_common.utilities import SEVERITY, print_and_log
 
+if TYPE_CHECKING:
+    from genie_python.mysql_abstraction_layer import (  # type: ignore
+        AbstractSQLCommands,
+        ParamsSequenceOrDictType,
+    )
+
 REG_KEY_NPDRV = r"SYSTEM\\CurrentControlSet\\Services\\npdrv\\Parameters"
 REG_DIR_NPDRV2 = r"SYSTEM\\CurrentControlSet\\Enum\\ROOT\\PORTS"
 GET_MOXA_IPS = """
@@ -57,7 +58,7 @@ class MoxaDataSource(object):
     A source for IOC data from the database
     """
 
-    def __init__(self, mysql_abstraction_layer: AbstractSQLCommands) -> None:
+    def __init__(self, mysql_abstraction_layer: "AbstractSQLCommands") -> None:
         """
         Constructor.
 
@@ -68,7 +69,7 @@ class MoxaDataSource(object):
         self.mysql_abstraction_layer = mysql_abstraction_layer
 
     def _query_and_normalise(
-        self, sqlquery: str, bind_vars: Optional[ParamsSequenceOrDictType] = None
+        self, sqlquery: str, bind_vars: Optional["ParamsSequenceOrDictType"] = None
     ) -> list[list[str]]:
         """
         Executes the given query to the database and converts the data in each row from bytearray to
@@ -15,9 +15,10 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 # along with this program; if not, you can obtain a copy from
 # https://www.eclipse.org/org/documents/epl-v10.php or
 # http://opensource.org/licenses/eclipse-1.0.php
-from server_common.channel_access import ChannelAccess
 from server_common.utilities import print_and_log
 
+from ServerTools.ca_statistics import ChannelAccess
+
 
 class ProcServWrapper(object):
     """A wrapper for ProcSev to allow for control of IOCs"""
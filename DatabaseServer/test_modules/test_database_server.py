@@ -42,6 +42,12 @@ from server_common.test_modules.test_ioc_data import (
     MEDIUM_PV_NAMES,
 )
 from server_common.utilities import dehex_and_decompress, set_logger
+from ServerTools.binary_payload import binary_pv, decode_binary
+from ServerTools.database_pv_names import IOC_NAMES, RUNNING_IOCS
+from ServerTools.payload_dictionary import (
+    dehex_and_decompress_with_dictionary,
+    dictionary_pv,
+)
 
 # Use a dummy logger during tests as real logger requires log server
 set_logger(Logger())
@@ -116,6 +122,49 @@ class TestDatabaseServer(unittest.TestCase):
                 name in pv_names, msg="{name} in {pv_names}".format(name=name, pv_names=pv_names)
             )
 
+    @unittest.skipIf(IS_LINUX, "DB server not configured to run properly on Linux build")
+    def test_WHEN_asked_for_ioc_names_THEN_get_sorted_names_only(self):
+        pv_data = json.loads(dehex_and_decompress(self.db_server.read(IOC_NAMES)))
+        self.assertEqual(pv_data, sorted(IOCS))
+
+    @unittest.skipIf(IS_LINUX, "DB server not configured to run properly on Linux build")
+    def test_WHEN_asked_for_running_iocs_THEN_get_names_of_running_iocs(self):
+        iocs = json.loads(dehex_and_decompress(self.db_server.read(DatabasePVNames.IOCS)))
+        pv_data = json.loads(dehex_and_decompress(self.db_server.read(RUNNING_IOCS)))
+        self.assertEqual(pv_data, sorted(name for name, info in iocs.items() if info["running"]))
+
+    @unittest.skipIf(IS_LINUX, "DB server not configured to run properly on Linux build")
+    def test_WHEN_binary_twin_read_THEN_decodes_to_same_data_as_hexed_pv(self):
+        hexed = json.loads(dehex_and_decompress(self.db_server.read(DatabasePVNames.IOCS)))
+        binary = json.loads(decode_binary(self.db_server.read(binary_pv(DatabasePVNames.IOCS))))
+        self.assertEqual(binary, hexed)
+
+    @unittest.skipIf(IS_LINUX, "DB server not configured to run properly on Linux build")
+    def test_WHEN_dictionary_variant_read_THEN_decodes_to_same_data_as_hexed_pv(self):
+        hexed = json.loads(dehex_and_decompress(self.db_server.read(DatabasePVNames.IOCS)))
+        variant = json.loads(
+            dehex_and_decompress_with_dictionary(
+                self.db_server.read(dictionary_pv(DatabasePVNames.IOCS))
+            )
+        )
+        self.assertEqual(variant, hexed)
+
+    def test_GIVEN_no_sizes_WHEN_pv_info_generated_THEN_pvs_have_default_size(self):
+        pv_info = DatabaseServer.generate_pv_info()
+
+        self.assertEqual(pv_info[DatabasePVNames.IOCS]["count"], 256000)
+        self.assertEqual(pv_info[DatabasePVNames.SAMPLE_PARS]["count"], 10000)
+
+    def test_GIVEN_data_larger_than_default_WHEN_pv_info_generated_THEN_pv_and_twin_grown(self):
+        pv_info = DatabaseServer.generate_pv_info({DatabasePVNames.IOCS: 300000})
+
+        self.assertGreaterEqual(pv_info[DatabasePVNames.IOCS]["count"], 300000)
+        self.assertEqual(
+            pv_info[binary_pv(DatabasePVNames.IOCS)]["count"],
+            pv_info[DatabasePVNames.IOCS]["count"],
+        )
+        self.assertEqual(pv_info[DatabasePVNames.ALL_PVS]["count"], 256000)
+
     @unittest.skipIf(IS_LINUX, "DB server not configured to run properly on Linux build")
     def test_iocs_pvs_correct(self):
         pv_data = json.loads(dehex_and_decompress(self.db_server.read(DatabasePVNames.IOCS)))
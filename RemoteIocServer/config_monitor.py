@@ -14,8 +14,8 @@ from BlockServer.config.ioc import IOC
 from server_common.file_path_manager import FILEPATH_MANAGER
 from BlockServer.fileIO.file_manager import ConfigurationFileManager
 from RemoteIocServer.utilities import THREADPOOL, get_hostname_from_prefix, print_and_log
-from server_common.channel_access import ChannelAccess
 from server_common.utilities import dehex_and_decompress_waveform
+from ServerTools.ca_statistics import ChannelAccess
 
 REMOTE_IOC_CONFIG_NAME = "_REMOTE_IOC"
 
@@ -6,9 +6,10 @@ import sys
 from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
-from server_common.channel_access import ChannelAccess
 from server_common.utilities import print_and_log as _common_print_and_log
 
+from ServerTools.ca_statistics import ChannelAccess
+
 CONFIG_DIR = os.getenv("ICPCONFIGROOT")
 
 
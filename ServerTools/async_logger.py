@@ -0,0 +1,186 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Writes log messages on a background thread, so print_and_log does not wait for the log server.
+
+The messages are queued and written in batches. When the queue is full a message is dropped or
+the caller waits, depending on the overflow policy, and the number dropped is logged once the
+queue has room again.
+"""
+
+import atexit
+from collections import deque
+from threading import Condition, Thread
+from typing import Any, Deque, Dict, Tuple
+
+from server_common.utilities import set_logger
+
+# Overflow policies: drop the new message, drop the oldest queued message or wait for room
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+DEFAULT_MAX_QUEUED = 10000
+DEFAULT_BATCH_SIZE = 100
+CLOSE_TIMEOUT = 5
+
+
+class AsyncLogger:
+    """Passes log messages to another logger from a background thread.
+
+    Messages written after the logger is closed are passed on straight away.
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        overflow: str = DROP_NEWEST,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            logger: The logger to write the messages to, with a write_to_log method
+            max_queued: The most messages to queue
+            batch_size: The most messages to take from the queue at a time
+            overflow: What to do with a message when the queue is full (see OVERFLOW_POLICIES)
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow}")
+        self._logger = logger
+        self._max_queued = max_queued
+        self._batch_size = batch_size
+        self._overflow = overflow
+        self._queue: Deque[Tuple[str, str, str]] = deque()
+        self._condition = Condition()
+        self._writing = 0
+        self._closed = False
+        # The number of dropped messages that have been logged
+        self._dropped_reported = 0
+        self._counters = {"queued": 0, "written": 0, "dropped": 0, "failed": 0}
+        self._thread = Thread(target=self._write_messages, name="AsyncLogger", daemon=True)
+        self._thread.start()
+
+    def write_to_log(self, message: str, severity: str = "INFO", src: str = "BLOCKSVR") -> None:
+        """Queues a message to be written to the log.
+
+        Args:
+            message: The message
+            severity: The severity of the message
+            src: The source of the message
+        """
+        with self._condition:
+            if not self._closed:
+                if len(self._queue) >= self._max_queued:
+                    if self._overflow == DROP_NEWEST:
+                        self._counters["dropped"] += 1
+                        return
+                    if self._overflow == DROP_OLDEST:
+                        self._queue.popleft()
+                        self._counters["dropped"] += 1
+                    else:
+                        self._condition.wait_for(
+                            lambda: len(self._queue) < self._max_queued or self._closed
+                        )
+                if not self._closed:
+                    self._queue.append((message, severity, src))
+                    self._counters["queued"] += 1
+                    self._condition.notify_all()
+                    return
+        self._write(message, severity, src)
+
+    def get_counters(self) -> Dict[str, int]:
+        """Gets the numbers of messages queued, written, dropped and failed, and waiting now.
+
+        Returns:
+            The counters
+        """
+        with self._condition:
+            return dict(self._counters, waiting=len(self._queue) + self._writing)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Waits for the messages queued so far to be written.
+
+        Args:
+            timeout: The longest to wait in seconds, or None to wait until they are
+
+        Returns:
+            True if they were written, False if the wait timed out
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and self._writing == 0, timeout)
+
+    def close(self, timeout: float = CLOSE_TIMEOUT) -> None:
+        """Writes the queued messages and stops the background thread.
+
+        Args:
+            timeout: The longest to wait for the messages to be written in seconds
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _write_messages(self) -> None:
+        while True:
+            with self._condition:
+                self._writing = 0
+                self._condition.notify_all()
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                size = min(self._batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(size)]
+                self._writing = len(batch)
+                dropped = self._counters["dropped"] - self._dropped_reported
+                self._dropped_reported += dropped
+                # Wake any callers waiting for room
+                self._condition.notify_all()
+
+            if dropped:
+                message = f"{dropped} log messages were dropped as the queue was full"
+                self._write(message, "MINOR", batch[0][2])
+            for record in batch:
+                self._write(*record)
+
+    def _write(self, message: str, severity: str = "INFO", src: str = "BLOCKSVR") -> None:
+        try:
+            self._logger.write_to_log(message, severity, src)
+        except Exception:
+            # Logging must never stop the server, and there is nowhere to report the failure
+            with self._condition:
+                self._counters["failed"] += 1
+        else:
+            with self._condition:
+                self._counters["written"] += 1
+
+
+def start_async_logging(logger: Any, **kwargs: Any) -> AsyncLogger:
+    """Makes print_and_log write to a logger from a background thread, until the program exits.
+
+    Args:
+        logger: The logger to write the messages to
+        kwargs: The options of AsyncLogger
+
+    Returns:
+        The logger used by print_and_log
+    """
+    async_logger = AsyncLogger(logger, **kwargs)
+    set_logger(async_logger)
+    atexit.register(async_logger.close)
+    return async_logger
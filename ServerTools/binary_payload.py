@@ -0,0 +1,155 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Binary wire format for the large JSON PVs.
+
+The large BlockServer and DatabaseServer PVs hold zlib compressed JSON which is hex encoded into
+a char waveform, doubling its size. Each of these PVs can have a binary twin, named by adding
+BINARY_PV_SUFFIX to its name, which holds the same compressed bytes directly as an array of
+unsigned chars. Clients read the twin as a uchar array and decode it with decode_binary.
+
+For clients which can only handle strings the same bytes can be carried as base64, which is a
+third larger than the raw bytes rather than twice as large.
+"""
+
+import base64
+import zlib
+from typing import Any, Dict, List, Sequence, Union
+
+from server_common.utilities import convert_to_json
+
+BINARY_PV_SUFFIX = ":BIN"
+
+BinaryData = Union[bytes, bytearray, memoryview, Sequence[int]]
+
+
+def binary_pv(pv: str) -> str:
+    """Gets the name of the binary twin of a PV.
+
+    Args:
+        pv: The name of the PV holding hexed data
+
+    Returns:
+        The name of the PV holding the same data as raw bytes
+    """
+    return pv + BINARY_PV_SUFFIX
+
+
+def binary_waveform(length: int) -> Dict[str, Any]:
+    """Gets the information needed to create a binary twin PV.
+
+    Args:
+        length: The maximum number of bytes the PV holds
+
+    Returns:
+        The PV information
+    """
+    return {"type": "char", "count": length, "value": [0]}
+
+
+def compress_binary(data: Union[str, bytes]) -> bytes:
+    """Compresses data with the same settings used for the hexed PVs.
+
+    Args:
+        data: The data to compress; strings are encoded as UTF-8
+
+    Returns:
+        The compressed data
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return zlib.compress(data)
+
+
+def to_waveform(data: bytes) -> List[int]:
+    """Converts bytes into the values of a uchar waveform.
+
+    Args:
+        data: The bytes to convert
+
+    Returns:
+        The value of each byte
+    """
+    return list(data)
+
+
+def binary_from_hexed(value: Union[str, bytes]) -> List[int]:
+    """Converts the compressed and hexed value of a PV into the value of its binary twin.
+
+    Args:
+        value: The compressed and hexed value
+
+    Returns:
+        The value of each compressed byte
+    """
+    if isinstance(value, bytes):
+        value = value.decode("ascii")
+    return to_waveform(bytes.fromhex(value))
+
+
+def encode_binary(value: Any) -> List[int]:
+    """Converts a value to JSON and compresses it into the values of a uchar waveform.
+
+    Args:
+        value: The value to encode
+
+    Returns:
+        The value of each compressed byte
+    """
+    return to_waveform(compress_binary(convert_to_json(value)))
+
+
+def decode_binary(data: BinaryData) -> bytes:
+    """Decompresses the value of a binary PV; the binary equivalent of dehex_and_decompress.
+
+    Args:
+        data: The value read from the PV, as bytes or as a sequence of signed or unsigned
+            byte values (e.g. a numpy array)
+
+    Returns:
+        The decompressed data
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return zlib.decompress(data)
+    astype = getattr(data, "astype", None)
+    if astype is not None:
+        # e.g. a numpy array, which may hold the bytes as signed or wider integers
+        return zlib.decompress(astype("uint8").tobytes())
+    return zlib.decompress(bytes(value & 0xFF for value in data))
+
+
+def encode_base64(data: Union[str, bytes]) -> bytes:
+    """Compresses data and encodes it as base64.
+
+    Args:
+        data: The data to encode; strings are encoded as UTF-8
+
+    Returns:
+        The encoded data
+    """
+    return base64.b64encode(compress_binary(data))
+
+
+def decode_base64(data: Union[str, bytes]) -> bytes:
+    """Decodes data encoded with encode_base64.
+
+    Args:
+        data: The encoded data
+
+    Returns:
+        The decompressed data
+    """
+    return zlib.decompress(base64.b64decode(data))
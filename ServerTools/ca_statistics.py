@@ -0,0 +1,157 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Counts and times the Channel Access calls made by the servers.
+
+The servers use the ChannelAccess class here in place of the one in server_common. Each caget,
+caput and pv_exists is counted by the function making the call and the prefix of the PV, which
+is the PV name without its last field, with a histogram of how long the calls took.
+"""
+
+import sys
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Any, Callable, Dict, List, Tuple
+
+from server_common.channel_access import ChannelAccess as _ChannelAccess
+from server_common.pv_names import prepend_blockserver
+
+# Publishes the statistics as compressed and hexed JSON
+CA_STATS_PV = prepend_blockserver("CA_STATS")
+# Any write clears the statistics
+RESET_CA_STATS_PV = prepend_blockserver("CA_STATS:RESET")
+# How often the statistics are published in seconds
+PUBLISH_INTERVAL = 10
+
+# The upper bounds of the histogram buckets in seconds; the last bucket holds slower calls
+BUCKET_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+
+class _Record:
+    __slots__ = ("site", "calls", "errors", "total", "max", "buckets")
+
+    def __init__(self, site: str) -> None:
+        self.site = site
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+
+class CaStatistics:
+    """Counts and times Channel Access calls by call site, operation and PV prefix."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        # Keyed by the id of the code of the caller, as code objects are slow to hash
+        self._records: Dict[Tuple[int, str, str], _Record] = {}
+        self._since = time.time()
+
+    def call(self, operation: str, function: Callable[..., Any], name: str, *args, **kwargs) -> Any:
+        """Makes a Channel Access call and records how long it took.
+
+        A call is counted as an error if it raises an exception or, for a caget, returns None,
+        which is how a timeout is reported.
+
+        Args:
+            operation: The name of the call, e.g. caget
+            function: The function making the call
+            name: The name of the PV
+            args: The other arguments of the call
+            kwargs: The keyword arguments of the call
+
+        Returns:
+            The result of the call
+        """
+        # The caller of the ChannelAccess method
+        frame = sys._getframe(2)
+        failed = True
+        start = time.perf_counter()
+        try:
+            result = function(name, *args, **kwargs)
+            failed = result is None and operation == "caget"
+            return result
+        finally:
+            duration = time.perf_counter() - start
+            key = (id(frame.f_code), operation, name.rpartition(":")[0])
+            with self._lock:
+                record = self._records.get(key)
+                if record is None:
+                    site = f"{frame.f_globals.get('__name__')}.{frame.f_code.co_qualname}"
+                    record = self._records[key] = _Record(site)
+                record.calls += 1
+                record.errors += failed
+                record.total += duration
+                if duration > record.max:
+                    record.max = duration
+                record.buckets[bisect_left(BUCKET_BOUNDS, duration)] += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Gets the statistics recorded since they were last reset.
+
+        Returns:
+            The time they were reset, the bucket bounds in milliseconds and, for each call site,
+            operation and PV prefix, the number of calls and errors, the total and longest times
+            in milliseconds and the number of calls in each bucket, slowest in total first
+        """
+        with self._lock:
+            calls: List[Dict[str, Any]] = [
+                {
+                    "site": record.site,
+                    "operation": operation,
+                    "prefix": prefix,
+                    "calls": record.calls,
+                    "errors": record.errors,
+                    "total_ms": round(1000 * record.total, 3),
+                    "max_ms": round(1000 * record.max, 3),
+                    "histogram": list(record.buckets),
+                }
+                for (_, operation, prefix), record in self._records.items()
+            ]
+            since = self._since
+        calls.sort(key=lambda c: c["total_ms"], reverse=True)
+        return {
+            "since": since,
+            "buckets_ms": [1000 * bound for bound in BUCKET_BOUNDS],
+            "calls": calls,
+        }
+
+    def reset(self) -> None:
+        """Clears the statistics."""
+        with self._lock:
+            self._records = {}
+            self._since = time.time()
+
+
+CA_STATISTICS = CaStatistics()
+
+
+class ChannelAccess(_ChannelAccess):
+    """The server_common ChannelAccess, recording the calls made in CA_STATISTICS."""
+
+    @staticmethod
+    def caget(name: str, *args, **kwargs) -> Any:
+        return CA_STATISTICS.call("caget", _ChannelAccess.caget, name, *args, **kwargs)
+
+    @staticmethod
+    def caput(name: str, *args, **kwargs) -> Any:
+        return CA_STATISTICS.call("caput", _ChannelAccess.caput, name, *args, **kwargs)
+
+    @staticmethod
+    def pv_exists(name: str, *args, **kwargs) -> Any:
+        return CA_STATISTICS.call("pv_exists", _ChannelAccess.pv_exists, name, *args, **kwargs)
@@ -0,0 +1,196 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Chunked transfer of payloads too large for a single waveform PV.
+
+A large PV holding a compressed and hexed payload is also published in pieces. The PV named by
+chunks_pv holds a compressed and hexed JSON header giving the number of chunks, the total size
+and the SHA-256 digest of the payload. The chunks themselves are held in the PVs named by
+chunk_pv, numbered from zero, which are created as they are needed. The header is set after the
+chunks, so a client which reads the header and then the chunks either gets a consistent set or
+sees the digest fail to match and reads them again; read_chunked does this.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from server_common.utilities import compress_and_hex, convert_to_json, dehex_and_decompress
+
+CHUNK_SIZE = 16000
+CHUNK_HEADER_SIZE = 1000
+DEFAULT_READ_ATTEMPTS = 3
+
+
+class ChunkError(ValueError):
+    """Raised when a set of chunks does not reassemble into the payload its header describes."""
+
+
+def chunks_pv(pv: str) -> str:
+    """Gets the name of the PV holding the chunk header of a PV.
+
+    Args:
+        pv: The name of the PV
+
+    Returns:
+        The name of the header PV
+    """
+    return pv + ":CHUNKS"
+
+
+def chunk_pv(pv: str, index: int) -> str:
+    """Gets the name of the PV holding one chunk of a PV.
+
+    Args:
+        pv: The name of the PV
+        index: The number of the chunk, from zero
+
+    Returns:
+        The name of the chunk PV
+    """
+    return f"{pv}:CHUNK:{index}"
+
+
+def payload_digest(payload: bytes) -> str:
+    """Gets the digest used to check a reassembled payload.
+
+    Args:
+        payload: The payload
+
+    Returns:
+        The SHA-256 digest of the payload as a hex string
+    """
+    return hashlib.sha256(payload).hexdigest()
+
+
+def split_payload(
+    payload: bytes, chunk_size: int = CHUNK_SIZE
+) -> Tuple[Dict[str, Any], List[bytes]]:
+    """Splits a payload into chunks.
+
+    Args:
+        payload: The payload to split
+        chunk_size: The largest size of a chunk
+
+    Returns:
+        The header describing the payload, and the chunks
+    """
+    chunks = [payload[i : i + chunk_size] for i in range(0, len(payload), chunk_size)]
+    header = {"count": len(chunks), "size": len(payload), "sha256": payload_digest(payload)}
+    return header, chunks
+
+
+def join_chunks(header: Dict[str, Any], chunks: Sequence[Union[str, bytes]]) -> bytes:
+    """Reassembles a payload from its chunks and checks it against its header.
+
+    Args:
+        header: The header describing the payload
+        chunks: The chunks, in order
+
+    Returns:
+        The payload
+
+    Raises:
+        ChunkError: If the chunks do not match the header
+    """
+    if len(chunks) != header["count"]:
+        raise ChunkError(f"Expected {header['count']} chunks but got {len(chunks)}")
+    payload = b"".join(c.encode("utf-8") if isinstance(c, str) else bytes(c) for c in chunks)
+    if len(payload) != header["size"]:
+        raise ChunkError(f"Expected {header['size']} bytes but got {len(payload)}")
+    if payload_digest(payload) != header["sha256"]:
+        raise ChunkError("Digest of the chunks does not match the header")
+    return payload
+
+
+def read_chunked(
+    get_value: Callable[[str], Union[str, bytes]],
+    pv: str,
+    attempts: int = DEFAULT_READ_ATTEMPTS,
+) -> bytes:
+    """Reads a chunked payload, reading it again if it changes while being read.
+
+    Args:
+        get_value: Gets the value of a PV from its name, e.g. a channel access get
+        pv: The name of the PV whose payload to read
+        attempts: The number of times to try before giving up
+
+    Returns:
+        The decompressed payload
+
+    Raises:
+        ChunkError: If a consistent set of chunks could not be read
+    """
+    error = ChunkError(f"No attempts made to read {pv}")
+    for _ in range(attempts):
+        header_value = get_value(chunks_pv(pv))
+        if isinstance(header_value, str):
+            header_value = header_value.encode("utf-8")
+        header = json.loads(dehex_and_decompress(header_value))
+        chunks = [get_value(chunk_pv(pv, i)) for i in range(header["count"])]
+        try:
+            return dehex_and_decompress(join_chunks(header, chunks))
+        except ChunkError as err:
+            error = err
+    raise error
+
+
+class ChunkPublisher:
+    """Publishes payloads in chunks, creating chunk PVs as they are needed.
+
+    Chunk PVs are never removed; any left over from a larger payload are emptied.
+    """
+
+    def __init__(
+        self,
+        add_pv: Callable[[str, int], None],
+        set_param: Callable[[str, bytes], None],
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            add_pv: Creates a char waveform PV from its name and size
+            set_param: Sets the value of a PV
+            chunk_size: The size of each chunk PV
+        """
+        self._add_pv = add_pv
+        self._set_param = set_param
+        self._chunk_size = chunk_size
+        self._created: Dict[str, int] = dict()
+
+    def publish(self, pv: str, payload: bytes) -> int:
+        """Sets the chunk PVs and then the header PV of a PV.
+
+        Args:
+            pv: The name of the PV
+            payload: The compressed and hexed payload
+
+        Returns:
+            The number of chunks
+        """
+        header, chunks = split_payload(payload, self._chunk_size)
+        created = self._created.get(pv, 0)
+        for index in range(created, len(chunks)):
+            self._add_pv(chunk_pv(pv, index), self._chunk_size)
+        self._created[pv] = max(created, len(chunks))
+
+        for index, chunk in enumerate(chunks):
+            self._set_param(chunk_pv(pv, index), chunk)
+        for index in range(len(chunks), created):
+            self._set_param(chunk_pv(pv, index), b"")
+        self._set_param(chunks_pv(pv), compress_and_hex(convert_to_json(header)))
+        return len(chunks)
@@ -0,0 +1,33 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+"""
+Names of DatabaseServer PVs which are not part of the shared server_common PV names.
+"""
+
+from server_common.pv_names import prepend_blockserver
+
+# Sorted list of the names of all IOCs, without descriptions or options
+IOC_NAMES = prepend_blockserver("IOC_NAMES")
+# Sorted list of the names of the IOCs which procServ reports as running
+RUNNING_IOCS = prepend_blockserver("IOCS:RUNNING")
+# The statistics of the Channel Access calls made by the DatabaseServer, see ca_statistics
+CA_STATS = prepend_blockserver("DATABASE:CA_STATS")
+# Any write clears the statistics
+RESET_CA_STATS = prepend_blockserver("DATABASE:CA_STATS:RESET")
+# Requests a memory snapshot of the DatabaseServer, see memory_snapshot
+TAKE_MEMORY_SNAPSHOT = prepend_blockserver("DATABASE:TAKE_MEMORY_SNAPSHOT")
+# The latest memory snapshot of the DatabaseServer
+MEMORY_SNAPSHOT = prepend_blockserver("DATABASE:MEMORY_SNAPSHOT")
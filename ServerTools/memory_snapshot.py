@@ -0,0 +1,147 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Reports where a long running server is using memory, to find leaks without a debugger.
+
+Tracing memory allocations with tracemalloc slows the server and uses memory itself, so it is
+only started on request. Each snapshot then reports the lines of code that allocated the most
+memory still in use, and how that changed since the previous snapshot. The sizes of the caches
+and the numbers of PVs held by the server are reported whether or not tracing is on.
+"""
+
+import time
+import tracemalloc
+from threading import Lock
+from typing import Any, Callable, Dict, List
+
+from server_common.pv_names import prepend_blockserver
+
+# Requests a memory snapshot, with JSON giving the action (start, snapshot or stop)
+TAKE_MEMORY_SNAPSHOT_PV = prepend_blockserver("TAKE_MEMORY_SNAPSHOT")
+# Publishes the latest memory snapshot as compressed and hexed JSON
+MEMORY_SNAPSHOT_PV = prepend_blockserver("MEMORY_SNAPSHOT")
+
+START = "start"
+SNAPSHOT = "snapshot"
+STOP = "stop"
+
+DEFAULT_FRAMES = 1
+DEFAULT_TOP = 25
+
+# Allocations made by tracemalloc itself and by the import system are not of interest
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _site(stat: Any) -> str:
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemorySnapshots:
+    """Takes memory snapshots and compares each with the previous one."""
+
+    def __init__(self, get_counts: Callable[[], Dict[str, int]]) -> None:
+        """Constructor.
+
+        Args:
+            get_counts: Gets the sizes of the caches and the numbers of PVs held by the server
+        """
+        self._get_counts = get_counts
+        self._previous: tracemalloc.Snapshot | None = None
+        self._lock = Lock()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Starts or stops tracing memory allocations if requested, then takes a snapshot. The
+        snapshot taken on starting is the one the next snapshot is compared with.
+
+        Args:
+            request: The action (start, snapshot or stop, by default snapshot), the number of
+             frames to trace for each allocation when starting and the number of lines to report
+
+        Returns:
+            The snapshot, as given by take
+        """
+        action = request.get("action", SNAPSHOT)
+        if action == START:
+            self.start(int(request.get("frames", DEFAULT_FRAMES)))
+        elif action == STOP:
+            self.stop()
+        elif action != SNAPSHOT:
+            raise ValueError(f"Unknown memory snapshot action {action}")
+        return self.take(int(request.get("top", DEFAULT_TOP)))
+
+    def start(self, frames: int = DEFAULT_FRAMES) -> None:
+        """Starts tracing memory allocations, if they are not already traced.
+
+        Args:
+            frames: The number of frames to trace for each allocation
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+                self._previous = None
+
+    def stop(self) -> None:
+        """Stops tracing memory allocations and frees the traces."""
+        with self._lock:
+            tracemalloc.stop()
+            self._previous = None
+
+    def take(self, top: int = DEFAULT_TOP) -> Dict[str, Any]:
+        """Takes a memory snapshot.
+
+        Args:
+            top: The number of lines allocating the most memory to report
+
+        Returns:
+            When it was taken, whether allocations are traced and the sizes of the caches and the
+            numbers of PVs. When they are traced, also the memory traced now and at most, the
+            lines allocating the most memory and the lines whose allocations changed the most
+            since the previous snapshot
+        """
+        report: Dict[str, Any] = {
+            "taken": time.time(),
+            "tracing": tracemalloc.is_tracing(),
+            "counts": self._get_counts(),
+        }
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                return report
+            snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            current, peak = tracemalloc.get_traced_memory()
+            report["traced_kb"] = round(current / 1024, 1)
+            report["peak_kb"] = round(peak / 1024, 1)
+            report["top"] = self._top(snapshot.statistics("lineno"), top)
+            if self._previous is not None:
+                report["changes"] = self._top(snapshot.compare_to(self._previous, "lineno"), top)
+            self._previous = snapshot
+        return report
+
+    @staticmethod
+    def _top(stats: List[Any], top: int) -> List[Dict[str, Any]]:
+        lines = []
+        for stat in stats[:top]:
+            line = {"site": _site(stat), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+            if hasattr(stat, "size_diff"):
+                line["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+                line["count_diff"] = stat.count_diff
+            lines.append(line)
+        return lines
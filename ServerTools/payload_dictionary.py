@@ -0,0 +1,238 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Compression of JSON payloads with a preset zlib dictionary.
+
+The JSON held by the large PVs repeats the same keys and values in every payload, so starting
+zlib off with a dictionary of those fragments makes payloads smaller, particularly small ones.
+Each PV using the dictionary has a variant named by dictionary_pv, holding the version of the
+dictionary as its first byte followed by the compressed data, all hexed. Clients fetch the
+dictionary for a version once from PAYLOAD_DICTIONARY_PV and fall back to the plain PV if they
+cannot get it.
+
+Dictionaries are never changed once shipped; a new one is added with the next version number.
+"""
+
+import base64
+import os
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
+
+from server_common.pv_names import prepend_blockserver
+from server_common.utilities import convert_to_json, dehex_and_decompress
+
+DICTIONARY_VERSION = 1
+DEFAULT_DICTIONARY_SIZE = 4096
+DICTIONARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dictionaries")
+
+PAYLOAD_DICTIONARY_PV = prepend_blockserver("PAYLOAD_DICTIONARY")
+
+# Splits JSON into keys (with the following colon), strings, and runs of other characters
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"(?:: ?)?|[^"]+')
+# The longest run of adjacent tokens considered as a single fragment
+_MAX_RUN = 4
+# Fragments longer than this are mostly one-off values which are not worth including
+_MAX_FRAGMENT = 64
+
+
+def dictionary_pv(pv: str) -> str:
+    """Gets the name of the variant of a PV which is compressed with the preset dictionary.
+
+    Args:
+        pv: The name of the PV
+
+    Returns:
+        The name of the variant
+    """
+    return pv + ":DICT"
+
+
+def dictionary_path(version: int) -> str:
+    """Gets the path of the file holding a version of the dictionary.
+
+    Args:
+        version: The version of the dictionary
+
+    Returns:
+        The path of the file
+    """
+    return os.path.join(DICTIONARY_DIR, f"payload_v{version}.dict")
+
+
+@lru_cache(maxsize=None)
+def load_dictionary(version: int = DICTIONARY_VERSION) -> bytes:
+    """Loads a version of the dictionary.
+
+    Args:
+        version: The version of the dictionary
+
+    Returns:
+        The dictionary
+
+    Raises:
+        ValueError: If there is no such version
+    """
+    try:
+        with open(dictionary_path(version), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise ValueError(f"Unknown payload dictionary version {version}")
+
+
+def compress_with_dictionary(data: str | bytes, version: int = DICTIONARY_VERSION) -> bytes:
+    """Compresses data with a version of the dictionary.
+
+    Args:
+        data: The data to compress; strings are encoded as UTF-8
+        version: The version of the dictionary to use
+
+    Returns:
+        The version as a single byte followed by the compressed data
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    compressor = zlib.compressobj(zdict=load_dictionary(version))
+    return bytes([version]) + compressor.compress(data) + compressor.flush()
+
+
+def decompress_with_dictionary(data: bytes) -> bytes:
+    """Decompresses data compressed by compress_with_dictionary.
+
+    Args:
+        data: The compressed data, starting with the version of the dictionary
+
+    Returns:
+        The decompressed data
+
+    Raises:
+        ValueError: If the version of the dictionary is not known
+    """
+    decompressor = zlib.decompressobj(zdict=load_dictionary(data[0]))
+    return decompressor.decompress(data[1:]) + decompressor.flush()
+
+
+def compress_and_hex_with_dictionary(data: str | bytes) -> bytes:
+    """Compresses data with the current dictionary and hexes it.
+
+    Args:
+        data: The data to compress; strings are encoded as UTF-8
+
+    Returns:
+        The compressed and hexed data
+    """
+    return compress_with_dictionary(data).hex().encode("ascii")
+
+
+def encode_json_with_dictionary(value: Any) -> bytes:
+    """Converts a value to JSON, compresses it with the current dictionary and hexes it.
+
+    Args:
+        value: The value to encode
+
+    Returns:
+        The encoded value
+    """
+    return compress_and_hex_with_dictionary(convert_to_json(value))
+
+
+def dictionary_from_hexed(value: str | bytes) -> bytes:
+    """Converts the compressed and hexed value of a PV into the value of its dictionary variant.
+
+    Args:
+        value: The compressed and hexed value
+
+    Returns:
+        The value compressed with the current dictionary and hexed
+    """
+    if isinstance(value, str):
+        value = value.encode("ascii")
+    return compress_and_hex_with_dictionary(dehex_and_decompress(value))
+
+
+def dehex_and_decompress_with_dictionary(value: str | bytes) -> bytes:
+    """Decodes the value of a dictionary variant PV; the counterpart of dehex_and_decompress.
+
+    Args:
+        value: The value read from the PV
+
+    Returns:
+        The decompressed data
+    """
+    if isinstance(value, bytes):
+        value = value.decode("ascii")
+    return decompress_with_dictionary(bytes.fromhex(value))
+
+
+def get_dictionary_info(version: int = DICTIONARY_VERSION) -> Dict[str, Any]:
+    """Gets the value served by PAYLOAD_DICTIONARY_PV, before it is compressed.
+
+    Args:
+        version: The version of the dictionary to serve
+
+    Returns:
+        The version and the base64 encoded dictionary
+    """
+    return {"version": version, "dictionary": base64.b64encode(load_dictionary(version)).decode()}
+
+
+def _fragments(sample: bytes) -> Iterable[bytes]:
+    tokens = _TOKEN.findall(sample)
+    for start in range(len(tokens)):
+        for end in range(start + 1, min(start + _MAX_RUN, len(tokens)) + 1):
+            fragment = b"".join(tokens[start:end])
+            if len(fragment) > _MAX_FRAGMENT:
+                break
+            yield fragment
+
+
+def train_dictionary(samples: Iterable[str | bytes], size: int = DEFAULT_DICTIONARY_SIZE) -> bytes:
+    """Builds a dictionary from the fragments of JSON which are most common in some samples.
+
+    Fragments are runs of JSON keys, strings and punctuation. Each is scored by how many samples
+    it appears in multiplied by its length, which is roughly how much it saves. zlib finds
+    matches at the end of the dictionary most cheaply, so the best fragments go last.
+
+    Args:
+        samples: Example payloads, as JSON
+        size: The largest size of the dictionary in bytes
+
+    Returns:
+        The dictionary
+    """
+    counts: Counter = Counter()
+    for sample in samples:
+        if isinstance(sample, str):
+            sample = sample.encode("utf-8")
+        counts.update(set(_fragments(sample)))
+
+    ranked = sorted(
+        (fragment for fragment, count in counts.items() if count > 1),
+        key=lambda fragment: (counts[fragment] * len(fragment), fragment),
+        reverse=True,
+    )
+    chosen: List[bytes] = []
+    length = 0
+    for fragment in ranked:
+        if length + len(fragment) > size:
+            continue
+        if any(fragment in existing for existing in chosen):
+            continue
+        chosen.append(fragment)
+        length += len(fragment)
+    return b"".join(reversed(chosen))
@@ -0,0 +1,138 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import threading
+import unittest
+
+from hamcrest import *
+
+from ServerTools.async_logger import BLOCK, DROP_NEWEST, DROP_OLDEST, AsyncLogger
+
+TIMEOUT = 5
+
+
+class RecordingLogger:
+    """Records the messages written, and can be held so messages stay queued."""
+
+    def __init__(self):
+        self.messages = []
+        self.released = threading.Event()
+        self.released.set()
+        self.writing = threading.Event()
+
+    def write_to_log(self, message, severity="INFO", src="BLOCKSVR"):
+        self.writing.set()
+        self.released.wait(TIMEOUT)
+        if message == "FAIL":
+            raise IOError("Log server not available")
+        self.messages.append(message)
+
+    def hold(self, logger):
+        # Leaves the background thread writing a message until released
+        self.released.clear()
+        logger.write_to_log("HELD")
+        self.writing.wait(TIMEOUT)
+
+
+class TestAsyncLogger(unittest.TestCase):
+    def _logger(self, **kwargs):
+        self.recorder = RecordingLogger()
+        logger = AsyncLogger(self.recorder, **kwargs)
+        self.addCleanup(logger.close)
+        self.addCleanup(self.recorder.released.set)
+        return logger
+
+    def test_WHEN_messages_written_and_flushed_THEN_written_in_order(self):
+        logger = self._logger(batch_size=3)
+
+        for i in range(10):
+            logger.write_to_log(f"MESSAGE {i}")
+
+        assert_that(logger.flush(TIMEOUT), is_(True))
+        assert_that(self.recorder.messages, is_([f"MESSAGE {i}" for i in range(10)]))
+        assert_that(logger.get_counters(), has_entries(queued=10, written=10, waiting=0))
+
+    def test_GIVEN_queue_full_and_dropping_newest_THEN_new_messages_dropped_and_reported(self):
+        logger = self._logger(max_queued=2, overflow=DROP_NEWEST)
+        self.recorder.hold(logger)
+
+        for i in range(4):
+            logger.write_to_log(f"MESSAGE {i}")
+        self.recorder.released.set()
+        logger.flush(TIMEOUT)
+
+        assert_that(
+            self.recorder.messages,
+            is_(
+                [
+                    "HELD",
+                    "2 log messages were dropped as the queue was full",
+                    "MESSAGE 0",
+                    "MESSAGE 1",
+                ]
+            ),
+        )
+        assert_that(logger.get_counters(), has_entries(dropped=2))
+
+    def test_GIVEN_queue_full_and_dropping_oldest_THEN_latest_messages_kept(self):
+        logger = self._logger(max_queued=2, overflow=DROP_OLDEST)
+        self.recorder.hold(logger)
+
+        for i in range(4):
+            logger.write_to_log(f"MESSAGE {i}")
+        self.recorder.released.set()
+        logger.flush(TIMEOUT)
+
+        assert_that(self.recorder.messages[-2:], is_(["MESSAGE 2", "MESSAGE 3"]))
+        assert_that(logger.get_counters(), has_entries(dropped=2))
+
+    def test_GIVEN_queue_full_and_blocking_THEN_caller_waits_and_nothing_dropped(self):
+        logger = self._logger(max_queued=1, overflow=BLOCK)
+        self.recorder.hold(logger)
+        logger.write_to_log("MESSAGE 0")
+
+        writer = threading.Thread(target=logger.write_to_log, args=("MESSAGE 1",))
+        writer.start()
+        writer.join(0.1)
+        assert_that(writer.is_alive(), is_(True))
+
+        self.recorder.released.set()
+        writer.join(TIMEOUT)
+        logger.flush(TIMEOUT)
+        assert_that(self.recorder.messages, is_(["HELD", "MESSAGE 0", "MESSAGE 1"]))
+        assert_that(logger.get_counters(), has_entries(dropped=0))
+
+    def test_GIVEN_write_fails_THEN_counted_and_later_messages_written(self):
+        logger = self._logger()
+
+        logger.write_to_log("FAIL")
+        logger.write_to_log("MESSAGE")
+        logger.flush(TIMEOUT)
+
+        assert_that(self.recorder.messages, is_(["MESSAGE"]))
+        assert_that(logger.get_counters(), has_entries(failed=1, written=1))
+
+    def test_WHEN_closed_THEN_queued_messages_written_and_later_ones_written_directly(self):
+        logger = self._logger()
+        logger.write_to_log("QUEUED")
+
+        logger.close()
+        logger.write_to_log("AFTER CLOSE")
+
+        assert_that(self.recorder.messages, is_(["QUEUED", "AFTER CLOSE"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
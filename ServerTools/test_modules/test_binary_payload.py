@@ -0,0 +1,78 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import json
+import unittest
+
+import numpy as np
+from hamcrest import *
+from server_common.utilities import compress_and_hex, convert_to_json
+
+from ServerTools.binary_payload import (
+    BINARY_PV_SUFFIX,
+    binary_from_hexed,
+    binary_pv,
+    decode_base64,
+    decode_binary,
+    encode_base64,
+    encode_binary,
+)
+
+VALUE = {
+    "name": "CONFIG",
+    "blocks": [{"name": f"BLOCK_{i}", "pv": f"IN:INST:PV_{i}", "local": True} for i in range(200)],
+}
+
+
+class TestBinaryPayload(unittest.TestCase):
+    def test_binary_pv_adds_suffix(self):
+        assert_that(binary_pv("BLOCKSERVER:GROUPS"), is_("BLOCKSERVER:GROUPS" + BINARY_PV_SUFFIX))
+
+    def test_GIVEN_value_encoded_WHEN_decoded_THEN_same_json_returned(self):
+        waveform = encode_binary(VALUE)
+
+        assert_that(all(0 <= b <= 255 for b in waveform), is_(True))
+        assert_that(json.loads(decode_binary(waveform)), is_(VALUE))
+
+    def test_GIVEN_hexed_value_WHEN_converted_to_binary_THEN_same_as_encoded(self):
+        hexed = compress_and_hex(convert_to_json(VALUE))
+
+        assert_that(binary_from_hexed(hexed), is_(encode_binary(VALUE)))
+        assert_that(binary_from_hexed(hexed.decode("ascii")), is_(encode_binary(VALUE)))
+
+    def test_GIVEN_bytes_read_as_signed_values_WHEN_decoded_THEN_same_json_returned(self):
+        signed = [b - 256 if b > 127 else b for b in encode_binary(VALUE)]
+
+        assert_that(json.loads(decode_binary(signed)), is_(VALUE))
+
+    def test_GIVEN_bytes_read_as_numpy_array_WHEN_decoded_THEN_same_json_returned(self):
+        for dtype in ["uint8", "int8", "int32"]:
+            array = np.array(encode_binary(VALUE), dtype="uint8").astype(dtype)
+            assert_that(json.loads(decode_binary(array)), is_(VALUE), dtype)
+
+    def test_GIVEN_value_encoded_as_base64_WHEN_decoded_THEN_same_json_returned(self):
+        encoded = encode_base64(convert_to_json(VALUE))
+
+        assert_that(json.loads(decode_base64(encoded.decode("ascii"))), is_(VALUE))
+
+    def test_binary_is_half_the_size_of_hex(self):
+        hexed = compress_and_hex(convert_to_json(VALUE))
+
+        assert_that(len(encode_binary(VALUE)) * 2, is_(len(hexed)))
+        assert_that(len(encode_base64(convert_to_json(VALUE))), is_(less_than(len(hexed))))
+
+
+if __name__ == "__main__":
+    unittest.main()
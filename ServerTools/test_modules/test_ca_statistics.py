@@ -0,0 +1,83 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import unittest
+
+from hamcrest import *
+from mock import Mock, patch
+
+from ServerTools.ca_statistics import CA_STATISTICS, ChannelAccess
+
+PREFIX = "IN:INST:CS:PS:SIMPLE"
+
+
+def read_status():
+    return ChannelAccess.caget(f"{PREFIX}:STATUS", as_string=True)
+
+
+def start_ioc():
+    ChannelAccess.caput(f"{PREFIX}:START", 1)
+
+
+class TestCaStatistics(unittest.TestCase):
+    def setUp(self):
+        self.ca = Mock()
+        ca_patch = patch("ServerTools.ca_statistics._ChannelAccess", self.ca)
+        ca_patch.start()
+        self.addCleanup(ca_patch.stop)
+        CA_STATISTICS.reset()
+        self.addCleanup(CA_STATISTICS.reset)
+
+    def _calls(self):
+        return {(c["site"], c["operation"]): c for c in CA_STATISTICS.get_statistics()["calls"]}
+
+    def test_WHEN_calls_made_THEN_counted_by_site_operation_and_prefix(self):
+        self.ca.caget.return_value = "Running"
+
+        for _ in range(3):
+            assert_that(read_status(), is_("Running"))
+        start_ioc()
+
+        calls = self._calls()
+        site = f"{__name__}.read_status"
+        assert_that(calls[(site, "caget")], has_entries(prefix=PREFIX, calls=3, errors=0))
+        assert_that(sum(calls[(site, "caget")]["histogram"]), is_(3))
+        assert_that(calls[(f"{__name__}.start_ioc", "caput")], has_entries(calls=1))
+        self.ca.caget.assert_called_with(f"{PREFIX}:STATUS", as_string=True)
+
+    def test_GIVEN_caget_times_out_WHEN_called_THEN_counted_as_error(self):
+        self.ca.caget.return_value = None
+
+        read_status()
+
+        assert_that(self._calls()[(f"{__name__}.read_status", "caget")], has_entries(errors=1))
+
+    def test_GIVEN_call_raises_WHEN_called_THEN_counted_as_error_and_raised(self):
+        self.ca.caput.side_effect = IOError("Put failed")
+
+        self.assertRaises(IOError, start_ioc)
+
+        assert_that(self._calls()[(f"{__name__}.start_ioc", "caput")], has_entries(errors=1))
+
+    def test_WHEN_reset_THEN_statistics_cleared(self):
+        start_ioc()
+
+        CA_STATISTICS.reset()
+
+        assert_that(CA_STATISTICS.get_statistics()["calls"], is_(empty()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import json
+import unittest
+
+from hamcrest import *
+from server_common.utilities import compress_and_hex, convert_to_json
+
+from ServerTools.chunked_payload import (
+    ChunkError,
+    ChunkPublisher,
+    chunk_pv,
+    chunks_pv,
+    join_chunks,
+    read_chunked,
+    split_payload,
+)
+
+PV = "TEST_PV"
+CHUNK_SIZE = 100
+
+
+def payload_of(value):
+    return compress_and_hex(convert_to_json(value))
+
+
+VALUE = {"blocks": [f"BLOCK_{i}" for i in range(500)]}
+
+
+class TestChunkedPayload(unittest.TestCase):
+    def setUp(self):
+        self.pvs = dict()
+        self.added = []
+        self.publisher = ChunkPublisher(self._add_pv, self.pvs.__setitem__, CHUNK_SIZE)
+
+    def _add_pv(self, name, count):
+        self.added.append((name, count))
+
+    def test_GIVEN_payload_split_WHEN_joined_THEN_same_payload(self):
+        payload = payload_of(VALUE)
+
+        header, chunks = split_payload(payload, CHUNK_SIZE)
+
+        assert_that(len(chunks), is_(header["count"]))
+        assert_that(all(len(chunk) <= CHUNK_SIZE for chunk in chunks), is_(True))
+        assert_that(join_chunks(header, chunks), is_(payload))
+
+    def test_GIVEN_chunk_changed_WHEN_joined_THEN_error(self):
+        header, chunks = split_payload(payload_of(VALUE), CHUNK_SIZE)
+        chunks[1] = chunks[1][::-1]
+
+        assert_that(calling(join_chunks).with_args(header, chunks), raises(ChunkError))
+
+    def test_GIVEN_chunk_missing_WHEN_joined_THEN_error(self):
+        header, chunks = split_payload(payload_of(VALUE), CHUNK_SIZE)
+
+        assert_that(calling(join_chunks).with_args(header, chunks[:-1]), raises(ChunkError))
+
+    def test_GIVEN_payload_published_WHEN_read_THEN_same_value(self):
+        count = self.publisher.publish(PV, payload_of(VALUE))
+
+        assert_that(count, is_(greater_than(1)))
+        assert_that(self.added, is_([(chunk_pv(PV, i), CHUNK_SIZE) for i in range(count)]))
+        assert_that(json.loads(read_chunked(self.pvs.__getitem__, PV)), is_(VALUE))
+
+    def test_GIVEN_smaller_payload_published_THEN_no_new_pvs_and_left_over_chunks_emptied(self):
+        count = self.publisher.publish(PV, payload_of(VALUE))
+        self.added.clear()
+
+        smaller_count = self.publisher.publish(PV, payload_of({"blocks": []}))
+
+        assert_that(self.added, is_(empty()))
+        assert_that(self.pvs[chunk_pv(PV, count - 1)], is_(b""))
+        assert_that(json.loads(read_chunked(self.pvs.__getitem__, PV)), is_({"blocks": []}))
+        assert_that(smaller_count, is_(1))
+
+    def test_GIVEN_payload_changes_while_being_read_THEN_read_again(self):
+        self.publisher.publish(PV, payload_of(VALUE))
+        new_value = {"blocks": ["NEW"] * 300}
+        reads = []
+
+        def get_value(name):
+            reads.append(name)
+            value = self.pvs[name]
+            if name == chunk_pv(PV, 0) and reads.count(name) == 1:
+                # The payload is republished between the header and the chunks being read
+                self.publisher.publish(PV, payload_of(new_value))
+            return value.decode("utf-8")
+
+        assert_that(json.loads(read_chunked(get_value, PV)), is_(new_value))
+        assert_that(reads.count(chunks_pv(PV)), is_(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
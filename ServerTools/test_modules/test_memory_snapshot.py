@@ -0,0 +1,69 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import tracemalloc
+import unittest
+
+from hamcrest import *
+
+from ServerTools.memory_snapshot import MemorySnapshots
+
+COUNTS = {"pvs": 10, "on_the_fly_pvs": 2}
+
+
+def allocate():
+    return [str(i) * 10 for i in range(20000)]
+
+
+class TestMemorySnapshot(unittest.TestCase):
+    def setUp(self):
+        if tracemalloc.is_tracing():
+            self.skipTest("Memory allocations are already traced")
+        self.snapshots = MemorySnapshots(lambda: COUNTS)
+        self.addCleanup(tracemalloc.stop)
+
+    def test_GIVEN_not_tracing_WHEN_snapshot_taken_THEN_only_counts_reported(self):
+        report = self.snapshots.handle({})
+
+        assert_that(report, has_entries(tracing=False, counts=COUNTS))
+        assert_that(report, not_(has_key("top")))
+
+    def test_GIVEN_tracing_started_WHEN_snapshot_taken_THEN_allocations_and_changes_reported(self):
+        started = self.snapshots.handle({"action": "start"})
+        kept = allocate()
+
+        report = self.snapshots.handle({"top": 5})
+
+        assert_that(started, has_entries(tracing=True, counts=COUNTS))
+        assert_that(started, not_(has_key("changes")))
+        for lines in (report["top"], report["changes"]):
+            assert_that(lines[0]["site"], starts_with(__file__.rsplit(".", 1)[0] + ".py:"))
+        assert_that(report["changes"][0], has_entries(size_diff_kb=greater_than(100)))
+        assert_that(len(kept), is_(20000))
+
+    def test_GIVEN_tracing_WHEN_stopped_THEN_not_tracing(self):
+        self.snapshots.handle({"action": "start"})
+
+        report = self.snapshots.handle({"action": "stop"})
+
+        assert_that(report, has_entries(tracing=False))
+
+    def test_WHEN_unknown_action_requested_THEN_error(self):
+        with self.assertRaises(ValueError):
+            self.snapshots.handle({"action": "dump"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import base64
+import json
+import unittest
+import zlib
+
+from hamcrest import *
+from server_common.utilities import compress_and_hex, convert_to_json
+
+from BlockServer.config.block import Block
+from ServerTools.payload_dictionary import (
+    DICTIONARY_VERSION,
+    compress_with_dictionary,
+    decompress_with_dictionary,
+    dehex_and_decompress_with_dictionary,
+    dictionary_from_hexed,
+    encode_json_with_dictionary,
+    get_dictionary_info,
+    load_dictionary,
+    train_dictionary,
+)
+
+BLOCKS = [Block(f"BLOCK_{i}", f"IN:INST:DEVICE_{i}:VALUE").to_dict() for i in range(3)]
+
+
+class TestPayloadDictionary(unittest.TestCase):
+    def test_GIVEN_value_encoded_WHEN_decoded_THEN_same_value(self):
+        encoded = encode_json_with_dictionary(BLOCKS)
+
+        assert_that(json.loads(dehex_and_decompress_with_dictionary(encoded)), is_(BLOCKS))
+        assert_that(
+            json.loads(dehex_and_decompress_with_dictionary(encoded.decode("ascii"))),
+            is_(BLOCKS),
+        )
+
+    def test_GIVEN_hexed_value_WHEN_converted_to_dictionary_variant_THEN_same_as_encoded(self):
+        hexed = compress_and_hex(convert_to_json(BLOCKS))
+
+        assert_that(dictionary_from_hexed(hexed), is_(encode_json_with_dictionary(BLOCKS)))
+
+    def test_GIVEN_compressed_THEN_first_byte_is_dictionary_version(self):
+        assert_that(compress_with_dictionary("{}")[0], is_(DICTIONARY_VERSION))
+
+    def test_GIVEN_unknown_version_WHEN_decompressed_THEN_error(self):
+        data = bytes([255]) + compress_with_dictionary("{}")[1:]
+
+        assert_that(calling(decompress_with_dictionary).with_args(data), raises(ValueError))
+
+    def test_GIVEN_small_config_payload_THEN_smaller_with_dictionary(self):
+        data = convert_to_json(BLOCKS)
+
+        assert_that(
+            len(compress_with_dictionary(data)), is_(less_than(len(zlib.compress(data.encode()))))
+        )
+
+    def test_dictionary_info_holds_dictionary(self):
+        info = get_dictionary_info()
+
+        assert_that(info["version"], is_(DICTIONARY_VERSION))
+        assert_that(base64.b64decode(info["dictionary"]), is_(load_dictionary()))
+
+    def test_GIVEN_samples_WHEN_trained_THEN_only_common_fragments_included(self):
+        samples = [
+            json.dumps({"name": f"N{i}", "visible": True, "unique": f"U{i}"}) for i in range(20)
+        ]
+
+        dictionary = train_dictionary(samples, size=40).decode()
+
+        assert_that(len(dictionary), is_(less_than_or_equal_to(40)))
+        assert_that(dictionary, contains_string('"visible": true'))
+        assert_that(dictionary, is_not(contains_string("U1")))
+
+
+if __name__ == "__main__":
+    unittest.main()
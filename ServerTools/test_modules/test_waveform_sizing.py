@@ -0,0 +1,72 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import *
+
+from ServerTools.waveform_sizing import (
+    DETAILS_SIZE,
+    LIST_SIZE,
+    estimate_config_payload_sizes,
+    hexed_size,
+    required_count,
+)
+
+
+class TestWaveformSizing(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.config_dir = os.path.join(self.root, "configurations")
+        self.component_dir = os.path.join(self.root, "components")
+
+    def _write(self, directory, name, files):
+        os.makedirs(os.path.join(directory, name))
+        for filename, content in files.items():
+            with open(os.path.join(directory, name, filename), "wb") as f:
+                f.write(content)
+
+    def test_GIVEN_small_data_THEN_minimum_size_used(self):
+        assert_that(required_count(100, 16000), is_(16000))
+
+    def test_GIVEN_large_data_THEN_size_has_headroom_and_is_rounded(self):
+        count = required_count(40000, 16000, headroom=1.5)
+
+        assert_that(count, is_(60000))
+        assert_that(required_count(40001, 16000, headroom=1.5), is_(61000))
+
+    def test_GIVEN_no_configurations_THEN_estimates_are_zero(self):
+        sizes = estimate_config_payload_sizes(self.config_dir, self.component_dir)
+
+        assert_that(sizes, is_({DETAILS_SIZE: 0, LIST_SIZE: 0}))
+
+    def test_GIVEN_configurations_THEN_details_estimate_from_largest(self):
+        small = {"blocks.xml": b"<blocks/>", "meta.xml": b"<meta>small</meta>"}
+        large = {"blocks.xml": os.urandom(5000), "meta.xml": b"<meta>large</meta>"}
+        self._write(self.config_dir, "SMALL", small)
+        self._write(self.component_dir, "LARGE", large)
+
+        sizes = estimate_config_payload_sizes(self.config_dir, self.component_dir)
+
+        assert_that(sizes[DETAILS_SIZE], is_(hexed_size(large["blocks.xml"] + large["meta.xml"])))
+        assert_that(sizes[LIST_SIZE], is_(hexed_size(small["meta.xml"] + large["meta.xml"])))
+
+
+if __name__ == "__main__":
+    unittest.main()
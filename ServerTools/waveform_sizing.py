@@ -0,0 +1,108 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+"""Works out how large the waveform PVs need to be from the data they will hold.
+
+The size of a waveform PV is fixed when it is created, so it is chosen at startup from the data
+available then, with headroom for the data to grow. Payloads which outgrow their PV later are
+still available in full through the chunked PVs (see chunked_payload).
+"""
+
+import math
+import os
+from typing import Dict, Iterable, Optional
+
+from ServerTools.binary_payload import compress_binary
+
+DEFAULT_HEADROOM = 2.0
+SIZE_STEP = 1000
+
+# Keys of the estimates made by estimate_config_payload_sizes
+DETAILS_SIZE = "details"
+LIST_SIZE = "list"
+
+META_FILE = "meta.xml"
+
+
+def required_count(length: int, minimum: int, headroom: float = DEFAULT_HEADROOM) -> int:
+    """Gets the number of elements a waveform needs to hold some data and allow it to grow.
+
+    Args:
+        length: The length of the data
+        minimum: The smallest size to return
+        headroom: The factor by which the data may grow
+
+    Returns:
+        The size, rounded up to a whole number of SIZE_STEP elements
+    """
+    return max(minimum, math.ceil(length * headroom / SIZE_STEP) * SIZE_STEP)
+
+
+def hexed_size(data: bytes) -> int:
+    """Gets the length data will have once it has been compressed and hexed.
+
+    Args:
+        data: The uncompressed data
+
+    Returns:
+        The length of the compressed and hexed data
+    """
+    return 2 * len(compress_binary(data)) if data else 0
+
+
+def _read_files(paths: Iterable[str]) -> bytes:
+    contents = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                contents.append(f.read())
+        except OSError:
+            continue
+    return b"".join(contents)
+
+
+def _subdirectories(root: Optional[str]) -> Iterable[str]:
+    if root is None or not os.path.isdir(root):
+        return []
+    paths = (os.path.join(root, name) for name in sorted(os.listdir(root)))
+    return [path for path in paths if os.path.isdir(path)]
+
+
+def _files_in(directory: str) -> Iterable[str]:
+    paths = (os.path.join(directory, name) for name in sorted(os.listdir(directory)))
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def estimate_config_payload_sizes(config_dir: str, component_dir: str) -> Dict[str, int]:
+    """Estimates the size of the compressed JSON PVs from the configurations on disk.
+
+    The details of a configuration hold the same information as its XML files, and compress to
+    about the same size, so the largest configuration or component gives the size of the
+    details PVs. The list PVs hold the metadata of every configuration or component.
+
+    Args:
+        config_dir: The directory holding the configurations
+        component_dir: The directory holding the components
+
+    Returns:
+        The estimated compressed and hexed lengths, keyed by DETAILS_SIZE and LIST_SIZE
+    """
+    details = 0
+    metadata = []
+    for directory in [*_subdirectories(config_dir), *_subdirectories(component_dir)]:
+        details = max(details, hexed_size(_read_files(_files_in(directory))))
+        metadata.append(os.path.join(directory, META_FILE))
+    return {DETAILS_SIZE: details, LIST_SIZE: hexed_size(_read_files(metadata))}
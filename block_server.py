@@ -20,7 +20,7 @@ import json
 import os
 import sys
 import traceback
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Tuple
 
 from server_common.channel_access import ManagerModeRequiredError, verify_manager_mode
 from server_common.channel_access_server import CAServer
@@ -32,13 +32,12 @@ import argparse
 import datetime
 from importlib.resources import as_file, files
 from queue import Queue
-from threading import RLock, Thread
+from threading import Lock, RLock, Thread
 from time import sleep, time
 
 from ibex_non_ca_helpers.compress_hex import compress_and_hex, dehex_and_decompress
 from pcaspy import Driver, SimpleServer
 from pcaspy.driver import Data, manager
-from server_common.channel_access import ChannelAccess
 from server_common.file_path_manager import FILEPATH_MANAGER
 from server_common.helpers import BLOCK_PREFIX, CONTROL_SYSTEM_PREFIX, MACROS, PVPREFIX_MACRO
 from server_common.pv_names import BlockserverPVNames
@@ -47,33 +46,114 @@ from server_common.utilities import (
     convert_from_json,
     convert_to_json,
     print_and_log,
-    set_logger,
 )
 
 from BlockServer.component_switcher.component_switcher import ComponentSwitcher
 from BlockServer.config.json_converter import ConfigurationJsonConverter
 from BlockServer.core.active_config_holder import ActiveConfigHolder
+from BlockServer.core.command_profiler import (
+    COMMAND_PROFILES_PV,
+    PROFILE_COMMANDS_PV,
+    CommandProfiler,
+)
+from BlockServer.core.config_batch import (
+    EDIT_CONFIGS_PV,
+    ConfigEdit,
+    edit_paths,
+    parse_edits,
+    prepare_edits,
+    save_edits,
+)
+from BlockServer.core.config_diff import CONFIG_DIFF_PV, DIFF_CONFIGS_PV, diff_configs
 from BlockServer.core.config_list_manager import ConfigListManager
+from BlockServer.core.config_staging import (
+    PRESTAGE_CONFIG_PV,
+    ConfigStager,
+    config_content_paths,
+    content_hash,
+)
+from BlockServer.core.constants import ARCHIVE_CONFIG, GATEWAY_ALIASES, RUNCONTROL_FILE
+from BlockServer.core.encoding_service import (
+    Encoder,
+    EncodingService,
+    encode_json,
+    encode_json_as_str,
+)
 from BlockServer.core.inactive_config_holder import InactiveConfigHolder
 from BlockServer.core.ioc_control import IocControl
+from BlockServer.core.resource_scheduler import (
+    ACTIVE_CONFIG,
+    ResourceScheduler,
+    active_config_resources,
+    component_resource,
+    config_resource,
+)
+from BlockServer.core.search_index import SEARCH_CONFIGS_PV, SEARCH_RESULTS_PV
+from BlockServer.core.state_snapshot import (
+    SNAPSHOT_FILENAME,
+    SNAPSHOT_INTERVAL,
+    StateSnapshot,
+    file_digests,
+)
+from BlockServer.core.static_payloads import StaticPayloadRegistry
 from BlockServer.devices.devices_manager import DevicesManager
 from BlockServer.epics.archiver_manager import ArchiverManager
 from BlockServer.epics.gateway import Gateway
-from BlockServer.fileIO.file_manager import ConfigurationFileManager
+from BlockServer.fileIO.file_manager import STAGING_DIR_IGNORE_PATTERN, ConfigurationFileManager
+from BlockServer.fileIO.sqlite_file_manager import (
+    ConfigDatabase,
+    SqliteConfigurationFileManager,
+    SqliteDevicesFileIO,
+    SqliteSynopticFileIO,
+)
 from BlockServer.mocks.mock_version_control import MockVersionControl
-from BlockServer.runcontrol.runcontrol_manager import RunControlManager
+from BlockServer.runcontrol.runcontrol_manager import (
+    RunControlManager,
+    build_runcontrol_settings,
+)
 from BlockServer.site_specific.default.block_rules import BlockRules
 from BlockServer.site_specific.default.general_rules import (
     ConfigurationDescriptionRules,
     GroupRules,
 )
 from BlockServer.synoptic.synoptic_manager import SynopticManager
-from ConfigVersionControl.git_version_control import GitVersionControl, RepoFactory
 from ConfigVersionControl.version_control_exceptions import (
     NotUnderVersionControl,
     VersionControlException,
 )
-from WebServer.simple_webserver import Server
+from ServerTools.async_logger import start_async_logging
+from ServerTools.binary_payload import (
+    binary_from_hexed,
+    binary_pv,
+    binary_waveform,
+    encode_binary,
+)
+from ServerTools.ca_statistics import (
+    CA_STATISTICS,
+    CA_STATS_PV,
+    PUBLISH_INTERVAL,
+    RESET_CA_STATS_PV,
+    ChannelAccess,
+)
+from ServerTools.chunked_payload import CHUNK_HEADER_SIZE, ChunkPublisher, chunks_pv
+from ServerTools.memory_snapshot import (
+    MEMORY_SNAPSHOT_PV,
+    TAKE_MEMORY_SNAPSHOT_PV,
+    MemorySnapshots,
+)
+from ServerTools.payload_dictionary import (
+    PAYLOAD_DICTIONARY_PV,
+    dictionary_from_hexed,
+    dictionary_pv,
+    encode_json_with_dictionary,
+    get_dictionary_info,
+)
+from ServerTools.waveform_sizing import (
+    DETAILS_SIZE,
+    LIST_SIZE,
+    estimate_config_payload_sizes,
+    required_count,
+)
 
 if TYPE_CHECKING:
     from BlockServer.config.ioc import IOC
@@ -95,6 +175,7 @@ initial_dbs = {
     BlockserverPVNames.GROUPS: char_waveform(16000),
     BlockserverPVNames.COMPS: char_waveform(16000),
     BlockserverPVNames.LOAD_CONFIG: char_waveform(1000),
+    PRESTAGE_CONFIG_PV: char_waveform(1000),
     BlockserverPVNames.RELOAD_CURRENT_CONFIG: char_waveform(100),
     BlockserverPVNames.START_IOCS: char_waveform(16000),
     BlockserverPVNames.STOP_IOCS: char_waveform(1000),
@@ -111,6 +192,18 @@ initial_dbs = {
     BlockserverPVNames.ALL_COMPONENT_DETAILS: char_waveform(64000),
     BlockserverPVNames.BANNER_DESCRIPTION: char_waveform(16000),
     BlockserverPVNames.CURR_CONFIG_NAME: char_waveform(500),
+    PAYLOAD_DICTIONARY_PV: char_waveform(16000),
+    DIFF_CONFIGS_PV: char_waveform(1000),
+    CONFIG_DIFF_PV: char_waveform(64000),
+    SEARCH_CONFIGS_PV: char_waveform(1000),
+    SEARCH_RESULTS_PV: char_waveform(64000),
+    EDIT_CONFIGS_PV: char_waveform(64000),
+    CA_STATS_PV: char_waveform(256000),
+    RESET_CA_STATS_PV: char_waveform(100),
+    PROFILE_COMMANDS_PV: char_waveform(1000),
+    COMMAND_PROFILES_PV: char_waveform(64000),
+    TAKE_MEMORY_SNAPSHOT_PV: char_waveform(1000),
+    MEMORY_SNAPSHOT_PV: char_waveform(64000),
     BlockserverPVNames.CURR_CONFIG_NAME_SEVR: {
         "type": "enum",
         "count": 1,
@@ -119,6 +212,168 @@ initial_dbs = {
     },
 }
 
+# PVs whose values are not kept in snapshots: they change constantly or acknowledge commands
+SNAPSHOT_EXCLUDED_PVS = frozenset(
+    {
+        BlockserverPVNames.HEARTBEAT,
+        BlockserverPVNames.SERVER_STATUS,
+        BlockserverPVNames.LOAD_CONFIG,
+        PRESTAGE_CONFIG_PV,
+        DIFF_CONFIGS_PV,
+        SEARCH_CONFIGS_PV,
+        BlockserverPVNames.RELOAD_CURRENT_CONFIG,
+        BlockserverPVNames.START_IOCS,
+        BlockserverPVNames.STOP_IOCS,
+        BlockserverPVNames.RESTART_IOCS,
+        BlockserverPVNames.SET_CURR_CONFIG_DETAILS,
+        BlockserverPVNames.SAVE_NEW_CONFIG,
+        BlockserverPVNames.SAVE_NEW_COMPONENT,
+        EDIT_CONFIGS_PV,
+        BlockserverPVNames.DELETE_CONFIGS,
+        BlockserverPVNames.DELETE_COMPONENTS,
+        CA_STATS_PV,
+        RESET_CA_STATS_PV,
+        PROFILE_COMMANDS_PV,
+        COMMAND_PROFILES_PV,
+        TAKE_MEMORY_SNAPSHOT_PV,
+        MEMORY_SNAPSHOT_PV,
+    }
+)
+
+# The large compressed JSON PVs, keyed by which estimate of their size they need. Each also has
+# a binary twin holding the same compressed JSON without the hex encoding and a variant
+# compressed with the preset payload dictionary, and is published in chunks for when it outgrows
+# its PV.
+LARGE_JSON_PVS = {
+    BlockserverPVNames.BLOCKNAMES: DETAILS_SIZE,
+    BlockserverPVNames.GROUPS: DETAILS_SIZE,
+    BlockserverPVNames.COMPS: LIST_SIZE,
+    BlockserverPVNames.CONFIGS: LIST_SIZE,
+    BlockserverPVNames.GET_CURR_CONFIG_DETAILS: DETAILS_SIZE,
+    BlockserverPVNames.WD_CONF_DETAILS: DETAILS_SIZE,
+    # A diff holds at most the details of both configurations, and the results of a broad search
+    # can hold every block in every configuration, so both may still need their chunks
+    CONFIG_DIFF_PV: DETAILS_SIZE,
+    SEARCH_RESULTS_PV: DETAILS_SIZE,
+}
+# The binary twins, dictionary variants and chunk headers of the large JSON PVs, which are
+# derived from their values and so are not kept in snapshots
+DERIVED_PVS: set[str] = set()
+# The large JSON PV each binary twin and dictionary variant is built from and the function
+# building it from the compressed and hexed value of that PV
+LAZY_DERIVED_PVS: Dict[str, Tuple[str, Callable[[str | bytes], Any]]] = {}
+
+
+# The SQLite database holding the configurations, if they are not kept as XML files
+CONFIG_DATABASE: ConfigDatabase | None = None
+
+
+def new_file_manager() -> ConfigurationFileManager:
+    """Creates a file manager for the configurations in the configured store.
+
+    Returns:
+        The file manager
+    """
+    if CONFIG_DATABASE is not None:
+        return SqliteConfigurationFileManager(CONFIG_DATABASE)
+    return ConfigurationFileManager()
+
+
+def config_fingerprint(paths: Iterable[str]) -> str:
+    """Gets a fingerprint of the configurations and components in the configured store, which
+    changes whenever they are saved.
+
+    Args:
+        paths: The directories of the configurations and components, if kept as XML files
+
+    Returns:
+        The hash of the files, or the revision of the database, which changes whenever anything
+        in it is saved
+    """
+    if CONFIG_DATABASE is not None:
+        return f"{CONFIG_DATABASE.path}@{CONFIG_DATABASE.get_revision()}"
+    return content_hash(paths)
+
+
+def size_large_json_pvs(sizes: Dict[str, int]) -> None:
+    """Sizes the large JSON PVs, and adds their binary twins, dictionary variants and chunk
+    headers, before they are created.
+
+    PVs are only ever made larger than their default size.
+
+    Args:
+        sizes: The estimated size of the payloads, keyed by the values of LARGE_JSON_PVS
+    """
+    for pv, size_key in LARGE_JSON_PVS.items():
+        count = required_count(sizes.get(size_key, 0), initial_dbs[pv]["count"])
+        initial_dbs[pv] = char_waveform(count)
+        initial_dbs[binary_pv(pv)] = binary_waveform(count)
+        initial_dbs[dictionary_pv(pv)] = char_waveform(count)
+        initial_dbs[chunks_pv(pv)] = char_waveform(CHUNK_HEADER_SIZE)
+        DERIVED_PVS.update({binary_pv(pv), dictionary_pv(pv), chunks_pv(pv)})
+        LAZY_DERIVED_PVS[binary_pv(pv)] = (pv, binary_from_hexed)
+        LAZY_DERIVED_PVS[dictionary_pv(pv)] = (pv, dictionary_from_hexed)
+
+
+size_large_json_pvs({})
+
+
+def _is_derived_pv(pv: str) -> bool:
+    """Checks whether a PV holds a value derived from one of the large JSON PVs.
+
+    Args:
+        pv: The name of the PV
+
+    Returns:
+        True for the binary twins, dictionary variants, chunk headers and chunks
+    """
+    return pv in DERIVED_PVS or pv.rpartition(":CHUNK:")[0] in LARGE_JSON_PVS
+
+
+def _name_from_details(details: str) -> str | None:
+    """Gets the name from the JSON details of a configuration or component.
+
+    Args:
+        details: The JSON details
+
+    Returns:
+        The name, or None if the details cannot be read
+    """
+    try:
+        return convert_from_json(details)["name"]
+    except Exception:
+        # The write command itself reports the problem when it runs
+        return None
+
+
+def _resources_for(resource: Callable[[str], str], names: Any) -> set[str] | None:
+    """Gets the resources for some configurations or components.
+
+    Args:
+        resource: Gets the resource for a name
+        names: The names
+
+    Returns:
+        The resources, or None (meaning every resource) if the names are not all known
+    """
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        return None
+    return {resource(name) for name in names}
+
+
+def _edit_resources(edits: list[ConfigEdit]) -> set[str]:
+    """Gets the resources for a batch of edits.
+
+    Args:
+        edits: The edits
+
+    Returns:
+        The resources of the configurations and components edited
+    """
+    return {
+        (component_resource if edit.is_component else config_resource)(edit.name) for edit in edits
+    }
+
 
 class BlockServer(Driver):
     """The class for handling all the static PV access and monitors etc."""
@@ -130,12 +385,31 @@ class BlockServer(Driver):
             ca_server (CAServer): The CA server used for generating PVs on the fly
         """
         super(BlockServer, self).__init__()
+        # The values published on each PV, kept to snapshot
+        self._published: Dict[str, Any] = dict()
+        # The PVs created to restore the snapshot which no handler has created since
+        self._snapshot_only_pvs: set[str] = set()
+        # The binary twins and dictionary variants which have been read, and so are built
+        # whenever their PV is published, and those not built since their PV was last published
+        self._read_derived_pvs: set[str] = set()
+        self._stale_derived_pvs: set[str] = set(LAZY_DERIVED_PVS)
+        self._derived_lock = Lock()
 
         # Threading stuff
         self.monitor_lock = RLock()
         self.write_queue = Queue()
+        self._write_commands = ResourceScheduler()
+        self._running_states: list[str] = []
+        self._status_lock = Lock()
+        self._chunks = ChunkPublisher(self.add_string_pv_to_db, self.setParam)
+        self._encoding_service = EncodingService(
+            self._set_encoded_param, self.updatePVs, self.monitor_lock
+        )
+        self._command_profiler = CommandProfiler(
+            lambda profiles: self.encode_and_set_param(COMMAND_PROFILES_PV, profiles)
+        )
+        self._memory_snapshots = MemorySnapshots(self._get_memory_counts)
 
-        FILEPATH_MANAGER.initialise(CONFIG_DIR, SCRIPT_DIR, SCHEMA_DIR)
         drive = os.path.abspath(".").split(os.path.sep)[0] + os.path.sep
         self.instrument_scripts = os.path.join(drive, "Instrument", "scripts")
 
@@ -148,6 +422,9 @@ class BlockServer(Driver):
             self.instrument_prefix + BLOCK_PREFIX,
         )
         self._active_configserver = None
+        # The configuration most recently queued to load, which may become the active one
+        self._queued_config: str | None = None
+        self._stager = None
         self._run_control = None
         self._syn = None
         self._devices = None
@@ -156,13 +433,170 @@ class BlockServer(Driver):
         self.block_rules = BlockRules(self)
         self.group_rules = GroupRules(self)
         self.config_desc = ConfigurationDescriptionRules(self)
-        self.spangle_banner = json.dumps(ConfigurationFileManager.get_banner_config())
+        self._static_payloads = StaticPayloadRegistry()
+        self._static_payloads.register(
+            BlockserverPVNames.BANNER_DESCRIPTION,
+            lambda data: json.dumps(ConfigurationFileManager.parse_banner_config(data)),
+            FILEPATH_MANAGER.get_banner_path(),
+        )
+        self._static_payloads.register(
+            BlockserverPVNames.BLANK_CONFIG, lambda _: convert_to_json(self.get_blank_config())
+        )
+        self._static_payloads.register(
+            PAYLOAD_DICTIONARY_PV, lambda _: convert_to_json(get_dictionary_info())
+        )
+
+        self._config_list = None
+        self._config_vc = MockVersionControl()
+        self._component_switcher = None
+        self._active_fingerprint = ""
+        # Serve the values published before the last restart until the configuration is loaded
+        self._snapshot = StateSnapshot(os.path.join(MACROS["$(ICPVARDIR)"], SNAPSHOT_FILENAME))
+        self._restored_snapshot = self._restore_snapshot()
+        self._serving_snapshot = self._restored_snapshot is not None
+
+        # Start a background thread for handling write commands
+        write_thread = Thread(target=self.consume_write_queue, args=())
+        write_thread.daemon = True  # Daemonise thread
+        write_thread.start()
+
+        # Importing the configurations is slow, so it is done on the write thread while the
+        # snapshot is served
+        self.write_queue.put((self.initialise_config_list, (), "INITIALISING"))
+        self.write_queue.put((self.initialise_configserver, (FACILITY,), "INITIALISING"))
+        # The web server is not needed to serve the PVs, so it is started after the configurations
+        self.server = None
+        self.write_queue.put((self._start_web_server, (), "INITIALISING"))
+
+        # Save snapshots in the background for a warm restart
+        snapshot_thread = Thread(target=self._save_snapshots, args=())
+        snapshot_thread.daemon = True
+        snapshot_thread.start()
+
+        # Publish the statistics of the Channel Access calls made
+        ca_statistics_thread = Thread(target=self._publish_ca_statistics, args=())
+        ca_statistics_thread.daemon = True
+        ca_statistics_thread.start()
+
+    def setParam(self, reason: str, value: Any) -> None:
+        """Sets the value of a PV, recording it for the next snapshot.
+
+        Args:
+            reason: The PV name (without the PV prefix)
+            value: The value
+        """
+        if reason not in SNAPSHOT_EXCLUDED_PVS and not _is_derived_pv(reason):
+            self._published[reason] = value
+        super(BlockServer, self).setParam(reason, value)
+
+    def _restore_snapshot(self) -> Dict[str, Any] | None:
+        """Publishes the values in the snapshot saved before the last restart, and the values
+        derived from the large JSON PVs.
+
+        Returns:
+            The snapshot, or None if there was no usable snapshot
+        """
+        snapshot = self._snapshot.load()
+        if snapshot is None:
+            return None
+        with self.monitor_lock:
+            for pv, value in snapshot["pvs"].items():
+                try:
+                    if not self.does_pv_exist(pv) and isinstance(value, str):
+                        # PVs of inactive configurations and on-the-fly handlers
+                        self.add_string_pv_to_db(pv, required_count(len(value), 16000))
+                        self._snapshot_only_pvs.add(pv)
+                    if self.does_pv_exist(pv):
+                        self.setParam(pv, value)
+                except Exception as err:
+                    print_and_log(f"Could not restore {pv} from snapshot: {err}", "MINOR")
+            for pv in LARGE_JSON_PVS:
+                if snapshot["pvs"].get(pv):
+                    try:
+                        self._set_derived_params(pv, snapshot["pvs"][pv])
+                    except Exception as err:
+                        print_and_log(f"Could not restore variants of {pv}: {err}", "MINOR")
+            self.updatePVs()
+        print_and_log(f"Serving snapshot of configuration '{snapshot['config']}'")
+        return snapshot
+
+    def _remove_snapshot_only_pvs(self) -> None:
+        """Removes the PVs created to restore the snapshot which no handler has created since the
+        configurations were loaded, such as those of configurations deleted before the restart.
+        """
+        with self.monitor_lock:
+            for pv in sorted(self._snapshot_only_pvs):
+                self.delete_pv_from_db(pv)
+            self._snapshot_only_pvs.clear()
+
+    def _save_snapshots(self) -> None:
+        while True:
+            sleep(SNAPSHOT_INTERVAL)
+            try:
+                self.save_snapshot()
+            except Exception as err:
+                print_and_log(f"Could not save snapshot: {err}", "MINOR")
+
+    def _publish_ca_statistics(self) -> None:
+        while True:
+            self.encode_and_set_param(CA_STATS_PV, CA_STATISTICS.get_statistics())
+            sleep(PUBLISH_INTERVAL)
+
+    def save_snapshot(self) -> None:
+        """Saves a snapshot of the published values and the active configuration, if it is
+        loaded."""
+        if self._serving_snapshot or self._active_configserver is None:
+            return
+        self._snapshot.save(
+            self._active_configserver.get_config_name(),
+            self._active_fingerprint,
+            file_digests(self._generated_files()),
+            self._published.copy(),
+        )
+
+    def _get_active_fingerprint(self) -> str:
+        """Gets the fingerprint of the files of the active configuration and its components.
+
+        Returns:
+            The fingerprint, or an empty string for the blank configuration
+        """
+        if self._active_configserver is None:
+            return ""
+        name = self._active_configserver.get_config_name()
+        if not name:
+            return ""
+        return config_fingerprint(
+            config_content_paths(
+                name, self._active_configserver.get_component_names(include_base=True)
+            )
+        )
+
+    def _generated_files(self) -> list[str]:
+        """Gets the locations of the files generated from the active configuration.
+
+        Returns:
+            The gateway, archiver and run-control files
+        """
+        files = [path for path in (PVLIST_FILE, ARCHIVE_SETTINGS) if path is not None]
+        if self._run_control is not None:
+            files.append(self._run_control.get_settings_file())
+        return files
+
+    def initialise_config_list(self) -> None:
+        """Connects to version control and imports the data about all configurations."""
+        # Git is slow to import, so it is imported here rather than before the PVs are served
+        from ConfigVersionControl.git_version_control import GitVersionControl, RepoFactory
+
+        # Saves which did not finish leave staging directories behind
+        ConfigurationFileManager.remove_staging_dirs()
 
         # Connect to version control
         try:
             self._config_vc = GitVersionControl(
                 CONFIG_DIR, RepoFactory.get_repo(CONFIG_DIR), "config", CONFIG_PUSH_TIME
             )
+            # Saves in progress are not committed by the background thread
+            self._config_vc.ignore(STAGING_DIR_IGNORE_PATTERN)
             self._config_vc.setup()
             print_and_log("Config version control initialised correctly", "INFO")
         except NotUnderVersionControl as err:
@@ -196,7 +630,7 @@ class BlockServer(Driver):
 
         # Import data about all configs
         try:
-            self._config_list = ConfigListManager(self, ConfigurationFileManager())
+            self._config_list = ConfigListManager(self, new_file_manager())
         except Exception as err:
             print_and_log(
                 "Error creating inactive config list. "
@@ -205,17 +639,7 @@ class BlockServer(Driver):
                 % str(err),
                 "MINOR",
             )
-            self._config_list = ConfigListManager(self, ConfigurationFileManager())
-
-        # Start a background thread for handling write commands
-        write_thread = Thread(target=self.consume_write_queue, args=())
-        write_thread.daemon = True  # Daemonise thread
-        write_thread.start()
-
-        self.write_queue.put((self.initialise_configserver, (FACILITY,), "INITIALISING"))
-        # Starts the Web Server
-        self.server = Server()
-        self.server.start()
+            self._config_list = ConfigListManager(self, new_file_manager())
 
         self._component_switcher = ComponentSwitcher(
             self._config_list, self.write_queue, self.reload_current_config
@@ -232,7 +656,20 @@ class BlockServer(Driver):
         arch = ArchiverManager(ARCHIVE_UPLOADER, ARCHIVE_SETTINGS)
 
         self._active_configserver = ActiveConfigHolder(
-            MACROS, arch, ConfigurationFileManager(), self._ioc_control, CONFIG_DIR
+            MACROS, arch, new_file_manager(), self._ioc_control, CONFIG_DIR
+        )
+        artifact_builders = {
+            GATEWAY_ALIASES: self._gateway.build_alias_file,
+            ARCHIVE_CONFIG: self._active_configserver.build_archive_config,
+        }
+        if facility == "ISIS":
+            artifact_builders[RUNCONTROL_FILE] = build_runcontrol_settings
+        self._stager = ConfigStager(
+            MACROS,
+            new_file_manager(),
+            artifact_builders,
+            self._active_configserver.get_all_iocs,
+            fingerprint=config_fingerprint,
         )
 
         if facility == "ISIS":
@@ -249,13 +686,26 @@ class BlockServer(Driver):
         # Import all the synoptic data and create PVs
         print_and_log("Creating synoptic manager...")
         if SCHEMA_DIR is not None:
-            self._syn = SynopticManager(self, SCHEMA_DIR, self._active_configserver)
+            if CONFIG_DATABASE is not None:
+                self._syn = SynopticManager(
+                    self,
+                    SCHEMA_DIR,
+                    self._active_configserver,
+                    SqliteSynopticFileIO(CONFIG_DATABASE),
+                )
+            else:
+                self._syn = SynopticManager(self, SCHEMA_DIR, self._active_configserver)
             self.on_the_fly_handlers.append(self._syn)
             print_and_log("Finished creating synoptic manager")
 
             # Import all the devices data and create PVs
             print_and_log("Creating devices manager...")
-            self._devices = DevicesManager(self, SCHEMA_DIR)
+            if CONFIG_DATABASE is not None:
+                self._devices = DevicesManager(
+                    self, SCHEMA_DIR, SqliteDevicesFileIO(CONFIG_DATABASE)
+                )
+            else:
+                self._devices = DevicesManager(self, SCHEMA_DIR)
             self.on_the_fly_handlers.append(self._devices)
             print_and_log("Finished creating devices manager")
 
@@ -270,8 +720,20 @@ class BlockServer(Driver):
             print_and_log("Could not load last configuration. Message was: %s" % err, "MAJOR")
             self._active_configserver.clear_config()
             self._initialise_config()
+        self._serving_snapshot = False
+        self._remove_snapshot_only_pvs()
 
-    def read(self, reason: str) -> str:
+    def _start_web_server(self) -> None:
+        """Starts the web server and gives it the active configuration."""
+        # Tornado is slow to import, so it is imported here rather than before the PVs are served
+        from WebServer.simple_webserver import Server
+
+        self.server = Server()
+        self.server.start()
+        if self._active_configserver is not None:
+            self.server.set_config(convert_to_json(self._active_configserver.get_config_details()))
+
+    def read(self, reason: str) -> str | list[int]:
         """A method called by SimpleServer when a PV is read from the BlockServer over
          Channel Access.
 
@@ -280,11 +742,17 @@ class BlockServer(Driver):
 
         Returns:
             string : A compressed and hexed JSON formatted string that gives the desired
-            information based on reason.
+            information based on reason, or for a binary twin the compressed JSON as a list of
+            bytes.
             If an Exception is thrown in the reading of the information this is returned
              in compressed and hexed JSON.
         """
-        if self._active_configserver is not None:
+        if reason in LAZY_DERIVED_PVS:
+            return self._get_derived_param(reason)
+        if self._serving_snapshot:
+            value = self.getParam(reason)
+            return bytes.decode(value, "utf-8") if type(value) is bytes else str(value)
+        if self._active_configserver is not None and self._config_list is not None:
             try:
                 if reason == BlockserverPVNames.GROUPS:
                     grps = ConfigurationJsonConverter.groups_to_json(
@@ -295,15 +763,10 @@ class BlockServer(Driver):
                     value = compress_and_hex(convert_to_json(self._config_list.get_configs()))
                 elif reason == BlockserverPVNames.COMPS:
                     value = compress_and_hex(convert_to_json(self._config_list.get_components()))
-                elif reason == BlockserverPVNames.BLANK_CONFIG:
-                    js = convert_to_json(self.get_blank_config())
-                    value = compress_and_hex(js)
-                elif reason == BlockserverPVNames.BANNER_DESCRIPTION:
-                    value = compress_and_hex(self.spangle_banner)
+                elif reason in self._static_payloads:
+                    value = self._static_payloads.get(reason)
                 elif reason == BlockserverPVNames.ALL_COMPONENT_DETAILS:
-                    value = compress_and_hex(
-                        convert_to_json(list(self._config_list.all_components.values()))
-                    )
+                    value = self._config_list.get_all_component_details_payload()
                 elif reason == BlockserverPVNames.CURR_CONFIG_NAME:
                     value = self._active_configserver.get_config_name()
                 elif reason == BlockserverPVNames.CURR_CONFIG_NAME_SEVR:
@@ -311,6 +774,11 @@ class BlockServer(Driver):
                 elif reason == BlockserverPVNames.HEARTBEAT:
                     value = 0
                 else:
+                    # Fetching the details of a configuration suggests it may be loaded next
+                    config_name = self._config_list.get_config_name_for_details_pv(reason)
+                    if config_name is not None:
+                        self.prestage_config(config_name)
+
                     # Check to see if it is a on-the-fly PV
                     for handler in self.on_the_fly_handlers:
                         if handler.read_pv_exists(reason):
@@ -340,14 +808,63 @@ class BlockServer(Driver):
         try:
             data = dehex_and_decompress(bytes(value, encoding="utf-8")).strip(b'"').decode("utf-8")
             if reason == BlockserverPVNames.LOAD_CONFIG:
-                self.write_queue.put((self.load_config, (data,), "LOADING_CONFIG"))
+                resources = self._active_config_resources(data)
+                self._queued_config = data
+                self.write_queue.put((self.load_config, (data,), "LOADING_CONFIG", resources))
+            elif reason == PRESTAGE_CONFIG_PV:
+                self.prestage_config(data)
+            elif reason == DIFF_CONFIGS_PV:
+                request = convert_from_json(data)
+                names = (request.get("from"), request.get("to"))
+                resources = _resources_for(config_resource, [n for n in names if n is not None])
+                if resources is not None and None in names:
+                    resources.add(ACTIVE_CONFIG)
+                self.write_queue.put((self.diff_configs, names, "DIFFING_CONFIGS", resources))
+            elif reason == SEARCH_CONFIGS_PV:
+                self.write_queue.put(
+                    (self.search_configs, (convert_from_json(data),), "SEARCHING_CONFIGS", set())
+                )
+            elif reason == PROFILE_COMMANDS_PV:
+                request = convert_from_json(data)
+                self._command_profiler.arm(int(request.get("count", 1)), request.get("command"))
+            elif reason == TAKE_MEMORY_SNAPSHOT_PV:
+                self.write_queue.put(
+                    (
+                        self.take_memory_snapshot,
+                        (convert_from_json(data),),
+                        "TAKING_MEMORY_SNAPSHOT",
+                        set(),
+                    )
+                )
+            elif reason == RESET_CA_STATS_PV:
+                CA_STATISTICS.reset()
+                self.encode_and_set_param(CA_STATS_PV, CA_STATISTICS.get_statistics())
             elif reason == BlockserverPVNames.RELOAD_CURRENT_CONFIG:
-                self.write_queue.put((self.reload_current_config, (), "RELOAD_CURRENT_CONFIG"))
+                self.write_queue.put(
+                    (
+                        self.reload_current_config,
+                        (),
+                        "RELOAD_CURRENT_CONFIG",
+                        self._active_config_resources(),
+                    )
+                )
             elif reason == BlockserverPVNames.START_IOCS:
-                self.write_queue.put((self.start_iocs, (convert_from_json(data),), "START_IOCS"))
+                self.write_queue.put(
+                    (
+                        self.start_iocs,
+                        (convert_from_json(data),),
+                        "START_IOCS",
+                        self._active_config_resources(),
+                    )
+                )
             elif reason == BlockserverPVNames.STOP_IOCS:
                 self.write_queue.put(
-                    (self._ioc_control.stop_iocs, (convert_from_json(data),), "STOP_IOCS")
+                    (
+                        self._ioc_control.stop_iocs,
+                        (convert_from_json(data),),
+                        "STOP_IOCS",
+                        self._active_config_resources(),
+                    )
                 )
             elif reason == BlockserverPVNames.RESTART_IOCS:
                 self.write_queue.put(
@@ -355,24 +872,59 @@ class BlockServer(Driver):
                         self._ioc_control.restart_iocs,
                         (convert_from_json(data), True),
                         "RESTART_IOCS",
+                        self._active_config_resources(),
                     )
                 )
             elif reason == BlockserverPVNames.SET_CURR_CONFIG_DETAILS:
-                self.write_queue.put((self._set_curr_config, (data,), "SETTING_CONFIG"))
+                self.write_queue.put(
+                    (
+                        self._set_curr_config,
+                        (data,),
+                        "SETTING_CONFIG",
+                        self._active_config_resources(_name_from_details(data)),
+                    )
+                )
             elif reason == BlockserverPVNames.SAVE_NEW_CONFIG:
-                self.write_queue.put((self.save_config, (data,), "SAVING_NEW_CONFIG"))
+                self.write_queue.put(
+                    (
+                        self.save_config,
+                        (data,),
+                        "SAVING_NEW_CONFIG",
+                        _resources_for(config_resource, [_name_from_details(data)]),
+                    )
+                )
             elif reason == BlockserverPVNames.SAVE_NEW_COMPONENT:
-                self.write_queue.put((self.save_config, (data, True), "SAVING_NEW_COMP"))
+                self.write_queue.put(
+                    (
+                        self.save_config,
+                        (data, True),
+                        "SAVING_NEW_COMP",
+                        _resources_for(component_resource, [_name_from_details(data)]),
+                    )
+                )
+            elif reason == EDIT_CONFIGS_PV:
+                edits = parse_edits(data)
+                self.write_queue.put(
+                    (self.edit_configs, (edits,), "EDITING_CONFIGS", _edit_resources(edits))
+                )
             elif reason == BlockserverPVNames.DELETE_CONFIGS:
+                names = convert_from_json(data)
                 self.write_queue.put(
-                    (self._config_list.delete_configs, (convert_from_json(data),), "DELETE_CONFIGS")
+                    (
+                        self.delete_configs,
+                        (names,),
+                        "DELETE_CONFIGS",
+                        _resources_for(config_resource, names),
+                    )
                 )
             elif reason == BlockserverPVNames.DELETE_COMPONENTS:
+                names = convert_from_json(data)
                 self.write_queue.put(
                     (
-                        self._config_list.delete_components,
-                        (convert_from_json(data),),
+                        self.delete_components,
+                        (names,),
                         "DELETE_COMPONENTS",
+                        _resources_for(component_resource, names),
                     )
                 )
             else:
@@ -381,7 +933,12 @@ class BlockServer(Driver):
                 for handler in self.on_the_fly_handlers:
                     if handler.write_pv_exists(reason):
                         self.write_queue.put(
-                            (handler.handle_pv_write, (reason, data), "SETTING_CONFIG")
+                            (
+                                handler.handle_pv_write,
+                                (reason, data),
+                                "SETTING_CONFIG",
+                                handler.get_write_resources(reason),
+                            )
                         )
                         status = True
                         break
@@ -398,6 +955,29 @@ class BlockServer(Driver):
             self.setParam(reason, value)
         return status
 
+    def _active_config_resources(
+        self, *configs: str | None, components: Iterable[str] = ()
+    ) -> set[str] | None:
+        """Gets the resources for a command on the active configuration: the active configuration
+        and the configuration last queued to load, the configurations the command may load, the
+        components of each, and some other components (see active_config_resources).
+
+        Args:
+            configs: The names of the configurations the command may load
+            components: The names of other components the command uses
+
+        Returns:
+            The resources, or None (meaning every resource) if the configurations are not known
+        """
+        config_list = self._config_list
+        if config_list is None or not all(isinstance(name, str) for name in configs):
+            return None
+        names = {config_list.active_config_name, self._queued_config, *configs}
+        resources = active_config_resources(
+            {name: config_list.get_components_of(name) for name in names if name}
+        )
+        return resources | {component_resource(name) for name in components}
+
     def load_last_config(self) -> None:
         """Loads the last configuration used.
 
@@ -412,7 +992,18 @@ class BlockServer(Driver):
                 self._active_configserver.clear_config()
             else:
                 print_and_log("Loaded last configuration: %s" % last)
-            self._initialise_config()
+
+            # Skip regenerating files which were generated from the same configuration before
+            # the restart and have not changed since
+            regenerate = True
+            snapshot, self._restored_snapshot = self._restored_snapshot, None
+            if last is not None and snapshot is not None:
+                regenerate = not StateSnapshot.is_unchanged(
+                    snapshot, last, self._get_active_fingerprint(), self._generated_files()
+                )
+                if not regenerate:
+                    print_and_log("Configuration unchanged since snapshot - not regenerating files")
+            self._initialise_config(regenerate=regenerate)
 
     def _set_curr_config(self, details: str) -> None:
         """Sets the current configuration details to that defined in the JSON, saves to disk,
@@ -439,15 +1030,18 @@ class BlockServer(Driver):
 
             self.save_config(details)
 
-    def _initialise_config(self, full_init: bool = False) -> None:
+    def _initialise_config(self, full_init: bool = False, regenerate: bool = True) -> None:
         """Responsible for initialising the configuration.
         Sets all the monitors, initialises the gateway, etc.
 
         Args:
             full_init (bool, optional): whether this requires a full initialisation,
              e.g. on loading a new configuration
+            regenerate (bool, optional): whether to regenerate the gateway, archiver and
+             run-control files; False if they are known to match the configuration already
         """
         if self._active_configserver is not None:
+            self._active_fingerprint = self._get_active_fingerprint()
             new_iocs, changed_iocs, removed_iocs = self._active_configserver.iocs_changed()
             self._ioc_control.stop_iocs(list(removed_iocs))
             self._start_config_iocs(list(new_iocs), list(changed_iocs))
@@ -471,31 +1065,41 @@ class BlockServer(Driver):
                         self.start_iocs([CAEN_DISCRIMINATOR_IOC_NAME])
 
             # Set up the gateway
-            if self._active_configserver.blocks_changed() or full_init:
+            if regenerate and (self._active_configserver.blocks_changed() or full_init):
                 self._gateway.set_new_aliases(
                     self._active_configserver.get_block_details(),
                     self._active_configserver.configures_block_gateway_and_archiver(),
                     os.path.join(
                         CONFIG_DIR, "configurations", self._active_configserver.get_config_name()
                     ),
+                    self._active_configserver.get_staged_artifact(GATEWAY_ALIASES),
                 )
 
-            self._config_list.active_config_name = self._active_configserver.get_config_name()
-            self._config_list.active_components = self._active_configserver.get_component_names()
-            self._config_list.update_monitors()
+            if self._config_list is not None:
+                config_list = self._config_list
+                config_list.active_config_name = self._active_configserver.get_config_name()
+                config_list.active_components = self._active_configserver.get_component_names()
+                config_list.update_monitors()
 
             self.update_blocks_monitors()
 
             self.update_get_details_monitors()
             self.update_wd_details_monitors()
             self.update_curr_config_name_monitors()
-            self._active_configserver.update_archiver(full_init)
+            if regenerate:
+                self._active_configserver.update_archiver(full_init)
             for handler in self.on_the_fly_handlers:
-                handler.on_config_change(full_init=full_init)
+                if regenerate or handler is not self._run_control:
+                    handler.on_config_change(full_init=full_init)
 
             # Update Web Server text
-            self.server.set_config(convert_to_json(self._active_configserver.get_config_details()))
-            self.write_queue.put((self.set_config_block_values, (), "LOADING_BLOCK_SETS"))
+            if self.server is not None:
+                self.server.set_config(
+                    convert_to_json(self._active_configserver.get_config_details())
+                )
+            self.write_queue.put(
+                (self.set_config_block_values, (), "LOADING_BLOCK_SETS", {ACTIVE_CONFIG})
+            )
 
     def _start_config_iocs(self, iocs_to_start: list[str], iocs_to_restart: list[str]) -> None:
         # Start the IOCs, if they are available and if they are flagged for autostart
@@ -545,13 +1149,104 @@ class BlockServer(Driver):
         if self._active_configserver is not None:
             print_and_log(f"Loading configuration '{config}'")
             try:
-                self._active_configserver.load_active(config)
+                staged = self._stager.take(config) if self._stager is not None else None
+                self._active_configserver.load_active(config, staged)
                 # If we get this far then assume the config is okay
                 self._initialise_config(full_init=full_init)
             except Exception as err:
                 print_and_log(f"Exception while loading configuration '{config}': {err}", "MAJOR")
                 traceback.print_exc()
 
+    def prestage_config(self, config: str) -> None:
+        """Starts loading and preparing a configuration in the background, so it loads more
+        quickly if it is loaded next.
+
+        Args:
+            config (string): The name of the configuration
+        """
+        if self._stager is None or self._active_configserver is None:
+            return
+        if config.lower() == self._active_configserver.get_config_name().lower():
+            # Reloading the active configuration does not use staged configurations
+            return
+        self._stager.prestage(config)
+
+    def diff_configs(self, old: str | None, new: str | None) -> None:
+        """Publishes the differences between two configurations on CONFIG_DIFF_PV, or the error if
+        they cannot be compared.
+
+        The saved configurations are staged, so they are only loaded again if their files have
+        changed, and a configuration being compared to is ready to load.
+
+        Args:
+            old (string): The name of the configuration to compare from, or None for the active
+             configuration
+            new (string): The name of the configuration to compare to, or None for the active
+             configuration
+        """
+        if self._stager is None or self._active_configserver is None:
+            return
+        try:
+            holders = [
+                self._active_configserver
+                if name is None
+                else self._stager.prestage(name).result().holder
+                for name in (old, new)
+            ]
+            diff = diff_configs(*holders)
+        except Exception as err:
+            print_and_log(f"Could not compare configurations {old} and {new}: {err}", "MAJOR")
+            diff = "Error: " + str(err)
+        self.encode_and_set_param(CONFIG_DIFF_PV, diff)
+
+    def search_configs(self, request: Dict[str, Any]) -> None:
+        """Publishes the configurations and components containing a block, PV or IOC on
+        SEARCH_RESULTS_PV, or the error if the request is not a valid search.
+
+        Args:
+            request (dict): The field to search (pv, block or ioc), the value to look for and
+             optionally whether the field must equal the value (exact, the default) or contain it
+             (contains)
+        """
+        if self._config_list is None:
+            return
+        try:
+            missing = [key for key in ("field", "value") if key not in request]
+            if missing:
+                raise ValueError(f"Search request is missing {', '.join(missing)}")
+            results = self._config_list.search(
+                request["field"], request["value"], request.get("match", "exact")
+            )
+        except Exception as err:
+            print_and_log(f"Could not search configurations: {err}", "MAJOR")
+            results = "Error: " + str(err)
+        self.encode_and_set_param(SEARCH_RESULTS_PV, results)
+
+    def take_memory_snapshot(self, request: Dict[str, Any]) -> None:
+        """Publishes a memory snapshot on MEMORY_SNAPSHOT_PV, starting or stopping tracing memory
+        allocations first if requested.
+
+        Args:
+            request (dict): The request, see MemorySnapshots.handle
+        """
+        self.encode_and_set_param(MEMORY_SNAPSHOT_PV, self._memory_snapshots.handle(request))
+
+    def _get_memory_counts(self) -> Dict[str, int]:
+        """Gets the numbers of PVs and the sizes of the caches, to look for memory leaks.
+
+        Returns:
+            The counts
+        """
+        counts = {
+            "pvs": len(self.pvDB),
+            "on_the_fly_pvs": len(self.pvDB) - len(initial_dbs),
+            "published_values": len(self._published),
+        }
+        for holder in (self._config_list, self._stager, self._syn):
+            if holder is not None:
+                counts.update(holder.get_cache_sizes())
+        return counts
+
     def reload_current_config(self) -> None:
         """Reload the current configuration."""
         if self._active_configserver is not None:
@@ -586,7 +1281,7 @@ class BlockServer(Driver):
                 )
             )
 
-        inactive = InactiveConfigHolder(MACROS, ConfigurationFileManager())
+        inactive = InactiveConfigHolder(MACROS, new_file_manager())
 
         # Is the config we're overwriting (if any) marked with the protected flag?
         try:
@@ -613,34 +1308,149 @@ class BlockServer(Driver):
             if not as_comp:
                 print_and_log(f"Saving configuration ({config_name})")
                 inactive.save_inactive()
-                self._config_list.update_a_config_in_list(inactive)
             else:
                 print_and_log(f"Saving component ({config_name})")
                 inactive.save_inactive(as_comp=True)
-                self._config_list.update_a_config_in_list(inactive, True)
+            if self._config_list is not None:
+                self._config_list.update_a_config_in_list(inactive, as_comp)
 
             print_and_log(f"Finished saving ({config_name})")
+            if self._stager is not None:
+                # A staged configuration may use the component, so discard them all
+                self._stager.discard(None if as_comp else config_name)
 
         except Exception:
             print_and_log(
                 f"Problem occurred saving configuration: {traceback.format_exc()}", "MAJOR"
             )
 
-        if self._active_configserver is not None:
-            # Reload configuration if a component has changed
-            if as_comp and new_details["name"] in self._active_configserver.get_component_names():
-                self.load_last_config()
+        # Reload the active configuration if it uses what was saved. This runs once the active
+        # configuration is free, and checks again then as it may have changed in the meantime.
+        if as_comp:
+            self.write_queue.put(
+                (
+                    self._reload_if_component_active,
+                    (config_name,),
+                    "LOADING_CONFIG",
+                    self._active_config_resources(components=[config_name]),
+                )
+            )
+        else:
+            self.write_queue.put(
+                (
+                    self._reload_if_config_active,
+                    (config_name,),
+                    "LOADING_CONFIG",
+                    self._active_config_resources(config_name),
+                )
+            )
 
-            # If the configuration we are trying to save is the currently active one,
-            # we need to reload it.
+    def edit_configs(self, edits: list[ConfigEdit]) -> None:
+        """Saves a batch of edits to configurations and components so that either all or none of
+        them change.
 
-            if config_name == self._active_configserver.get_config_name():
-                self.load_config(config_name, full_init=False)
+        Every edit is checked before any is saved. The configuration lists are then updated once
+        and the changes committed to version control together.
+
+        Args:
+            edits (list): The edits, as read by parse_edits
+        """
+        file_manager = new_file_manager()
+        prepared = prepare_edits(edits, file_manager, self._get_timestamp())
+        names = ", ".join(edit.name for edit in edits)
+        print_and_log(f"Saving edits to {names}")
+        paths = edit_paths(edits)
+        with self._config_vc.hold_commits(paths):
+            save_edits(prepared, file_manager)
+            self._config_vc.commit(f"Edited {names}", paths)
+        print_and_log(f"Finished saving edits to {names}")
+
+        if self._config_list is not None:
+            self._config_list.update_configs_in_list(
+                [(edit.holder, edit.is_component) for edit in prepared]
+            )
+        configs = [edit.name for edit in edits if not edit.is_component]
+        components = [edit.name for edit in edits if edit.is_component]
+        if self._stager is not None:
+            if components:
+                # A staged configuration may use the components, so discard them all
+                self._stager.discard(None)
+            else:
+                for name in configs:
+                    self._stager.discard(name)
+
+        # Reload the active configuration if it uses what was saved, once it is free
+        self.write_queue.put(
+            (
+                self._reload_if_edits_active,
+                (configs, components),
+                "LOADING_CONFIG",
+                self._active_config_resources(*configs, components=components),
+            )
+        )
+
+    def delete_configs(self, names: list[str]) -> None:
+        """Deletes configurations.
+
+        Args:
+            names (list): The names of the configurations
+        """
+        if self._config_list is not None:
+            self._config_list.delete_configs(names)
+
+    def delete_components(self, names: list[str]) -> None:
+        """Deletes components.
+
+        Args:
+            names (list): The names of the components
+        """
+        if self._config_list is not None:
+            self._config_list.delete_components(names)
+
+    def _reload_if_edits_active(self, configs: list[str], components: list[str]) -> None:
+        """Reloads the active configuration if it is one of some configurations or contains one
+        of some components.
+
+        Args:
+            configs (list): The names of the configurations
+            components (list): The names of the components
+        """
+        if self._active_configserver is None:
+            return
+        active = self._active_configserver.get_config_name()
+        if active in configs:
+            self.load_config(active, full_init=False)
+        elif set(components) & set(self._active_configserver.get_component_names()):
+            self.load_last_config()
+
+    def _reload_if_component_active(self, name: str) -> None:
+        """Reloads the active configuration if it contains a component.
+
+        Args:
+            name (string): The name of the component
+        """
+        if (
+            self._active_configserver is not None
+            and name in self._active_configserver.get_component_names()
+        ):
+            self.load_last_config()
+
+    def _reload_if_config_active(self, name: str) -> None:
+        """Reloads the active configuration if it is the named configuration.
+
+        Args:
+            name (string): The name of the configuration
+        """
+        if (
+            self._active_configserver is not None
+            and name == self._active_configserver.get_config_name()
+        ):
+            self.load_config(name, full_init=False)
 
     def _get_inactive_history(self, name: str, is_component: bool = False) -> list[str | None]:
         # If it already exists load it
         try:
-            inactive = InactiveConfigHolder(MACROS, ConfigurationFileManager())
+            inactive = InactiveConfigHolder(MACROS, new_file_manager())
             inactive.load_inactive(name, is_component)
             # Get previous history
             history = inactive.get_history()
@@ -655,16 +1465,106 @@ class BlockServer(Driver):
     def update_blocks_monitors(self) -> None:
         """Updates the PV monitors for the blocks and groups, so the clients can see any changes."""
         if self._active_configserver is not None:
-            with self.monitor_lock:
-                block_names = convert_to_json(self._active_configserver.get_blocknames())
-                self.setParam(BlockserverPVNames.BLOCKNAMES, compress_and_hex(block_names))
-
-                groups = ConfigurationJsonConverter.groups_to_json(
+            self.encode_and_set_param(
+                BlockserverPVNames.BLOCKNAMES, self._active_configserver.get_blocknames()
+            )
+            self.encode_and_set_param(
+                BlockserverPVNames.GROUPS,
+                ConfigurationJsonConverter.groups_to_list(
                     self._active_configserver.get_group_details()
-                )
-                self.setParam(BlockserverPVNames.GROUPS, compress_and_hex(groups))
+                ),
+            )
+
+    def encode_and_set_param(self, pv: str, value: Any, encoder: Encoder = encode_json) -> None:
+        """Encodes a value on a worker thread and then sets it on a PV and updates the monitors.
+
+        Values are set in the order they are submitted. The value must not be modified
+        afterwards, as it is encoded on another thread. If the PV has a binary twin, with the
+        value as compressed JSON, and a variant compressed with the preset payload dictionary,
+        they are also encoded if they have ever been read. Otherwise they are only built from the
+        value of the PV when they are next read.
+
+        Args:
+            pv (string): The name of the PV
+            value: The value to encode
+            encoder: Function to encode the value, by default to compressed and hexed JSON
+        """
+        self._encoding_service.submit(pv, value, encoder)
+        if pv in LARGE_JSON_PVS:
+            with self._derived_lock:
+                encode_binary_twin = binary_pv(pv) in self._read_derived_pvs
+                encode_dictionary_variant = dictionary_pv(pv) in self._read_derived_pvs
+            if encode_binary_twin:
+                self._encoding_service.submit(binary_pv(pv), value, encode_binary)
+            if encode_dictionary_variant:
+                self._encoding_service.submit(dictionary_pv(pv), value, encode_json_with_dictionary)
+
+    def _set_derived_params(self, pv: str, value: str | bytes) -> None:
+        """Sets the chunks of a large JSON PV from its value, and marks its binary twin and
+        dictionary variant to be built from it when next read.
+
+        Args:
+            pv (string): The name of the PV
+            value: The compressed and hexed value of the PV
+        """
+        with self._derived_lock:
+            self._stale_derived_pvs.update({binary_pv(pv), dictionary_pv(pv)})
+        self._chunks.publish(pv, value.encode("utf-8") if isinstance(value, str) else value)
+
+    def _get_derived_param(self, pv: str) -> Any:
+        """Gets the value of a binary twin or dictionary variant, building it from the value of
+        its PV if that has been published since it was last built.
 
+        Once read, it is encoded along with its PV whenever that is published, so that monitors
+        of it are kept up to date.
+
+        Args:
+            pv (string): The name of the binary twin or dictionary variant
+
+        Returns:
+            The value
+        """
+        source, build = LAZY_DERIVED_PVS[pv]
+        with self._derived_lock:
+            self._read_derived_pvs.add(pv)
+            stale = pv in self._stale_derived_pvs
+            # Marked again if the PV is published while building
+            self._stale_derived_pvs.discard(pv)
+        if stale:
+            try:
+                value = build(self.getParam(source))
+            except Exception as err:
+                print_and_log(f"Could not build {pv}: {err}", "MAJOR")
+                with self._derived_lock:
+                    self._stale_derived_pvs.add(pv)
+                return self.getParam(pv)
+            with self.monitor_lock:
+                self.setParam(pv, value)
                 self.updatePVs()
+        return self.getParam(pv)
+
+    def _set_encoded_param(self, pv: str, value: Any) -> None:
+        """Sets an encoded value on a PV, and on its chunks if it is one of the large JSON PVs.
+
+        Args:
+            pv (string): The name of the PV
+            value: The encoded value
+        """
+        self.setParam(pv, value)
+        if pv in LAZY_DERIVED_PVS:
+            with self._derived_lock:
+                self._stale_derived_pvs.discard(pv)
+        elif pv in LARGE_JSON_PVS:
+            with self._derived_lock:
+                self._stale_derived_pvs.update({binary_pv(pv), dictionary_pv(pv)})
+            self._chunks.publish(pv, value.encode("utf-8") if isinstance(value, str) else value)
+            if len(value) > initial_dbs[pv]["count"]:
+                print_and_log(
+                    f"Value of {pv} is {len(value)} characters but the PV only holds "
+                    f"{initial_dbs[pv]['count']}; it is available in full from "
+                    f"{chunks_pv(pv)}",
+                    "MAJOR",
+                )
 
     def update_server_status(self, status: str = "") -> None:
         """Updates the monitor for the server status, so the clients can see any changes.
@@ -683,32 +1583,24 @@ class BlockServer(Driver):
     def update_get_details_monitors(self) -> None:
         """Updates the monitor for the active configuration, so the clients can see any changes."""
         if self._active_configserver is not None:
-            with self.monitor_lock:
-                config_details_json = convert_to_json(
-                    self._active_configserver.get_config_details()
-                )
-                self.setParam(
-                    BlockserverPVNames.GET_CURR_CONFIG_DETAILS,
-                    bytes.decode(compress_and_hex(config_details_json), "utf-8"),
-                )
-                self.updatePVs()
+            self.encode_and_set_param(
+                BlockserverPVNames.GET_CURR_CONFIG_DETAILS,
+                self._active_configserver.get_config_details(),
+                encode_json_as_str,
+            )
 
     def update_wd_details_monitors(self) -> None:
         """Updates the monitor for the active configuration,
         so the web dashboard can see any changes."""
         if self._active_configserver is not None:
-            with self.monitor_lock:
-                config_details_json = convert_to_json(
-                    {
-                        k: v
-                        for k, v in self._active_configserver.get_config_details().items()
-                        if k not in ["component_iocs", "iocs"]
-                    }
-                )
-                self.setParam(
-                    BlockserverPVNames.WD_CONF_DETAILS, compress_and_hex(config_details_json)
-                )
-                self.updatePVs()
+            self.encode_and_set_param(
+                BlockserverPVNames.WD_CONF_DETAILS,
+                {
+                    k: v
+                    for k, v in self._active_configserver.get_config_details().items()
+                    if k not in ["component_iocs", "iocs"]
+                },
+            )
 
     def update_curr_config_name_monitors(self) -> None:
         """Updates the monitor for the active configuration name,
@@ -724,27 +1616,53 @@ class BlockServer(Driver):
     def consume_write_queue(self) -> None:
         """Actions any requests on the write queue.
 
-        Queue items are tuples with three values:
+        Queue items are tuples with three or four values:
         the method to call; the argument(s) to send (tuple);
-         and, the description of the state (string))
+         the description of the state (string);
+         and, optionally, the resources the method uses (see ResourceScheduler).
+        Requests using different resources run at the same time; those without resources run on
+        their own.
 
         For example:
-            self.load_config, ("configname",), "LOADING_CONFIG")
+            self.load_config, ("configname",), "LOADING_CONFIG", {ACTIVE_CONFIG})
         """
         while True:
-            cmd, arg, state = self.write_queue.get(block=True)
-            self.update_server_status(state)
-            try:
-                cmd(*arg) if arg is not None else cmd()
-            except ManagerModeRequiredError as err:
-                print_and_log(f"Error, operation requires manager mode: {err}", "MAJOR")
-            except Exception as err:
-                print_and_log(
-                    f"Error executing write queue command {cmd.__name__} for state {state}: {err}",
-                    "MAJOR",
-                )
-                traceback.print_exc()
-            self.update_server_status("")
+            cmd, arg, state, *resources = self.write_queue.get(block=True)
+            self._write_commands.submit(
+                self._run_write_command, (cmd, arg, state), resources[0] if resources else None
+            )
+
+    def _run_write_command(self, cmd: Callable[..., Any], arg: tuple | None, state: str) -> None:
+        """Runs a request from the write queue, showing its state while it runs and profiling it
+        if the command profiler is armed.
+
+        Args:
+            cmd: The method to call
+            arg: The argument(s) to send
+            state: The description of the state
+        """
+        self._set_running_state(state, running=True)
+        try:
+            self._command_profiler.run(cmd, arg, state)
+        except ManagerModeRequiredError as err:
+            print_and_log(f"Error, operation requires manager mode: {err}", "MAJOR")
+        except Exception as err:
+            print_and_log(
+                f"Error executing write queue command {cmd.__name__} for state {state}: {err}",
+                "MAJOR",
+            )
+            traceback.print_exc()
+        finally:
+            self._set_running_state(state, running=False)
+
+    def _set_running_state(self, state: str, running: bool) -> None:
+        # The status shows the most recently started of the running requests
+        with self._status_lock:
+            if running:
+                self._running_states.append(state)
+            else:
+                self._running_states.remove(state)
+            self.update_server_status(self._running_states[-1] if self._running_states else "")
 
     def get_blank_config(self) -> Dict[str, Any]:
         """Get a blank configuration which can be used to create a new configuration from scratch.
@@ -752,7 +1670,7 @@ class BlockServer(Driver):
         Returns:
             dict : A dictionary containing all the details of a blank configuration
         """
-        temp_config = InactiveConfigHolder(MACROS, ConfigurationFileManager())
+        temp_config = InactiveConfigHolder(MACROS, new_file_manager())
         return temp_config.get_config_details()
 
     def start_iocs(self, iocs: list[str]) -> None:
@@ -820,8 +1738,11 @@ class BlockServer(Driver):
             del manager.pvs[self.port][name]
             del manager.pvf[fullname]
             del self.pvDB[name]
+            self._published.pop(name, None)
 
     def add_string_pv_to_db(self, name: str, count: int = 1000) -> None:
+        # A PV restored from the snapshot is still needed if a handler creates it again
+        self._snapshot_only_pvs.discard(name)
         # Check name not already in PVDB and that a PV does not already exist
         if name not in manager.pvs[self.port]:
             try:
@@ -920,6 +1841,14 @@ if __name__ == "__main__":
         default=["ISIS"],
         help="Which facility is this being run for (default=ISIS)",
     )
+    parser.add_argument(
+        "-db",
+        "--config_database",
+        nargs=1,
+        type=str,
+        help="An SQLite database to keep the configurations in, instead of the configuration "
+        "directory (default=use the configuration directory)",
+    )
 
     args = parser.parse_args()
 
@@ -927,7 +1856,7 @@ if __name__ == "__main__":
     if FACILITY == "ISIS":
         from server_common.loggers.isis_logger import IsisLogger
 
-        set_logger(IsisLogger())
+        start_async_logging(IsisLogger())
     print_and_log(f"FACILITY = {FACILITY}")
 
     GATEWAY_PREFIX = args.gateway_prefix[0]
@@ -964,14 +1893,27 @@ if __name__ == "__main__":
         PVLIST_FILE = args.pvlist_name[0]
 
         print_and_log(f"BLOCKSERVER PREFIX = {CONTROL_SYSTEM_PREFIX}")
+        FILEPATH_MANAGER.initialise(CONFIG_DIR, SCRIPT_DIR, SCHEMA_DIR)
+        if args.config_database:
+            CONFIG_DATABASE = ConfigDatabase(os.path.abspath(args.config_database[0]))
+            print_and_log(f"CONFIGURATION DATABASE = {CONFIG_DATABASE.path}")
+        size_large_json_pvs(
+            estimate_config_payload_sizes(
+                FILEPATH_MANAGER.config_dir, FILEPATH_MANAGER.component_dir
+            )
+        )
+
         SERVER = SimpleServer()
         SERVER.createPV(CONTROL_SYSTEM_PREFIX, initial_dbs)
         DRIVER = BlockServer(SERVER)  # pyright: ignore
 
         # Process CA transactions
-        while True:
-            try:
-                SERVER.process(0.1)
-            except Exception as err:
-                print_and_log(err, "MAJOR")
-                break
+        try:
+            while True:
+                try:
+                    SERVER.process(0.1)
+                except Exception as err:
+                    print_and_log(err, "MAJOR")
+                    break
+        finally:
+            DRIVER.save_snapshot()